@@ -0,0 +1,62 @@
+"""Import-time profiling for ``aion --profile-startup``.
+
+Kept out of ``aion.cli`` so it can be imported (and tested) without the
+CLI's logging setup side effects.
+"""
+
+import os
+import subprocess
+import sys
+
+from aion._rich_compat import Table
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Parse ``-X importtime`` output into ``(module, self_us, cumulative_us, depth)``."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+            rows.append((name.strip(), int(self_us), int(cum_us), depth))
+        except ValueError:
+            continue
+    return rows
+
+
+def profile_startup(argv: list[str], console, top: int = 15) -> int:
+    """Re-run ``aion <argv>`` under ``-X importtime`` and print a breakdown.
+
+    Two views: the heaviest top-level imports (cumulative — what a lazy
+    import would save) and self-time summed per root package (where the
+    time actually goes).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "aion.cli", *argv],
+        stderr=subprocess.PIPE, text=True, env=os.environ.copy(),
+    )
+    rows = _parse_importtime(proc.stderr)
+    total_us = sum(r[1] for r in rows)
+
+    top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: -r[2])
+    table = Table(title=f"Top-level imports (total {total_us / 1000:.0f} ms)")
+    table.add_column("Module", style="cyan")
+    table.add_column("Cumulative ms", style="yellow", justify="right")
+    for name, _, cum_us, _ in top_level[:top]:
+        table.add_row(name, f"{cum_us / 1000:.1f}")
+    console.print(table)
+
+    by_package: dict[str, int] = {}
+    for name, self_us, _, _ in rows:
+        root = name.split(".", 1)[0]
+        by_package[root] = by_package.get(root, 0) + self_us
+    pkg_table = Table(title="Self time by package")
+    pkg_table.add_column("Package", style="cyan")
+    pkg_table.add_column("ms", style="yellow", justify="right")
+    pkg_table.add_column("%", style="dim", justify="right")
+    for root, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        pkg_table.add_row(root, f"{us / 1000:.1f}", f"{100 * us / max(total_us, 1):.0f}")
+    console.print(pkg_table)
+    return proc.returncode
@@ -334,3 +334,72 @@ def process_history(
         start = 0
     result.extend(messages[start:])
     return result
+
+
+async def run_streaming(
+    agent,
+    user_message: str,
+    ctx: SessionContext,
+    message_history: list[ModelMessage] | None = None,
+    batch_chars: int | None = None,
+) -> str:
+    """Run ``agent`` like ``agent.run(...).output``, streaming answer text.
+
+    Walks the run with ``Agent.iter`` so tool-calling turns still execute,
+    and streams every model response: text deltas are batched to
+    ``batch_chars`` and emitted as ``text`` events through
+    ``ctx.emit_event``. A response that ends in tool calls was narration,
+    not the answer — whatever of it was already shown is retracted with an
+    empty ``replace`` event and its unsent tail is dropped.
+
+    ``batch_chars`` defaults to ``agents.stream_batch_chars`` in
+    runtime.yaml. Small batches favour time-to-first-token.
+    """
+    from pydantic_ai import Agent
+    from pydantic_ai.messages import (
+        PartDeltaEvent,
+        PartStartEvent,
+        TextPart,
+        TextPartDelta,
+        ToolCallPart,
+    )
+
+    from aion.config.runtime import get_runtime_value
+
+    if batch_chars is None:
+        batch_chars = get_runtime_value("agents.stream_batch_chars", 40)
+
+    async with agent.iter(
+        user_message, deps=ctx, message_history=message_history or [],
+    ) as run:
+        async for node in run:
+            if not Agent.is_model_request_node(node):
+                continue
+            buf = ""
+            sent = False
+            has_tool_calls = False
+            async with node.stream(run.ctx) as stream:
+                async for part_event in stream:
+                    delta = ""
+                    if isinstance(part_event, PartStartEvent):
+                        if isinstance(part_event.part, TextPart):
+                            delta = part_event.part.content
+                        elif isinstance(part_event.part, ToolCallPart):
+                            has_tool_calls = True
+                    elif isinstance(part_event, PartDeltaEvent) and isinstance(
+                        part_event.delta, TextPartDelta
+                    ):
+                        delta = part_event.delta.content_delta
+                    if not delta or has_tool_calls:
+                        continue
+                    buf += delta
+                    if len(buf) >= batch_chars:
+                        ctx.emit_event(Event(type="text", content=buf))
+                        sent = True
+                        buf = ""
+            if has_tool_calls:
+                if sent:
+                    ctx.emit_event(Event(type="replace", content=""))
+            elif buf:
+                ctx.emit_event(Event(type="text", content=buf))
+    return run.result.output
@@ -36,6 +36,7 @@ from aion.tools.artifacts import (
 )
 from aion.tools.capability_gaps import request_data as _request_data
 from aion.tools.rag_search import _get_skill_content
+from aion.tracing import traced_tool
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,7 @@ def _build_archimate_agent(mcp_tools=None) -> Agent[SessionContext, str]:
     # See agents/__init__.py:_rewrite_decision for the rewrite logic.
 
     @agent.tool
+    @traced_tool
     def validate_archimate(
         ctx_: RunContext[SessionContext], xml_content: str
     ) -> dict:
@@ -85,6 +87,7 @@ def _build_archimate_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         return _validate_archimate(xml_content)
 
     @agent.tool
+    @traced_tool
     def inspect_archimate_model(
         ctx_: RunContext[SessionContext], xml_content: str
     ) -> dict:
@@ -113,6 +116,7 @@ def _build_archimate_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         return _inspect_archimate(xml_content)
 
     @agent.tool
+    @traced_tool
     def merge_archimate_view(
         ctx_: RunContext[SessionContext],
         model_xml: str,
@@ -141,6 +145,7 @@ def _build_archimate_agent(mcp_tools=None) -> Agent[SessionContext, str]:
     # ── Artifact tools (4-5) ──
 
     @agent.tool
+    @traced_tool
     def save_artifact(
         ctx_: RunContext[SessionContext],
         filename: str,
@@ -182,6 +187,7 @@ def _build_archimate_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         )
 
     @agent.tool
+    @traced_tool
     def get_artifact(
         ctx_: RunContext[SessionContext], content_type: str = ""
     ) -> dict:
@@ -213,6 +219,7 @@ def _build_archimate_agent(mcp_tools=None) -> Agent[SessionContext, str]:
     # ── Capability gap probe (6) ──
 
     @agent.tool
+    @traced_tool
     def request_data(ctx_: RunContext[SessionContext], description: str) -> str:
         """Use this when you need data that none of your other tools can
         provide. Describe exactly what data you need and why. This tool
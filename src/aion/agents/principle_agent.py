@@ -7,6 +7,7 @@ Stateless per query — the Persona handles multi-turn context via query
 rewriting before this agent is called.
 """
 
+import asyncio
 import logging
 import time
 from queue import Queue
@@ -16,7 +17,13 @@ from pydantic_ai.messages import ModelMessage
 from pydantic_ai.tools import RunContext
 from weaviate import WeaviateClient
 
-from aion.agents import AGENT_LABELS, SessionContext, _get_max_tool_calls, process_history
+from aion.agents import (
+    AGENT_LABELS,
+    SessionContext,
+    _get_max_tool_calls,
+    process_history,
+    run_streaming,
+)
 from aion.config import settings
 from aion.events import Event
 from aion.text_utils import elapsed_ms
@@ -29,6 +36,7 @@ from aion.tools.artifacts import (
 from aion.config.runtime import get_runtime_value
 from aion.tools.capability_gaps import request_data as _request_data
 from aion.tools.rag_search import RAGToolkit, _get_skill_content
+from aion.tracing import traced_tool
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +63,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
     # See agents/__init__.py:_rewrite_decision for the rewrite logic.
 
     @agent.tool
+    @traced_tool
     def search_related_principles(
         ctx_: RunContext[SessionContext], query: str, limit: int = 6
     ) -> list[dict]:
@@ -87,6 +96,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
             return [{"error": str(e)}]
 
     @agent.tool
+    @traced_tool
     def search_principles(
         ctx_: RunContext[SessionContext], query: str, limit: int = 10
     ) -> list[dict]:
@@ -125,6 +135,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
             return [{"error": str(e)}]
 
     @agent.tool
+    @traced_tool
     def list_principles(
         ctx_: RunContext[SessionContext],
         query: str = "",
@@ -165,6 +176,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
             return [{"error": str(e)}]
 
     @agent.tool
+    @traced_tool
     def validate_principle_structure(
         ctx_: RunContext[SessionContext], principle_text: str
     ) -> dict:
@@ -202,6 +214,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
     # ── Artifact tools (3-4) ──
 
     @agent.tool
+    @traced_tool
     def save_principle(
         ctx_: RunContext[SessionContext],
         filename: str,
@@ -238,6 +251,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
         )
 
     @agent.tool
+    @traced_tool
     def get_principle(
         ctx_: RunContext[SessionContext],
     ) -> dict:
@@ -265,6 +279,7 @@ def _build_principle_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[Session
     # ── Capability gap probe (5) ──
 
     @agent.tool
+    @traced_tool
     def request_data(
         ctx_: RunContext[SessionContext],
         capability: str,
@@ -323,9 +338,13 @@ class PrincipleAgent:
         artifact_context: str | None = None,
         message_history: list[ModelMessage] | None = None,
         running_summary: str | None = None,
+        stream: bool = False,
     ) -> tuple[str, list[dict]]:
         """Process a principle generation, refinement, or quality assessment query.
 
+        With ``stream=True`` the answer is emitted as ``text`` events while
+        it is generated (see ``run_streaming``).
+
         Returns (response_text, retrieved_objects) tuple.
         """
         skill_content = _get_skill_content(question, skill_tags=skill_tags or ["generate-principle"])
@@ -370,11 +389,16 @@ class PrincipleAgent:
             user_message = question
             if artifact_context:
                 user_message = f"{artifact_context}\n\n## QUESTION:\n{question}"
-            result = await self._agent.run(user_message, deps=ctx, message_history=message_history or [])
-            response = result.output
+            if stream:
+                response = await run_streaming(self._agent, user_message, ctx, message_history)
+            else:
+                result = await self._agent.run(user_message, deps=ctx, message_history=message_history or [])
+                response = result.output
         except Exception as e:
             logger.exception("PrincipleAgent error")
             response = f"I encountered an error generating the principle: {e}"
+            if stream:
+                ctx.emit_event(Event(type="replace", content=response))
 
         elapsed = elapsed_ms(ctx._query_start)
         logger.info(
@@ -394,8 +418,9 @@ class PrincipleAgent:
         """Evaluate document against principles in batches for weak models.
 
         Splits all principles into groups of ~batch_size, runs one LLM call
-        per batch with the document + that subset of principles, then
-        synthesizes all partial results into a unified compliance table.
+        per batch with the document + that subset of principles (up to
+        ``compliance_batch_concurrency`` at a time), then merges the partial
+        tables in batch order into a unified compliance table.
         """
         batch_size = agent_cfg.get("compliance_batch_size", 10)
 
@@ -413,63 +438,95 @@ class PrincipleAgent:
             content=f"Evaluating {total} principles in {len(batches)} batches...",
         ))
 
-        partial_results = []
-        for batch_idx, batch in enumerate(batches):
-            pcp_ids = [p.get("principle_number", "?") for p in batch]
-            ctx.emit_event(Event(
-                type="status",
-                content=(
-                    f"Batch {batch_idx + 1}/{len(batches)}: "
-                    f"{pcp_ids[0]}–{pcp_ids[-1]}..."
-                ),
-            ))
-
-            principles_text = "\n\n".join(
-                f"### {p.get('principle_number', '?')} — "
-                f"{p.get('title', 'Untitled')}\n{p.get('content', '')}"
-                for p in batch
-            )
-            batch_prompt = (
-                f"{artifact_context}\n\n"
-                f"## PRINCIPLES TO EVALUATE "
-                f"(batch {batch_idx + 1}/{len(batches)}, "
-                f"{len(batch)} of {total} total):\n\n"
-                f"{principles_text}\n\n"
-                f"## TASK:\n"
-                f"Evaluate the document against ONLY the {len(batch)} "
-                f"principles above. For each produce one row in a markdown table "
-                f"with columns: Principle ID | Name "
-                f"| Verdict (COMPLIANT/VIOLATED/PARTIAL/N/A) | Evidence "
-                f"| Reasoning | Recommended Action.\n"
-                f"Output ONLY the markdown table rows. No introduction, no preamble, "
-                f"no summary, no conclusion, no 'Overall notes'. Start directly with "
-                f"the table header and end with the last row.\n"
-                f"Do NOT call any tools.\n"
-                f"Original question: {question}"
-            )
-
-            # Fresh context per batch — prevents tool_call_count accumulation
-            batch_ctx = SessionContext(
-                conversation_id=ctx.conversation_id,
-                event_queue=ctx.event_queue,
-                agent_label=ctx.agent_label,
-                system_prompt=ctx.system_prompt,
-                _query_start=ctx._query_start,
-                max_tool_calls=0,
-            )
-
-            try:
-                result = await self._agent.run(
-                    batch_prompt, deps=batch_ctx, message_history=[],
+        # Byte-identical across batches: the document, the task and the
+        # question come first so provider prompt caching (and Ollama's KV
+        # prefix reuse) can serve every batch after the first from cache.
+        # Only the principle subset at the end differs per batch.
+        shared_prefix = (
+            f"{artifact_context}\n\n"
+            f"## TASK:\n"
+            f"Evaluate the document against ONLY the principles listed under "
+            f"PRINCIPLES TO EVALUATE below. For each produce one row in a markdown "
+            f"table with columns: Principle ID | Name "
+            f"| Verdict (COMPLIANT/VIOLATED/PARTIAL/N/A) | Evidence "
+            f"| Reasoning | Recommended Action.\n"
+            f"Output ONLY the markdown table rows. No introduction, no preamble, "
+            f"no summary, no conclusion, no 'Overall notes'. Start directly with "
+            f"the table header and end with the last row.\n"
+            f"Do NOT call any tools.\n"
+            f"Original question: {question}\n\n"
+        )
+        concurrency = max(1, agent_cfg.get("compliance_batch_concurrency", 4))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_batch(batch_idx: int, batch: list[dict]) -> tuple[str, int]:
+            async with semaphore:
+                pcp_ids = [p.get("principle_number", "?") for p in batch]
+                ctx.emit_event(Event(
+                    type="status",
+                    content=(
+                        f"Batch {batch_idx + 1}/{len(batches)}: "
+                        f"{pcp_ids[0]}–{pcp_ids[-1]}..."
+                    ),
+                ))
+
+                principles_text = "\n\n".join(
+                    f"### {p.get('principle_number', '?')} — "
+                    f"{p.get('title', 'Untitled')}\n{p.get('content', '')}"
+                    for p in batch
+                )
+                batch_prompt = (
+                    f"{shared_prefix}"
+                    f"## PRINCIPLES TO EVALUATE "
+                    f"(batch {batch_idx + 1}/{len(batches)}, "
+                    f"{len(batch)} of {total} total):\n\n"
+                    f"{principles_text}"
                 )
-                partial_results.append(result.output)
-            except Exception as e:
-                logger.error("compliance_batch_error batch=%d error=%s",
-                             batch_idx + 1, e)
-                partial_results.append(
-                    f"[Batch {batch_idx + 1} failed: {e}]"
+
+                # Fresh context per batch — prevents tool_call_count accumulation
+                batch_ctx = SessionContext(
+                    conversation_id=ctx.conversation_id,
+                    event_queue=ctx.event_queue,
+                    agent_label=ctx.agent_label,
+                    system_prompt=ctx.system_prompt,
+                    _query_start=ctx._query_start,
+                    max_tool_calls=0,
                 )
 
+                batch_start = time.perf_counter()
+                try:
+                    result = await self._agent.run(
+                        batch_prompt, deps=batch_ctx, message_history=[],
+                    )
+                    output = result.output
+                except Exception as e:
+                    logger.error("compliance_batch_error batch=%d error=%s",
+                                 batch_idx + 1, e)
+                    output = f"[Batch {batch_idx + 1} failed: {e}]"
+                return output, elapsed_ms(batch_start)
+
+        wall_start = time.perf_counter()
+        # gather preserves input order, so tables merge in batch order
+        # regardless of which batch finishes first.
+        batch_results = await asyncio.gather(
+            *(run_batch(i, batch) for i, batch in enumerate(batches))
+        )
+        wall_ms = elapsed_ms(wall_start)
+        partial_results = [output for output, _ in batch_results]
+        serial_ms = sum(ms for _, ms in batch_results)
+        speedup = serial_ms / wall_ms if wall_ms else 1.0
+        logger.info(
+            "compliance_batch_timing wall_ms=%d sum_batch_ms=%d speedup=%.1fx concurrency=%d",
+            wall_ms, serial_ms, speedup, concurrency,
+        )
+        ctx.emit_event(Event(
+            type="status",
+            content=(
+                f"Evaluated {len(batches)} batches in {wall_ms / 1000:.1f}s "
+                f"(batches sum to {serial_ms / 1000:.1f}s, {speedup:.1f}x speedup)"
+            ),
+        ))
+
         # Programmatic concatenation — skip the synthesis LLM call.
         # Weak models can't merge tables reliably, and the extra call
         # costs ~150s for no value. Just join the batch tables and add
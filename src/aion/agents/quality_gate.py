@@ -4,20 +4,42 @@ Evaluates whether a response's shape matches the query's complexity
 classification. When it doesn't, reshapes via LLM condensation or
 code-level abstention cleanup.
 
+Proportionality is decided in two stages. A local, deterministic scorer
+(word count, list items, headings, citation density, query class)
+settles clear passes and clear failures without any LLM call. Only the
+uncertain middle goes to the LLM, in one of three modes
+(``quality_gate.proportionality.mode``):
+
+- ``sequential`` — evaluation call, then condensation call on FAIL
+- ``fused`` — one structured call returning verdict + condensed text
+- ``speculative`` — condensation starts alongside evaluation and is
+  cancelled on PASS. Opt-in: it trades a condensation call's tokens (and
+  an LLM slot) on every uncertain-band PASS for lower latency on FAIL
+
+Every evaluation records its path and latency in ``gate_stats``.
+
 All gate parameters are configurable in
 src/aion/config/runtime.yaml under quality_gate.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import re
+import threading
 import time
+from contextlib import suppress
 from queue import Queue
 
 import structlog
 
 from aion.config import is_reasoning_model, settings
 from aion.config.runtime import get_runtime_value
+from aion.events import Event
+from aion.llm_scheduler import Priority, llm_scheduler
+from aion.text_utils import strip_think_tags
+from aion.tracing import annotate, traced
 
 logger = structlog.get_logger(__name__)
 
@@ -52,19 +74,153 @@ def _count_list_items(text: str) -> int:
     ))
 
 
+def _count_headings(text: str) -> int:
+    """Count markdown headings (``#`` to ``######``) and bold-only lines."""
+    return len(re.findall(r"^\s*(?:#{1,6}\s+\S|\*\*[^*\n]+\*\*\s*$)", text, re.MULTILINE))
+
+
+_DEFINITION_QUERY = re.compile(
+    r"^\s*(?:what\s+(?:is|are|does|do)|define|definition\s+of|who|when|which|"
+    r"what'?s|meaning\s+of)\b",
+    re.IGNORECASE,
+)
+
+
+def _classify_query(query: str) -> str:
+    """``definition`` for single-fact questions, ``lookup`` otherwise."""
+    return "definition" if _DEFINITION_QUERY.match(query or "") else "lookup"
+
+
+def _score_proportionality(response: str, query: str, config: dict) -> tuple[str, dict]:
+    """Deterministic proportionality verdict for a simple-query response.
+
+    Returns ``("pass" | "fail" | "uncertain", features)``. Only the
+    uncertain band needs an LLM. Thresholds live under
+    ``quality_gate.proportionality.local_scorer``; single-fact
+    (definition) queries scale the word thresholds down.
+    """
+    tokens = _estimate_tokens(response)
+    citations = len(_extract_citations(response))
+    features = {
+        "tokens": tokens,
+        "list_items": _count_list_items(response),
+        "headings": _count_headings(response),
+        "citation_density": round(citations * 100 / tokens, 2) if tokens else 0.0,
+        "query_class": _classify_query(query),
+    }
+
+    if tokens <= config.get("token_ceiling", 300):
+        return "pass", {**features, "reason": "under token ceiling"}
+
+    scorer = config.get("local_scorer", {})
+    if not scorer.get("enabled", False):
+        return "uncertain", features
+
+    scale = scorer.get("definition_scale", 0.75) if features["query_class"] == "definition" else 1.0
+    if tokens >= scorer.get("fail_tokens", 700) * scale:
+        return "fail", {**features, "reason": "far over token budget"}
+    # Many sections with sparse citations: a document walk-through rather
+    # than a cited summary. Citation-dense answers go to the LLM instead.
+    if (features["headings"] >= scorer.get("fail_headings", 4)
+            and features["citation_density"] < scorer.get("dense_citations", 2.0)):
+        return "fail", {**features, "reason": "sectioned walk-through"}
+    if (tokens <= scorer.get("pass_tokens", 400) * scale
+            and features["headings"] <= scorer.get("max_pass_headings", 1)
+            and features["list_items"] <= scorer.get("max_pass_list_items", 2)):
+        return "pass", {**features, "reason": "concise prose"}
+    return "uncertain", features
+
+
+class _GateStats:
+    """Process-wide hit rate and latency per gate path (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._paths: dict[str, dict] = {}
+
+    def record(self, path: str, latency_ms: int) -> None:
+        with self._lock:
+            entry = self._paths.setdefault(path, {"count": 0, "total_ms": 0, "max_ms": 0})
+            entry["count"] += 1
+            entry["total_ms"] += latency_ms
+            entry["max_ms"] = max(entry["max_ms"], latency_ms)
+
+    def snapshot(self) -> dict:
+        """``{"total": n, "paths": {path: {count, hit_rate, avg_ms, max_ms}}}``."""
+        with self._lock:
+            total = sum(e["count"] for e in self._paths.values())
+            return {
+                "total": total,
+                "paths": {
+                    path: {
+                        "count": e["count"],
+                        "hit_rate": round(e["count"] / total, 3),
+                        "avg_ms": round(e["total_ms"] / e["count"], 1),
+                        "max_ms": e["max_ms"],
+                    }
+                    for path, e in sorted(self._paths.items())
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._paths.clear()
+
+
+gate_stats = _GateStats()
+
+
+def _new_client(provider: str):
+    """One LLM client per gate evaluation, shared by its evaluation and
+    condensation calls. Created per event loop — agent threads each run
+    their own loop, so a process-wide async client cannot be shared."""
+    if provider in ("github_models", "openai"):
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(**settings.get_openai_client_kwargs(
+            provider, timeout=settings.timeout_llm_inspect,
+        ))
+
+    import httpx
+
+    return httpx.AsyncClient(timeout=settings.timeout_llm_inspect)
+
+
+def _parse_fused(text: str) -> tuple[bool, str | None]:
+    """Parse a fused verdict. Returns (needs_condensation, condensed_or_None).
+
+    Malformed output defaults to pass, like the evaluation call.
+    """
+    text = strip_think_tags(text).strip()
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text.upper().startswith("FAIL"), None
+    if not isinstance(data, dict):
+        return False, None
+    if not str(data.get("verdict", "")).strip().upper().startswith("FAIL"):
+        return False, None
+    condensed = data.get("condensed")
+    return True, condensed.strip() if isinstance(condensed, str) and condensed.strip() else None
+
+
 def _emit(queue: Queue | None, agent_label: str, content: str) -> None:
     """Emit a QA status event to the UI trace."""
     if queue is not None:
-        queue.put({
-            "type": "status",
-            "agent": agent_label,
-            "content": content,
-        })
+        queue.put(Event(type="status", agent=agent_label, content=content))
+
+
+def _emit_replacement(queue: Queue | None, agent_label: str, response: str) -> None:
+    """Replace an answer the user has already seen streamed."""
+    if queue is not None:
+        queue.put(Event(type="replace", agent=agent_label, content=response))
 
 
 class ResponseQualityGate:
     """Closed-loop quality gate: generate, evaluate, correct."""
 
+    @traced("quality_gate.evaluate", "quality_gate")
     async def evaluate(
         self,
         response: str,
@@ -72,16 +228,39 @@ class ResponseQualityGate:
         complexity: str | None,
         event_queue: Queue | None,
         agent_label: str,
+        already_streamed: bool = False,
     ) -> tuple[str, dict]:
         """Evaluate and optionally reshape a RAG response.
 
-        Returns (possibly_modified_response, gate_metadata).
+        With ``already_streamed=True`` the user has seen the response as it
+        was generated; if the gate reshapes it, a ``replace`` event with
+        the corrected text is emitted so the UI swaps the streamed answer.
+
+        Returns (possibly_modified_response, gate_metadata). The metadata
+        carries ``path`` — which branch decided — recorded in
+        ``gate_stats`` together with the gate latency.
         """
+        start = time.perf_counter()
+        result, meta = await self._evaluate(
+            response, query, complexity, event_queue, agent_label, already_streamed,
+        )
+        gate_stats.record(meta.get("path", meta["action"]), int((time.perf_counter() - start) * 1000))
+        return result, meta
+
+    async def _evaluate(
+        self,
+        response: str,
+        query: str,
+        complexity: str | None,
+        event_queue: Queue | None,
+        agent_label: str,
+        already_streamed: bool,
+    ) -> tuple[str, dict]:
         config = _get_quality_gate_config()
 
         # Gate disabled or complexity not provided (CLI, tests, etc.)
         if not config.get("enabled", False) or complexity is None:
-            return response, {"gate_fired": False, "action": "skipped"}
+            return response, {"gate_fired": False, "action": "skipped", "path": "disabled"}
 
         # ── Abstention cleanup (code-level, zero latency) ──
         abstention_cfg = config.get("abstention_cleanup", {})
@@ -100,11 +279,13 @@ class ResponseQualityGate:
                     final_tokens=meta["final_tokens"],
                     latency_ms=0,
                 )
-                return trimmed, meta
+                if already_streamed:
+                    _emit_replacement(event_queue, agent_label, trimmed)
+                return trimmed, {**meta, "path": "abstention_trimmed"}
 
         # ── Proportionality (LLM-assisted, simple queries only) ──
         if complexity != "simple":
-            return response, {"gate_fired": False, "action": "passed"}
+            return response, {"gate_fired": False, "action": "passed", "path": "not_simple"}
 
         # ── Enumeration guard (code-level, zero latency) ──
         # Responses with 5+ structured list items are enumerations that
@@ -119,48 +300,87 @@ class ResponseQualityGate:
             return response, {
                 "gate_fired": False, "action": "skipped",
                 "reason": f"enumeration detected ({enum_count} items)",
+                "path": "enumeration",
             }
 
         prop_cfg = config.get("proportionality", {})
         if not prop_cfg.get("enabled", False):
-            return response, {"gate_fired": False, "action": "passed"}
+            return response, {"gate_fired": False, "action": "passed", "path": "proportionality_disabled"}
 
-        # Fast pre-check: skip LLM if response is already concise
-        token_ceiling = prop_cfg.get("token_ceiling", 300)
-        est_tokens = _estimate_tokens(response)
-        if est_tokens <= token_ceiling:
+        # Local scorer: settle clear passes and failures without an LLM
+        gate_start = time.perf_counter()
+        verdict, features = _score_proportionality(response, query, prop_cfg)
+        est_tokens = features["tokens"]
+        if verdict == "pass":
             logger.info(
                 "[QA] gate_skipped",
-                reason="under token ceiling",
+                reason=features["reason"],
                 response_tokens=est_tokens,
-                ceiling=token_ceiling,
+                ceiling=prop_cfg.get("token_ceiling", 300),
             )
             return response, {
                 "gate_fired": False, "action": "skipped",
-                "reason": "under token ceiling",
+                "reason": features["reason"], "path": "local_pass",
             }
 
-        # LLM evaluation: is this response proportionate?
-        gate_start = time.perf_counter()
-        needs_condensation = await self._evaluate_proportionality(
-            response, prop_cfg,
-        )
-        eval_ms = int((time.perf_counter() - gate_start) * 1000)
+        mode = prop_cfg.get("mode", "sequential")
+        model = prop_cfg.get("model_override") or settings.effective_rag_model
+        provider = settings.effective_rag_provider
+        condensed = None
+
+        async with _new_client(provider) as client:
+            if verdict == "fail":
+                path = "local_fail"
+                needs_condensation = True
+                logger.info("[QA] local_fail", **features)
+            elif mode == "fused" and prop_cfg.get("fused_prompt"):
+                path = "fused"
+                needs_condensation, condensed = await self._fused(
+                    response, query, prop_cfg, model, provider, client,
+                )
+            elif mode == "speculative":
+                path = "speculative"
+                # Condense in parallel; thrown away if the verdict is PASS
+                condense_task = asyncio.create_task(self._condense(
+                    response, query, prop_cfg, model, provider, client,
+                ))
+                needs_condensation = False
+                try:
+                    needs_condensation = await self._evaluate_proportionality(
+                        response, prop_cfg, model, provider, client,
+                    )
+                finally:
+                    if not needs_condensation:
+                        condense_task.cancel()
+                        with suppress(asyncio.CancelledError):
+                            await condense_task
+                if needs_condensation:
+                    condensed = await condense_task
+            else:
+                path = "sequential"
+                needs_condensation = await self._evaluate_proportionality(
+                    response, prop_cfg, model, provider, client,
+                )
 
-        if not needs_condensation:
-            logger.info(
-                "[QA] gate_passed",
-                complexity="simple",
-                response_tokens=est_tokens,
-                latency_ms=eval_ms,
-            )
-            return response, {
-                "gate_fired": False, "action": "passed",
-                "latency_ms": eval_ms,
-            }
+            eval_ms = int((time.perf_counter() - gate_start) * 1000)
+            if not needs_condensation:
+                logger.info(
+                    "[QA] gate_passed",
+                    complexity="simple",
+                    response_tokens=est_tokens,
+                    latency_ms=eval_ms,
+                    mode=path,
+                )
+                return response, {
+                    "gate_fired": False, "action": "passed",
+                    "latency_ms": eval_ms, "path": f"{path}_pass",
+                }
 
-        # Condensation pass
-        condensed = await self._condense(response, query, prop_cfg)
+            # Condensation pass (fused/speculative may already have it)
+            if condensed is None:
+                condensed = await self._condense(
+                    response, query, prop_cfg, model, provider, client,
+                )
         final_tokens = _estimate_tokens(condensed)
 
         # Citation recovery: check if condensation dropped any references
@@ -193,6 +413,8 @@ class ResponseQualityGate:
             final_tokens=final_tokens,
             latency_ms=total_ms,
         )
+        if already_streamed:
+            _emit_replacement(event_queue, agent_label, condensed)
         return condensed, {
             "gate_fired": True,
             "action": "condensed",
@@ -200,6 +422,7 @@ class ResponseQualityGate:
             "original_tokens": est_tokens,
             "final_tokens": final_tokens,
             "latency_ms": total_ms,
+            "path": path if path == "local_fail" else f"{path}_fail",
         }
 
     # ── Private helpers ──
@@ -251,16 +474,13 @@ class ResponseQualityGate:
         }
 
     async def _evaluate_proportionality(
-        self, response: str, config: dict,
+        self, response: str, config: dict, model: str, provider: str, client=None,
     ) -> bool:
         """LLM call: is this response proportionate? Returns True if condensation needed."""
         prompt = config.get("evaluation_prompt", "")
         if not prompt:
             return False  # No prompt configured → pass
 
-        model = config.get("model_override") or settings.effective_rag_model
-        provider = settings.effective_rag_provider
-
         try:
             result = await self._llm_call(
                 system_prompt=prompt,
@@ -268,6 +488,7 @@ class ResponseQualityGate:
                 model=model,
                 provider=provider,
                 max_tokens=config.get("evaluation_max_tokens", 10),
+                client=client,
             )
             # Default to pass — only condense on explicit FAIL
             return result.strip().upper().startswith("FAIL")
@@ -276,16 +497,13 @@ class ResponseQualityGate:
             return False
 
     async def _condense(
-        self, response: str, query: str, config: dict,
+        self, response: str, query: str, config: dict, model: str, provider: str, client=None,
     ) -> str:
         """LLM call: condense the response to summary format."""
         prompt = config.get("condensation_prompt", "")
         if not prompt:
             return response  # No prompt → return original
 
-        model = config.get("model_override") or settings.effective_rag_model
-        provider = settings.effective_rag_provider
-
         try:
             result = await self._llm_call(
                 system_prompt=prompt,
@@ -296,12 +514,41 @@ class ResponseQualityGate:
                 model=model,
                 provider=provider,
                 max_tokens=config.get("condensation_max_tokens", 1024),
+                client=client,
             )
             return result.strip() if result.strip() else response
         except Exception as e:
             logger.warning(f"[QA] condensation call failed: {e}, using original")
             return response
 
+    async def _fused(
+        self, response: str, query: str, config: dict, model: str, provider: str, client=None,
+    ) -> tuple[bool, str | None]:
+        """One structured LLM call returning verdict and, on FAIL, condensed text.
+
+        Returns (needs_condensation, condensed). ``condensed`` is None when
+        the model gave a FAIL verdict without usable text — the caller
+        then falls back to a separate condensation call.
+        """
+        try:
+            result = await self._llm_call(
+                system_prompt=config["fused_prompt"],
+                user_content=(
+                    f"Original query: {query}\n\n"
+                    f"Response to evaluate:\n\n{response}"
+                ),
+                model=model,
+                provider=provider,
+                max_tokens=config.get("condensation_max_tokens", 1024),
+                client=client,
+                json_output=True,
+            )
+            return _parse_fused(result)
+        except Exception as e:
+            logger.warning(f"[QA] fused call failed: {e}, defaulting to pass")
+            return False, None
+
+    @traced("llm.quality_gate", "llm")
     async def _llm_call(
         self,
         system_prompt: str,
@@ -309,41 +556,76 @@ class ResponseQualityGate:
         model: str,
         provider: str,
         max_tokens: int,
+        client=None,
+        json_output: bool = False,
     ) -> str:
-        """Direct LLM call (not agentic). Supports OpenAI and Ollama."""
-        if provider in ("github_models", "openai"):
-            from openai import AsyncOpenAI
-
-            async with AsyncOpenAI(**settings.get_openai_client_kwargs(
-                provider, timeout=settings.timeout_llm_inspect,
-            )) as client:
-                kwargs = {
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_content},
-                    ],
-                }
-                if is_reasoning_model(model):
-                    kwargs["max_completion_tokens"] = max_tokens
-                else:
-                    kwargs["max_tokens"] = max_tokens
+        """Direct LLM call (not agentic). Supports OpenAI and Ollama.
 
-                resp = await client.chat.completions.create(**kwargs)
+        ``client`` is reused when given (see ``_new_client``); otherwise
+        a client is opened for this call only. Admitted at ``GATE``
+        priority, behind interactive answers and classification.
+        """
+        async with llm_scheduler.slot(provider, Priority.GATE):
+            if client is None:
+                async with _new_client(provider) as own_client:
+                    return await self._request(
+                        own_client, system_prompt, user_content, model, provider,
+                        max_tokens, json_output,
+                    )
+            return await self._request(
+                client, system_prompt, user_content, model, provider, max_tokens, json_output,
+            )
+
+    async def _request(
+        self,
+        client,
+        system_prompt: str,
+        user_content: str,
+        model: str,
+        provider: str,
+        max_tokens: int,
+        json_output: bool,
+    ) -> str:
+        if provider in ("github_models", "openai"):
+            kwargs = {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+            }
+            if is_reasoning_model(model):
+                kwargs["max_completion_tokens"] = max_tokens
+            else:
+                kwargs["max_tokens"] = max_tokens
+            if json_output:
+                kwargs["response_format"] = {"type": "json_object"}
+
+            resp = await client.chat.completions.create(**kwargs)
+            usage = getattr(resp, "usage", None)
+            if usage is not None:
+                annotate(
+                    model=model,
+                    input_tokens=usage.prompt_tokens,
+                    output_tokens=usage.completion_tokens,
+                )
             choice = resp.choices[0] if resp.choices else None
             return choice.message.content or "" if choice else ""
 
         # Ollama
-        import httpx
-
-        async with httpx.AsyncClient(timeout=settings.timeout_llm_inspect) as client:
-            resp = await client.post(
-                f"{settings.ollama_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": f"{system_prompt}\n\n{user_content}",
-                    "stream": False,
-                },
-            )
-            resp.raise_for_status()
-            return resp.json().get("response", "")
+        payload = {
+            "model": model,
+            "prompt": f"{system_prompt}\n\n{user_content}",
+            "stream": False,
+        }
+        if json_output:
+            payload["format"] = "json"
+        resp = await client.post(f"{settings.ollama_url}/api/generate", json=payload)
+        resp.raise_for_status()
+        result = resp.json()
+        annotate(
+            model=model,
+            input_tokens=result.get("prompt_eval_count"),
+            output_tokens=result.get("eval_count"),
+        )
+        return result.get("response", "")
@@ -19,10 +19,17 @@ from pydantic_ai.tools import RunContext
 from weaviate import WeaviateClient
 from weaviate.classes.query import Filter, MetadataQuery
 
-from aion.agents import AGENT_LABELS, SessionContext, _get_max_tool_calls, process_history
+from aion.agents import (
+    AGENT_LABELS,
+    SessionContext,
+    _get_max_tool_calls,
+    process_history,
+    run_streaming,
+)
 from aion.config import is_reasoning_model, settings
 from aion.config.runtime import get_runtime_value
 from aion.events import Event
+from aion.llm_scheduler import Priority, llm_scheduler
 from aion.text_utils import elapsed_ms, strip_think_tags
 from aion.tools.capability_gaps import request_data as _request_data
 from aion.tools.rag_search import (
@@ -35,6 +42,7 @@ from aion.tools.rag_search import (
     is_general_knowledge_eligible,
     should_abstain,
 )
+from aion.tracing import traced_tool
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +71,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
     # See agents/__init__.py:_rewrite_decision for the rewrite logic.
 
     @agent.tool
+    @traced_tool
     def search_architecture_decisions(
         ctx_: RunContext[SessionContext], query: str, limit: int = 10
     ) -> list[dict]:
@@ -132,6 +141,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return result
 
     @agent.tool
+    @traced_tool
     def search_principles(
         ctx_: RunContext[SessionContext], query: str, limit: int = 10
     ) -> list[dict]:
@@ -201,6 +211,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return result
 
     @agent.tool
+    @traced_tool
     def search_policies(
         ctx_: RunContext[SessionContext], query: str, limit: int = 5
     ) -> list[dict]:
@@ -240,6 +251,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return result
 
     @agent.tool
+    @traced_tool
     def list_adrs(
         ctx_: RunContext[SessionContext],
         owner_filter: str = "",
@@ -287,6 +299,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return filtered
 
     @agent.tool
+    @traced_tool
     def list_principles(
         ctx_: RunContext[SessionContext],
         owner_filter: str = "",
@@ -339,6 +352,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return filtered
 
     @agent.tool
+    @traced_tool
     def list_policies(
         ctx_: RunContext[SessionContext],
         owner_filter: str = "",
@@ -378,6 +392,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return filtered
 
     @agent.tool
+    @traced_tool
     def list_dars(
         ctx_: RunContext[SessionContext],
         source_filter: str = "",
@@ -433,6 +448,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
         return filtered
 
     @agent.tool
+    @traced_tool
     def search_by_team(
         ctx_: RunContext[SessionContext],
         team_name: str,
@@ -481,6 +497,7 @@ def _build_rag_agent(toolkit: RAGToolkit, mcp_tools=None) -> Agent[SessionContex
     # ── Capability gap probe (9) ──
 
     @agent.tool
+    @traced_tool
     def request_data(ctx_: RunContext[SessionContext], description: str) -> str:
         """Use this when you need data that none of your other tools can
         provide. Describe exactly what data you need and why. This tool
@@ -543,9 +560,14 @@ class RAGAgent:
         message_history: list[ModelMessage] | None = None,
         running_summary: str | None = None,
         step_index: int | None = None,
+        stream: bool = False,
     ) -> tuple[str, list[dict]]:
         """Process a query using the Pydantic AI agent.
 
+        With ``stream=True`` the answer is emitted as ``text`` events while
+        it is generated, and the quality gate replaces it afterwards if it
+        reshapes it (see ``run_streaming`` and ``ResponseQualityGate.evaluate``).
+
         Returns (response_text, retrieved_objects) tuple.
         """
         skill_content = _get_skill_content(question, skill_tags=skill_tags)
@@ -577,10 +599,15 @@ class RAGAgent:
             if artifact_context:
                 user_message = f"{artifact_context}\n\n## QUESTION:\n{question}"
 
-            result = await self._agent.run(
-                user_message, deps=ctx, message_history=message_history or [],
-            )
-            final_response = result.output
+            if stream:
+                final_response = await run_streaming(
+                    self._agent, user_message, ctx, message_history,
+                )
+            else:
+                result = await self._agent.run(
+                    user_message, deps=ctx, message_history=message_history or [],
+                )
+                final_response = result.output
 
             # Post-generation quality gate
             final_response, _gate_meta = await self._quality_gate.evaluate(
@@ -589,6 +616,7 @@ class RAGAgent:
                 complexity=complexity,
                 event_queue=ctx.event_queue,
                 agent_label=ctx.agent_label,
+                already_streamed=stream,
             )
 
             total_ms = elapsed_ms(ctx._query_start)
@@ -610,6 +638,9 @@ class RAGAgent:
                 e, ctx.step_index,
             )
             final_response, objects = await self._direct_query(question, ctx)
+            if stream:
+                # Drop any partially streamed answer; complete carries the fallback.
+                ctx.emit_event(Event(type="replace", content=final_response))
             return final_response, objects
 
         return final_response, ctx.retrieved_objects
@@ -870,10 +901,11 @@ Guidelines:
         user_prompt = f"Context:\n{context}\n\nQuestion: {question}"
 
         # Generate response based on provider
-        if settings.effective_rag_provider != "ollama":
-            response_text = await self._generate_with_openai(system_prompt, user_prompt)
-        else:
-            response_text = await self._generate_with_ollama(system_prompt, user_prompt)
+        async with llm_scheduler.slot(settings.effective_rag_provider, Priority.INTERACTIVE):
+            if settings.effective_rag_provider != "ollama":
+                response_text = await self._generate_with_openai(system_prompt, user_prompt)
+            else:
+                response_text = await self._generate_with_ollama(system_prompt, user_prompt)
 
         return response_text, all_results
 
@@ -1,14 +1,19 @@
-"""RepoAnalysisAgent — Pydantic AI agent for repository architecture extraction.
+"""RepoAnalysisAgent — repository architecture extraction.
 
 Analyzes GitHub repos or local codebases and produces a structured
-architecture_notes document. Zero LLM tokens for extraction — the LLM
-only orchestrates tool calls.
+architecture_notes document. Zero LLM tokens for extraction: when the
+request names a repository, the six extraction steps run natively
+(``run_repo_pipeline``) and the LLM only writes the closing summary.
+The tool-calling agent remains as the fallback for requests where the
+repository has to be inferred.
 """
 
+import asyncio
 import logging
+import os
+import re
 import time
 
-import yaml
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.messages import ModelMessage
 from queue import Queue
@@ -30,9 +35,19 @@ from aion.tools.repo_extractors import (
     extract_code_structure as _extract_code_structure,
     extract_manifests as _extract_manifests,
 )
+from aion.tracing import traced_tool
+from aion.yaml_utils import dump_yaml
 
 logger = logging.getLogger(__name__)
 
+# Repository links only: a known git host's owner/repo path, any https URL
+# ending in .git, or an scp-style git@host:path. Docs links are not cloned.
+_REPO_URL_RE = re.compile(
+    r"https://(?:www\.)?(?:github\.com|gitlab\.com|bitbucket\.org)/[\w.-]+/[\w.-]+(?:/[^\s<>]*)?"
+    r"|https://[^\s<>]+?\.git(?![\w-])"
+    r"|git@[\w.-]+:[\w./-]+"
+)
+
 
 def _get_skill_content(skill_tags: list[str] | None = None) -> str:
     """Load skill content for the repo-analysis skill."""
@@ -40,6 +55,214 @@ def _get_skill_content(skill_tags: list[str] | None = None) -> str:
     return registry.get_skill_content(active_tags=skill_tags or ["repo-analysis"])
 
 
+# ---------------------------------------------------------------------------
+# Extraction steps — shared by the agent tools and the native pipeline
+# ---------------------------------------------------------------------------
+
+def _emit_decision(deps: SessionContext, tool: str, reasoning: str) -> None:
+    deps.emit_event(Event(
+        type="decision",
+        content=f"Decision: {tool} Reasoning: {reasoning}",
+        elapsed_ms=elapsed_ms(deps._query_start),
+    ))
+
+
+def _emit_status(deps: SessionContext, content: str, log_level: int | None = None) -> None:
+    deps.emit_event(
+        Event(type="status", content=content, elapsed_ms=elapsed_ms(deps._query_start)),
+        log_level=log_level,
+    )
+
+
+def _step_clone(deps: SessionContext, url_or_path: str) -> dict:
+    _emit_decision(deps, "clone_repo", f"Cloning repository from {url_or_path[:80]}")
+    result = _clone_repo(url_or_path)
+    if "error" in result:
+        error_msg = result["error"]
+        # Detect auth failures and provide actionable guidance
+        if any(hint in error_msg.lower() for hint in
+               ("authentication", "could not read username", "permission denied", "404")):
+            error_msg += " This may be a private repository. Try providing a local path instead."
+        # Deviation from Phase 1a.2.c spec (event type="error"): emit
+        # type="status" so _capture_event does NOT force every agent's
+        # UI avatar to idle mid-stream (lines 2647-2650 in chat_ui.py).
+        # The log_level=ERROR override delivers the server-side ERROR
+        # tee that 1a.2.c needs without the terminal-UI side effect.
+        _emit_status(deps, f"Clone failed: {error_msg}", log_level=logging.ERROR)
+    else:
+        _emit_status(deps, f"Repository cloned: {result['repo_name']}")
+    deps.retrieved_objects.append({"type": "clone_result", **result})
+    return result
+
+
+def _step_profile(deps: SessionContext, repo_path: str) -> dict:
+    _emit_decision(deps, "profile_repo", "Profiling repository structure")
+    result = _profile_repo(repo_path)
+    t1 = result['file_tier_counts'].get('T1', 0)
+    t2 = result['file_tier_counts'].get('T2', 0)
+    _emit_status(deps, (
+        f"Profile complete: {result['total_files']} files "
+        f"({t1} T1 critical, {t2} T2 relevant), "
+        f"structure: {result.get('structure_type', 'unknown')}"
+    ))
+    deps.retrieved_objects.append({"type": "profile", **result})
+    return result
+
+
+def _step_manifests(deps: SessionContext, repo_path: str, profile: dict) -> dict:
+    _emit_decision(deps, "extract_manifests", "Extracting manifest files")
+    result = _extract_manifests(repo_path, profile)
+    sections = [k for k, v in result.items() if v]
+    _emit_status(deps, f"Extracted {len(sections)} manifest sections")
+    deps.retrieved_objects.append({"type": "manifests", **result})
+    return result
+
+
+def _step_code_structure(deps: SessionContext, repo_path: str, profile: dict) -> dict:
+    _emit_decision(deps, "extract_code_structure", "Analyzing code structure via AST")
+    result = _extract_code_structure(repo_path, profile)
+    stats = result.get("stats", {})
+    _emit_status(
+        deps,
+        f"Analyzed {stats.get('processed', 0)} files, {len(result.get('modules', []))} modules",
+    )
+    deps.retrieved_objects.append({"type": "code_structure", **result})
+    return result
+
+
+def _step_dep_graph(deps: SessionContext, code_structure: dict, manifests: dict) -> dict:
+    _emit_decision(deps, "build_dep_graph", "Building dependency graph")
+    result = _build_dep_graph(code_structure, manifests)
+    _emit_status(
+        deps,
+        f"Graph: {len(result.get('nodes', []))} nodes, {len(result.get('edges', []))} edges",
+    )
+    deps.retrieved_objects.append({"type": "dep_graph", **result})
+    return result
+
+
+def _diff_stats_for(clone_result: dict | None) -> dict | None:
+    """Diff stats against the default branch, or None when not applicable."""
+    if not clone_result:
+        return None
+    base_branch = clone_result.get("default_branch")
+    repo_path = clone_result.get("repo_path")
+    if base_branch and repo_path:
+        return _git_diff_stats(repo_path, base_branch) or None
+    return None
+
+
+def _step_merge_and_save(
+    deps: SessionContext, profile: dict, manifests: dict, code_structure: dict,
+    dep_graph: dict, clone_result: dict | None, diff_stats: dict | None,
+) -> dict:
+    _emit_decision(deps, "merge_and_save_notes", "Merging architecture analysis")
+    merged = _merge_notes(
+        profile, manifests, code_structure, dep_graph,
+        clone_result=clone_result,
+        base_branch=clone_result.get("default_branch") if clone_result else None,
+        diff_stats=diff_stats,
+    )
+
+    # Save as artifact for Phase 2 handoff
+    if deps.conversation_id:
+        summary_text = (
+            f"Repository architecture analysis: {merged.get('summary', {}).get('repo_name', 'unknown')} — "
+            f"{merged.get('summary', {}).get('total_components', 0)} components, "
+            f"{merged.get('summary', {}).get('total_infrastructure', 0)} infrastructure"
+        )
+        _save_artifact(
+            "architecture_notes.yaml",
+            dump_yaml(merged, default_flow_style=False, allow_unicode=True, sort_keys=False),
+            "repo-analysis/yaml",
+            summary_text,
+            deps.conversation_id,
+            deps.event_queue,
+        )
+
+    _emit_status(deps, (
+        f"Architecture notes saved: {merged.get('summary', {}).get('total_components', 0)} components, "
+        f"{merged.get('summary', {}).get('total_edges', 0)} relationships"
+    ))
+    deps.retrieved_objects.append(merged)
+    return merged
+
+
+async def run_repo_pipeline(deps: SessionContext, url_or_path: str) -> dict:
+    """Run the six extraction steps natively — no LLM round trip per step.
+
+    Manifest and code-structure extraction both depend only on the profile
+    and run concurrently; ``git diff`` for the change overlay runs
+    alongside extraction as soon as the clone is available. Emits the same
+    decision/status events as the agent tools.
+
+    Returns the merged architecture_notes, or ``{"error": ...}`` when the
+    clone fails.
+    """
+    clone_result = await asyncio.to_thread(_step_clone, deps, url_or_path)
+    if "error" in clone_result:
+        return clone_result
+    repo_path = clone_result["repo_path"]
+
+    diff_task = asyncio.create_task(asyncio.to_thread(_diff_stats_for, clone_result))
+    try:
+        profile = await asyncio.to_thread(_step_profile, deps, repo_path)
+        manifests, code_structure = await asyncio.gather(
+            asyncio.to_thread(_step_manifests, deps, repo_path, profile),
+            asyncio.to_thread(_step_code_structure, deps, repo_path, profile),
+        )
+        dep_graph = await asyncio.to_thread(_step_dep_graph, deps, code_structure, manifests)
+        diff_stats = await diff_task
+    finally:
+        if not diff_task.done():
+            diff_task.cancel()
+
+    return await asyncio.to_thread(
+        _step_merge_and_save, deps, profile, manifests, code_structure,
+        dep_graph, clone_result, diff_stats,
+    )
+
+
+def _find_repo_ref(question: str) -> str | None:
+    """Pull a git repository URL or an existing local directory out of the request."""
+    match = _REPO_URL_RE.search(question)
+    if match:
+        return match.group(0).rstrip(".,;:)]}>'\"")
+    for token in question.split():
+        token = token.strip(".,;:'\"()[]")
+        if token.startswith(("/", "~", "./", "../")):
+            path = os.path.expanduser(token)
+            if os.path.isdir(path):
+                return path
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Agents
+# ---------------------------------------------------------------------------
+
+# The summary agent has no tools: the extraction already ran natively, so
+# it gets only the narrative instructions, not the tool-order guidelines.
+_SUMMARY_SYSTEM_PROMPT = (
+    "You are AInstein, the Energy System Architecture AI Assistant at Alliander.\n\n"
+    "A repository's architecture has already been extracted and saved as "
+    "architecture notes. Using only the extracted architecture in the user "
+    "message, summarize what was found: components, infrastructure, tech "
+    "stack, and key relationships. Include the repository profile summary. "
+    "Do not invent components that are not listed."
+)
+
+
+def _build_summary_agent() -> Agent[SessionContext, str]:
+    """Tool-less agent that writes the narrative after native extraction."""
+    return Agent(
+        model=settings.build_pydantic_ai_model("tree"),
+        deps_type=SessionContext,
+        system_prompt=_SUMMARY_SYSTEM_PROMPT,
+        retries=1,
+    )
+
+
 def _build_repo_analysis_agent(mcp_tools=None) -> Agent[SessionContext, str]:
     """Build the Pydantic AI agent with repo analysis tools + any plugin MCP tools."""
     agent: Agent[SessionContext, str] = Agent(
@@ -53,7 +276,14 @@ def _build_repo_analysis_agent(mcp_tools=None) -> Agent[SessionContext, str]:
     def dynamic_system_prompt(ctx: RunContext[SessionContext]) -> str:
         return ctx.deps.system_prompt
 
+    def _find(deps: SessionContext, obj_type: str) -> dict | None:
+        for obj in reversed(deps.retrieved_objects):
+            if obj.get("type") == obj_type:
+                return obj
+        return None
+
     @agent.tool
+    @traced_tool
     def clone_repo(ctx_: RunContext[SessionContext], url_or_path: str) -> dict:
         """Clone a GitHub repository or validate a local path.
         ALWAYS call this first with the URL or path the user provided.
@@ -63,41 +293,10 @@ def _build_repo_analysis_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         """
         if ctx_.deps.check_iteration_limit():
             return {"error": "Tool call limit reached"}
-        ctx_.deps.emit_event(Event(
-            type="decision",
-            content=f"Decision: clone_repo Reasoning: Cloning repository from {url_or_path[:80]}",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        result = _clone_repo(url_or_path)
-        if "error" in result:
-            error_msg = result["error"]
-            # Detect auth failures and provide actionable guidance
-            if any(hint in error_msg.lower() for hint in
-                   ("authentication", "could not read username", "permission denied", "404")):
-                error_msg += " This may be a private repository. Try providing a local path instead."
-            # Deviation from Phase 1a.2.c spec (event type="error"): emit
-            # type="status" so _capture_event does NOT force every agent's
-            # UI avatar to idle mid-stream (lines 2647-2650 in chat_ui.py).
-            # The log_level=ERROR override delivers the server-side ERROR
-            # tee that 1a.2.c needs without the terminal-UI side effect.
-            ctx_.deps.emit_event(
-                Event(
-                    type="status",
-                    content=f"Clone failed: {error_msg}",
-                    elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-                ),
-                log_level=logging.ERROR,
-            )
-        else:
-            ctx_.deps.emit_event(Event(
-                type="status",
-                content=f"Repository cloned: {result['repo_name']}",
-                elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-            ))
-        ctx_.deps.retrieved_objects.append({"type": "clone_result", **result})
-        return result
+        return _step_clone(ctx_.deps, url_or_path)
 
     @agent.tool
+    @traced_tool
     def profile_repo(ctx_: RunContext[SessionContext], repo_path: str) -> dict:
         """Profile the repository structure — detect tech stack, modules, and classify files.
         Call this after clone_repo to understand the repository layout.
@@ -107,25 +306,10 @@ def _build_repo_analysis_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         """
         if ctx_.deps.check_iteration_limit():
             return {"error": "Tool call limit reached"}
-        ctx_.deps.emit_event(Event(
-            type="decision",
-            content="Decision: profile_repo Reasoning: Profiling repository structure",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        result = _profile_repo(repo_path)
-        t1 = result['file_tier_counts'].get('T1', 0)
-        t2 = result['file_tier_counts'].get('T2', 0)
-        ctx_.deps.emit_event(Event(
-            type="status",
-            content=(f"Profile complete: {result['total_files']} files "
-                     f"({t1} T1 critical, {t2} T2 relevant), "
-                     f"structure: {result.get('structure_type', 'unknown')}"),
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        ctx_.deps.retrieved_objects.append({"type": "profile", **result})
-        return result
+        return _step_profile(ctx_.deps, repo_path)
 
     @agent.tool
+    @traced_tool
     def extract_manifests(ctx_: RunContext[SessionContext], repo_path: str) -> dict:
         """Extract deployment topology, API definitions, database schemas, CI/CD config,
         and package dependencies from manifest files.
@@ -136,30 +320,13 @@ def _build_repo_analysis_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         """
         if ctx_.deps.check_iteration_limit():
             return {"error": "Tool call limit reached"}
-        ctx_.deps.emit_event(Event(
-            type="decision",
-            content="Decision: extract_manifests Reasoning: Extracting manifest files",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        # Need the profile from retrieved_objects
-        profile = None
-        for obj in ctx_.deps.retrieved_objects:
-            if obj.get("type") == "profile":
-                profile = obj
-                break
+        profile = _find(ctx_.deps, "profile")
         if not profile:
             return {"error": "No profile found. Call profile_repo first."}
-        result = _extract_manifests(repo_path, profile)
-        sections = [k for k, v in result.items() if v]
-        ctx_.deps.emit_event(Event(
-            type="status",
-            content=f"Extracted {len(sections)} manifest sections",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        ctx_.deps.retrieved_objects.append({"type": "manifests", **result})
-        return result
+        return _step_manifests(ctx_.deps, repo_path, profile)
 
     @agent.tool
+    @traced_tool
     def extract_code_structure(ctx_: RunContext[SessionContext], repo_path: str) -> dict:
         """Extract code structure using AST parsing (Python) and regex (JS/TS/Java/Go).
         Produces class hierarchies, function signatures, and import graphs.
@@ -170,124 +337,46 @@ def _build_repo_analysis_agent(mcp_tools=None) -> Agent[SessionContext, str]:
         """
         if ctx_.deps.check_iteration_limit():
             return {"error": "Tool call limit reached"}
-        ctx_.deps.emit_event(Event(
-            type="decision",
-            content="Decision: extract_code_structure Reasoning: Analyzing code structure via AST",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        profile = None
-        for obj in ctx_.deps.retrieved_objects:
-            if obj.get("type") == "profile":
-                profile = obj
-                break
+        profile = _find(ctx_.deps, "profile")
         if not profile:
             return {"error": "No profile found. Call profile_repo first."}
-        result = _extract_code_structure(repo_path, profile)
-        stats = result.get("stats", {})
-        ctx_.deps.emit_event(Event(
-            type="status",
-            content=f"Analyzed {stats.get('processed', 0)} files, {len(result.get('modules', []))} modules",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        ctx_.deps.retrieved_objects.append({"type": "code_structure", **result})
-        return result
+        return _step_code_structure(ctx_.deps, repo_path, profile)
 
     @agent.tool
+    @traced_tool
     def build_dep_graph(ctx_: RunContext[SessionContext]) -> dict:
         """Build the cross-module dependency graph from code imports and manifest data.
         Call this after extract_manifests and extract_code_structure.
         """
         if ctx_.deps.check_iteration_limit():
             return {"error": "Tool call limit reached"}
-        ctx_.deps.emit_event(Event(
-            type="decision",
-            content="Decision: build_dep_graph Reasoning: Building dependency graph",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        code_structure = None
-        manifests = None
-        for obj in ctx_.deps.retrieved_objects:
-            if obj.get("type") == "code_structure":
-                code_structure = obj
-            elif obj.get("type") == "manifests":
-                manifests = obj
+        code_structure = _find(ctx_.deps, "code_structure")
+        manifests = _find(ctx_.deps, "manifests")
         if not code_structure or not manifests:
             return {"error": "Missing code_structure or manifests. Call extraction tools first."}
-        result = _build_dep_graph(code_structure, manifests)
-        ctx_.deps.emit_event(Event(
-            type="status",
-            content=f"Graph: {len(result.get('nodes', []))} nodes, {len(result.get('edges', []))} edges",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        ctx_.deps.retrieved_objects.append({"type": "dep_graph", **result})
-        return result
+        return _step_dep_graph(ctx_.deps, code_structure, manifests)
 
     @agent.tool
+    @traced_tool
     def merge_and_save_notes(ctx_: RunContext[SessionContext]) -> dict:
         """Merge all extraction outputs into architecture_notes and save as artifact.
         Call this LAST after all extraction tools have completed.
         """
         if ctx_.deps.check_iteration_limit():
             return {"error": "Tool call limit reached"}
-        ctx_.deps.emit_event(Event(
-            type="decision",
-            content="Decision: merge_and_save_notes Reasoning: Merging architecture analysis",
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        profile = manifests = code_structure = dep_graph = clone_result = None
-        for obj in ctx_.deps.retrieved_objects:
-            t = obj.get("type")
-            if t == "profile":
-                profile = obj
-            elif t == "manifests":
-                manifests = obj
-            elif t == "code_structure":
-                code_structure = obj
-            elif t == "dep_graph":
-                dep_graph = obj
-            elif t == "clone_result":
-                clone_result = obj
+        profile = _find(ctx_.deps, "profile")
+        manifests = _find(ctx_.deps, "manifests")
+        code_structure = _find(ctx_.deps, "code_structure")
+        dep_graph = _find(ctx_.deps, "dep_graph")
+        clone_result = _find(ctx_.deps, "clone_result")
 
         if not all([profile, manifests, code_structure, dep_graph]):
             return {"error": "Missing extraction data. Run all extraction tools first."}
 
-        # Derive base_branch and diff stats for the v1.0 template
-        base_branch = None
-        diff_stats = None
-        if clone_result:
-            base_branch = clone_result.get("default_branch")
-            repo_path = clone_result.get("repo_path")
-            if base_branch and repo_path:
-                diff_stats = _git_diff_stats(repo_path, base_branch) or None
-
-        merged = _merge_notes(
-            profile, manifests, code_structure, dep_graph,
-            clone_result=clone_result, base_branch=base_branch, diff_stats=diff_stats,
+        merged = _step_merge_and_save(
+            ctx_.deps, profile, manifests, code_structure, dep_graph,
+            clone_result, _diff_stats_for(clone_result),
         )
-
-        # Save as artifact for Phase 2 handoff
-        if ctx_.deps.conversation_id:
-            summary_text = (
-                f"Repository architecture analysis: {merged.get('summary', {}).get('repo_name', 'unknown')} — "
-                f"{merged.get('summary', {}).get('total_components', 0)} components, "
-                f"{merged.get('summary', {}).get('total_infrastructure', 0)} infrastructure"
-            )
-            _save_artifact(
-                "architecture_notes.yaml",
-                yaml.dump(merged, default_flow_style=False, allow_unicode=True, sort_keys=False),
-                "repo-analysis/yaml",
-                summary_text,
-                ctx_.deps.conversation_id,
-                ctx_.deps.event_queue,
-            )
-
-        ctx_.deps.emit_event(Event(
-            type="status",
-            content=(f"Architecture notes saved: {merged.get('summary', {}).get('total_components', 0)} components, "
-                     f"{merged.get('summary', {}).get('total_edges', 0)} relationships"),
-            elapsed_ms=elapsed_ms(ctx_.deps._query_start),
-        ))
-        ctx_.deps.retrieved_objects.append(merged)
         return {"status": "saved", "summary": merged.get("summary", {})}
 
     from aion.agents._mcp_inject import attach_mcp_tools
@@ -301,6 +390,7 @@ class RepoAnalysisAgent:
 
     def __init__(self, mcp_tools=None):
         self._agent = _build_repo_analysis_agent(mcp_tools=mcp_tools)
+        self._summary_agent = _build_summary_agent()
 
     async def query(
         self,
@@ -330,9 +420,13 @@ class RepoAnalysisAgent:
         logger.info("RepoAnalysisAgent processing: %s", question[:200])
         logger.info("repo_analysis_agent_model model=%s", self._agent.model.model_name)
 
+        repo_ref = _find_repo_ref(question)
         try:
-            result = await self._agent.run(question, deps=ctx, message_history=message_history or [])
-            response = result.output
+            if repo_ref:
+                response = await self._run_native(question, repo_ref, ctx)
+            else:
+                result = await self._agent.run(question, deps=ctx, message_history=message_history or [])
+                response = result.output
         except Exception as e:
             logger.exception("RepoAnalysisAgent error")
             response = f"I encountered an error during repository analysis: {e}"
@@ -342,6 +436,41 @@ class RepoAnalysisAgent:
 
         return response, ctx.retrieved_objects
 
+    async def _run_native(self, question: str, repo_ref: str, ctx: SessionContext) -> str:
+        """Native extraction, then a single LLM call for the narrative summary."""
+        logger.info("RepoAnalysisAgent native pipeline: %s", repo_ref)
+        merged = await run_repo_pipeline(ctx, repo_ref)
+        if "error" in merged:
+            return f"Repository analysis failed: {merged['error']}"
+
+        digest = {
+            "summary": merged.get("summary", {}),
+            "components": [c.get("name", c.get("id")) for c in merged.get("components", [])[:40]],
+            "infrastructure": [i.get("name", i.get("id")) for i in merged.get("infrastructure", [])[:20]],
+            "external_services": [
+                e.get("name", e.get("id")) for e in merged.get("external_services", [])[:20]
+            ],
+        }
+        prompt = (
+            f"USER REQUEST:\n{question}\n\n"
+            f"EXTRACTED ARCHITECTURE (already saved as architecture_notes):\n"
+            f"{dump_yaml(digest, default_flow_style=False, allow_unicode=True, sort_keys=False)}"
+        )
+        try:
+            result = await self._summary_agent.run(prompt, deps=ctx)
+            return result.output
+        except Exception:
+            # Extraction succeeded and notes are saved — don't fail the phase
+            # over the narrative.
+            logger.exception("RepoAnalysisAgent summary failed")
+            s = digest["summary"]
+            return (
+                f"Analyzed {s.get('repo_name', 'repository')}: "
+                f"{s.get('total_components', 0)} components, "
+                f"{s.get('total_infrastructure', 0)} infrastructure, "
+                f"{s.get('total_external', 0)} external services."
+            )
+
     @staticmethod
     def _build_system_prompt(skill_content: str) -> str:
         parts = [
@@ -17,7 +17,13 @@ from pydantic_ai.messages import ModelMessage
 from pydantic_ai.tools import RunContext
 from weaviate import WeaviateClient
 
-from aion.agents import AGENT_LABELS, SessionContext, _get_max_tool_calls, process_history
+from aion.agents import (
+    AGENT_LABELS,
+    SessionContext,
+    _get_max_tool_calls,
+    process_history,
+    run_streaming,
+)
 from aion.config import settings
 from aion.events import Event
 from aion.text_utils import elapsed_ms
@@ -38,6 +44,7 @@ from aion.tools.skosmos import (
 from aion.tools.skosmos import (
     skosmos_search as _skosmos_search,
 )
+from aion.tracing import traced_tool
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +68,7 @@ def _build_vocabulary_agent(toolkit: RAGToolkit | None, mcp_tools=None) -> Agent
     # See agents/__init__.py:_rewrite_decision for the rewrite logic.
 
     @agent.tool
+    @traced_tool
     def skosmos_define(
         ctx_: RunContext[SessionContext],
         term: str,
@@ -108,6 +116,7 @@ def _build_vocabulary_agent(toolkit: RAGToolkit | None, mcp_tools=None) -> Agent
         return result
 
     @agent.tool
+    @traced_tool
     def skosmos_search(
         ctx_: RunContext[SessionContext],
         query: str,
@@ -158,6 +167,7 @@ def _build_vocabulary_agent(toolkit: RAGToolkit | None, mcp_tools=None) -> Agent
         return result
 
     @agent.tool
+    @traced_tool
     def skosmos_concept_details(
         ctx_: RunContext[SessionContext],
         uri: str,
@@ -202,6 +212,7 @@ def _build_vocabulary_agent(toolkit: RAGToolkit | None, mcp_tools=None) -> Agent
         return _skosmos_details(uri, vocab=vocab, lang=lang)
 
     @agent.tool
+    @traced_tool
     def skosmos_list_vocabularies(
         ctx_: RunContext[SessionContext], lang: str = "en"
     ) -> dict:
@@ -229,6 +240,7 @@ def _build_vocabulary_agent(toolkit: RAGToolkit | None, mcp_tools=None) -> Agent
 
     if toolkit:
         @agent.tool
+        @traced_tool
         def search_knowledge_base(
             ctx_: RunContext[SessionContext], query: str
         ) -> list[dict]:
@@ -273,6 +285,7 @@ def _build_vocabulary_agent(toolkit: RAGToolkit | None, mcp_tools=None) -> Agent
     # ── Capability gap probe ──
 
     @agent.tool
+    @traced_tool
     def request_data(ctx_: RunContext[SessionContext], description: str) -> str:
         """Use this when you need data that none of your other tools can
         provide. Describe exactly what data you need and why. This tool
@@ -322,9 +335,13 @@ class VocabularyAgent:
         conversation_id: str | None = None,
         message_history: list[ModelMessage] | None = None,
         running_summary: str | None = None,
+        stream: bool = False,
     ) -> tuple[str, list[dict]]:
         """Process a vocabulary query using the Pydantic AI agent.
 
+        With ``stream=True`` the answer is emitted as ``text`` events while
+        it is generated (see ``run_streaming``).
+
         Returns (response_text, retrieved_objects) tuple.
         """
         skill_content = _get_skill_content(question, skill_tags=skill_tags or ["vocabulary"])
@@ -346,11 +363,16 @@ class VocabularyAgent:
 
         # Run the agent
         try:
-            result = await self._agent.run(question, deps=ctx, message_history=message_history or [])
-            response = result.output
+            if stream:
+                response = await run_streaming(self._agent, question, ctx, message_history)
+            else:
+                result = await self._agent.run(question, deps=ctx, message_history=message_history or [])
+                response = result.output
         except Exception as e:
             logger.exception("VocabularyAgent error")
             response = f"I encountered an error while looking up vocabulary terms: {e}"
+            if stream:
+                ctx.emit_event(Event(type="replace", content=response))
 
         elapsed = elapsed_ms(ctx._query_start)
         logger.info(
@@ -0,0 +1,379 @@
+"""Two-level cache tier shared by the workers of one host.
+
+Each uvicorn worker is a separate process, so module-level caches
+(runtime config, skill registries, query embeddings) start cold in every
+worker and a reload in one worker is invisible to the others. This module
+adds:
+
+- **Cache tiers** — ``cache_tier(namespace)`` returns a ``CacheTier``: an
+  in-process LRU in front of a shared SQLite (WAL) store on the same host.
+  A miss in the LRU falls through to the shared store before the caller
+  computes the value, so one worker's work warms every other worker.
+  Values must be JSON-serialisable.
+- **Invalidation broadcast** — ``invalidate(namespace)`` drops the
+  namespace everywhere by bumping its generation in the shared store.
+  Other workers notice the bump in ``sync_invalidations()`` (called once
+  per HTTP request, rate-limited to ``shared_cache_poll_seconds``), clear
+  their LRU for that namespace and run the callbacks registered with
+  ``on_invalidate`` — e.g. re-reading runtime.yaml or reloading the
+  plugin registry.
+- **Eviction** — the shared store drops expired entries and, past
+  ``shared_cache_max_entries`` rows, the least recently written ones. The
+  sweep runs when a worker attaches and every ``_PRUNE_EVERY`` writes.
+- **Metrics** — ``cache_stats()`` reports local hits, shared hits and
+  misses per namespace (served in ``/api/status``).
+
+The shared store is enabled by ``settings.shared_cache_path``. Without it
+(CLI, tests, single-worker runs) tiers are plain in-process LRUs and
+invalidation is local. Connection objects — the Weaviate client, HTTP
+clients — are never shared; only their results are.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS cache_generations (
+    namespace TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+_MISSING = object()
+
+# Writes per process between shared-store sweeps
+_PRUNE_EVERY = 256
+
+
+class SharedStore:
+    """SQLite-WAL key/value store shared by every process on the host."""
+
+    def __init__(self, path: str | Path, max_entries: int | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        self.prune()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread: agent worker threads read concurrently.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> str | None:
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return row[0]
+
+    def set(self, namespace: str, key: str, value: str, ttl: float | None) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (namespace, key, value, time.time() + ttl if ttl else None),
+        )
+        conn.commit()
+        # Unlocked counter: a lost increment only shifts the next sweep.
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete expired entries, then the oldest writes over ``max_entries``.
+
+        ``INSERT OR REPLACE`` gives a rewritten key a new rowid, so rowid
+        order is write order. Returns the number of rows removed.
+        """
+        conn = self._conn()
+        removed = conn.execute(
+            "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        ).rowcount
+        if self.max_entries:
+            excess = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+            if excess > 0:
+                removed += conn.execute(
+                    "DELETE FROM cache_entries WHERE rowid IN "
+                    "(SELECT rowid FROM cache_entries ORDER BY rowid LIMIT ?)",
+                    (excess,),
+                ).rowcount
+        conn.commit()
+        return removed
+
+    def invalidate(self, namespace: str) -> int:
+        """Delete the namespace's entries and bump its generation."""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        conn.execute(
+            "INSERT INTO cache_generations (namespace, generation) VALUES (?, 1) "
+            "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1",
+            (namespace,),
+        )
+        conn.commit()
+        return conn.execute(
+            "SELECT generation FROM cache_generations WHERE namespace = ?", (namespace,),
+        ).fetchone()[0]
+
+    def generations(self) -> dict[str, int]:
+        return dict(self._conn().execute(
+            "SELECT namespace, generation FROM cache_generations"
+        ).fetchall())
+
+
+class CacheTier:
+    """In-process LRU in front of the shared store, for one namespace."""
+
+    def __init__(self, namespace: str, maxsize: int = 1024, ttl: float | None = None):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return key if len(key) <= 64 else hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        key = self._key(key)
+        with self._lock:
+            value = self._lru.get(key, _MISSING)
+            if value is not _MISSING:
+                self._lru.move_to_end(key)
+                self.local_hits += 1
+                return value
+
+        store = _get_store()
+        if store is not None:
+            try:
+                raw = store.get(self.namespace, key)
+            except sqlite3.Error as e:
+                logger.warning(f"Shared cache read failed ({self.namespace}): {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._remember(key, value)
+                with self._lock:
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any) -> None:
+        key = self._key(key)
+        self._remember(key, value)
+        store = _get_store()
+        if store is not None:
+            try:
+                store.set(self.namespace, key, json.dumps(value), self.ttl)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Shared cache write failed ({self.namespace}): {e}")
+
+    def get_or_set(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Cached value for ``key``, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.local_hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._lru),
+                "local_hits": self.local_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.local_hits + self.shared_hits) / lookups, 3) if lookups else None,
+            }
+
+
+# ── Module state ─────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_tiers: dict[str, CacheTier] = {}
+_listeners: dict[str, list[Callable[[], None]]] = {}
+_store: SharedStore | None = None
+_configured = False
+_poll_seconds = 1.0
+_last_sync = 0.0
+_generations: dict[str, int] = {}
+
+
+def configure(
+    path: str | Path | None, poll_seconds: float = 1.0, max_entries: int | None = None,
+) -> None:
+    """Point the tier at a shared store (``None`` = process-local only).
+
+    Called lazily from settings on first use; tests call it directly.
+    """
+    global _store, _configured, _poll_seconds, _generations, _last_sync
+    with _lock:
+        _store = None
+        if path:
+            try:
+                _store = SharedStore(path, max_entries)
+                _generations = _store.generations()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Shared cache unavailable at {path}: {e} — using process-local cache")
+                _store = None
+        _poll_seconds = poll_seconds
+        _last_sync = time.monotonic()
+        _configured = True
+
+
+def _get_store() -> SharedStore | None:
+    if not _configured:
+        from aion.config import settings
+
+        configure(
+            settings.shared_cache_path,
+            settings.shared_cache_poll_seconds,
+            settings.shared_cache_max_entries,
+        )
+    return _store
+
+
+def cache_tier(namespace: str, maxsize: int = 1024, ttl: float | None = None) -> CacheTier:
+    """The process-wide tier for ``namespace`` (created on first call)."""
+    with _lock:
+        tier = _tiers.get(namespace)
+        if tier is None:
+            tier = _tiers[namespace] = CacheTier(namespace, maxsize, ttl)
+        return tier
+
+
+def on_invalidate(namespace: str, callback: Callable[[], None]) -> None:
+    """Run ``callback`` when another worker invalidates ``namespace``."""
+    with _lock:
+        _listeners.setdefault(namespace, []).append(callback)
+
+
+def invalidate(namespace: str) -> None:
+    """Drop ``namespace`` in this worker and broadcast it to the others.
+
+    Local listeners are not called — the caller has already refreshed
+    its own state (that is usually why it is invalidating).
+    """
+    tier = _tiers.get(namespace)
+    if tier is not None:
+        tier.clear_local()
+    store = _get_store()
+    if store is None:
+        return
+    try:
+        generation = store.invalidate(namespace)
+    except sqlite3.Error as e:
+        logger.warning(f"Shared cache invalidation failed ({namespace}): {e}")
+        return
+    with _lock:
+        _generations[namespace] = generation
+    logger.info(f"Cache namespace {namespace!r} invalidated (generation {generation})")
+
+
+def sync_invalidations(force: bool = False) -> list[str]:
+    """Apply invalidations broadcast by other workers since the last sync.
+
+    Cheap enough to call per request: reads the generation table at most
+    once every ``shared_cache_poll_seconds``. Returns the namespaces
+    that were invalidated.
+    """
+    global _last_sync
+    store = _get_store()
+    if store is None:
+        return []
+    now = time.monotonic()
+    if not force and now - _last_sync < _poll_seconds:
+        return []
+    _last_sync = now
+    try:
+        current = store.generations()
+    except sqlite3.Error as e:
+        logger.warning(f"Shared cache sync failed: {e}")
+        return []
+
+    with _lock:
+        changed = [ns for ns, gen in current.items() if gen != _generations.get(ns)]
+        _generations.update(current)
+        callbacks = [(ns, cb) for ns in changed for cb in _listeners.get(ns, [])]
+    for ns in changed:
+        tier = _tiers.get(ns)
+        if tier is not None:
+            tier.clear_local()
+    for ns, callback in callbacks:
+        try:
+            callback()
+        except Exception:
+            logger.exception(f"Invalidation callback for {ns!r} failed")
+    if changed:
+        logger.info(f"Applied cache invalidations from other workers: {changed}")
+    return changed
+
+
+def cache_stats() -> dict:
+    """Per-namespace hit/miss counts and hit rate, plus backend info."""
+    with _lock:
+        tiers = dict(_tiers)
+    return {
+        "shared_backend": str(_store.path) if _store is not None else None,
+        "namespaces": {name: tier.stats() for name, tier in sorted(tiers.items())},
+    }
+
+
+def _reset_for_tests() -> None:
+    global _store, _configured, _last_sync
+    with _lock:
+        _tiers.clear()
+        _generations.clear()
+        _store = None
+        _configured = False
+        _last_sync = 0.0
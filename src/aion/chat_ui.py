@@ -5,15 +5,16 @@ Streams the agent's thinking process to the UI.
 """
 
 import asyncio
+import contextvars
 import json
 import re
 import sqlite3
 import time
 import uuid
 
-import yaml
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from queue import Empty, Queue
@@ -35,17 +36,21 @@ from weaviate.classes.query import Filter
 from aion.agents import AGENT_LABELS
 from aion.agents.archimate_agent import ArchiMateAgent
 from aion.agents.principle_agent import PrincipleAgent
+from aion.agents.quality_gate import gate_stats
 from aion.agents.rag_agent import RAGAgent
 from aion.agents.vocabulary_agent import VocabularyAgent
+from aion.cache import cache_stats, sync_invalidations
 from aion.config import is_reasoning_model, settings
 from aion.events import Event
 from aion.generation import GenerationPipeline, stream_synthesis_response
 from aion.tools.html_explorer import generate_explorer_html
 from aion.ingestion.client import get_weaviate_client
 from aion.ingestion.embeddings import close_embeddings_client, embed_text
+from aion.llm_scheduler import Priority, llm_scheduler
 from aion.memory.session_store import (
     create_session,
     get_running_summary,
+    get_summary_state,
     init_memory_tables,
     update_running_summary,
 )
@@ -57,9 +62,13 @@ from aion.registry.element_registry import init_registry_table
 from aion.routing import ExecutionModel
 from aion.routing import get_execution_model as _get_execution_model
 from aion.skills import api as skills_api
+from aion.skills.hook_runner import hook_runner
+from aion.sse import coalesce_sse, sse_stats
 from aion.text_utils import elapsed_ms, strip_think_tags
-from aion.config.runtime import get_runtime_value
+from aion.tracing import finish_trace, start_trace, traced
+from aion.config.runtime import get_runtime_value, reload_runtime_config
 from aion.tools.rag_search import _get_retrieval_limits, _get_truncation
+from aion.yaml_utils import load_yaml
 
 logger = structlog.get_logger(__name__)
 
@@ -235,13 +244,38 @@ async def lifespan(app: FastAPI):
     _persona = Persona()
     logger.info("Persona orchestrator initialized")
 
-    pixel_registry.init(pixel_agents_dir=settings.pixel_agents_dir)
+    llm_scheduler.configure(
+        providers=get_runtime_value("llm_scheduler.providers", {}) or {},
+        default_concurrency=get_runtime_value("llm_scheduler.default_concurrency", 8),
+        interactive_budget_ms=get_runtime_value("llm_scheduler.interactive_budget_ms", 2000),
+        background_deadline_ms=get_runtime_value("llm_scheduler.background_deadline_ms", 30000),
+    )
+
+    pixel_registry.init(
+        pixel_agents_dir=settings.pixel_agents_dir,
+        buffer_size=get_runtime_value("pixel_agents.buffer_size", 10000),
+        flush_records=get_runtime_value("pixel_agents.flush_records", 64),
+        flush_interval=get_runtime_value("pixel_agents.flush_interval_ms", 100) / 1000,
+    )
+
+    hook_runner.init(
+        _db_path,
+        workers=get_runtime_value("hooks.workers", 4),
+        plugin_concurrency=get_runtime_value("hooks.plugin_concurrency", {}) or {},
+        default_concurrency=get_runtime_value("hooks.plugin_concurrency_default", 1),
+        lease_seconds=get_runtime_value("hooks.lease_seconds", 60),
+        retention_days=get_runtime_value("hooks.retention_days", 7),
+    )
 
     try:
         yield  # App is running
     finally:
         # Shutdown — always clean up pixel agents, even on crash
         pixel_registry.shutdown()
+        hook_runner.shutdown()
+        # Pending summaries resume from the watermark on the next turn
+        for task in list(_summary_tasks.values()):
+            task.cancel()
         close_embeddings_client()
         logger.info("Embeddings client closed")
         if _weaviate_client:
@@ -267,6 +301,13 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def sync_shared_cache(request: Request, call_next):
+    """Apply cache invalidations broadcast by other workers (rate-limited)."""
+    sync_invalidations()
+    return await call_next(request)
+
+
 # Pydantic models
 class ChatMessage(BaseModel):
     role: str  # "user" or "assistant"
@@ -464,6 +505,7 @@ def init_db():
     init_registry_table(_db_path)
 
 
+@traced("db.save_message", "db")
 def save_message(conversation_id: str, role: str, content: str, sources: list[dict] = None, timing: dict = None, turn_summary: str = None, thinking_steps: list[dict] = None, artifact_ids: list[str] = None):
     """Save a message to the database."""
     conn = _get_connection()
@@ -492,6 +534,7 @@ def save_message(conversation_id: str, role: str, content: str, sources: list[di
         conn.close()
 
 
+@traced("db.create_conversation", "db")
 def create_conversation(title: str = "New Conversation") -> str:
     """Create a new conversation and return its ID."""
     conn = _get_connection()
@@ -613,6 +656,7 @@ def get_all_conversations() -> list[dict]:
     return conversations
 
 
+@traced("db.update_conversation_title", "db")
 def update_conversation_title(conversation_id: str, title: str):
     """Update conversation title."""
     conn = _get_connection()
@@ -658,6 +702,7 @@ def delete_all_conversations():
         conn.close()
 
 
+@traced("db.save_artifact", "db")
 def save_artifact(
     conversation_id: str,
     filename: str,
@@ -699,12 +744,14 @@ def save_artifact(
     # that declares the artifact_materialization host capability instead
     # receives a real ephemeral path materialized from `content` for the
     # duration of its hooks (Phase 3 — see aion.skills.hooks /
-    # aion.skills.artifact_materialization).
+    # aion.skills.artifact_materialization). In the server the event is
+    # only enqueued here; the background hook runner fires the scripts.
     try:
-        from aion.skills.hooks import fire_post_tool_use
-        fire_post_tool_use(
+        from aion.skills.hook_runner import submit_post_tool_use
+        submit_post_tool_use(
             filename, tool_name="Write",
             content=content, content_type=content_type,
+            ordering_key=f"{conversation_id}/{filename}",
         )
     except Exception:
         logger.exception("PostToolUse hook firing raised — suppressed to protect artifact save")
@@ -821,6 +868,7 @@ async def _build_turn_summary(response: str, sources: list[dict]) -> str:
 async def _llm_summarize_turn(response: str) -> str | None:
     """Use the Persona's LLM to produce a one-sentence turn summary.
 
+    Runs at background priority; a shed call counts as a failure.
     Returns None on failure so the caller can fall back to truncation.
     """
     # Truncate input to avoid sending huge payloads (e.g., full XML models)
@@ -834,10 +882,12 @@ async def _llm_summarize_turn(response: str) -> str | None:
         f"RESPONSE:\n{text}\n\nSUMMARY:"
     )
 
+    provider = settings.effective_persona_provider
     try:
-        if settings.effective_persona_provider in ("github_models", "openai"):
-            return await _llm_summarize_openai(prompt)
-        return await _llm_summarize_ollama(prompt)
+        async with llm_scheduler.slot(provider, Priority.BACKGROUND):
+            if provider in ("github_models", "openai"):
+                return await _llm_summarize_openai(prompt)
+            return await _llm_summarize_ollama(prompt)
     except Exception as e:
         logger.warning(f"LLM turn summary failed, falling back to truncation: {e}")
         return None
@@ -887,54 +937,123 @@ async def _llm_summarize_ollama(prompt: str) -> str | None:
         return text if text else None
 
 
+def _get_unsummarized_messages(
+    conversation_id: str, after_id: int, limit: int,
+) -> list[dict]:
+    """Oldest ``limit`` messages with id > ``after_id`` (bounded tail read)."""
+    conn = _get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT id, role, content, turn_summary FROM messages "
+            "WHERE conversation_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (conversation_id, after_id, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {"id": r[0], "role": r[1], "content": r[2], "turn_summary": r[3]}
+        for r in rows
+    ]
+
+
+def _count_messages_after(conversation_id: str, after_id: int) -> int:
+    conn = _get_connection()
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM messages WHERE conversation_id = ? AND id > ?",
+            (conversation_id, after_id),
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
 async def _maybe_update_summary(conversation_id: str) -> None:
-    """Trigger a rolling summary update if enough messages have left the verbatim window.
+    """Fold messages that left the verbatim window into the rolling summary.
 
     The verbatim window is loaded from runtime.yaml `persona:` config
     via get_runtime_value("persona") (default 20) — system-infra, not a
     per-plugin threshold.
-    We summarize when settings.summarize_trigger_count (4) messages have accumulated
-    beyond that window since the last summary, so roughly every 4-6 turns.
+
+    The session stores a watermark: the id of the last message the
+    running summary covers. Only messages after it are counted and read
+    (bounded by `persona.summary_max_batch`), and the LLM is called once
+    settings.summarize_trigger_count (4) of them have left the window —
+    so roughly every 4-6 turns, with the watermark advancing each time.
+    A failed or shed summary call leaves the watermark where it was, so
+    the same messages are retried on a later pass.
     """
-    messages = get_conversation_messages(conversation_id)
     persona_config = get_runtime_value("persona", {})
     verbatim_window = persona_config.get("verbatim_window", 20)
+    max_batch = persona_config.get("summary_max_batch", 40)
 
-    # Nothing to summarize if all messages fit in the verbatim window
-    if len(messages) <= verbatim_window:
-        return
+    current_summary, watermark = get_summary_state(conversation_id)
+    pending = _count_messages_after(conversation_id, watermark) - verbatim_window
 
-    # Messages before the verbatim window that need summarizing
-    older_messages = messages[:-verbatim_window]
+    if pending <= 0:
+        return
 
-    # Check how many unsummarized messages exist. The running summary
-    # covers some earlier messages — we only need to summarize when
-    # enough new ones have accumulated.
-    current_summary = get_running_summary(conversation_id)
+    if current_summary and not watermark:
+        # Summary written before watermarks existed: it already covers
+        # everything outside the window, so adopt that as the watermark
+        # instead of re-summarizing the whole history.
+        covered = _get_unsummarized_messages(conversation_id, 0, pending)
+        update_running_summary(conversation_id, current_summary, watermark=covered[-1]["id"])
+        return
 
-    # Heuristic: if the summary is empty, summarize all older messages.
-    # Otherwise, only summarize when settings.summarize_trigger_count new messages
-    # have accumulated (we count from the last summary update by tracking
-    # how many older messages exist vs what the summary likely covers).
-    if current_summary and len(older_messages) < settings.summarize_trigger_count:
+    if current_summary and pending < settings.summarize_trigger_count:
         return
 
-    # Only summarize the most recent batch of older messages (the ones
-    # that just left the window), not the entire history again.
-    batch = older_messages[-settings.summarize_trigger_count:] if current_summary else older_messages
+    batch = _get_unsummarized_messages(conversation_id, watermark, min(pending, max_batch))
 
     try:
         new_summary = await generate_rolling_summary(current_summary, batch)
         if new_summary:
-            update_running_summary(conversation_id, new_summary)
+            update_running_summary(conversation_id, new_summary, watermark=batch[-1]["id"])
             logger.info(
                 f"Rolling summary updated for {conversation_id}: "
-                f"{len(new_summary)} chars, {len(older_messages)} older messages"
+                f"{len(new_summary)} chars, {len(batch)} messages, "
+                f"watermark {batch[-1]['id']}"
             )
     except Exception as e:
         logger.warning(f"Rolling summary update failed: {e}")
 
 
+# Per-conversation summarization tasks. A turn arriving while a task is
+# pending or running only marks the conversation dirty, so a burst of
+# turns is coalesced into one summary pass after the debounce delay.
+_summary_tasks: dict[str, asyncio.Task] = {}
+_summary_dirty: set[str] = set()
+
+
+def _schedule_summary_update(conversation_id: str) -> None:
+    """Run _maybe_update_summary in the background, debounced per conversation.
+
+    Keeps the LLM summarization call off the request's critical path.
+    """
+    task = _summary_tasks.get(conversation_id)
+    if task is not None and not task.done():
+        _summary_dirty.add(conversation_id)
+        return
+    _summary_tasks[conversation_id] = asyncio.create_task(
+        _summary_worker(conversation_id), name=f"summary-{conversation_id}",
+    )
+
+
+async def _summary_worker(conversation_id: str) -> None:
+    delay = get_runtime_value("persona.summary_debounce_seconds", 2.0)
+    try:
+        while True:
+            await asyncio.sleep(delay)
+            # Turns that arrived during the sleep are covered by this pass
+            _summary_dirty.discard(conversation_id)
+            await _maybe_update_summary(conversation_id)
+            if conversation_id not in _summary_dirty:
+                break
+    finally:
+        if _summary_tasks.get(conversation_id) is asyncio.current_task():
+            del _summary_tasks[conversation_id]
+
+
 def _query_references_artifact(query: str, intent: str, artifact: dict, artifact_age: int = 0) -> bool:
     """Check if the query references a previously loaded artifact.
 
@@ -1141,9 +1260,11 @@ async def _stream_agent_response(
         agent=AGENT_LABELS.get(agent_key, agent_key) if agent_key else None,
     )
 
+    # Run in a copy of this context so the agent thread inherits the
+    # structlog request_id and the request's trace (aion.tracing).
     thread = Thread(
-        target=_run_agent_in_thread,
-        args=(coro_factory, result_queue, output_queue, label),
+        target=contextvars.copy_context().run,
+        args=(_run_agent_in_thread, coro_factory, result_queue, output_queue, label),
     )
     thread.daemon = True
     thread.start()
@@ -1154,7 +1275,9 @@ async def _stream_agent_response(
 
     while thread.is_alive():
         try:
-            event = output_queue.get(timeout=0.1)
+            # Non-blocking: a blocking get would stall the event loop (and
+            # the SSE writer's flush timer) for up to its timeout.
+            event = output_queue.get_nowait()
             if event is None:
                 break
             event_count += 1
@@ -1162,7 +1285,8 @@ async def _stream_agent_response(
             # endpoint converts to SSE via .to_sse() at the FastAPI
             # boundary. (1a.3-bridge transiently did .to_sse() here
             # before the internal-generator restructure landed.)
-            logger.info(f"{label} event {event_count}: {event.type}")
+            if event.type != "text":
+                logger.info(f"{label} event {event_count}: {event.type}")
             yield event
             last_status_time = asyncio.get_event_loop().time()
         except Empty:
@@ -1171,7 +1295,7 @@ async def _stream_agent_response(
                 elapsed_sec = int(now - start_time)
                 yield Event(type="heartbeat", elapsed_sec=elapsed_sec)
                 last_status_time = now
-            await asyncio.sleep(0.05)
+            await asyncio.sleep(0.01)
             continue
 
     # Drain remaining events
@@ -1510,41 +1634,42 @@ async def stream_inspect_response(
 
     start_time = time.perf_counter()
     try:
-        if settings.effective_rag_provider in ("github_models", "openai"):
-            from openai import OpenAI
-            client = OpenAI(**settings.get_openai_client_kwargs(
-                settings.effective_rag_provider, timeout=settings.timeout_llm_inspect,
-            ))
-            model = settings.effective_rag_model
-            kwargs = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-            }
-            token_limits = get_runtime_value("llm_token_limits", {})
-            if is_reasoning_model(model):
-                kwargs["max_completion_tokens"] = token_limits.get("chat_review_reasoning", 4096)
+        async with llm_scheduler.slot(settings.effective_rag_provider, Priority.INTERACTIVE):
+            if settings.effective_rag_provider in ("github_models", "openai"):
+                from openai import OpenAI
+                client = OpenAI(**settings.get_openai_client_kwargs(
+                    settings.effective_rag_provider, timeout=settings.timeout_llm_inspect,
+                ))
+                model = settings.effective_rag_model
+                kwargs = {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                }
+                token_limits = get_runtime_value("llm_token_limits", {})
+                if is_reasoning_model(model):
+                    kwargs["max_completion_tokens"] = token_limits.get("chat_review_reasoning", 4096)
+                else:
+                    kwargs["max_tokens"] = token_limits.get("chat_review_standard", 2000)
+                response = client.chat.completions.create(**kwargs)
+                choice = response.choices[0] if response.choices else None
+                response_text = (choice.message.content or "").strip() if choice else ""
             else:
-                kwargs["max_tokens"] = token_limits.get("chat_review_standard", 2000)
-            response = client.chat.completions.create(**kwargs)
-            choice = response.choices[0] if response.choices else None
-            response_text = (choice.message.content or "").strip() if choice else ""
-        else:
-            import httpx
-            async with httpx.AsyncClient(timeout=settings.timeout_llm_inspect) as client:
-                resp = await client.post(
-                    f"{settings.ollama_url}/api/generate",
-                    json={
-                        "model": settings.effective_rag_model,
-                        "prompt": f"{system_prompt}\n\n{user_prompt}",
-                        "stream": False,
-                        "options": {"num_predict": 2000},
-                    },
-                )
-                resp.raise_for_status()
-                response_text = strip_think_tags(resp.json().get("response", ""))
+                import httpx
+                async with httpx.AsyncClient(timeout=settings.timeout_llm_inspect) as client:
+                    resp = await client.post(
+                        f"{settings.ollama_url}/api/generate",
+                        json={
+                            "model": settings.effective_rag_model,
+                            "prompt": f"{system_prompt}\n\n{user_prompt}",
+                            "stream": False,
+                            "options": {"num_predict": 2000},
+                        },
+                    )
+                    resp.raise_for_status()
+                    response_text = strip_think_tags(resp.json().get("response", ""))
 
         total_ms = elapsed_ms(start_time)
         timing = {"total_ms": total_ms}
@@ -1568,8 +1693,13 @@ async def stream_rag_response(question: str,
                                  prior_sources: list[dict] | None = None,
                                  message_history: list | None = None,
                                  running_summary: str | None = None,
-                                 step_index: int | None = None) -> AsyncGenerator[Event, None]:
-    """Stream RAGAgent's thinking process as typed Event objects."""
+                                 step_index: int | None = None,
+                                 stream: bool = False) -> AsyncGenerator[Event, None]:
+    """Stream RAGAgent's thinking process as typed Event objects.
+
+    ``stream=True`` also streams the answer itself as ``text`` events
+    (plus ``replace`` corrections) ahead of the ``complete`` event.
+    """
     def factory(output_queue):
         return _rag_agent.query(
             question, event_queue=output_queue,
@@ -1581,6 +1711,7 @@ async def stream_rag_response(question: str,
             message_history=message_history,
             running_summary=running_summary,
             step_index=step_index,
+            stream=stream,
         )
     # 180s allows multi-tool chains with slow models
     # (gpt-5-nano: ~15s per LLM call × 5 iterations + SKOSMOS API calls)
@@ -1655,7 +1786,8 @@ async def stream_vocabulary_response(question: str,
                                      doc_refs: list[str] | None = None,
                                      conversation_id: str | None = None,
                                      message_history: list | None = None,
-                                     running_summary: str | None = None) -> AsyncGenerator[Event, None]:
+                                     running_summary: str | None = None,
+                                     stream: bool = False) -> AsyncGenerator[Event, None]:
     """Stream VocabularyAgent's thinking process as typed Event objects."""
     def factory(output_queue):
         return _vocabulary_agent.query(
@@ -1664,6 +1796,7 @@ async def stream_vocabulary_response(question: str,
             conversation_id=conversation_id,
             message_history=message_history,
             running_summary=running_summary,
+            stream=stream,
         )
     async for event in _stream_agent_response(
         factory, label="Vocabulary", initial_status="Looking up vocabulary...", agent_key="vocabulary_agent",
@@ -1680,7 +1813,8 @@ async def stream_principle_response(question: str,
                                     conversation_id: str | None = None,
                                     artifact_context: str | None = None,
                                     message_history: list | None = None,
-                                    running_summary: str | None = None) -> AsyncGenerator[Event, None]:
+                                    running_summary: str | None = None,
+                                    stream: bool = False) -> AsyncGenerator[Event, None]:
     """Stream PrincipleAgent's thinking process as typed Event objects."""
     def factory(output_queue):
         return _principle_agent.query(
@@ -1690,6 +1824,7 @@ async def stream_principle_response(question: str,
             artifact_context=artifact_context,
             message_history=message_history,
             running_summary=running_summary,
+            stream=stream,
         )
     is_assessment = skill_tags and "principle-quality" in skill_tags
     status = "Assessing principle quality..." if is_assessment else "Generating principle..."
@@ -1746,6 +1881,85 @@ async def stream_repo_analysis_response(
         yield event
 
 
+@dataclass
+class _Phase:
+    """One node of a phase graph: an event stream plus the phases it waits on.
+
+    ``run`` receives the shared results dict and records its own output
+    under ``name`` on success; dependents only start once every phase in
+    ``after`` has recorded a result, and are skipped if one did not. A phase
+    reports failure by yielding an ``error`` event (or raising).
+    """
+
+    name: str
+    run: Callable[[dict], AsyncGenerator[Event, None]]
+    after: tuple[str, ...] = ()
+
+
+async def _run_phase_graph(
+    phases: list[_Phase], results: dict, failures: dict[str, str],
+) -> AsyncGenerator[Event, None]:
+    """Run phases as soon as their dependencies succeed; merge their events.
+
+    Each phase's events keep their own order; independent phases interleave
+    in arrival order. The frontend treats ``error`` as the end of the turn,
+    so a phase's first error message is recorded in ``failures`` under its
+    name and forwarded as a ``status`` event; the caller reports failures in
+    its final event. Closing the generator (client disconnect) cancels every
+    phase still running and closes its event stream.
+    """
+    done_marker = object()
+    merged: asyncio.Queue = asyncio.Queue()
+    tasks: dict[str, asyncio.Task] = {}
+    finished: set[str] = set()
+
+    async def pump(phase: _Phase) -> None:
+        events = phase.run(results)
+        try:
+            async for event in events:
+                if event.type == "error":
+                    failures.setdefault(phase.name, event.content or f"{phase.name} failed.")
+                    event = Event(type="status", agent=event.agent, content=event.content)
+                await merged.put(event)
+        except Exception as e:
+            logger.exception("phase_failed", phase=phase.name)
+            failures.setdefault(phase.name, f"{phase.name} failed: {e}")
+            await merged.put(Event(type="status", content=failures[phase.name]))
+        finally:
+            await events.aclose()
+            await merged.put((done_marker, phase.name))
+
+    def schedule() -> None:
+        progressed = True
+        while progressed:
+            progressed = False
+            for phase in phases:
+                if phase.name in tasks or phase.name in finished:
+                    continue
+                if not all(dep in finished for dep in phase.after):
+                    continue
+                if all(dep in results for dep in phase.after):
+                    tasks[phase.name] = asyncio.create_task(pump(phase))
+                else:
+                    finished.add(phase.name)  # upstream failed — skip
+                    progressed = True
+
+    try:
+        schedule()
+        while len(finished) < len(phases):
+            item = await merged.get()
+            if isinstance(item, tuple) and item[0] is done_marker:
+                finished.add(item[1])
+                schedule()
+                continue
+            yield item
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
 async def stream_repo_archimate_response(
     question: str,
     skill_tags: list[str] | None = None,
@@ -1753,120 +1967,105 @@ async def stream_repo_archimate_response(
     message_history: list | None = None,
     running_summary: str | None = None,
 ) -> AsyncGenerator[Event, None]:
-    """Chain repo analysis (Phase 1) → ArchiMate generation (Phase 2).
+    """Repo analysis (Phase 1) → ArchiMate model (Phase 2) ‖ HTML explorer (Phase 3).
 
-    Phase 1a.4: forwards typed Event objects between the two phases —
-    no more ``json.loads(event_str.replace("data: ", ""))`` round-trip.
+    Phases 2 and 3 both depend only on Phase 1's architecture notes, so they
+    run concurrently: the deterministic explorer lands while the LLM is still
+    generating the model. Events are forwarded as typed Event objects; phase
+    failures surface as status events and are summarised in the single final
+    ``complete`` (or ``error``, when nothing was produced) event.
     """
     assert conversation_id, "stream_repo_archimate_response requires conversation_id for artifact handoff"
-    # Phase 1: Run repo analysis, forward status/decision events, suppress complete
-    phase1_error = False
-    phase1_response = ""
-    async for event in stream_repo_analysis_response(
-        question, skill_tags=skill_tags, conversation_id=conversation_id,
-        message_history=message_history, running_summary=running_summary,
-    ):
-        if event.type == "complete":
-            phase1_response = event.response or ""
-            continue  # suppress Phase 1 complete — Phase 2 produces the final complete
-        if event.type == "error":
-            # Enrich timeout errors with context
-            if event.content and "timed out" in event.content.lower():
-                event.content = event.content + (
-                    " The repository may have too many files for analysis. "
-                    "Try pointing to a specific subdirectory (e.g., src/) instead of the repo root."
-                )
-            yield event
-            phase1_error = True
-            break
-        yield event
 
-    if phase1_error:
-        return
+    async def analysis(results: dict) -> AsyncGenerator[Event, None]:
+        # Phase 1: Run repo analysis, forward status/decision events, suppress complete
+        phase1_response = ""
+        async for event in stream_repo_analysis_response(
+            question, skill_tags=skill_tags, conversation_id=conversation_id,
+            message_history=message_history, running_summary=running_summary,
+        ):
+            if event.type == "complete":
+                phase1_response = event.response or ""
+                continue  # suppress Phase 1 complete — the graph produces the final complete
+            if event.type == "error":
+                # Enrich timeout errors with context
+                if event.content and "timed out" in event.content.lower():
+                    event.content = event.content + (
+                        " The repository may have too many files for analysis. "
+                        "Try pointing to a specific subdirectory (e.g., src/) instead of the repo root."
+                    )
+                yield event
+                return
+            yield event
 
-    # Retrieve the saved architecture_notes artifact
-    architecture_notes = None
-    if conversation_id:
+        # Retrieve the saved architecture_notes artifact
         artifact = get_latest_artifact(conversation_id, content_type="repo-analysis/yaml")
         if not artifact:
             # Backwards compat: fall back to legacy JSON format
             artifact = get_latest_artifact(conversation_id, content_type="repo-analysis/json")
             if artifact:
                 logger.info("repo_archimate: fell back to legacy JSON artifact for conversation %s", conversation_id)
-        if artifact:
-            architecture_notes = artifact["content"]
-
-    if not architecture_notes:
-        # Surface the agent's response if it contains useful error context
-        detail = ""
-        if phase1_response:
-            detail = f" Agent response: {phase1_response[:300]}"
-        yield Event(
-            type="error",
-            content=(
-                "Repository analysis did not produce architecture notes. "
-                f"The agent may have encountered an error during extraction.{detail}"
-            ),
-        )
-        return
-
-    # Phase transition indicator
-    yield Event(
-        type="status",
-        agent=AGENT_LABELS["repo_analysis_agent"],
-        content="Analysis complete. Generating ArchiMate model...",
-    )
-
-    # Phase 2: Feed architecture_notes as source_text to generation pipeline
-    phase2_error = False
-    phase2_has_artifact = False
-    async for event in stream_generation_response(
-        question,
-        skill_tags=["archimate"],
-        conversation_id=conversation_id,
-        source_text=architecture_notes,
-    ):
-        if event.type == "complete":
-            continue  # suppress Phase 2 complete — Phase 3 produces the final response
-        if event.type == "error":
-            phase2_error = True
-        if event.type == "artifact":
-            phase2_has_artifact = True
-        yield event
 
-    if phase2_error:
-        return
+        if not artifact or not artifact["content"]:
+            # Surface the agent's response if it contains useful error context
+            detail = ""
+            if phase1_response:
+                detail = f" Agent response: {phase1_response[:300]}"
+            yield Event(
+                type="error",
+                content=(
+                    "Repository analysis did not produce architecture notes. "
+                    f"The agent may have encountered an error during extraction.{detail}"
+                ),
+            )
+            return
 
-    if not phase2_has_artifact:
-        yield Event(
-            type="error",
-            content=(
-                "ArchiMate model generation failed. The architecture notes were saved "
-                "but the XML conversion encountered errors."
-            ),
-        )
+        results["analysis"] = artifact["content"]
+        # Phase transition indicator
         yield Event(
-            type="complete",
-            response=(
-                "Repository analysis completed but ArchiMate model generation failed. "
-                "You can retry or check the architecture notes artifact."
-            ),
+            type="status",
+            agent=AGENT_LABELS["repo_analysis_agent"],
+            content="Analysis complete. Generating ArchiMate model and architecture explorer...",
         )
-        return
 
-    # Phase transition indicator
-    yield Event(
-        type="status",
-        agent=AGENT_LABELS["repo_analysis_agent"],
-        content="ArchiMate model generated. Building architecture explorer...",
-    )
+    async def model(results: dict) -> AsyncGenerator[Event, None]:
+        # Phase 2: Feed architecture_notes as source_text to generation pipeline
+        has_artifact = failed = False
+        async for event in stream_generation_response(
+            question,
+            skill_tags=["archimate"],
+            conversation_id=conversation_id,
+            source_text=results["analysis"],
+        ):
+            if event.type == "complete":
+                continue  # suppress Phase 2 complete — the graph produces the final response
+            if event.type == "error":
+                failed = True
+            if event.type == "artifact":
+                has_artifact = True
+            yield event
+
+        if has_artifact and not failed:
+            results["model"] = True
+        elif not failed:
+            yield Event(
+                type="error",
+                content=(
+                    "ArchiMate model generation failed. The architecture notes were saved "
+                    "but the XML conversion encountered errors."
+                ),
+            )
 
-    # Phase 3: Generate interactive HTML explorer (deterministic, no LLM)
-    html_content = generate_explorer_html(architecture_notes)
-    if html_content:
+    async def explorer(results: dict) -> AsyncGenerator[Event, None]:
+        # Phase 3: Generate interactive HTML explorer (deterministic, no LLM)
+        architecture_notes = results["analysis"]
+        html_content = await asyncio.to_thread(generate_explorer_html, architecture_notes)
+        if not html_content:
+            yield Event(type="error", content="Failed to generate HTML explorer from architecture notes.")
+            return
         ts = datetime.now().strftime("%y%m%d-%H%M%S")
         try:
-            parsed = yaml.safe_load(architecture_notes)
+            parsed = load_yaml(architecture_notes)
             repo_name = parsed.get("meta", {}).get("repo_name", "explorer")
         except Exception:
             repo_name = "explorer"
@@ -1874,8 +2073,10 @@ async def stream_repo_archimate_response(
         summary = "Interactive architecture explorer"
 
         # Uses the local save_artifact (chat_ui.py:608), not tools/artifacts.py
-        artifact_id = save_artifact(conversation_id, filename, html_content, "text/html", summary)
-
+        artifact_id = await asyncio.to_thread(
+            save_artifact, conversation_id, filename, html_content, "text/html", summary,
+        )
+        results["explorer"] = True
         yield Event(
             type="artifact",
             artifact_id=artifact_id,
@@ -1883,19 +2084,47 @@ async def stream_repo_archimate_response(
             content_type="text/html",
             summary=summary,
         )
-        yield Event(
-            type="complete",
-            response=(
-                "The interactive explorer has been saved as an artifact. "
-                "You can download and open the HTML file in any browser."
-            ),
+
+    results: dict = {}
+    failures: dict[str, str] = {}
+    async for event in _run_phase_graph([
+        _Phase("analysis", analysis),
+        _Phase("model", model, after=("analysis",)),
+        _Phase("explorer", explorer, after=("analysis",)),
+    ], results, failures):
+        yield event
+
+    if "analysis" not in results:
+        yield Event(type="error", content=failures.get("analysis", "Repository analysis failed."))
+        return
+    model_ok, explorer_ok = "model" in results, "explorer" in results
+    details = " ".join(failures[name] for name in ("model", "explorer") if name in failures)
+
+    if model_ok and explorer_ok:
+        response = (
+            "The interactive explorer has been saved as an artifact. "
+            "You can download and open the HTML file in any browser."
+        )
+    elif model_ok:
+        response = "HTML explorer generation failed. The ArchiMate model was saved successfully."
+    elif explorer_ok:
+        response = (
+            "Repository analysis completed but ArchiMate model generation failed. "
+            "The interactive explorer was saved as an artifact; you can retry the model "
+            "or check the architecture notes artifact."
         )
     else:
-        yield Event(type="error", content="Failed to generate HTML explorer from architecture notes.")
         yield Event(
-            type="complete",
-            response="HTML explorer generation failed. The ArchiMate model was saved successfully.",
+            type="error",
+            content=(
+                "Repository analysis completed but ArchiMate model and explorer generation failed. "
+                f"You can retry or check the architecture notes artifact. {details}"
+            ).rstrip(),
         )
+        return
+    if details:
+        response = f"{response}\n\nDetails: {details}"
+    yield Event(type="complete", response=response)
 
 
 # ============== Test Mode: LLM Comparison Functions ==============
@@ -2069,7 +2298,10 @@ async def generate_with_ollama(system_prompt: str, user_prompt: str, model: str)
     full_prompt = f"{system_prompt}\n\n{user_prompt}"
 
     try:
-        async with httpx.AsyncClient(timeout=settings.timeout_long_running) as client:
+        async with (
+            llm_scheduler.slot("ollama", Priority.INTERACTIVE),
+            httpx.AsyncClient(timeout=settings.timeout_long_running) as client,
+        ):
             response = await client.post(
                 f"{settings.ollama_url}/api/generate",
                 json={
@@ -2136,7 +2368,8 @@ async def generate_with_openai(system_prompt: str, user_prompt: str, model: str)
         else:
             completion_kwargs["max_tokens"] = token_limits.get("direct_standard", 1000)
 
-        response = openai_client.chat.completions.create(**completion_kwargs)
+        async with llm_scheduler.slot("openai", Priority.INTERACTIVE):
+            response = openai_client.chat.completions.create(**completion_kwargs)
 
         latency_ms = elapsed_ms(start_time)
 
@@ -2334,6 +2567,7 @@ async def chat_stream(request: ChatRequest):
             request_id=request_id,
             conversation_id=conversation_id,
         )
+        trace = start_trace("chat_stream", request_id)
 
         try:
             # Send conversation ID first
@@ -2475,7 +2709,7 @@ async def chat_stream(request: ChatRequest):
                     persona_result.direct_response, [], timing,
                     turn_summary=f"Direct response ({persona_result.intent})",
                 )
-                await _maybe_update_summary(conversation_id)
+                _schedule_summary_update(conversation_id)
                 final_response = persona_result.direct_response
                 return
 
@@ -2610,6 +2844,9 @@ async def chat_stream(request: ChatRequest):
             # Dumb conversion — the agent's history_processor handles truncation.
             message_history = _build_message_history(messages) if messages else None
             running_summary = get_running_summary(conversation_id) if conversation_id else None
+            # Token-level answer streaming for the single-agent paths
+            # (RAG, vocabulary, principle). Orchestrator steps never stream.
+            stream_answers = get_runtime_value("agents.stream_answers", True)
 
             final_response = None
             final_sources = []
@@ -2794,6 +3031,7 @@ async def chat_stream(request: ChatRequest):
                     conversation_id=conversation_id,
                     message_history=message_history,
                     running_summary=running_summary,
+                    stream=stream_answers,
                 ):
                     sse = event.to_sse()
                     yield sse
@@ -2820,6 +3058,7 @@ async def chat_stream(request: ChatRequest):
                     artifact_context=artifact_context,
                     message_history=message_history,
                     running_summary=running_summary,
+                    stream=stream_answers,
                 ):
                     sse = event.to_sse()
                     yield sse
@@ -2966,6 +3205,7 @@ async def chat_stream(request: ChatRequest):
                         prior_sources=prior_sources,
                         message_history=message_history,
                         running_summary=running_summary,
+                        stream=stream_answers,
                     ):
                         # Phase 1a.4: event is a typed Event; use attribute
                         # access instead of the json.loads round-trip the
@@ -2996,6 +3236,9 @@ async def chat_stream(request: ChatRequest):
                         rewritten_len=len(persona_result.rewritten_query or ""),
                     )
                     if will_synthesize:
+                        if stream_answers:
+                            # Clear the streamed RAG answer; synthesis streams its own.
+                            yield Event(type="replace", content="").to_sse()
                         yield Event(
                             type="status",
                             agent=AGENT_LABELS["synthesis"],
@@ -3049,7 +3292,7 @@ async def chat_stream(request: ChatRequest):
                     thinking_steps=thinking_steps or None,
                     artifact_ids=artifact_ids or None,
                 )
-                await _maybe_update_summary(conversation_id)
+                _schedule_summary_update(conversation_id)
 
         finally:
             logger.info(
@@ -3065,11 +3308,12 @@ async def chat_stream(request: ChatRequest):
                     if persona_result and persona_result.steps else 0
                 ),
             )
+            finish_trace(trace, settings.trace_export_dir)
             structlog.contextvars.clear_contextvars()
             pixel_registry.idle_all()
 
     return StreamingResponse(
-        event_generator(),
+        coalesce_sse(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -3118,7 +3362,7 @@ async def chat_stream_compare(request: ComparisonRequest):
             yield event.to_sse()
 
     return StreamingResponse(
-        comparison_generator(),
+        coalesce_sse(comparison_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -3187,7 +3431,7 @@ async def chat(request: ChatRequest):
             persona_result.direct_response, [],
             turn_summary=f"Direct response ({persona_result.intent})",
         )
-        await _maybe_update_summary(conversation_id)
+        _schedule_summary_update(conversation_id)
         return ChatResponse(
             response=persona_result.direct_response,
             sources=[],
@@ -3323,7 +3567,7 @@ async def chat(request: ChatRequest):
         # Save assistant response with turn summary
         turn_summary = await _build_turn_summary(response, sources)
         save_message(conversation_id, "assistant", response, sources, turn_summary=turn_summary)
-        await _maybe_update_summary(conversation_id)
+        _schedule_summary_update(conversation_id)
 
         return ChatResponse(
             response=response,
@@ -3474,7 +3718,8 @@ async def upload_file(request: Request):
     elif ext == "xml":
         content = raw_bytes.decode("utf-8")
         try:
-            xml_to_yaml(content)
+            # Single streaming pass over the raw bytes (validates structure)
+            xml_to_yaml(raw_bytes)
         except ValueError as e:
             raise HTTPException(
                 status_code=400,
@@ -3641,9 +3886,24 @@ async def status():
             "model": embedding_model,
             "reachable": embedding_ok,
         },
+        "quality_gate": gate_stats.snapshot(),
+        "cache": cache_stats(),
+        "sse": sse_stats.snapshot(),
+        "pixel_agents": pixel_registry.stats(),
+        "llm_scheduler": llm_scheduler.snapshot(),
     }
 
 
+@app.post("/api/settings/runtime/reload")
+async def reload_runtime_settings():
+    """Re-read runtime.yaml in every server worker after an edit."""
+    try:
+        config = reload_runtime_config()
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "sections": sorted(config)}
+
+
 # LLM Settings endpoints
 @app.get("/api/settings/llm")
 async def get_llm_settings():
@@ -4038,6 +4298,27 @@ async def reload_plugin(plugin_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/hooks/jobs")
+async def list_hook_jobs(limit: int = 50, status: str | None = None):
+    """Recent PostToolUse hook jobs with per-script results and durations."""
+    try:
+        return {
+            "jobs": await asyncio.to_thread(hook_runner.list_jobs, limit, status),
+            "stats": await asyncio.to_thread(hook_runner.stats),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/hooks/jobs/{job_id}")
+async def get_hook_job(job_id: int):
+    """One hook job: status, per-script exit codes, stderr tail, timings."""
+    job = await asyncio.to_thread(hook_runner.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Hook job {job_id} not found")
+    return job
+
+
 @app.get("/api/skills/{skill_name}/content")
 async def get_skill_content(skill_name: str):
     """Get SKILL.md content for a specific skill."""
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import sys
 import warnings
 from pathlib import Path
 
@@ -37,16 +38,12 @@ from aion._rich_compat import (  # noqa: E402
     TextColumn,
 )
 
-from aion.agents.archimate_agent import ArchiMateAgent  # noqa: E402
-from aion.agents.principle_agent import PrincipleAgent  # noqa: E402
-from aion.agents.rag_agent import RAGAgent  # noqa: E402
-from aion.agents.vocabulary_agent import VocabularyAgent  # noqa: E402
-from aion.persona import Persona  # noqa: E402
-from aion.routing import ExecutionModel, get_execution_model  # noqa: E402
+# Heavy modules (agents → pydantic-ai/openai, ingestion → weaviate/pymupdf,
+# persona, routing) are imported inside the commands that use them, so
+# `aion config`, `aion registry list` etc. don't pay for them. The
+# memory/registry sub-apps only depend on config + sqlite3 and stay eager.
+# Guarded by tests/test_cli_startup.py; inspect with `aion --profile-startup`.
 from aion.config import settings  # noqa: E402
-from aion.ingestion.client import get_weaviate_client, weaviate_client  # noqa: E402
-from aion.ingestion.collections import CollectionManager  # noqa: E402
-from aion.ingestion.ingestion import DataIngestionPipeline  # noqa: E402
 from aion.memory.cli import app as memory_app  # noqa: E402
 from aion.registry.cli import app as registry_app  # noqa: E402
 
@@ -99,6 +96,18 @@ app.add_typer(registry_app, name="registry")
 console = Console()
 
 
+@app.callback()
+def _root(
+    profile_startup: bool = typer.Option(
+        False, "--profile-startup",
+        help="Run the given command under -X importtime and print an import-time breakdown",
+    ),
+):
+    """AInstein: Multi-Agent RAG System for Energy System Architecture."""
+    # --profile-startup is intercepted in main() before Typer parses argv;
+    # the option is declared here so it shows up in --help.
+
+
 VALID_OPENAI_EMBEDDING_MODELS = [
     "text-embedding-3-small", "text-embedding-3-large", "text-embedding-ada-002"
 ]
@@ -183,6 +192,9 @@ def init(
     ),
 ):
     """Initialize Weaviate collections and ingest data."""
+    from aion.ingestion.client import get_weaviate_client
+    from aion.ingestion.ingestion import DataIngestionPipeline
+
     console.print(Panel("Initializing AInstein RAG System", style="bold blue"))
 
     # Show current configuration
@@ -244,6 +256,9 @@ def init(
 @app.command()
 def status():
     """Show the status of Weaviate collections."""
+    from aion.ingestion.client import weaviate_client
+    from aion.ingestion.collections import CollectionManager
+
     console.print(Panel("AInstein System Status", style="bold blue"))
 
     try:
@@ -296,6 +311,9 @@ def query(
 
 def _query_direct(question: str, verbose: bool):
     """Direct RAG query — bypasses Persona entirely."""
+    from aion.agents.rag_agent import RAGAgent
+    from aion.ingestion.client import weaviate_client
+
     try:
         with weaviate_client() as client:
             rag = RAGAgent(client)
@@ -320,6 +338,14 @@ def _query_direct(question: str, verbose: bool):
 
 async def _query_with_persona(question: str, verbose: bool):
     """Full Persona pipeline — intent classification, routing, orchestration."""
+    from aion.agents.archimate_agent import ArchiMateAgent
+    from aion.agents.principle_agent import PrincipleAgent
+    from aion.agents.rag_agent import RAGAgent
+    from aion.agents.vocabulary_agent import VocabularyAgent
+    from aion.ingestion.client import weaviate_client
+    from aion.persona import Persona
+    from aion.routing import ExecutionModel, get_execution_model
+
     try:
         persona_instance = Persona()
 
@@ -400,6 +426,7 @@ async def _run_orchestrated(
     client, original_question: str, result, verbose: bool,
 ) -> tuple[str, list[dict]]:
     """Execute multi-step orchestration from the CLI."""
+    from aion.agents.rag_agent import RAGAgent
     from aion.generation import stream_synthesis_response
 
     rag = RAGAgent(client)
@@ -471,6 +498,7 @@ def search(
     console.print(Panel(f"Search: {query_text}", style="bold blue"))
 
     try:
+        from aion.ingestion.client import weaviate_client
         from aion.ingestion.embeddings import embed_text
 
         with weaviate_client() as client:
@@ -549,6 +577,10 @@ def agents():
 @app.command()
 def interactive():
     """Start an interactive query session."""
+    from aion.agents.rag_agent import RAGAgent
+    from aion.ingestion.client import weaviate_client
+    from aion.ingestion.collections import CollectionManager
+
     console.print(Panel(
         "AInstein Interactive Mode\n"
         "Type 'quit' or 'exit' to end the session.\n"
@@ -611,6 +643,9 @@ def interactive():
 @app.command()
 def rag():
     """Start RAG agent interactive session (Pydantic AI-based)."""
+    from aion.agents.rag_agent import RAGAgent
+    from aion.ingestion.client import weaviate_client
+
     console.print(Panel(
         "AInstein RAG Agent Mode\n"
         "Using Pydantic AI agent with RAG tools\n"
@@ -660,6 +695,9 @@ def vocabulary(
     query_text: str = typer.Argument(..., help="Vocabulary term to look up"),
 ):
     """Search SKOSMOS vocabulary (bypasses Persona and RAG Agent)."""
+    from aion.agents.vocabulary_agent import VocabularyAgent
+    from aion.ingestion.client import weaviate_client
+
     try:
         with weaviate_client() as client:
             agent = VocabularyAgent(client)
@@ -677,11 +715,42 @@ def vocabulary(
         raise typer.Exit(1)
 
 
+@app.command(name="sync-vocabularies")
+def vocabulary_sync(
+    output: Path | None = typer.Option(
+        None, "--output", "-o",
+        help="Index file path (default: SKOSMOS_INDEX_PATH)",
+    ),
+):
+    """Snapshot all SKOSMOS vocabularies into the offline label index."""
+    import requests
+
+    from aion.tools.skosmos_index import index_path, sync_vocabularies
+
+    target = output or index_path()
+    try:
+        with console.status(f"Syncing vocabularies from {settings.skosmos_url}...", spinner="dots"):
+            index = sync_vocabularies(target)
+    except requests.RequestException as e:
+        console.print(f"[red]SKOSMOS sync failed: {e}[/red]")
+        raise typer.Exit(1)
+
+    table = Table(title=f"SKOS Index ({len(index)} concepts)")
+    table.add_column("Vocabulary", style="cyan")
+    table.add_column("Concepts", style="green", justify="right")
+    for vocab in index.vocabularies:
+        table.add_row(vocab["id"], str(vocab["concept_count"]))
+    console.print(table)
+    console.print(f"[green]Index written to {target}[/green]")
+
+
 @app.command()
 def archimate(
     query_text: str = typer.Argument(..., help="ArchiMate query (validate, inspect, merge)"),
 ):
     """Query the ArchiMate agent (bypasses Persona and RAG Agent)."""
+    from aion.agents.archimate_agent import ArchiMateAgent
+
     try:
         agent = ArchiMateAgent()
         with console.status("Processing ArchiMate model...", spinner="dots"):
@@ -788,20 +857,43 @@ def evaluate(
         f"http://127.0.0.1:{settings.server_port}", "--url", "-u",
         help="Base URL of the chat API server"
     ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-j",
+        help="Number of test cases to run concurrently"
+    ),
+    record: Path | None = typer.Option(
+        None, "--record",
+        help="Record server responses to a cassette file"
+    ),
+    replay: Path | None = typer.Option(
+        None, "--replay",
+        help="Replay a recorded cassette (no server needed)"
+    ),
 ):
     """Run evaluation comparing Ollama vs OpenAI RAG performance.
 
-    IMPORTANT: The chat server must be running before running evaluation.
-    Start it with: python -m aion.cli chat
+    IMPORTANT: The chat server must be running before running evaluation
+    (unless replaying a cassette). Start it with: python -m aion.cli chat
 
     Example usage:
         python -m aion.cli evaluate
         python -m aion.cli evaluate --categories vocabulary,adr
         python -m aion.cli evaluate --output results.json
+        python -m aion.cli evaluate -j 4 --record eval.cassette.json
+        python -m aion.cli evaluate --replay eval.cassette.json
     """
     import asyncio
 
     from aion.evaluation import RAGEvaluator
+    from aion.evaluation.cassette import Cassette
+
+    if record and replay:
+        console.print("[red]Error: --record and --replay are mutually exclusive[/red]")
+        raise typer.Exit(1)
+    cassette = Cassette(
+        record or replay,
+        mode="record" if record else "replay" if replay else "off",
+    )
 
     console.print(Panel(
         "[bold]RAG Evaluation: Ollama vs OpenAI[/bold]\n\n"
@@ -817,23 +909,27 @@ def evaluate(
         console.print(f"[dim]Filtering by categories: {category_list}[/dim]")
 
     # Check if server is running
-    import httpx
-    try:
-        response = httpx.get(f"{base_url}/health", timeout=settings.timeout_health_check)
-        if response.status_code != 200:
-            raise Exception("Server not healthy")
-    except Exception:
-        console.print("[red]Error: Chat server is not running![/red]")
-        console.print("[yellow]Start it with: python -m aion.cli chat[/yellow]")
-        raise typer.Exit(1)
+    if cassette.offline:
+        console.print(f"[green]Replaying cassette {cassette.path}[/green]\n")
+    else:
+        import httpx
+        try:
+            response = httpx.get(f"{base_url}/health", timeout=settings.timeout_health_check)
+            if response.status_code != 200:
+                raise Exception("Server not healthy")
+        except Exception:
+            console.print("[red]Error: Chat server is not running![/red]")
+            console.print("[yellow]Start it with: python -m aion.cli chat[/yellow]")
+            raise typer.Exit(1)
 
-    console.print(f"[green]Connected to server at {base_url}[/green]\n")
+        console.print(f"[green]Connected to server at {base_url}[/green]\n")
 
     # Run evaluation
     evaluator = RAGEvaluator(base_url=base_url)
 
     async def run_evaluation():
-        return await evaluator.run_all(categories=category_list)
+        with cassette:
+            return await evaluator.run_all(categories=category_list, concurrency=concurrency)
 
     console.print("[dim]Running evaluation (this may take several minutes)...[/dim]")
 
@@ -899,6 +995,14 @@ def evaluate(
         f"{ollama['avg_total_latency_ms']}ms",
         f"{openai['avg_total_latency_ms']}ms"
     )
+    for stage in ("retrieval", "generation", "total"):
+        ollama_pct = ollama["latency_percentiles"][stage]
+        openai_pct = openai["latency_percentiles"][stage]
+        table.add_row(
+            f"{stage.capitalize()} p50/p95/p99",
+            f"{ollama_pct['p50']}/{ollama_pct['p95']}/{ollama_pct['p99']}ms",
+            f"{openai_pct['p50']}/{openai_pct['p95']}/{openai_pct['p99']}ms"
+        )
 
     if ollama.get("context_truncations", 0) > 0:
         table.add_row(
@@ -945,6 +1049,11 @@ def evaluate(
 
 def main():
     """Main entry point."""
+    if "--profile-startup" in sys.argv[1:]:
+        argv = [a for a in sys.argv[1:] if a != "--profile-startup"]
+        from aion._startup_profile import profile_startup
+
+        raise SystemExit(profile_startup(argv or ["--help"], console))
     app()
 
 
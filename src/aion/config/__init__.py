@@ -76,12 +76,35 @@ class Settings(BaseSettings):
     wcd_url: str | None = Field(default=None)
     wcd_api_key: str | None = Field(default=None)
 
+    # Retrieval backend: "weaviate" (server) or "embedded" (in-process
+    # vector + BM25 index under embedded_index_path, no server needed)
+    retrieval_backend: str = Field(default="weaviate")
+    embedded_index_path: Path = Field(default=Path("./data/embedded_index"))
+
     # SKOSMOS Configuration
     skosmos_url: str = Field(default="http://localhost:8080")
+    # Offline vocabulary snapshot written by `aion sync-vocabularies`.
+    # Missing file = every vocabulary lookup goes to the live API.
+    skosmos_index_path: Path = Field(default=Path.home() / ".ainstein" / "skosmos-index.json.gz")
 
     # Pixel Agents (VSCode extension visualization)
     pixel_agents_dir: str | None = Field(default=None)
 
+    # Request tracing: write a Chrome trace (<request_id>.trace.json) per
+    # /api/chat/stream request into this directory. None = no export; the
+    # span summary is still returned in the complete event's timing.
+    trace_export_dir: str | None = Field(default=None)
+
+    # Shared cache tier (aion.cache): SQLite-WAL file shared by every
+    # uvicorn worker on the host, e.g. ./data/shared_cache.db. None = each
+    # worker keeps a process-local cache and reloads stay local.
+    shared_cache_path: str | None = Field(default=None)
+    # How often a worker checks for invalidations broadcast by the others.
+    shared_cache_poll_seconds: float = Field(default=1.0)
+    # Row cap for the shared store; the oldest writes are pruned past it.
+    # None = expired entries are still pruned, but size is unbounded.
+    shared_cache_max_entries: int | None = Field(default=20000)
+
     # LLM Provider Configuration
     llm_provider: PROVIDER_TYPE = Field(default="openai")
 
@@ -247,12 +270,17 @@ class Settings(BaseSettings):
                 openai_max_retries.
 
         Returns:
-            OpenAIChatModel configured for the component's provider.
+            OpenAIChatModel configured for the component's provider, wrapped
+            so each request is recorded as an ``llm`` span (see aion.tracing)
+            and admitted by the LLM scheduler (see aion.llm_scheduler).
         """
         from openai import AsyncOpenAI
         from pydantic_ai.models.openai import OpenAIChatModel
         from pydantic_ai.providers.openai import OpenAIProvider
 
+        from aion.llm_scheduler import Priority, scheduled_model
+        from aion.tracing import traced_model
+
         if component == "persona":
             provider = self.effective_persona_provider
             model_name = self.effective_persona_model
@@ -270,7 +298,7 @@ class Settings(BaseSettings):
                 max_retries=_retries,
                 timeout=httpx.Timeout(_timeout, connect=10.0),
             )
-            return OpenAIChatModel(
+            model = OpenAIChatModel(
                 model_name,
                 provider=OpenAIProvider(openai_client=client),
             )
@@ -283,7 +311,7 @@ class Settings(BaseSettings):
                 max_retries=_retries,
                 timeout=kwargs["timeout"],
             )
-            return OpenAIChatModel(
+            model = OpenAIChatModel(
                 bare_model,
                 provider=OpenAIProvider(openai_client=client),
             )
@@ -294,10 +322,12 @@ class Settings(BaseSettings):
                 max_retries=_retries,
                 timeout=kwargs["timeout"],
             )
-            return OpenAIChatModel(
+            model = OpenAIChatModel(
                 model_name,
                 provider=OpenAIProvider(openai_client=client),
             )
+        priority = Priority.CLASSIFICATION if component == "persona" else Priority.INTERACTIVE
+        return scheduled_model(traced_model(model, component), provider, priority)
 
     # Project root — found by walking up to the pyproject.toml marker.
     # Do NOT count .parent calls: this module's nesting depth has changed
@@ -356,6 +386,10 @@ class Settings(BaseSettings):
     embedding_max_retries: int = Field(default=3)
     embedding_retry_delay: float = Field(default=5.0)
 
+    # Ingestion: worker processes for parsing/chunking source files
+    # (1 = serial, the default; 0 = one per CPU)
+    ingestion_workers: int = Field(default=1)
+
     # Memory summarizer
     summarize_trigger_count: int = Field(default=4)
 
@@ -13,7 +13,8 @@ import logging
 from pathlib import Path
 from typing import Any
 
-import yaml
+from aion.cache import invalidate, on_invalidate
+from aion.yaml_utils import YAMLError, load_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -51,8 +52,8 @@ def _load_runtime() -> dict[str, Any]:
         return _cache
 
     try:
-        _cache = yaml.safe_load(text) or {}
-    except yaml.YAMLError as e:
+        _cache = load_yaml(text) or {}
+    except YAMLError as e:
         raise RuntimeError(f"Malformed runtime.yaml at {_RUNTIME_YAML_PATH}: {e}") from e
     return _cache
 
@@ -81,3 +82,18 @@ def clear_cache() -> None:
     """Reset the cached runtime config. Used in tests."""
     global _cache
     _cache = None
+
+
+def reload_runtime_config() -> dict[str, Any]:
+    """Re-read runtime.yaml here and in every other worker on the host.
+
+    Other workers drop their copy when they next sync invalidations
+    (see aion.cache).
+    """
+    clear_cache()
+    config = _load_runtime()
+    invalidate("runtime_config")
+    return config
+
+
+on_invalidate("runtime_config", clear_cache)
@@ -0,0 +1,341 @@
+"""Record/replay of external calls for offline, deterministic evaluation runs.
+
+A ``Cassette`` intercepts the three kinds of I/O an evaluation run makes:
+
+- HTTP through httpx — LLM chat completions (OpenAI SDK / pydantic-ai),
+  Ollama and OpenAI embeddings, and the chat server for ``RAGEvaluator``.
+  Hooked at ``httpx.HTTPTransport`` / ``httpx.AsyncHTTPTransport``, so
+  every client that uses the default transport is covered.
+- Weaviate retrieval, recorded at the ``RAGToolkit`` tool-method level
+  (the gRPC client bypasses httpx). Results are plain lists of dicts.
+
+``mode="record"`` performs the real calls and writes every response to a
+JSON cassette on exit. ``mode="replay"`` serves responses from the
+cassette and never touches the network; a request with no recording
+raises ``CassetteMissError``. ``mode="off"`` passes calls through and
+only times them. Requests are keyed by method, path and a hash of the
+canonical body (host-independent, request headers never stored); repeated
+identical requests replay their recordings in order.
+
+In every mode, call durations are collected per stage (``llm``,
+``embedding``, ``retrieval``, ``http``) into ``StageTimings`` for the
+p50/p95/p99 latency report.
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("off", "record", "replay")
+
+# RAGToolkit methods that hit Weaviate (and the query embedding)
+TOOLKIT_METHODS = (
+    "search_architecture_decisions",
+    "search_principles",
+    "search_policies",
+    "list_adrs",
+    "list_principles",
+    "list_policies",
+    "list_dars",
+    "search_by_team",
+    "get_collection_stats",
+)
+
+# Response headers worth replaying; the body is stored decoded, so
+# content-encoding/length are dropped along with cookies and request ids.
+_KEPT_HEADERS = ("content-type",)
+
+
+class CassetteMissError(RuntimeError):
+    """A replayed call has no (remaining) recording in the cassette."""
+
+
+def percentiles(values: list[float], points: tuple[int, ...] = (50, 95, 99)) -> dict:
+    """Latency percentiles with linear interpolation between closest ranks.
+
+    Returns ``{"count": n, "p50": ..., "p95": ..., "p99": ...}`` rounded to
+    0.1 ms; percentiles are None when ``values`` is empty.
+    """
+    ordered = sorted(values)
+    result: dict = {"count": len(ordered)}
+    for p in points:
+        if not ordered:
+            result[f"p{p}"] = None
+            continue
+        rank = (len(ordered) - 1) * p / 100
+        lo = int(rank)
+        hi = min(lo + 1, len(ordered) - 1)
+        value = ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+        result[f"p{p}"] = round(value, 1)
+    return result
+
+
+class StageTimings:
+    """Thread-safe collector of per-stage durations (milliseconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, stage: str, ms: float) -> None:
+        with self._lock:
+            self._samples[stage].append(ms)
+
+    def summary(self) -> dict[str, dict]:
+        """``{stage: percentiles(...)}`` for every stage with samples, sorted by name."""
+        with self._lock:
+            return {stage: percentiles(v) for stage, v in sorted(self._samples.items())}
+
+
+def http_stage(url: str) -> str:
+    """Classify an HTTP call for the latency report."""
+    path = urlsplit(url).path
+    if "embed" in path:
+        return "embedding"
+    if path.endswith(("/chat/completions", "/completions", "/responses", "/api/chat", "/api/generate")):
+        return "llm"
+    return "http"
+
+
+def _canonical_body(content: bytes) -> bytes:
+    try:
+        return json.dumps(json.loads(content), sort_keys=True, separators=(",", ":")).encode()
+    except (ValueError, UnicodeDecodeError):
+        return content
+
+
+def _http_key(request: httpx.Request) -> str:
+    url = request.url
+    target = url.raw_path.decode("ascii", "replace")
+    digest = hashlib.sha256(_canonical_body(request.content)).hexdigest()[:16]
+    return f"{request.method} {target} {digest}"
+
+
+def _call_key(name: str, args: tuple, kwargs: dict) -> str:
+    payload = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return f"{name} {hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+
+
+def _encode_body(body: bytes) -> tuple[str, str]:
+    try:
+        return body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode("ascii"), "base64"
+
+
+def _decode_body(entry: dict) -> bytes:
+    if entry.get("encoding") == "base64":
+        return base64.b64decode(entry["body"])
+    return entry["body"].encode("utf-8")
+
+
+class Cassette:
+    """Context manager that records or replays external calls.
+
+    Args:
+        path: Cassette JSON file (read in replay mode, written in record mode).
+        mode: ``"off"``, ``"record"`` or ``"replay"``.
+        timings: Collector for per-stage durations; one is created if omitted.
+
+    Example:
+        with Cassette("eval.cassette.json", mode="replay") as cassette:
+            report = await run_tests(...)
+        cassette.timings.summary()
+    """
+
+    _active: "Cassette | None" = None
+
+    def __init__(self, path: str | Path | None = None, mode: str = "off",
+                 timings: StageTimings | None = None):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}' (expected one of {CASSETTE_MODES})")
+        if mode != "off" and path is None:
+            raise ValueError(f"Cassette mode '{mode}' needs a cassette path")
+        self.path = Path(path) if path else None
+        self.mode = mode
+        self.timings = timings or StageTimings()
+        self._lock = threading.Lock()
+        self._http: dict[str, list[dict]] = defaultdict(list)
+        self._calls: dict[str, list[dict]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        self._originals: list[tuple[object, str, object]] = []
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "replay"
+
+    # ── lifecycle ──
+
+    def __enter__(self) -> "Cassette":
+        if Cassette._active is not None:
+            raise RuntimeError("Another cassette is already active")
+        if self.mode == "replay":
+            self._load()
+        self._install()
+        Cassette._active = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._uninstall()
+        Cassette._active = None
+        if self.mode == "record":
+            self.save()
+
+    def _load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {data.get('version')} in {self.path}")
+        for entry in data.get("http", []):
+            self._http[entry["key"]].append(entry)
+        for entry in data.get("calls", []):
+            self._calls[entry["key"]].append(entry)
+        logger.info(
+            f"[cassette] Loaded {sum(map(len, self._http.values()))} HTTP and "
+            f"{sum(map(len, self._calls.values()))} retrieval recordings from {self.path}"
+        )
+
+    def save(self) -> None:
+        """Write all recordings (HTTP and retrieval) to the cassette file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "version": CASSETTE_VERSION,
+                "http": [e for entries in self._http.values() for e in entries],
+                "calls": [e for entries in self._calls.values() for e in entries],
+            }
+        self.path.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"[cassette] Saved {len(data['http'])} HTTP and {len(data['calls'])} retrieval recordings to {self.path}")
+
+    # ── patching ──
+
+    def _patch(self, owner, name: str, replacement) -> None:
+        self._originals.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def _install(self) -> None:
+        from aion.tools.rag_search import RAGToolkit
+
+        self._patch(httpx.HTTPTransport, "handle_request",
+                    self._wrap_sync_transport(httpx.HTTPTransport.handle_request))
+        self._patch(httpx.AsyncHTTPTransport, "handle_async_request",
+                    self._wrap_async_transport(httpx.AsyncHTTPTransport.handle_async_request))
+        for name in TOOLKIT_METHODS:
+            self._patch(RAGToolkit, name, self._wrap_tool(name, getattr(RAGToolkit, name)))
+
+    def _uninstall(self) -> None:
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            setattr(owner, name, original)
+
+    # ── recordings ──
+
+    def _next(self, store: dict[str, list[dict]], key: str, what: str) -> dict:
+        with self._lock:
+            index = self._cursor[key]
+            entries = store.get(key, [])
+            if index >= len(entries):
+                raise CassetteMissError(
+                    f"No recording for {what} ({key}, occurrence {index + 1}) in {self.path}. "
+                    f"Re-record the cassette."
+                )
+            self._cursor[key] += 1
+            return entries[index]
+
+    def _replay_http(self, request: httpx.Request) -> httpx.Response:
+        entry = self._next(self._http, _http_key(request), f"{request.method} {request.url}")
+        return httpx.Response(entry["status"], headers=entry["headers"], content=_decode_body(entry))
+
+    def _record_http(self, request: httpx.Request, response: httpx.Response, body: bytes) -> httpx.Response:
+        headers = {k: v for k, v in response.headers.items() if k.lower() in _KEPT_HEADERS}
+        if self.mode == "record":
+            text, encoding = _encode_body(body)
+            key = _http_key(request)
+            with self._lock:
+                self._http[key].append({
+                    "key": key,
+                    "method": request.method,
+                    "url": str(request.url.copy_with(query=None)),
+                    "status": response.status_code,
+                    "headers": headers,
+                    "body": text,
+                    "encoding": encoding,
+                })
+        return httpx.Response(response.status_code, headers=headers, content=body,
+                              extensions=response.extensions)
+
+    def _wrap_sync_transport(self, original):
+        cassette = self
+
+        @functools.wraps(original)
+        def handle_request(transport, request: httpx.Request) -> httpx.Response:
+            t0 = time.perf_counter()
+            try:
+                if cassette.offline:
+                    return cassette._replay_http(request)
+                response = original(transport, request)
+                try:
+                    body = response.read()
+                finally:
+                    response.close()
+                return cassette._record_http(request, response, body)
+            finally:
+                cassette.timings.record(http_stage(str(request.url)), (time.perf_counter() - t0) * 1000)
+
+        return handle_request
+
+    def _wrap_async_transport(self, original):
+        cassette = self
+
+        @functools.wraps(original)
+        async def handle_async_request(transport, request: httpx.Request) -> httpx.Response:
+            t0 = time.perf_counter()
+            try:
+                if cassette.offline:
+                    return cassette._replay_http(request)
+                response = await original(transport, request)
+                try:
+                    body = await response.aread()
+                finally:
+                    await response.aclose()
+                return cassette._record_http(request, response, body)
+            finally:
+                cassette.timings.record(http_stage(str(request.url)), (time.perf_counter() - t0) * 1000)
+
+        return handle_async_request
+
+    def _wrap_tool(self, name: str, original):
+        cassette = self
+
+        @functools.wraps(original)
+        def tool(toolkit, *args, **kwargs):
+            key = _call_key(name, args, kwargs)
+            t0 = time.perf_counter()
+            try:
+                if cassette.offline:
+                    # JSON round-trip: callers may mutate what they get back
+                    return json.loads(json.dumps(cassette._next(cassette._calls, key, name)["result"]))
+                result = original(toolkit, *args, **kwargs)
+                if cassette.mode == "record":
+                    with cassette._lock:
+                        cassette._calls[key].append({
+                            "key": key,
+                            "name": name,
+                            "result": json.loads(json.dumps(result, default=str)),
+                        })
+                return result
+            finally:
+                cassette.timings.record("retrieval", (time.perf_counter() - t0) * 1000)
+
+        return tool
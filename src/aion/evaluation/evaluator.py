@@ -16,6 +16,7 @@ from pathlib import Path
 import httpx
 
 from aion.config import settings
+from aion.evaluation.cassette import percentiles
 from aion.text_utils import elapsed_ms
 
 logger = logging.getLogger(__name__)
@@ -283,27 +284,34 @@ class RAGEvaluator:
             openai=openai_result,
         )
 
-    async def run_all(self, categories: list[str] | None = None) -> list[EvaluationResult]:
+    async def run_all(
+        self,
+        categories: list[str] | None = None,
+        concurrency: int = 1,
+    ) -> list[EvaluationResult]:
         """Run all test cases (optionally filtered by category).
 
         Args:
             categories: Optional list of categories to filter by
+            concurrency: Maximum number of test cases in flight at once.
+                Results keep the test-case order regardless.
 
         Returns:
             List of EvaluationResult objects
         """
-        self.results = []
-
         test_cases = self.test_cases
         if categories:
             test_cases = [tc for tc in test_cases if tc.get("category") in categories]
 
-        logger.info(f"Running {len(test_cases)} test cases...")
+        logger.info(f"Running {len(test_cases)} test cases (concurrency={concurrency})...")
 
-        for test_case in test_cases:
-            result = await self.run_test_case(test_case)
-            self.results.append(result)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
 
+        async def bounded(test_case: dict) -> EvaluationResult:
+            async with semaphore:
+                return await self.run_test_case(test_case)
+
+        self.results = list(await asyncio.gather(*(bounded(tc) for tc in test_cases)))
         return self.results
 
     def get_summary(self) -> dict:
@@ -384,12 +392,27 @@ class RAGEvaluator:
             openai_metrics["avg_generation_latency_ms"] //= n
             openai_metrics["avg_total_latency_ms"] //= n
 
+        ollama_metrics["latency_percentiles"] = self._latency_percentiles("ollama")
+        openai_metrics["latency_percentiles"] = self._latency_percentiles("openai")
+
         return {
             "total_test_cases": len(self.results),
             "ollama": ollama_metrics,
             "openai": openai_metrics,
         }
 
+    def _latency_percentiles(self, provider: str) -> dict:
+        """p50/p95/p99 per stage over the provider's successful results."""
+        runs = [
+            r for r in (getattr(result, provider) for result in self.results)
+            if r is not None and not r.error
+        ]
+        return {
+            "retrieval": percentiles([r.retrieval_latency_ms for r in runs]),
+            "generation": percentiles([r.generation_latency_ms for r in runs]),
+            "total": percentiles([r.total_latency_ms for r in runs]),
+        }
+
     def export_results(self, output_path: Path) -> None:
         """Export detailed results to JSON file.
 
@@ -11,6 +11,9 @@ Usage:
     python -m aion.evaluation.test_runner --provider ollama
     python -m aion.evaluation.test_runner --provider openai
     python -m aion.evaluation.test_runner --quick  # Run only 10 questions
+    python -m aion.evaluation.test_runner -j 4     # 4 questions in flight
+    python -m aion.evaluation.test_runner --record eval.cassette.json
+    python -m aion.evaluation.test_runner --replay eval.cassette.json  # offline
 """
 
 import argparse
@@ -26,6 +29,7 @@ from datetime import datetime
 from pathlib import Path
 
 from aion.config import settings
+from aion.evaluation.cassette import Cassette, StageTimings
 from aion.text_utils import elapsed_ms
 
 # Suppress verbose logging during tests
@@ -34,35 +38,69 @@ logging.getLogger("weaviate").setLevel(logging.WARNING)
 logging.getLogger("aion.agents").setLevel(logging.WARNING)
 
 
-@contextmanager
-def suppress_output():
-    """Suppress stdout/stderr and Rich console output for verbose RAG output."""
+# Shared by overlapping suppress_output() blocks (concurrent questions):
+# the entry that takes the count from 0 to 1 redirects, the exit that
+# brings it back to 0 restores — whichever block that happens to be.
+_suppress_depth = 0
+_saved_stdout_fd: int | None = None
+_saved_stderr_fd: int | None = None
+_saved_streams: tuple | None = None
 
-    # Save original file descriptors
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-    old_stdout_fd = os.dup(1)
-    old_stderr_fd = os.dup(2)
 
-    # Open devnull
+def _start_suppressing() -> None:
+    global _saved_stdout_fd, _saved_stderr_fd, _saved_streams
+    sys.stdout.flush()
+    _saved_streams = (sys.stdout, sys.stderr)
+    _saved_stdout_fd = os.dup(1)
+    _saved_stderr_fd = os.dup(2)
+    # Redirect at both Python and OS level
     devnull = os.open(os.devnull, os.O_WRONLY)
-
     try:
-        # Redirect at both Python and OS level
-        sys.stdout = io.StringIO()
-        sys.stderr = io.StringIO()
         os.dup2(devnull, 1)
         os.dup2(devnull, 2)
-        yield
     finally:
-        # Restore everything
-        os.dup2(old_stdout_fd, 1)
-        os.dup2(old_stderr_fd, 2)
-        os.close(old_stdout_fd)
-        os.close(old_stderr_fd)
         os.close(devnull)
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
+    sys.stdout = io.StringIO()
+    sys.stderr = io.StringIO()
+
+
+def _stop_suppressing() -> None:
+    global _saved_stdout_fd, _saved_stderr_fd, _saved_streams
+    os.dup2(_saved_stdout_fd, 1)
+    os.dup2(_saved_stderr_fd, 2)
+    os.close(_saved_stdout_fd)
+    os.close(_saved_stderr_fd)
+    sys.stdout, sys.stderr = _saved_streams
+    _saved_stdout_fd = _saved_stderr_fd = _saved_streams = None
+
+
+@contextmanager
+def suppress_output():
+    """Suppress stdout/stderr and Rich console output for verbose RAG output.
+
+    Reentrant: concurrent queries may open overlapping blocks, entered and
+    exited in any order. Use ``progress()`` to print while any block is
+    active.
+    """
+    global _suppress_depth
+
+    if _suppress_depth == 0:
+        _start_suppressing()
+    _suppress_depth += 1
+    try:
+        yield
+    finally:
+        _suppress_depth -= 1
+        if _suppress_depth == 0:
+            _stop_suppressing()
+
+
+def progress(line: str) -> None:
+    """Print a progress line, even while another query suppresses output."""
+    if _saved_stdout_fd is not None:
+        os.write(_saved_stdout_fd, (line + "\n").encode())
+    else:
+        print(line, flush=True)
 
 
 # Global RAG system instance
@@ -403,12 +441,14 @@ def check_no_answer(response: str) -> bool:
     return any(phrase in response_lower for phrase in no_answer_phrases)
 
 
-async def init_rag_system(provider: str = "ollama", model: str = None) -> bool:
+async def init_rag_system(provider: str = "ollama", model: str = None, offline: bool = False) -> bool:
     """Initialize the RAG system directly (no chat server needed).
 
     Args:
         provider: 'ollama' or 'openai'
         model: Specific model to use, or None for default
+        offline: Cassette replay — no Weaviate connection; retrieval and
+            LLM calls are served from the cassette.
 
     Returns:
         True if initialization successful
@@ -436,12 +476,19 @@ async def init_rag_system(provider: str = "ollama", model: str = None) -> bool:
         settings.openai_chat_model = model
 
     try:
-        # Initialize Weaviate client
-        if not _weaviate_client:
-            _weaviate_client = get_weaviate_client()
+        if offline:
+            # The OpenAI client refuses to start without a key, even though
+            # every request is replayed
+            if provider == "openai" and not settings.openai_api_key:
+                settings.openai_api_key = "replay"
+            _rag_system = RAGAgent(None)
+        else:
+            # Initialize Weaviate client
+            if not _weaviate_client:
+                _weaviate_client = get_weaviate_client()
 
-        # Initialize RAG system
-        _rag_system = RAGAgent(_weaviate_client)
+            # Initialize RAG system
+            _rag_system = RAGAgent(_weaviate_client)
 
         print(f"✓ RAG system initialized: {provider} ({model})")
         return True
@@ -496,10 +543,10 @@ async def query_rag(question: str, debug: bool = False, verbose: bool = False) -
             sources.append(source)
 
         if debug:
-            print(f"\n    [DEBUG] Response length: {len(response)}")
-            print(f"    [DEBUG] Sources: {len(sources)}")
+            progress(f"    [DEBUG] Response length: {len(response)}")
+            progress(f"    [DEBUG] Sources: {len(sources)}")
             if not response:
-                print(f"    [DEBUG] Raw objects: {objects}")
+                progress(f"    [DEBUG] Raw objects: {objects}")
 
         return {
             "response": response,
@@ -512,7 +559,7 @@ async def query_rag(question: str, debug: bool = False, verbose: bool = False) -
         latency_ms = elapsed_ms(start_time)
         error_msg = str(e)
         if debug:
-            print(f"\n    [DEBUG] Error: {error_msg}")
+            progress(f"    [DEBUG] Error: {error_msg}")
         return {
             "response": "",
             "latency_ms": latency_ms,
@@ -521,13 +568,17 @@ async def query_rag(question: str, debug: bool = False, verbose: bool = False) -
 
 
 async def run_single_test(test: dict, debug: bool = False, verbose: bool = False) -> dict:
-    """Run a single test question and evaluate the result."""
-    print(f"  [{test['id']}] {test['question'][:50]}...", end=" ", flush=True)
+    """Run a single test question and evaluate the result.
+
+    The progress line is printed once the question completes, so lines
+    from concurrent questions never interleave.
+    """
+    prefix = f"  [{test['id']}] {test['question'][:50]}..."
 
     result = await query_rag(test["question"], debug=debug, verbose=verbose)
 
     if result["error"]:
-        print(f"❌ ERROR: {result['error']}")
+        progress(f"{prefix} ❌ ERROR: {result['error']}")
         return {
             **test,
             "response": "",
@@ -573,11 +624,11 @@ async def run_single_test(test: dict, debug: bool = False, verbose: bool = False
     output = f"{score} ({result['latency_ms']}ms, keywords: {keyword_score:.0%})"
     if hallucination["is_hallucination"] and "🔮" not in score:
         output += " ⚠️HALLUC"
-    print(output)
+    progress(f"{prefix} {output}")
 
     if debug and hallucination["issues"]:
         for issue in hallucination["issues"]:
-            print(f"    [HALLUCINATION] {issue}")
+            progress(f"    [HALLUCINATION] {issue}")
 
     return {
         **test,
@@ -591,8 +642,16 @@ async def run_single_test(test: dict, debug: bool = False, verbose: bool = False
     }
 
 
-async def run_tests(provider: str = "ollama", model: str = None, quick: bool = False, debug: bool = False, verbose: bool = False, skip_health_check: bool = False) -> dict:
-    """Run all tests and generate report."""
+async def run_tests(provider: str = "ollama", model: str = None, quick: bool = False, debug: bool = False, verbose: bool = False, skip_health_check: bool = False,
+                    concurrency: int = 1, cassette_path: str | Path | None = None, cassette_mode: str = "off") -> dict:
+    """Run all tests and generate report.
+
+    Args:
+        concurrency: Questions in flight at once. Results keep question order.
+        cassette_path: Cassette file for ``cassette_mode`` "record"/"replay".
+        cassette_mode: "off", "record" (capture LLM, embedding and retrieval
+            responses) or "replay" (run offline from the cassette).
+    """
 
     questions = TEST_QUESTIONS
     if quick:
@@ -602,8 +661,12 @@ async def run_tests(provider: str = "ollama", model: str = None, quick: bool = F
     print(f"RAG Quality Test - {provider.upper()} Provider")
     print(f"{'='*60}")
 
-    # Health check before running tests
-    if not skip_health_check:
+    cassette = Cassette(cassette_path, mode=cassette_mode)
+    if cassette.mode != "off":
+        print(f"Cassette: {cassette.mode} ({cassette.path})")
+
+    # Health check before running tests (nothing to check when replaying)
+    if not skip_health_check and not cassette.offline:
         health = await check_service_health(verbose=True)
 
         # Critical: Weaviate must be running
@@ -634,41 +697,21 @@ async def run_tests(provider: str = "ollama", model: str = None, quick: bool = F
 
     print()
 
-    # Initialize RAG system directly (no chat server needed)
-    if not await init_rag_system(provider, model):
-        print("FATAL: Could not initialize RAG system.")
-        return {"error": "rag_init_failed", "results": []}
-    print()
-
-    print(f"Running {len(questions)} questions...")
-    if debug:
-        print("[DEBUG MODE ENABLED]")
-    print()
+    with cassette:
+        # Initialize RAG system directly (no chat server needed)
+        if not await init_rag_system(provider, model, offline=cassette.offline):
+            print("FATAL: Could not initialize RAG system.")
+            return {"error": "rag_init_failed", "results": []}
+        print()
 
-    results = []
-    consecutive_timeouts = 0
-    timeout_warned = False
-
-    for test in questions:
-        result = await run_single_test(test, debug=debug, verbose=verbose)
-        results.append(result)
+        print(f"Running {len(questions)} questions (concurrency: {max(1, concurrency)})...")
+        if debug:
+            print("[DEBUG MODE ENABLED]")
+        print()
 
-        # Track consecutive timeouts
-        if result.get("error") and "timeout" in result["error"].lower():
-            consecutive_timeouts += 1
-            if consecutive_timeouts >= 3 and not timeout_warned:
-                timeout_warned = True
-                print("\n" + "="*60)
-                print("⚠️  MULTIPLE TIMEOUTS DETECTED!")
-                print("="*60)
-                print("The current model may be too slow. Consider:")
-                print("  1. Using a faster model: --model llama3.2:1b")
-                print("  2. Using a smaller model: --model qwen3.5:9b")
-                print("  3. Switching to OpenAI: --openai")
-                print("  4. Increasing server timeout in agents/rag.py")
-                print("="*60 + "\n")
-        else:
-            consecutive_timeouts = 0  # Reset on successful query
+        results = await _run_questions(
+            questions, concurrency, cassette.timings, debug=debug, verbose=verbose,
+        )
 
     # Calculate summary statistics
     total = len(results)
@@ -723,6 +766,7 @@ async def run_tests(provider: str = "ollama", model: str = None, quick: bool = F
         },
         "by_category": {cat: f"{v['correct']}/{v['total']}" for cat, v in categories.items()},
         "by_difficulty": {diff: f"{v['correct']}/{v['total']}" for diff, v in difficulties.items()},
+        "latency": cassette.timings.summary(),
         "results": results,
     }
 
@@ -748,10 +792,49 @@ async def run_tests(provider: str = "ollama", model: str = None, quick: bool = F
     print("By Difficulty:")
     for diff, score in report["by_difficulty"].items():
         print(f"  {diff}: {score}")
+    print()
+    print("Latency (ms):")
+    for stage, pct in report["latency"].items():
+        print(f"  {stage:<10} n={pct['count']:<4} p50={pct['p50']}  p95={pct['p95']}  p99={pct['p99']}")
 
     return report
 
 
+async def _run_questions(questions: list[dict], concurrency: int, timings: StageTimings,
+                         debug: bool = False, verbose: bool = False) -> list[dict]:
+    """Run questions with at most ``concurrency`` in flight, in question order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    consecutive_timeouts = 0
+    timeout_warned = False
+
+    async def bounded(test: dict) -> dict:
+        nonlocal consecutive_timeouts, timeout_warned
+        async with semaphore:
+            result = await run_single_test(test, debug=debug, verbose=verbose)
+        timings.record("total", result["latency_ms"])
+
+        # Track consecutive timeouts (in completion order)
+        if result.get("error") and "timeout" in result["error"].lower():
+            consecutive_timeouts += 1
+            if consecutive_timeouts >= 3 and not timeout_warned:
+                timeout_warned = True
+                progress("\n" + "="*60)
+                progress("⚠️  MULTIPLE TIMEOUTS DETECTED!")
+                progress("="*60)
+                progress("The current model may be too slow. Consider:")
+                progress("  1. Using a faster model: --model llama3.2:1b")
+                progress("  2. Using a smaller model: --model qwen3.5:9b")
+                progress("  3. Switching to OpenAI: --openai")
+                progress("  4. Increasing server timeout in agents/rag.py")
+                progress("  5. Lowering concurrency: --concurrency 1")
+                progress("="*60 + "\n")
+        else:
+            consecutive_timeouts = 0  # Reset on successful query
+        return result
+
+    return list(await asyncio.gather(*(bounded(test) for test in questions)))
+
+
 def save_report(report: dict, output_dir: str = "test_results"):
     """Save test report to JSON file."""
     output_path = Path(output_dir)
@@ -787,6 +870,13 @@ def main():
                        help="Skip service health check before tests")
     parser.add_argument("--check-only", action="store_true",
                        help="Only run health check, don't run tests")
+    parser.add_argument("--concurrency", "-j", type=int, default=1,
+                       help="Number of questions to run concurrently (default: 1)")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE", default=None,
+                       help="Record LLM, embedding and retrieval responses to a cassette file")
+    cassette_group.add_argument("--replay", metavar="CASSETTE", default=None,
+                       help="Replay a recorded cassette (offline, deterministic)")
 
     args = parser.parse_args()
 
@@ -808,6 +898,14 @@ def main():
     print(f"Mode: {'Quick (10 questions)' if args.quick else 'Full (25 questions)'}")
     if args.debug:
         print("Debug: ENABLED")
+    if args.concurrency > 1:
+        print(f"Concurrency: {args.concurrency}")
+
+    cassette_mode, cassette_path = "off", None
+    if args.record:
+        cassette_mode, cassette_path = "record", args.record
+    elif args.replay:
+        cassette_mode, cassette_path = "replay", args.replay
 
     # Run tests
     report = asyncio.run(run_tests(
@@ -816,7 +914,10 @@ def main():
         quick=args.quick,
         debug=args.debug,
         verbose=args.verbose,
-        skip_health_check=args.skip_health_check
+        skip_health_check=args.skip_health_check,
+        concurrency=args.concurrency,
+        cassette_path=cassette_path,
+        cassette_mode=cassette_mode,
     ))
 
     # Save report (skip if initialization failed)
@@ -22,13 +22,15 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import asdict, dataclass
-from typing import Literal
+from dataclasses import dataclass, fields
+from typing import Literal, get_args
+
+from aion.tracing import current_trace
 
 logger = logging.getLogger(__name__)
 
 
-# ── The 11-variant event-type union ─────────────────────────────────────────
+# ── The 12-variant event-type union ─────────────────────────────────────────
 #
 # Audited against (post-Phase-0 tree):
 #   - chat_ui.py:2520 ``thinking_types`` set
@@ -44,6 +46,11 @@ logger = logging.getLogger(__name__)
 # ``thinking_aloud`` has a consumer branch in ``_capture_event`` but no
 # current emitter — keep in the union for compatibility; flag for a later
 # cleanup phase if no emitter is added.
+#
+# ``replace`` swaps the answer streamed so far via ``text`` events for
+# ``content`` (empty = retract). Emitted when streamed narration turns out
+# to precede tool calls, and by the quality gate when it reshapes an
+# already-streamed answer.
 EventType = Literal[
     "status",
     "decision",
@@ -56,6 +63,7 @@ EventType = Literal[
     "thinking_aloud",
     "persona_intent",
     "artifact",
+    "replace",
 ]
 
 
@@ -166,9 +174,36 @@ class Event:
         are omitted from the payload (keeps the wire-format compact and
         matches the pre-1a behaviour of dict-emission, which only ever
         carried fields the emitter explicitly set).
+
+        ``complete`` events carry the request's span summary in
+        ``timing["trace"]`` when a trace is active (see ``aion.tracing``);
+        the event itself is not modified, so persisted timing stays lean.
+
+        The payload is assembled from the pre-encoded fragments below
+        rather than ``json.dumps`` of a dict: streams are dominated by
+        small ``text`` / ``status`` events whose keys never change. The
+        output is byte-identical to ``json.dumps(payload)``.
         """
-        payload = {k: v for k, v in asdict(self).items() if v is not None}
-        return f"data: {json.dumps(payload)}\n\n"
+        timing = self.timing
+        trace_timing = False
+        if self.type == "complete":
+            trace = current_trace()
+            if trace is not None:
+                trace_timing = self.timing is None
+                timing = {**(self.timing or {}), "trace": trace.summary()}
+
+        parts = [sse_prefix(self.type)]
+        for name in _PAYLOAD_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                if name == "timing":
+                    value = timing
+                parts.append(_SSE_KEY_FRAGMENTS[name] + json.dumps(value))
+        if trace_timing:
+            # A dict payload gained "timing" last when the event had none.
+            parts.append(_SSE_KEY_FRAGMENTS["timing"] + json.dumps(timing))
+        parts.append("}\n\n")
+        return "".join(parts)
 
     @classmethod
     def from_legacy_dict(cls, d: dict) -> Event:
@@ -205,6 +240,26 @@ class Event:
         return cls(**{k: v for k, v in d.items() if k in known})
 
 
+# ── Pre-encoded SSE fragments ───────────────────────────────────────────────
+#
+# ``'data: {"type": "text"'`` per event type and ``', "content": '`` per
+# field, matching ``json.dumps``' default separators. Built once at import.
+_PAYLOAD_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(Event) if f.name != "type")
+_SSE_KEY_FRAGMENTS: dict[str, str] = {name: f", {json.dumps(name)}: " for name in _PAYLOAD_FIELDS}
+_SSE_TYPE_PREFIX: dict[str, str] = {
+    t: f'data: {{"type": {json.dumps(t)}' for t in get_args(EventType)
+}
+
+
+def sse_prefix(event_type: str) -> str:
+    """Leading bytes of every ``to_sse`` frame for ``event_type``.
+
+    Lets the SSE writer (``aion.sse``) classify already-serialised frames
+    without parsing them.
+    """
+    return _SSE_TYPE_PREFIX.get(event_type) or f'data: {{"type": {json.dumps(event_type)}'
+
+
 # ── Tee-to-logs severity mapping ────────────────────────────────────────────
 #
 # ``SessionContext.emit_event`` tees every event to structlog at the level
@@ -217,6 +272,7 @@ _TYPE_TO_LEVEL: dict[str, int] = {
     "complete": logging.DEBUG,
     "error": logging.ERROR,
     "text": logging.DEBUG,
+    "replace": logging.INFO,
     "init": logging.DEBUG,
     "heartbeat": logging.DEBUG,
     "assistant": logging.DEBUG,
@@ -21,7 +21,9 @@ from weaviate import WeaviateClient
 from weaviate.classes.query import Filter, MetadataQuery
 
 from aion.config import is_reasoning_model, settings
+from aion.ingestion import doc_index
 from aion.ingestion.embeddings import embed_text
+from aion.llm_scheduler import Priority, llm_scheduler
 from aion.registry.element_registry import (
     format_registry_context,
     query_registry_for_prompt,
@@ -40,13 +42,20 @@ from aion.tools.archimate import (
 )
 from aion.tools.reconciliation import (
     build_source_metadata,
-    enrich_yaml_with_dct,
+    enrich_model_with_dct,
     normalize_ref,
 )
-from aion.tools.yaml_to_xml import yaml_to_archimate_xml
+from aion.tools.yaml_model import YamlModel, parse_model
+from aion.tools.yaml_stream import IncrementalModelParser, YamlStreamError
+from aion.tools.yaml_to_xml import serialize_model, yaml_to_archimate_xml
+from aion.tracing import annotate, span
+from aion.yaml_utils import dump_yaml, load_yaml
 
 logger = logging.getLogger(__name__)
 
+# Chunk UUIDs per fetch-by-id query in _fetch_documents
+_FETCH_BY_ID_BATCH = 1000
+
 # Extension + fallback-prefix mapping for artifact filenames, keyed by content_type.
 # Archimate (.archimate.xml) is handled separately — compound extension not derivable from MIME.
 _EXT_MAP = {
@@ -129,6 +138,7 @@ class GenerationPipeline:
             source_text = ""
 
         yaml_refinement = False
+        previous_xml = None
         if is_refinement and conversation_id:
             self._emit(event_queue, "status", "Loading previous artifact...", start)
 
@@ -139,6 +149,11 @@ class GenerationPipeline:
             if yaml_artifact:
                 source_text = yaml_artifact["content"]
                 yaml_refinement = True
+                # The XML it was rendered to: carried-over elements keep
+                # their view coordinates (incremental relayout)
+                xml_artifact = self._load_previous_artifact(conversation_id, skill_entry)
+                if xml_artifact and xml_artifact.get("content_type") == "archimate/xml":
+                    previous_xml = xml_artifact["content"]
                 logger.info(
                     f"[generation] refinement: loaded YAML companion "
                     f"'{yaml_artifact['filename']}' ({len(source_text)} chars)"
@@ -318,14 +333,50 @@ class GenerationPipeline:
         elif skill_entry.content_type == "text/html":
             max_tokens_override = 32768  # HTML explorers are large self-contained files
 
-        self._emit(event_queue, "status", "Generating...", start)
-        raw_output, llm_stats = await self._call_llm(
-            system_prompt, user_prompt, max_tokens_override=max_tokens_override,
-        )
-        total_tokens = {
-            "prompt_tokens": llm_stats["prompt_tokens"],
-            "completion_tokens": llm_stats["completion_tokens"],
+        pipeline_info = {
+            "pipeline": "xml",
+            "yaml_detected": False,
+            "yaml_valid_first_attempt": None,
+            "yaml_retry_triggered": False,
+            "yaml_retry_succeeded": None,
+            "yaml_fallback_to_xml": False,
+            "yaml_stream_abort": False,
+            "convert_ms": None,
+            "diff_merge": None,
         }
+        # YAML-pipeline output is validated while it streams so a structural
+        # error aborts the call instead of surfacing after full generation.
+        # Legacy XML refinement returns XML, so there is nothing to monitor.
+        stream_validate = skill_entry.yaml_pipeline and not (
+            is_refinement and not yaml_refinement
+        )
+
+        total_tokens = {"prompt_tokens": 0, "completion_tokens": 0}
+        self._emit(event_queue, "status", "Generating...", start)
+        try:
+            raw_output = await self._call_llm_monitored(
+                system_prompt, user_prompt, total_tokens,
+                max_tokens_override=max_tokens_override,
+                monitor=self._yaml_stream_monitor(event_queue, start)
+                if stream_validate else None,
+            )
+        except YamlStreamError as e:
+            pipeline_info["yaml_detected"] = True
+            pipeline_info["yaml_valid_first_attempt"] = False
+            pipeline_info["yaml_retry_triggered"] = True
+            pipeline_info["yaml_stream_abort"] = True
+            logger.warning(f"[generation] YAML stream aborted: {e}")
+            self._emit(event_queue, "status", "Fixing YAML errors...", start)
+            try:
+                raw_output = await self._call_llm_monitored(
+                    system_prompt, self._yaml_retry_prompt(user_prompt, e), total_tokens,
+                    max_tokens_override=max_tokens_override,
+                    monitor=self._yaml_stream_monitor(event_queue, start),
+                )
+            except YamlStreamError as e2:
+                pipeline_info["yaml_retry_succeeded"] = False
+                logger.warning(f"[generation] YAML stream aborted on retry: {e2}")
+                return f"YAML conversion failed after retry: {e2}", []
 
         if not raw_output:
             return "The model did not produce output. Try a cloud model for generation tasks.", []
@@ -338,53 +389,47 @@ class GenerationPipeline:
         # Step 3b: YAML → XML conversion (skills opt in via yaml_pipeline — ISS-002)
         yaml_source = None
         change_summary = None
-        pipeline_info = {
-            "pipeline": "xml",
-            "yaml_detected": False,
-            "yaml_valid_first_attempt": None,
-            "yaml_retry_triggered": False,
-            "yaml_retry_succeeded": None,
-            "yaml_fallback_to_xml": False,
-            "convert_ms": None,
-            "diff_merge": None,
-        }
         if skill_entry.yaml_pipeline:
             yaml_text = self._extract_yaml(raw_output)
             if yaml_text:
                 pipeline_info["yaml_detected"] = True
 
                 # Diff-based refinement: try merging a diff envelope first
+                model = None
                 if is_refinement and yaml_refinement:
                     merge_result = self._try_diff_merge(yaml_text, source_text)
                     if merge_result:
-                        yaml_text, change_summary = merge_result
+                        model, change_summary = merge_result
                         pipeline_info["diff_merge"] = True
                         self._emit(event_queue, "status", "Applying changes...", start)
                     else:
                         pipeline_info["diff_merge"] = False
 
-                # Integration Point B: reconcile element IDs with registry
-                yaml_text = self._reconcile_with_registry(yaml_text, doc_refs, source_metadata)
-
-                # Backfill source_metadata from generated YAML if empty
-                # (e.g., repo-analysis flow where source_text is pre-provided
-                # and the Weaviate fetch was skipped).
-                source_metadata = self._backfill_source_metadata(yaml_text, source_metadata)
-
-                # Enrich with dct properties before XML conversion.
-                # Always call — strips source_ref even when no metadata matches.
-                yaml_text = enrich_yaml_with_dct(yaml_text, source_metadata)
-
-                convert_start = time.perf_counter()
+                # Parse once; every later stage works on the typed model and
+                # it is serialized only at the edges (XML + companion YAML).
                 try:
-                    raw_output, _info = yaml_to_archimate_xml(yaml_text)
+                    if model is None:
+                        model = parse_model(yaml_text)
+                    source_metadata = self._prepare_model(model, doc_refs, source_metadata)
+                    convert_start = time.perf_counter()
+                    raw_output, _info = yaml_to_archimate_xml(model, previous_xml)
                     pipeline_info["convert_ms"] = int(
                         (time.perf_counter() - convert_start) * 1000
                     )
                     pipeline_info["pipeline"] = "yaml"
-                    pipeline_info["yaml_valid_first_attempt"] = True
-                    yaml_source = yaml_text
+                    if pipeline_info["yaml_retry_triggered"]:
+                        pipeline_info["yaml_retry_succeeded"] = True
+                    else:
+                        pipeline_info["yaml_valid_first_attempt"] = True
+                    yaml_source = serialize_model(model)
                 except ValueError as e:
+                    if pipeline_info["yaml_retry_triggered"]:
+                        # Already retried after a stream abort — don't pay twice.
+                        pipeline_info["yaml_retry_succeeded"] = False
+                        logger.warning(
+                            "[generation] YAML conversion failed after retry: %s", e,
+                        )
+                        return f"YAML conversion failed after retry: {e}", []
                     pipeline_info["yaml_valid_first_attempt"] = False
                     pipeline_info["yaml_retry_triggered"] = True
                     # Log failing YAML for prompt debugging
@@ -394,37 +439,32 @@ class GenerationPipeline:
                         f"{yaml_text[:500]}"
                     )
                     self._emit(event_queue, "status", "Fixing YAML errors...", start)
-                    retry_prompt = (
-                        f"{user_prompt}\n\n"
-                        f"YOUR PREVIOUS YAML HAD ERRORS:\n{e}\n\n"
-                        f"Fix the errors and generate corrected YAML."
-                    )
-                    retry_output, retry_stats = await self._call_llm(
-                        system_prompt, retry_prompt,
-                        max_tokens_override=max_tokens_override,
-                    )
-                    total_tokens["prompt_tokens"] += retry_stats["prompt_tokens"]
-                    total_tokens["completion_tokens"] += retry_stats["completion_tokens"]
+                    try:
+                        retry_output = await self._call_llm_monitored(
+                            system_prompt, self._yaml_retry_prompt(user_prompt, e), total_tokens,
+                            max_tokens_override=max_tokens_override,
+                            monitor=self._yaml_stream_monitor(event_queue, start),
+                        )
+                    except YamlStreamError as e2:
+                        pipeline_info["yaml_stream_abort"] = True
+                        pipeline_info["yaml_retry_succeeded"] = False
+                        logger.warning(f"[generation] YAML stream aborted on retry: {e2}")
+                        return f"YAML conversion failed after retry: {e2}", []
                     yaml_text = self._extract_yaml(retry_output)
                     if yaml_text:
-                        yaml_text = self._reconcile_with_registry(
-                            yaml_text, doc_refs, source_metadata
-                        )
-                        source_metadata = self._backfill_source_metadata(
-                            yaml_text, source_metadata
-                        )
-                        yaml_text = enrich_yaml_with_dct(
-                            yaml_text, source_metadata
-                        )
-                        convert_start = time.perf_counter()
                         try:
-                            raw_output, _info = yaml_to_archimate_xml(yaml_text)
+                            model = parse_model(yaml_text)
+                            source_metadata = self._prepare_model(
+                                model, doc_refs, source_metadata
+                            )
+                            convert_start = time.perf_counter()
+                            raw_output, _info = yaml_to_archimate_xml(model, previous_xml)
                             pipeline_info["convert_ms"] = int(
                                 (time.perf_counter() - convert_start) * 1000
                             )
                             pipeline_info["pipeline"] = "yaml"
                             pipeline_info["yaml_retry_succeeded"] = True
-                            yaml_source = yaml_text
+                            yaml_source = serialize_model(model)
                         except ValueError as e2:
                             pipeline_info["yaml_retry_succeeded"] = False
                             logger.warning(
@@ -498,9 +538,11 @@ class GenerationPipeline:
         yaml_retry = pipeline_info["yaml_retry_triggered"]
         cvt_ms = pipeline_info["convert_ms"]
         diff_merge = pipeline_info["diff_merge"]
+        stream_abort = pipeline_info["yaml_stream_abort"]
         logger.info(
             f"[generation] COMPLETE: refs={refs}, model={model}, "
             f"pipeline={pl}, yaml_valid={yaml_ok}, yaml_retry={yaml_retry}, "
+            f"stream_abort={stream_abort}, "
             f"diff_merge={diff_merge}, convert_ms={cvt_ms}, "
             f"prompt={pt}tok, completion={ct}tok, "
             f"elements={ec}, relationships={rc}, valid={valid}, "
@@ -567,8 +609,8 @@ class GenerationPipeline:
             collection_name: Weaviate collection name.
             id_prop: Property that holds the document identifier (e.g. "adr_number").
             exclude_fn: Optional callable(properties_dict) -> bool. Returns True
-                to exclude the object. Applied after fetching, not as a Weaviate
-                filter (avoids the range + not_equal bug).
+                to exclude the object. Applied to document-index rows before
+                fetching and to fetched objects, never as a Weaviate filter.
         """
         collection = self._get_collection(collection_name)
         if not collection:
@@ -589,25 +631,47 @@ class GenerationPipeline:
         if not numbers:
             return []
 
-        # Build filter — range for multiple, exact for single
-        if len(numbers) >= 2:
-            start = str(min(numbers)).zfill(4)
-            end = str(max(numbers)).zfill(4)
-            doc_filter = (
-                Filter.by_property(id_prop).greater_or_equal(start)
-                & Filter.by_property(id_prop).less_or_equal(end)
+        padded = sorted({str(n).zfill(4) for n in numbers})
+
+        # Exact chunk UUIDs from the document-number index (written at
+        # ingestion); index metadata lets exclusions skip the fetch entirely.
+        indexed = doc_index.lookup(collection.name, padded)
+        chunk_order: dict[str, tuple[str, str, int]] = {}
+        resolved: set[str] = set()
+        for number, rows in indexed.items():
+            kept = [row for row in rows if not (exclude_fn and exclude_fn(row))]
+            if not kept:
+                resolved.add(number)  # every chunk excluded: nothing to fetch
+            for row in kept:
+                chunk_order[row["chunk_uuid"]] = (number, row["doc_type"] or "", row["chunk_index"])
+
+        objects = []
+        uuids = list(chunk_order)
+        for i in range(0, len(uuids), _FETCH_BY_ID_BATCH):
+            batch = uuids[i:i + _FETCH_BY_ID_BATCH]
+            results = collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(batch),
+                limit=len(batch), return_properties=props,
             )
-        else:
-            padded = str(numbers[0]).zfill(4)
-            doc_filter = Filter.by_property(id_prop).equal(padded)
-
-        results = collection.query.fetch_objects(
-            filters=doc_filter, limit=500, return_properties=props,
-        )
+            objects.extend(results.objects)
+        objects.sort(key=lambda obj: chunk_order.get(str(obj.uuid), ("", "", 0)))
+
+        # Numbers the index doesn't resolve (not built yet, or the backend
+        # was swapped since): exact property filter, never a range.
+        resolved.update(chunk_order[str(obj.uuid)][0] for obj in objects)
+        missing = [n for n in padded if n not in resolved]
+        if missing:
+            logger.debug(f"Document index miss for {collection.name} {missing}; filtering by {id_prop}")
+            exact = [Filter.by_property(id_prop).equal(n) for n in missing]
+            results = collection.query.fetch_objects(
+                filters=exact[0] if len(exact) == 1 else Filter.any_of(exact),
+                limit=500, return_properties=props,
+            )
+            objects.extend(results.objects)
 
         # Aggregate all chunks per document (generation needs full content).
         docs: dict[str, dict] = {}
-        for obj in results.objects:
+        for obj in objects:
             doc_id = obj.properties.get(id_prop, "")
             if not doc_id:
                 continue
@@ -652,16 +716,40 @@ class GenerationPipeline:
             pcp_refs, "Principle", "principle_number", _exclude_par,
         )
 
+    def _prepare_model(
+        self, model: YamlModel, doc_refs: list[str] | None, source_metadata: dict,
+    ) -> dict:
+        """Run the post-generation stages on the parsed model, in place.
+
+        Registry reconciliation (Integration Point B), source_metadata
+        backfill, then DCT enrichment. Returns the (possibly backfilled)
+        source_metadata.
+
+        Raises:
+            ValueError: If reconciliation maps two elements to one ID.
+        """
+        self._reconcile_model(model, doc_refs, source_metadata)
+
+        # Backfill source_metadata from the generated model if empty
+        # (e.g., repo-analysis flow where source_text is pre-provided
+        # and the Weaviate fetch was skipped).
+        source_metadata = self._backfill_source_metadata(model, source_metadata)
+
+        # Enrich with dct properties before XML conversion.
+        # Always call — strips source_ref even when no metadata matches.
+        enrich_model_with_dct(model, source_metadata)
+        return source_metadata
+
     def _backfill_source_metadata(
-        self, yaml_text: str, source_metadata: dict,
+        self, model: YamlModel, source_metadata: dict,
     ) -> dict:
-        """Extract source_ref values from generated YAML and fetch KB metadata.
+        """Extract source_ref values from the generated model and fetch KB metadata.
 
         When source_text is pre-provided (e.g., repo-analysis flow), the normal
         Weaviate fetch is skipped, leaving source_metadata empty. This method
-        scans the LLM-generated YAML for source_ref fields, fetches the
+        scans the LLM-generated elements for source_ref fields, fetches the
         referenced documents from Weaviate, and builds source_metadata so that
-        enrich_yaml_with_dct() can resolve DCT properties.
+        enrich_model_with_dct() can resolve DCT properties.
 
         Returns the original source_metadata if it's already populated, or
         a new dict built from the fetched documents.
@@ -669,20 +757,11 @@ class GenerationPipeline:
         if source_metadata:
             return source_metadata  # already have metadata, nothing to do
 
-        import yaml as _yaml
-        try:
-            data = _yaml.safe_load(yaml_text)
-        except Exception:
-            return source_metadata
-        if not data or "elements" not in data:
-            return source_metadata
-
         # Collect unique source_ref values from generated elements
         doc_refs = set()
-        for elem in data.get("elements", []):
-            ref = elem.get("source_ref")
-            if ref:
-                normalized = normalize_ref(ref)
+        for elem in model.elements.values():
+            if elem.source_ref:
+                normalized = normalize_ref(elem.source_ref)
                 if normalized:
                     doc_refs.add(normalized)
 
@@ -769,12 +848,11 @@ class GenerationPipeline:
         relationship source/target references. Preserves source_ref
         and all other fields — only IDs are changed.
 
-        Returns original yaml_text unchanged on any parse error.
+        Returns original yaml_text unchanged on any parse error. Text
+        form for callers holding YAML; ``generate`` uses ``_reconcile_model``.
         """
-        import yaml as _yaml
-
         try:
-            data = _yaml.safe_load(yaml_text)
+            data = load_yaml(yaml_text)
         except Exception as e:
             logger.warning("YAML parse error in reconciliation, skipping: %s", e)
             return yaml_text
@@ -820,10 +898,49 @@ class GenerationPipeline:
             len(elements), len(id_map),
         )
 
-        return _yaml.dump(
+        return dump_yaml(
             data, default_flow_style=False, allow_unicode=True, sort_keys=False
         )
 
+    @staticmethod
+    def _reconcile_model(
+        model: YamlModel,
+        doc_refs: list[str] | None = None,
+        source_metadata: dict | None = None,
+        db_path=None,
+    ) -> None:
+        """Reconcile a parsed model's element IDs with the element registry.
+
+        In-place counterpart of ``_reconcile_with_registry``: element IDs
+        become canonical registry IDs and relationships follow. Only IDs
+        change.
+
+        Raises:
+            ValueError: If two elements reconcile to the same registry ID.
+        """
+        elements = [
+            {
+                "id": elem.id.removeprefix("id-"),
+                "type": elem.type,
+                "name": elem.name,
+                "documentation": elem.documentation,
+                "source_ref": elem.source_ref,
+            }
+            for elem in model.elements.values()
+        ]
+        kwargs: dict = {"doc_refs": doc_refs}
+        if source_metadata is not None:
+            kwargs["source_metadata"] = source_metadata
+        if db_path is not None:
+            kwargs["db_path"] = db_path
+        id_map = reconcile_elements(elements, **kwargs)["id_map"]
+        model.remap_ids({f"id-{old}": f"id-{new}" for old, new in id_map.items()})
+
+        logger.info(
+            "registry reconciliation: %d elements reconciled, %d IDs remapped",
+            len(elements), len(id_map),
+        )
+
     @staticmethod
     def _extract_default_branch(metadata: str) -> str:
         """Extract default branch from GitHub repo metadata response.
@@ -948,16 +1065,90 @@ class GenerationPipeline:
     async def _call_llm(
         self, system_prompt: str, user_prompt: str,
         max_tokens_override: int | None = None,
+        on_token: Callable[[str], None] | None = None,
     ) -> tuple[str, dict]:
-        """Make a single LLM call. Returns (text, token_stats)."""
+        """Make a single LLM call. Returns (text, token_stats).
+
+        ``on_token`` receives each text delta as it arrives; an exception
+        raised from it aborts the call and propagates to the caller.
+        Recorded as a ``generation.llm`` span with its token counts.
+        """
         provider = settings.effective_rag_provider
-        if provider in ("github_models", "openai"):
-            return await self._call_openai(system_prompt, user_prompt, max_tokens_override)
-        return await self._call_ollama(system_prompt, user_prompt, max_tokens_override)
+        async with llm_scheduler.slot(provider, Priority.INTERACTIVE):
+            with span("generation.llm", "llm", model=settings.effective_rag_model, provider=provider):
+                if provider in ("github_models", "openai"):
+                    text, token_stats = await self._call_openai(
+                        system_prompt, user_prompt, max_tokens_override, on_token,
+                    )
+                else:
+                    text, token_stats = await self._call_ollama(
+                        system_prompt, user_prompt, max_tokens_override, on_token,
+                    )
+                annotate(
+                    input_tokens=token_stats.get("prompt_tokens"),
+                    output_tokens=token_stats.get("completion_tokens"),
+                )
+                return text, token_stats
+
+    async def _call_llm_monitored(
+        self, system_prompt: str, user_prompt: str, total_tokens: dict,
+        max_tokens_override: int | None = None,
+        monitor: IncrementalModelParser | None = None,
+    ) -> str:
+        """``_call_llm`` with ``monitor`` validating the stream. Returns the text.
+
+        Token usage is added to ``total_tokens``, including a call aborted
+        by a ``YamlStreamError`` — its usage is estimated from the prompt
+        and the text streamed before the abort, since the provider only
+        reports usage at the end. ``monitor.finish()`` runs once the stream
+        completes, so an error in the last item raises here too.
+        """
+        streamed: list[str] = []
+
+        def on_token(delta: str) -> None:
+            streamed.append(delta)
+            monitor.feed(delta)
+
+        try:
+            text, token_stats = await self._call_llm(
+                system_prompt, user_prompt, max_tokens_override=max_tokens_override,
+                on_token=on_token if monitor else None,
+            )
+        except YamlStreamError:
+            # Same ~4 chars/token estimate as the call log's est_tokens
+            total_tokens["prompt_tokens"] += (len(system_prompt) + len(user_prompt)) // 4
+            total_tokens["completion_tokens"] += len("".join(streamed)) // 4
+            raise
+        total_tokens["prompt_tokens"] += token_stats["prompt_tokens"]
+        total_tokens["completion_tokens"] += token_stats["completion_tokens"]
+        if monitor:
+            monitor.finish()
+        return text
+
+    @staticmethod
+    def _yaml_retry_prompt(user_prompt: str, error: Exception) -> str:
+        return (
+            f"{user_prompt}\n\n"
+            f"YOUR PREVIOUS YAML HAD ERRORS:\n{error}\n\n"
+            f"Fix the errors and generate corrected YAML."
+        )
+
+    def _yaml_stream_monitor(
+        self, event_queue: Queue | None, start: float,
+    ) -> IncrementalModelParser:
+        """Build a parser that validates YAML as it streams, reporting progress."""
+        def progress(elements: int, relationships: int) -> None:
+            self._emit(
+                event_queue, "status",
+                f"Generating... {elements} elements, {relationships} relationships",
+                start,
+            )
+        return IncrementalModelParser(on_progress=progress)
 
     async def _call_openai(
         self, system_prompt: str, user_prompt: str,
         max_tokens_override: int | None = None,
+        on_token: Callable[[str], None] | None = None,
     ) -> tuple[str, dict]:
         from openai import OpenAI
 
@@ -999,11 +1190,20 @@ class GenerationPipeline:
         )
         chunks = []
         usage_data = None
-        for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                chunks.append(chunk.choices[0].delta.content)
-            if hasattr(chunk, "usage") and chunk.usage:
-                usage_data = chunk.usage
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    chunks.append(delta)
+                    if on_token:
+                        on_token(delta)
+                if hasattr(chunk, "usage") and chunk.usage:
+                    usage_data = chunk.usage
+        finally:
+            # Closing releases the connection when on_token aborts mid-stream.
+            close = getattr(stream, "close", None)
+            if close:
+                close()
         text = "".join(chunks)
         duration_ms = elapsed_ms(start)
 
@@ -1025,6 +1225,7 @@ class GenerationPipeline:
     async def _call_ollama(
         self, system_prompt: str, user_prompt: str,
         max_tokens_override: int | None = None,
+        on_token: Callable[[str], None] | None = None,
     ) -> tuple[str, dict]:
         import httpx
 
@@ -1041,19 +1242,44 @@ class GenerationPipeline:
         )
 
         start = time.perf_counter()
+        payload = {
+            "model": model,
+            "prompt": full_prompt,
+            "stream": on_token is not None,
+            "options": {"num_predict": num_predict},
+        }
         async with httpx.AsyncClient(timeout=settings.timeout_generation) as client:
-            response = await client.post(
-                f"{settings.ollama_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": full_prompt,
-                    "stream": False,
-                    "options": {"num_predict": num_predict},
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            text = data.get("response", "")
+            if on_token is None:
+                response = await client.post(
+                    f"{settings.ollama_url}/api/generate", json=payload,
+                )
+                response.raise_for_status()
+                data = response.json()
+                text = data.get("response", "")
+            else:
+                # Leaving the stream context on an on_token abort closes the
+                # connection, which stops generation server-side.
+                parts = []
+                data = {}
+                async with client.stream(
+                    "POST", f"{settings.ollama_url}/api/generate", json=payload,
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        try:
+                            data = json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.warning(
+                                "Skipping malformed NDJSON line from Ollama: %s", line[:200],
+                            )
+                            continue
+                        delta = data.get("response", "")
+                        if delta:
+                            parts.append(delta)
+                            on_token(delta)
+                text = "".join(parts)
         duration_ms = elapsed_ms(start)
 
         # Strip <think> tags from reasoning models
@@ -1403,14 +1629,14 @@ class GenerationPipeline:
         target_nmap: dict[str, str] = {}  # elementRef → node identifier
         target_rrefs: set[str] = set()
 
-        def collect_nodes(parent: ET.Element, erefs: set, nmap: dict):
-            for node in parent.findall(TAG("node")):
+        def collect_nodes(view: ET.Element, erefs: set, nmap: dict):
+            # iter() covers nested nodes (groupings) without recursion
+            for node in view.iter(TAG("node")):
                 eref = node.get("elementRef")
                 nid = node.get("identifier")
                 if eref and nid:
                     erefs.add(eref)
                     nmap[eref] = nid
-                collect_nodes(node, erefs, nmap)
 
         # Collect from all views (for "missing from ANY view" check)
         for view in views:
@@ -1720,26 +1946,26 @@ class GenerationPipeline:
     @staticmethod
     def _try_diff_merge(
         yaml_text: str, base_yaml: str,
-    ) -> tuple[str, dict] | None:
+    ) -> tuple[YamlModel, dict] | None:
         """Attempt to parse yaml_text as a diff envelope and merge with base.
 
-        Returns (merged_yaml, change_summary) on success, None on failure
+        Returns (merged_model, change_summary) on success, None on failure
         (indicating fallback to full-regeneration should be used).
         """
-        from aion.tools.yaml_to_xml import apply_yaml_diff
+        from aion.tools.yaml_to_xml import apply_model_diff
 
         if "refinement:" not in yaml_text:
             return None
 
         try:
-            merged_yaml, summary = apply_yaml_diff(base_yaml, yaml_text)
+            merged, summary = apply_model_diff(parse_model(base_yaml), yaml_text)
             logger.info(
                 f"[generation] diff merge succeeded: "
                 f"added={summary['added_elements']}e+{summary['added_relationships']}r, "
                 f"modified={summary['modified']}, "
                 f"removed={summary['removed_elements']}e+{summary['removed_relationships']}r"
             )
-            return merged_yaml, summary
+            return merged, summary
         except (ValueError, KeyError, TypeError) as e:
             logger.warning(
                 f"[generation] diff merge failed, falling back to full regen: {e}"
@@ -1944,55 +2170,56 @@ async def stream_synthesis_response(
     synthesis_start = time.perf_counter()
     text_so_far: list[str] = []
 
-    if provider in ("github_models", "openai"):
-        from openai import AsyncOpenAI
-
-        async with AsyncOpenAI(**settings.get_openai_client_kwargs(
-            provider, timeout=settings.timeout_generation,
-        )) as client:
-            # Use cross-reference budget when document is in context
-            from aion.config.runtime import get_runtime_value
-            _token_limits = get_runtime_value("llm_token_limits", {})
-            _default_budget = 8192
-            if artifact_context:
-                _default_budget = _token_limits.get("cross_reference_synthesis", 16384)
-            token_kwarg = (
-                {"max_completion_tokens": _default_budget}
-                if is_reasoning_model(model)
-                else {"max_tokens": _default_budget}
-            )
-            stream = await client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": _user_message},
-                ],
-                **token_kwarg,
-                stream=True,
-            )
-            async for chunk in stream:
-                token = chunk.choices[0].delta.content or ""
-                if token:
-                    text_so_far.append(token)
-                    yield token
-    else:
-        import httpx
-
-        async with httpx.AsyncClient(timeout=settings.timeout_long_running) as http_client:
-            async with http_client.stream(
-                "POST",
-                f"{settings.ollama_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": f"{system_prompt}\n\n{_user_message}",
-                    "stream": True,
-                    "options": {"num_predict": 8192},
-                },
-            ) as resp:
-                resp.raise_for_status()
-                async for token in _iter_ollama_tokens(resp):
-                    text_so_far.append(token)
-                    yield token
+    async with llm_scheduler.slot(provider, Priority.INTERACTIVE):
+        if provider in ("github_models", "openai"):
+            from openai import AsyncOpenAI
+
+            async with AsyncOpenAI(**settings.get_openai_client_kwargs(
+                provider, timeout=settings.timeout_generation,
+            )) as client:
+                # Use cross-reference budget when document is in context
+                from aion.config.runtime import get_runtime_value
+                _token_limits = get_runtime_value("llm_token_limits", {})
+                _default_budget = 8192
+                if artifact_context:
+                    _default_budget = _token_limits.get("cross_reference_synthesis", 16384)
+                token_kwarg = (
+                    {"max_completion_tokens": _default_budget}
+                    if is_reasoning_model(model)
+                    else {"max_tokens": _default_budget}
+                )
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": _user_message},
+                    ],
+                    **token_kwarg,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    token = chunk.choices[0].delta.content or ""
+                    if token:
+                        text_so_far.append(token)
+                        yield token
+        else:
+            import httpx
+
+            async with httpx.AsyncClient(timeout=settings.timeout_long_running) as http_client:
+                async with http_client.stream(
+                    "POST",
+                    f"{settings.ollama_url}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": f"{system_prompt}\n\n{_user_message}",
+                        "stream": True,
+                        "options": {"num_predict": 8192},
+                    },
+                ) as resp:
+                    resp.raise_for_status()
+                    async for token in _iter_ollama_tokens(resp):
+                        text_so_far.append(token)
+                        yield token
 
     synthesis_ms = elapsed_ms(synthesis_start)
     _synthesis_logger.info(
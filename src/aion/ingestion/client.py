@@ -16,9 +16,18 @@ logger = logging.getLogger(__name__)
 def get_weaviate_client() -> WeaviateClient:
     """Create and return a Weaviate client based on configuration.
 
+    With ``RETRIEVAL_BACKEND=embedded`` this returns an in-process
+    ``EmbeddedClient`` exposing the same collection API, so ingestion and
+    the RAG tools run without a Weaviate server.
+
     Returns:
         Connected WeaviateClient instance
     """
+    if settings.retrieval_backend == "embedded":
+        from aion.ingestion.embedded_store import EmbeddedClient
+
+        return EmbeddedClient(settings.resolve_path(settings.embedded_index_path))
+
     if settings.weaviate_is_local:
         logger.info(f"Connecting to local Weaviate at {settings.weaviate_url}")
         client = weaviate.connect_to_local(
@@ -0,0 +1,130 @@
+"""Document-number index — ADR/PCP number → Weaviate chunk UUIDs.
+
+Reference lookups (``ADR.29``, ``PCP.10``) used to query Weaviate with a
+number-range filter, which for ``ADR.1`` + ``ADR.90`` fetched every chunk
+in between and stopped at 500 objects. ``DataIngestionPipeline`` now
+records every ADR and principle chunk it inserts here, and the generation
+pipeline resolves cited numbers to UUIDs and fetches exactly those.
+
+Each ingestion run replaces a collection's entries once that collection
+has been ingested without errors, so the index follows re-ingests.
+Lookups that miss (index never built, or the backend was swapped) fall
+back to a property filter in the caller.
+
+Uses the same chat_history.db as chat_ui.py and session_store.py.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from aion.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DB_PATH = settings.db_path
+
+# Properties that carry the document number, per indexed collection kind
+NUMBER_PROPS = ("adr_number", "principle_number")
+
+
+def init_doc_index_table(db_path: Path | None = None) -> None:
+    """Create the doc_index table if it doesn't exist."""
+    conn = sqlite3.connect(db_path or _DB_PATH)
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS doc_index (
+                collection      TEXT NOT NULL,
+                doc_number      TEXT NOT NULL,
+                chunk_uuid      TEXT NOT NULL,
+                chunk_index     INTEGER NOT NULL DEFAULT 0,
+                doc_type        TEXT,
+                title           TEXT,
+                status          TEXT,
+                file_path       TEXT,
+                indexed_at      TEXT NOT NULL,
+                PRIMARY KEY (collection, chunk_uuid)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_doc_index_number
+            ON doc_index(collection, doc_number)
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def index_entry(uuid: str, properties: dict) -> dict | None:
+    """Index row for an inserted object, or None if it has no document number."""
+    number = next((properties[p] for p in NUMBER_PROPS if properties.get(p)), "")
+    if not number:
+        return None
+    return {
+        "doc_number": str(number).zfill(4),
+        "chunk_uuid": str(uuid),
+        "chunk_index": properties.get("chunk_index") or 0,
+        "doc_type": properties.get("doc_type", ""),
+        "title": properties.get("title", ""),
+        "status": properties.get("status", ""),
+        "file_path": properties.get("file_path", ""),
+    }
+
+
+def replace_collection(
+    collection: str, entries: list[dict], db_path: Path | None = None,
+) -> None:
+    """Swap a collection's entries for ``entries`` in one transaction."""
+    init_doc_index_table(db_path)
+    now = datetime.now().isoformat()
+    conn = sqlite3.connect(db_path or _DB_PATH)
+    try:
+        with conn:
+            conn.execute("DELETE FROM doc_index WHERE collection = ?", (collection,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO doc_index (collection, doc_number, chunk_uuid, "
+                "chunk_index, doc_type, title, status, file_path, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (collection, e["doc_number"], e["chunk_uuid"], e["chunk_index"],
+                     e["doc_type"], e["title"], e["status"], e["file_path"], now)
+                    for e in entries
+                ],
+            )
+    finally:
+        conn.close()
+    logger.info(f"Document index: {len(entries)} chunks for {collection}")
+
+
+def lookup(
+    collection: str, numbers: list[str], db_path: Path | None = None,
+) -> dict[str, list[dict]]:
+    """Chunks per zero-padded document number, ordered by chunk_index.
+
+    Numbers without index entries are absent from the result.
+    """
+    if not numbers:
+        return {}
+    path = db_path or _DB_PATH
+    if not Path(path).exists():
+        return {}
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        placeholders = ",".join("?" * len(numbers))
+        rows = conn.execute(
+            f"SELECT doc_number, chunk_uuid, chunk_index, doc_type, title, status, file_path "
+            f"FROM doc_index WHERE collection = ? AND doc_number IN ({placeholders}) "
+            f"ORDER BY doc_number, doc_type, chunk_index",
+            (collection, *numbers),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return {}  # table not created yet: nothing ingested since this feature
+    finally:
+        conn.close()
+
+    result: dict[str, list[dict]] = {}
+    for row in rows:
+        result.setdefault(row["doc_number"], []).append(dict(row))
+    return result
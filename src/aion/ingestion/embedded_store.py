@@ -0,0 +1,628 @@
+"""Embedded retrieval backend: in-process vector + BM25 search, no server.
+
+``EmbeddedClient`` implements the slice of the Weaviate v4 client API that
+``RAGToolkit``, ``CollectionManager`` and ``DataIngestionPipeline`` use —
+``collections.exists/get/create/delete``, ``data.insert_many``,
+``query.fetch_objects``, ``query.hybrid``, ``aggregate.over_all`` and
+``config.get`` — so ``get_weaviate_client()`` can hand it out when
+``RETRIEVAL_BACKEND=embedded`` and every search_*/list_* tool and the
+ingestion pipeline run on it unchanged. Meant for laptops, CI and edge
+deployments with a few thousand chunks.
+
+Storage, one directory per collection under the index root:
+
+- ``schema.json``  — property names, data types and tokenization
+- ``objects.json`` — UUIDs and properties, in insertion order
+- ``vectors.npy``  — float32 matrix of L2-normalized vectors, opened with
+  ``mmap_mode="r"`` so start-up does not read it into memory
+
+Vector search is brute-force cosine over the matrix (one matrix-vector
+product). Keyword search is Okapi BM25 (k1=1.2, b=0.75, Weaviate's
+defaults) over an inverted index of the collection's searchable text
+properties. ``hybrid`` fuses the two the way Weaviate's default
+``relativeScoreFusion`` does: each result set is min-max normalized to
+[0, 1], then weighted ``alpha`` (vector) and ``1 - alpha`` (keyword).
+
+Differences from Weaviate, acceptable for this corpus: BM25 scores the
+searchable properties as one field (Weaviate uses BM25F per property),
+``Equal``/``NotEqual`` on text compare whole values, and ``fetch_objects``
+returns insertion order rather than UUID order. Writes are buffered and
+persisted on ``flush()``/``close()``.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid as uuid_lib
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Weaviate BM25 defaults
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Candidates taken from each side of a hybrid query before fusion
+HYBRID_CANDIDATES = 100
+
+# Tokenizations whose values are split into words for BM25. FIELD
+# (whole-value) properties — paths, numbers, enum-like tags — are
+# filter-only here.
+_WORD_TOKENIZATIONS = frozenset({"word", "lowercase", "whitespace", "trigram", None})
+_TEXT_TYPES = frozenset({"text", "text[]"})
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Weaviate ``word`` tokenization: lowercase, split on non-alphanumerics."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+# ── Result shapes (attribute-compatible with weaviate.collections.classes) ──
+
+
+@dataclass(slots=True)
+class EmbeddedMetadata:
+    score: float | None = None
+    distance: float | None = None
+
+
+@dataclass(slots=True)
+class EmbeddedObject:
+    uuid: str
+    properties: dict
+    metadata: EmbeddedMetadata = field(default_factory=EmbeddedMetadata)
+    # Weaviate's shape, {"default": [...]}; only set with include_vector=True
+    vector: dict | None = None
+
+
+@dataclass(slots=True)
+class EmbeddedQueryReturn:
+    objects: list[EmbeddedObject]
+
+
+@dataclass(slots=True)
+class EmbeddedBatchResult:
+    uuids: dict[int, str]
+    errors: dict[int, str]
+
+    @property
+    def has_errors(self) -> bool:
+        return bool(self.errors)
+
+
+@dataclass(slots=True)
+class EmbeddedAggregate:
+    total_count: int
+
+
+@dataclass(slots=True)
+class EmbeddedProperty:
+    name: str
+    data_type: str = "text"
+    tokenization: str | None = None
+
+
+@dataclass(slots=True)
+class EmbeddedCollectionConfig:
+    name: str
+    properties: list[EmbeddedProperty]
+
+
+# ── Filters ──
+
+
+def _filter_mask(flt, collection: "EmbeddedCollection") -> "np.ndarray":
+    """Evaluate a ``weaviate.classes.query.Filter`` into a boolean row mask."""
+    op = getattr(flt.operator, "value", flt.operator)
+    if op in ("And", "Or", "Not"):
+        masks = [_filter_mask(f, collection) for f in flt.filters]
+        if op == "Not":
+            return ~masks[0]
+        combine = np.logical_and if op == "And" else np.logical_or
+        return combine.reduce(masks)
+
+    target = flt.target
+    if not isinstance(target, str):
+        raise ValueError(f"Unsupported filter target for embedded backend: {target!r}")
+    column = collection._column(target)
+    value = flt.value
+
+    if op == "Equal":
+        return column == value
+    if op == "NotEqual":
+        return column != value
+    if op == "IsNull":
+        return np.fromiter((v in (None, "", []) for v in column), bool, len(column)) == bool(value)
+    if op in ("LessThan", "LessThanEqual", "GreaterThan", "GreaterThanEqual"):
+        compare = {
+            "LessThan": lambda v: v < value,
+            "LessThanEqual": lambda v: v <= value,
+            "GreaterThan": lambda v: v > value,
+            "GreaterThanEqual": lambda v: v >= value,
+        }[op]
+        return np.fromiter(
+            (v is not None and type(v) is type(value) and compare(v) for v in column),
+            bool, len(column),
+        )
+    if op == "Like":
+        pattern = str(value).lower()
+        return np.fromiter(
+            (isinstance(v, str) and fnmatchcase(v.lower(), pattern) for v in column),
+            bool, len(column),
+        )
+    if op in ("ContainsAny", "ContainsAll", "ContainsNone"):
+        wanted = set(value)
+
+        split = target != "_id" and collection._tokenization(target) in _WORD_TOKENIZATIONS
+
+        def _values(v):
+            if isinstance(v, list):
+                return set(v)
+            if isinstance(v, str) and split:
+                return set(tokenize(v))
+            return {v}
+
+        test = {
+            "ContainsAny": lambda v: bool(_values(v) & wanted),
+            "ContainsAll": lambda v: wanted <= _values(v),
+            "ContainsNone": lambda v: not (_values(v) & wanted),
+        }[op]
+        return np.fromiter((test(v) for v in column), bool, len(column))
+    raise ValueError(f"Filter operator '{op}' is not supported by the embedded backend")
+
+
+# ── Collection ──
+
+
+class _DataNamespace:
+    def __init__(self, collection: "EmbeddedCollection"):
+        self._collection = collection
+
+    def insert_many(self, objects) -> EmbeddedBatchResult:
+        return self._collection._insert_many(objects)
+
+    def insert(self, properties: dict, uuid=None, vector=None) -> str:
+        result = self._collection._insert_many([{"properties": properties, "uuid": uuid, "vector": vector}])
+        if result.has_errors:
+            raise ValueError(result.errors[0])
+        return result.uuids[0]
+
+
+class _QueryNamespace:
+    def __init__(self, collection: "EmbeddedCollection"):
+        self._collection = collection
+
+    def fetch_objects(self, filters=None, limit: int | None = None,
+                      return_properties: list[str] | None = None,
+                      include_vector: bool = False, **_ignored) -> EmbeddedQueryReturn:
+        return self._collection._fetch_objects(filters, limit, return_properties, include_vector)
+
+    def hybrid(self, query: str, vector=None, alpha: float = 0.7, limit: int | None = None,
+               filters=None, return_properties: list[str] | None = None,
+               **_ignored) -> EmbeddedQueryReturn:
+        return self._collection._hybrid(query, vector, alpha, limit, filters, return_properties)
+
+    def bm25(self, query: str, limit: int | None = None, filters=None,
+             return_properties: list[str] | None = None, **_ignored) -> EmbeddedQueryReturn:
+        return self._collection._hybrid(query, None, 0.0, limit, filters, return_properties)
+
+    def near_vector(self, near_vector, limit: int | None = None, filters=None,
+                    return_properties: list[str] | None = None, **_ignored) -> EmbeddedQueryReturn:
+        return self._collection._hybrid("", near_vector, 1.0, limit, filters, return_properties)
+
+
+class _AggregateNamespace:
+    def __init__(self, collection: "EmbeddedCollection"):
+        self._collection = collection
+
+    def over_all(self, total_count: bool = True, **_ignored) -> EmbeddedAggregate:
+        return EmbeddedAggregate(total_count=len(self._collection._uuids))
+
+
+class _ConfigNamespace:
+    def __init__(self, collection: "EmbeddedCollection"):
+        self._collection = collection
+
+    def get(self) -> EmbeddedCollectionConfig:
+        return EmbeddedCollectionConfig(
+            name=self._collection.name,
+            properties=list(self._collection._schema),
+        )
+
+
+class EmbeddedCollection:
+    """One collection: objects, a vector matrix and a lazily built BM25 index."""
+
+    def __init__(self, name: str, path: Path, schema: list[EmbeddedProperty]):
+        self.name = name
+        self.path = path
+        self._schema = schema
+        self._lock = threading.RLock()
+        self._uuids: list[str] = []
+        self._props: list[dict] = []
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._pending: list[np.ndarray | None] = []
+        self._has_vector: np.ndarray | None = None
+        self._dirty = False
+        self._columns: dict[str, np.ndarray] = {}
+        self._bm25 = None
+        self._load()
+
+        self.data = _DataNamespace(self)
+        self.query = _QueryNamespace(self)
+        self.aggregate = _AggregateNamespace(self)
+        self.config = _ConfigNamespace(self)
+
+    # ── persistence ──
+
+    def _load(self) -> None:
+        objects_file = self.path / "objects.json"
+        if objects_file.exists():
+            records = json.loads(objects_file.read_text(encoding="utf-8"))
+            self._uuids = [r["uuid"] for r in records]
+            self._props = [r["properties"] for r in records]
+        vectors_file = self.path / "vectors.npy"
+        if vectors_file.exists():
+            self._vectors = np.load(vectors_file, mmap_mode="r")
+
+    def flush(self) -> None:
+        """Persist buffered inserts (objects + vector matrix) atomically."""
+        with self._lock:
+            self._matrix()
+            if not self._dirty:
+                return
+            self.path.mkdir(parents=True, exist_ok=True)
+            records = [{"uuid": u, "properties": p} for u, p in zip(self._uuids, self._props)]
+            _atomic_write(self.path / "objects.json",
+                          lambda f: f.write(json.dumps(records, ensure_ascii=False).encode("utf-8")))
+            vectors = np.ascontiguousarray(self._vectors, dtype=np.float32)
+            _atomic_write(self.path / "vectors.npy", lambda f: np.save(f, vectors))
+            self._vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+            self._dirty = False
+
+    # ── writes ──
+
+    def _insert_many(self, objects) -> EmbeddedBatchResult:
+        uuids, errors = {}, {}
+        with self._lock:
+            dim = self._dimension()
+            for i, obj in enumerate(objects):
+                if isinstance(obj, dict) and "properties" not in obj:
+                    obj = {"properties": obj}
+                props = obj["properties"] if isinstance(obj, dict) else obj.properties
+                obj_uuid = obj.get("uuid") if isinstance(obj, dict) else obj.uuid
+                raw_vector = obj.get("vector") if isinstance(obj, dict) else obj.vector
+
+                vector = None
+                if raw_vector is not None:
+                    vector = np.asarray(raw_vector, dtype=np.float32).ravel()
+                    if dim and vector.shape[0] != dim:
+                        errors[i] = f"vector dimension {vector.shape[0]} does not match collection dimension {dim}"
+                        continue
+                    dim = dim or vector.shape[0]
+                    norm = float(np.linalg.norm(vector))
+                    vector = vector / norm if norm else vector
+
+                obj_uuid = str(obj_uuid or uuid_lib.uuid4())
+                self._uuids.append(obj_uuid)
+                self._props.append(dict(props))
+                self._pending.append(vector)
+                uuids[i] = obj_uuid
+            if uuids:
+                self._dirty = True
+                self._columns.clear()
+                self._bm25 = None
+        return EmbeddedBatchResult(uuids=uuids, errors=errors)
+
+    def _dimension(self) -> int:
+        if self._vectors.shape[1]:
+            return self._vectors.shape[1]
+        for vector in self._pending:
+            if vector is not None:
+                return vector.shape[0]
+        return 0
+
+    def _matrix(self) -> "np.ndarray":
+        """Vector matrix with pending rows folded in (objects without a vector are zero rows)."""
+        with self._lock:
+            if self._pending:
+                dim = self._dimension()
+                rows = [v if v is not None else np.zeros(dim, dtype=np.float32) for v in self._pending]
+                base = self._vectors if self._vectors.shape[1] == dim else np.zeros((0, dim), np.float32)
+                self._vectors = np.vstack([base, *rows]) if rows else base
+                self._pending = []
+                self._has_vector = None
+            if self._has_vector is None:
+                self._has_vector = np.any(self._vectors != 0, axis=1)
+            return self._vectors
+
+    # ── indexes ──
+
+    def _column(self, prop: str) -> "np.ndarray":
+        column = self._columns.get(prop)
+        if column is None:
+            column = np.empty(len(self._props), dtype=object)
+            # "_id" is the target of Filter.by_id()
+            column[:] = list(self._uuids) if prop == "_id" else [p.get(prop) for p in self._props]
+            self._columns[prop] = column
+        return column
+
+    def _tokenization(self, prop: str) -> str | None:
+        for p in self._schema:
+            if p.name == prop:
+                return p.tokenization
+        return None
+
+    def _searchable_props(self) -> list[str]:
+        return [
+            p.name for p in self._schema
+            if p.data_type in _TEXT_TYPES and p.tokenization in _WORD_TOKENIZATIONS
+        ]
+
+    def _bm25_index(self) -> "_BM25Index":
+        with self._lock:
+            if self._bm25 is None:
+                self._bm25 = _BM25Index.build(self._props, self._searchable_props())
+            return self._bm25
+
+    # ── reads ──
+
+    def _mask(self, filters) -> "np.ndarray | None":
+        return None if filters is None else _filter_mask(filters, self)
+
+    def _select(self, index: int, return_properties, score=None, distance=None) -> EmbeddedObject:
+        props = self._props[index]
+        if return_properties is not None:
+            props = {k: props[k] for k in return_properties if k in props}
+        return EmbeddedObject(
+            uuid=self._uuids[index],
+            properties=dict(props),
+            metadata=EmbeddedMetadata(score=score, distance=distance),
+        )
+
+    def _fetch_objects(self, filters, limit, return_properties, include_vector=False) -> EmbeddedQueryReturn:
+        with self._lock:
+            mask = self._mask(filters)
+            rows = range(len(self._props)) if mask is None else np.flatnonzero(mask)
+            rows = list(rows)[:limit] if limit else list(rows)
+            objects = [self._select(int(i), return_properties) for i in rows]
+            if include_vector and objects:
+                matrix = self._matrix()
+                for i, obj in zip(rows, objects):
+                    if self._has_vector[i]:
+                        # Unit-normalised at insert; the dimension is unchanged
+                        obj.vector = {"default": matrix[i].tolist()}
+            return EmbeddedQueryReturn(objects)
+
+    def _hybrid(self, query, vector, alpha, limit, filters, return_properties) -> EmbeddedQueryReturn:
+        limit = limit or 10
+        pool = max(limit, HYBRID_CANDIDATES)
+        with self._lock:
+            n = len(self._props)
+            if not n:
+                return EmbeddedQueryReturn([])
+            mask = self._mask(filters)
+            if mask is not None and not mask.any():
+                return EmbeddedQueryReturn([])
+
+            fused = np.zeros(n)
+            hit = np.zeros(n, dtype=bool)
+            similarity = None
+            if vector is not None and alpha > 0 and self._dimension():
+                matrix = self._matrix()
+                q = np.asarray(vector, dtype=np.float32).ravel()
+                norm = float(np.linalg.norm(q))
+                if q.shape[0] == matrix.shape[1] and norm:
+                    similarity = np.asarray(matrix) @ (q / norm)
+                    candidates = self._has_vector if mask is None else self._has_vector & mask
+                    _fuse(fused, hit, similarity, candidates, pool, alpha)
+                else:
+                    logger.warning(
+                        f"[embedded] {self.name}: query vector unusable "
+                        f"(dim {q.shape[0]} vs {matrix.shape[1]}), keyword-only"
+                    )
+                    alpha = 0.0
+            elif alpha > 0:
+                alpha = 0.0  # no vectorizer in-process: degrade to keyword search
+
+            if alpha < 1 and query:
+                bm25 = self._bm25_index().score(query)
+                candidates = bm25 > 0
+                if mask is not None:
+                    candidates &= mask
+                _fuse(fused, hit, bm25, candidates, pool, 1.0 - alpha)
+
+            rows = np.flatnonzero(hit)
+            ranked = rows[np.lexsort((rows, -fused[rows]))][:limit].tolist()
+            return EmbeddedQueryReturn([
+                self._select(
+                    i, return_properties, score=float(fused[i]),
+                    distance=None if similarity is None else float(1.0 - similarity[i]),
+                )
+                for i in ranked
+            ])
+
+
+def _fuse(fused: "np.ndarray", hit: "np.ndarray", scores: "np.ndarray",
+          candidates: "np.ndarray", pool: int, weight: float) -> None:
+    """Add one min-max-normalized result set into ``fused`` (relativeScoreFusion)."""
+    rows = np.flatnonzero(candidates)
+    if not rows.size or weight <= 0:
+        return
+    if rows.size > pool:
+        rows = rows[np.argpartition(-scores[rows], pool - 1)[:pool]]
+    values = scores[rows].astype(np.float64)
+    lo, hi = values.min(), values.max()
+    normalized = np.ones_like(values) if hi == lo else (values - lo) / (hi - lo)
+    fused[rows] += weight * normalized
+    hit[rows] = True
+
+
+class _BM25Index:
+    """Inverted index: term → (row indices, term frequencies), plus document lengths."""
+
+    def __init__(self, postings: dict, doc_len: "np.ndarray"):
+        self.postings = postings
+        self.doc_len = doc_len
+        self.n_docs = len(doc_len)
+        self.avgdl = float(doc_len.mean()) if self.n_docs else 0.0
+        # Length-normalization term of the BM25 denominator, per document
+        self.norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / self.avgdl) if self.avgdl else doc_len
+
+    @classmethod
+    def build(cls, props: list[dict], fields: list[str]) -> "_BM25Index":
+        grouped: dict[str, tuple[list[int], list[int]]] = {}
+        doc_len = np.zeros(len(props), dtype=np.float32)
+        for row, p in enumerate(props):
+            tokens = []
+            for name in fields:
+                value = p.get(name)
+                if isinstance(value, str):
+                    tokens.extend(tokenize(value))
+                elif isinstance(value, list):
+                    tokens.extend(t for v in value if isinstance(v, str) for t in tokenize(v))
+            doc_len[row] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                rows, tfs = grouped.setdefault(term, ([], []))
+                rows.append(row)
+                tfs.append(tf)
+        postings = {
+            term: (np.asarray(rows, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (rows, tfs) in grouped.items()
+        }
+        return cls(postings, doc_len)
+
+    def score(self, query: str) -> "np.ndarray":
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        if not self.n_docs or not self.avgdl:
+            return scores
+        for term in dict.fromkeys(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            rows, tf = posting
+            idf = math.log(1 + (self.n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + self.norm[rows])
+        return scores
+
+
+# ── Client ──
+
+
+class _CollectionsNamespace:
+    def __init__(self, client: "EmbeddedClient"):
+        self._client = client
+
+    def exists(self, name: str) -> bool:
+        return name in self._client._collections or (self._client.path / name / "schema.json").exists()
+
+    def get(self, name: str) -> EmbeddedCollection:
+        collections = self._client._collections
+        if name not in collections:
+            schema_file = self._client.path / name / "schema.json"
+            if not schema_file.exists():
+                raise ValueError(f"Collection {name} does not exist in the embedded index")
+            schema = [EmbeddedProperty(**p) for p in json.loads(schema_file.read_text())["properties"]]
+            collections[name] = EmbeddedCollection(name, self._client.path / name, schema)
+        return collections[name]
+
+    def create(self, name: str, properties=None, **_ignored) -> EmbeddedCollection:
+        """Create a collection from ``weaviate.classes.config.Property`` definitions.
+
+        Vectorizer, generative and index configuration are accepted and
+        ignored — vectors always come from the caller.
+        """
+        if self.exists(name):
+            raise ValueError(f"Collection {name} already exists")
+        schema = [
+            EmbeddedProperty(
+                name=p.name,
+                data_type=getattr(p.dataType, "value", p.dataType),
+                tokenization=getattr(p.tokenization, "value", p.tokenization),
+            )
+            for p in properties or []
+        ]
+        path = self._client.path / name
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "schema.json").write_text(json.dumps({
+            "name": name,
+            "properties": [
+                {"name": p.name, "data_type": p.data_type, "tokenization": p.tokenization}
+                for p in schema
+            ],
+        }, indent=2))
+        collection = EmbeddedCollection(name, path, schema)
+        self._client._collections[name] = collection
+        return collection
+
+    def delete(self, name: str | list[str]) -> None:
+        for n in [name] if isinstance(name, str) else name:
+            self._client._collections.pop(n, None)
+            path = self._client.path / n
+            if path.is_dir():
+                for child in path.iterdir():
+                    child.unlink()
+                path.rmdir()
+
+    def list_all(self) -> dict[str, EmbeddedCollectionConfig]:
+        names = sorted(p.parent.name for p in self._client.path.glob("*/schema.json"))
+        return {n: self.get(n).config.get() for n in names}
+
+
+class EmbeddedClient:
+    """Drop-in for the ``WeaviateClient`` subset the RAG tools and ingestion use.
+
+    Args:
+        path: Index root directory; one subdirectory per collection.
+    """
+
+    def __init__(self, path: Path):
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "The embedded retrieval backend requires numpy. "
+                "Install it with: pip install 'esa-ainstein-artifacts[embedded]'"
+            )
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._collections: dict[str, EmbeddedCollection] = {}
+        self.collections = _CollectionsNamespace(self)
+        logger.info(f"Using embedded retrieval index at {self.path}")
+
+    def is_ready(self) -> bool:
+        return True
+
+    def is_connected(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        for collection in self._collections.values():
+            collection.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "EmbeddedClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _atomic_write(target: Path, write) -> None:
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, target)
@@ -11,12 +11,16 @@ Instead of relying on Weaviate's vectorizer, we:
 """
 
 import atexit
+import base64
 import logging
 import time
+from array import array
 
 import httpx
 
+from aion.cache import cache_tier
 from aion.config import settings
+from aion.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,13 @@ _dimension_cache: dict[str, int] = {}
 # Backward compatibility constant
 EMBEDDING_DIMENSION = 768
 
+# Query-embedding cache tier. Vectors are stored as base64 float32 bytes
+# (~16 KB for 3072 dims, vs ~100 KB as a Python float list or ~60 KB as
+# JSON), in a small per-worker LRU and with a TTL so the shared store
+# does not accumulate every query ever asked.
+_QUERY_CACHE_SIZE = 256
+_QUERY_CACHE_TTL = 24 * 3600
+
 
 
 def get_embedding_dimension(model: str = None) -> int:
@@ -117,6 +128,7 @@ class OllamaEmbeddings:
             self._client = httpx.Client(timeout=self.timeout)
         return self._client
 
+    @traced("embedding.ollama", "embedding")
     def embed(self, text: str) -> list[float]:
         """Generate embedding for a single text.
 
@@ -159,6 +171,7 @@ class OllamaEmbeddings:
             logger.error(f"Error generating embedding: {e}")
             raise
 
+    @traced("embedding.ollama_batch", "embedding")
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple texts with retry logic.
 
@@ -314,6 +327,7 @@ class OpenAIEmbeddings:
             )
         return self._client
 
+    @traced("embedding.openai", "embedding")
     def embed(self, text: str) -> list[float]:
         """Generate embedding for a single text.
 
@@ -335,6 +349,7 @@ class OpenAIEmbeddings:
                 )
                 time.sleep(settings.embedding_retry_delay * (attempt + 1))
 
+    @traced("embedding.openai_batch", "embedding")
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple texts in batches."""
         if not texts:
@@ -438,13 +453,30 @@ atexit.register(close_embeddings_client)
 def embed_text(text: str) -> list[float]:
     """Generate embedding for a single text using global client.
 
+    Query embeddings are cached in the ``embeddings`` cache tier, shared
+    by every server worker on the host (see aion.cache), keyed by
+    provider, model and text. Cached vectors are float32, so every call —
+    hit or miss — returns the same float32-rounded values.
+
     Args:
         text: Text to embed
 
     Returns:
         Embedding vector as list of floats
     """
-    return get_embeddings_client().embed(text)
+    key = f"{settings.effective_embedding_provider}:{settings.embedding_model}:{text}"
+    packed = cache_tier(
+        "embeddings", maxsize=_QUERY_CACHE_SIZE, ttl=_QUERY_CACHE_TTL,
+    ).get_or_set(key, lambda: _pack_vector(get_embeddings_client().embed(text)))
+    return _unpack_vector(packed)
+
+
+def _pack_vector(vector: list[float]) -> str:
+    return base64.b64encode(array("f", vector).tobytes()).decode("ascii")
+
+
+def _unpack_vector(packed: str) -> list[float]:
+    return array("f", base64.b64decode(packed)).tolist()
 
 
 def embed_texts(texts: list[str]) -> list[list[float]]:
@@ -10,6 +10,7 @@ from weaviate.classes.data import DataObject
 
 from aion.chunking.strategies import ChunkingConfig
 from aion.config import settings
+from aion.ingestion import doc_index
 from aion.ingestion.collections import CollectionManager
 from aion.ingestion.embeddings import embed_texts
 from aion.loaders import DocumentLoader, MarkdownLoader
@@ -120,6 +121,8 @@ class DataIngestionPipeline:
         self.collection_manager = CollectionManager(client)
         self._registry = get_registry_lookup()
         self._principle_owners = _load_principle_owner_map()
+        # Document-number index rows staged per collection during a run
+        self._doc_index_entries: dict[str, list[dict]] = {}
 
     def _enrich_from_registry(self, doc_dict: dict, doc_type: str) -> dict:
         """Enrich a document dict with metadata from esa_doc_registry.md.
@@ -196,6 +199,7 @@ class DataIngestionPipeline:
 
         # Create collections (also cleans up legacy _OpenAI collections)
         self.collection_manager.create_all_collections(recreate=recreate_collections)
+        self._doc_index_entries = {}
 
         stats = {
             "vocabulary": 0,
@@ -253,9 +257,30 @@ class DataIngestionPipeline:
                 logger.error(f"Error ingesting policies: {e}")
                 stats["errors"].append(f"policy: {str(e)}")
 
+        self._write_doc_index(stats["errors"])
+
         logger.info(f"Ingestion complete. Stats: {stats}")
         return stats
 
+    def _write_doc_index(self, errors: list[str]) -> None:
+        """Replace the document-number index for each cleanly ingested collection.
+
+        A collection whose ingestion raised keeps its previous entries;
+        reference lookups fall back to a property filter for anything the
+        index no longer resolves.
+        """
+        for kind, name in (
+            ("adr", CollectionManager.ADR_COLLECTION),
+            ("principle", CollectionManager.PRINCIPLE_COLLECTION),
+        ):
+            if any(err.startswith(f"{kind}:") for err in errors):
+                logger.warning(f"Skipping document index update for {name}: ingestion errors")
+                continue
+            try:
+                doc_index.replace_collection(name, self._doc_index_entries.get(name, []))
+            except Exception as e:
+                logger.error(f"Failed to update document index for {name}: {e}")
+
     def _ingest_adrs(self, batch_size: int) -> int:
         """Ingest Architectural Decision Records.
 
@@ -508,7 +533,7 @@ class DataIngestionPipeline:
 
         config = ChunkingConfig(index_document_level=True, index_section_level=True, index_granular=False)
 
-        for chunked_doc in loader.load_adrs_chunked(adr_path, config):
+        for chunked_doc in loader.load_adrs_chunked(adr_path, config, workers=settings.ingestion_workers):
             title_lower = chunked_doc.document_title.lower()
             source_lower = chunked_doc.source_file.lower()
             # Skip non-content files: templates and index pages are
@@ -567,7 +592,9 @@ class DataIngestionPipeline:
 
         config = ChunkingConfig(index_document_level=True, index_section_level=True, index_granular=False)
 
-        for chunked_doc in loader.load_principles_chunked(principles_path, config):
+        for chunked_doc in loader.load_principles_chunked(
+            principles_path, config, workers=settings.ingestion_workers,
+        ):
             title_lower = chunked_doc.document_title.lower()
             source_lower = chunked_doc.source_file.lower()
             filename = Path(chunked_doc.source_file).name.lower()
@@ -625,7 +652,7 @@ class DataIngestionPipeline:
 
         for policy_path in policy_paths:
             loader = DocumentLoader(policy_path)
-            for chunked_doc in loader.load_all_chunked():
+            for chunked_doc in loader.load_all_chunked(workers=settings.ingestion_workers):
                 chunks = chunked_doc.get_chunks_for_indexing(
                     include_document_level=True,
                     include_section_level=True,
@@ -717,6 +744,17 @@ class DataIngestionPipeline:
                     logger.error(f"Batch insert error ({doc_type}): {error}")
             else:
                 logger.debug(f"Inserted batch of {len(batch)} {doc_type} objects with embeddings")
+            self._stage_doc_index(collection.name, batch, result.errors)
         except Exception as e:
             logger.error(f"Failed to insert batch with embeddings ({doc_type}): {e}")
             raise
+
+    def _stage_doc_index(self, collection_name: str, batch: list, errors: dict) -> None:
+        """Stage index rows for the objects of a batch that were inserted."""
+        staged = self._doc_index_entries.setdefault(collection_name, [])
+        for i, obj in enumerate(batch):
+            if i in errors:
+                continue
+            entry = doc_index.index_entry(obj.uuid, obj.properties)
+            if entry:
+                staged.append(entry)
@@ -0,0 +1,397 @@
+"""Admission control and priority scheduling for LLM calls.
+
+Every LLM request — pydantic-ai agent model requests, Persona
+classification, quality-gate checks, rolling and per-turn summaries, the
+generation pipeline, synthesis streams, inspect reviews and comparison
+mode — takes a slot from the process-wide ``llm_scheduler`` before it is
+sent, and gives it back when the response (or stream) is finished.
+
+**Lanes.** Each provider (``ollama``, ``openai``, ``github_models``) has
+its own concurrency limit and an optional token bucket (requests per
+minute with a burst allowance). A local Ollama serves a handful of
+requests at once and queues the rest in arrival order; keeping the limit
+here at or below ``OLLAMA_NUM_PARALLEL`` moves that queue into the
+scheduler, where it is ordered by priority.
+
+**Priorities.** Waiters are granted slots in ``Priority`` order
+(interactive answer > classification > gate > background), FIFO within a
+class. A running request is never pre-empted.
+
+**Shedding.** ``BACKGROUND`` work is dropped with ``LLMShedError`` when
+interactive requests are waiting longer than ``interactive_budget_ms``
+(p90 queue wait over the last minute, or an interactive request queued
+longer than that right now), or when it has itself waited longer than
+``background_deadline_ms``. Callers treat the error like any other
+failed call — the rolling summary keeps its watermark and the turn
+summary falls back to truncation.
+
+Waiters may be coroutines on any event loop (agents run on worker
+threads with their own loops), so the state lives under one
+``threading.Lock`` and grants wake waiters thread-safely.
+
+Module-level singleton ``llm_scheduler`` follows the ``pixel_registry``
+pattern: chat_ui calls ``configure()`` at startup with the values from
+``llm_scheduler:`` in runtime.yaml. Unconfigured (CLI, tests) it admits
+up to ``DEFAULT_CONCURRENCY`` requests per provider without rate limits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from enum import IntEnum
+
+from aion.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+_STATS_WINDOW_S = 60.0
+_MAX_SAMPLES = 1000
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+
+    INTERACTIVE = 0
+    CLASSIFICATION = 1
+    GATE = 2
+    BACKGROUND = 3
+
+
+class LLMShedError(RuntimeError):
+    """A background LLM call was dropped to protect interactive latency."""
+
+
+class _TokenBucket:
+    """Requests-per-minute limiter; ``reserve`` returns the wait in seconds."""
+
+    def __init__(self, rpm: float, burst: int):
+        self.rate = rpm / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1.0
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued", "deadline", "granted", "shed", "_wake")
+
+    def __init__(self, priority: Priority, deadline: float | None, wake):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.deadline = deadline
+        self.granted = False
+        self.shed = False
+        self._wake = wake
+
+    def wake(self) -> bool:
+        return self._wake()
+
+
+class _Lane:
+    def __init__(self, limit: int, bucket: _TokenBucket | None):
+        self.limit = limit
+        self.bucket = bucket
+        self.active = 0
+        self.waiters: list[tuple[int, int, _Waiter]] = []
+
+
+class LLMScheduler:
+    """Per-provider concurrency limits, priority queues and rate limiting."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self.configure()
+
+    def configure(
+        self,
+        providers: dict[str, dict] | None = None,
+        default_concurrency: int = DEFAULT_CONCURRENCY,
+        interactive_budget_ms: float = 2000,
+        background_deadline_ms: float = 30000,
+    ) -> None:
+        """Set lane limits and shedding thresholds.
+
+        Args:
+            providers: ``{provider: {"concurrency": n, "rpm": r, "burst": b}}``.
+                ``rpm`` 0 (default) disables rate limiting for the provider.
+            default_concurrency: Limit for providers not listed.
+            interactive_budget_ms: Interactive queue wait above which
+                background work is shed.
+            background_deadline_ms: Longest a background call may queue.
+
+        Requests already queued keep their place; new limits apply to the
+        next grant.
+        """
+        with self._lock:
+            self._providers = providers or {}
+            self._default_concurrency = max(1, int(default_concurrency))
+            self._budget_s = interactive_budget_ms / 1000
+            self._background_deadline_s = background_deadline_ms / 1000
+            lanes = getattr(self, "_lanes", {})
+            self._lanes: dict[str, _Lane] = {}
+            for name, old in lanes.items():
+                lane = self._new_lane(name)
+                lane.active, lane.waiters = old.active, old.waiters
+                self._lanes[name] = lane
+            for name in lanes:
+                self._dispatch(name)
+            if not hasattr(self, "_stats"):
+                self._reset_stats()
+
+    def _new_lane(self, provider: str) -> _Lane:
+        cfg = self._providers.get(provider) or {}
+        limit = max(1, int(cfg.get("concurrency", self._default_concurrency)))
+        rpm = float(cfg.get("rpm", 0) or 0)
+        bucket = _TokenBucket(rpm, int(cfg.get("burst", 1) or 1)) if rpm > 0 else None
+        return _Lane(limit, bucket)
+
+    def _lane(self, provider: str) -> _Lane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            lane = self._lanes[provider] = self._new_lane(provider)
+        return lane
+
+    # ── admission ──
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, provider: str, priority: Priority, deadline_ms: float | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold a slot on ``provider``'s lane for the duration of the block.
+
+        Raises:
+            LLMShedError: The call was shed before it started.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake() -> bool:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:  # the waiter's loop has closed
+                return False
+            return True
+
+        with span("llm_scheduler.wait", "scheduler", provider=provider, priority=priority.name.lower()):
+            waiter = self._enqueue(provider, priority, deadline_ms, wake)
+            if not (waiter.granted or waiter.shed):
+                timeout = None if waiter.deadline is None else max(0.0, waiter.deadline - time.monotonic())
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), timeout)
+                except asyncio.TimeoutError:
+                    self._expire(provider, waiter)
+                except BaseException:
+                    self._abandon(provider, waiter)
+                    raise
+            delay = self._admit(provider, waiter)
+            if delay:
+                try:
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    self._release(provider)
+                    raise
+        try:
+            yield
+        finally:
+            self._release(provider)
+
+    def _enqueue(self, provider: str, priority: Priority, deadline_ms, wake) -> _Waiter:
+        if deadline_ms is None and priority == Priority.BACKGROUND:
+            deadline_ms = self._background_deadline_s * 1000
+        deadline = None if deadline_ms is None else time.monotonic() + deadline_ms / 1000
+        waiter = _Waiter(priority, deadline, wake)
+        with self._lock:
+            if priority == Priority.BACKGROUND and self._overloaded():
+                waiter.shed = True
+            else:
+                lane = self._lane(provider)
+                heapq.heappush(lane.waiters, (priority, next(self._seq), waiter))
+                self._dispatch(provider)
+        return waiter
+
+    def _admit(self, provider: str, waiter: _Waiter) -> float:
+        """Record the queue wait of a woken waiter; raise if it was shed."""
+        waited = time.monotonic() - waiter.enqueued
+        with self._lock:
+            stats = self._stats[waiter.priority]
+            if waiter.shed:
+                stats["shed"] += 1
+            else:
+                stats["requests"] += 1
+                stats["total_wait"] += waited
+                stats["max_wait"] = max(stats["max_wait"], waited)
+                stats["waits"].append((time.monotonic(), waited))
+                bucket = self._lanes[provider].bucket
+                delay = bucket.reserve() if bucket else 0.0
+        if waiter.shed:
+            logger.info(f"Shed {waiter.priority.name.lower()} LLM call on {provider} after {waited * 1000:.0f}ms")
+            raise LLMShedError(f"{waiter.priority.name.lower()} LLM call on {provider} shed")
+        return delay
+
+    def _expire(self, provider: str, waiter: _Waiter) -> None:
+        """Deadline passed while queued: shed unless granted meanwhile."""
+        with self._lock:
+            if not waiter.granted:
+                self._remove(provider, waiter)
+                waiter.shed = True
+
+    def _abandon(self, provider: str, waiter: _Waiter) -> None:
+        """The waiting caller was cancelled: drop its place or its slot."""
+        with self._lock:
+            if not waiter.granted:
+                self._remove(provider, waiter)
+                return
+        self._release(provider)
+
+    def _remove(self, provider: str, waiter: _Waiter) -> None:
+        lane = self._lanes[provider]
+        lane.waiters = [entry for entry in lane.waiters if entry[2] is not waiter]
+        heapq.heapify(lane.waiters)
+
+    def _release(self, provider: str) -> None:
+        with self._lock:
+            self._lanes[provider].active -= 1
+            self._dispatch(provider)
+
+    def _dispatch(self, provider: str) -> None:
+        """Grant free slots in priority order (lock held)."""
+        lane = self._lanes[provider]
+        overloaded = None
+        while lane.waiters and lane.active < lane.limit:
+            _, _, waiter = heapq.heappop(lane.waiters)
+            if waiter.priority == Priority.BACKGROUND:
+                if overloaded is None:
+                    overloaded = self._overloaded()
+                if overloaded:
+                    waiter.shed = True
+                    waiter.wake()
+                    continue
+            waiter.granted = True
+            if waiter.wake():
+                lane.active += 1
+
+    def _overloaded(self) -> bool:
+        """Interactive queue wait over budget, recently or right now (lock held)."""
+        now = time.monotonic()
+        for lane in self._lanes.values():
+            for priority, _, waiter in lane.waiters:
+                if priority == Priority.INTERACTIVE and now - waiter.enqueued > self._budget_s:
+                    return True
+        p90 = self._recent_percentile(Priority.INTERACTIVE, 0.9, now)
+        return p90 is not None and p90 > self._budget_s
+
+    # ── metrics ──
+
+    def _recent_percentile(self, priority: Priority, q: float, now: float) -> float | None:
+        waits = self._stats[priority]["waits"]
+        while waits and waits[0][0] < now - _STATS_WINDOW_S:
+            waits.popleft()
+        if not waits:
+            return None
+        ordered = sorted(w for _, w in waits)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def _reset_stats(self) -> None:
+        self._stats = {
+            p: {"requests": 0, "shed": 0, "total_wait": 0.0, "max_wait": 0.0,
+                "waits": deque(maxlen=_MAX_SAMPLES)}
+            for p in Priority
+        }
+
+    def snapshot(self) -> dict:
+        """Lane occupancy, queue wait per priority (ms) and shed counts."""
+        with self._lock:
+            now = time.monotonic()
+            priorities = {}
+            for p in Priority:
+                s = self._stats[p]
+                p95 = self._recent_percentile(p, 0.95, now)
+                priorities[p.name.lower()] = {
+                    "requests": s["requests"],
+                    "shed": s["shed"],
+                    "queue_avg_ms": round(s["total_wait"] / s["requests"] * 1000, 1) if s["requests"] else None,
+                    "queue_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                    "queue_max_ms": round(s["max_wait"] * 1000, 1),
+                }
+            return {
+                "overloaded": self._overloaded(),
+                "interactive_budget_ms": round(self._budget_s * 1000),
+                "providers": {
+                    name: {
+                        "limit": lane.limit,
+                        "active": lane.active,
+                        "queued": len(lane.waiters),
+                        "rpm": round(lane.bucket.rate * 60, 1) if lane.bucket else None,
+                    }
+                    for name, lane in sorted(self._lanes.items())
+                },
+                "priorities": priorities,
+            }
+
+    def reset(self) -> None:
+        """Clear metrics and restore the unconfigured defaults (tests)."""
+        with self._lock:
+            self._lanes = {}
+            self._reset_stats()
+        self.configure()
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+llm_scheduler = LLMScheduler()
+
+
+@functools.cache
+def _scheduled_model_class():
+    from contextlib import asynccontextmanager
+
+    from pydantic_ai.models.wrapper import WrapperModel
+
+    class ScheduledModel(WrapperModel):
+        """pydantic-ai model wrapper taking a scheduler slot per request.
+
+        The slot covers one model request, not the agent run, so tool
+        calls between requests do not hold it.
+        """
+
+        def __init__(self, wrapped, provider: str, priority: Priority):
+            super().__init__(wrapped)
+            self.llm_provider = provider
+            self.priority = priority
+
+        async def request(self, *args, **kwargs):
+            async with llm_scheduler.slot(self.llm_provider, self.priority):
+                return await super().request(*args, **kwargs)
+
+        @asynccontextmanager
+        async def request_stream(self, *args, **kwargs):
+            async with llm_scheduler.slot(self.llm_provider, self.priority):
+                async with super().request_stream(*args, **kwargs) as stream:
+                    yield stream
+
+    return ScheduledModel
+
+
+def scheduled_model(model, provider: str, priority: Priority):
+    """Wrap a pydantic-ai model so each request goes through ``llm_scheduler``."""
+    return _scheduled_model_class()(model, provider, priority)
@@ -8,10 +8,12 @@ Supports two modes:
 import logging
 from collections.abc import Iterator
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 from aion.loaders.index_metadata_loader import get_document_metadata
+from aion.loaders.parallel import iter_ordered
 
 # Import chunking module (optional, for enhanced chunking)
 try:
@@ -380,6 +382,7 @@ class DocumentLoader:
     def load_all_chunked(
         self,
         config: Optional["ChunkingConfig"] = None,
+        workers: int | None = 1,
     ) -> Iterator["ChunkedDocument"]:
         """Load all documents with hierarchical, structure-aware chunking.
 
@@ -389,6 +392,8 @@ class DocumentLoader:
 
         Args:
             config: Optional chunking configuration
+            workers: Worker processes for extraction/chunking (1 = serial,
+                None or 0 = one per CPU). Output order is the same.
 
         Yields:
             ChunkedDocument objects with hierarchical chunks
@@ -397,8 +402,6 @@ class DocumentLoader:
             logger.warning("Chunking module not available. Use load_all() instead.")
             return
 
-        strategy = PolicyChunkingStrategy(config)
-
         docx_files = list(self.documents_path.glob("*.docx"))
         pdf_files = list(self.documents_path.glob("*.pdf"))
 
@@ -406,43 +409,41 @@ class DocumentLoader:
             f"Loading {len(docx_files)} DOCX and {len(pdf_files)} PDF files with chunking"
         )
 
-        for docx_file in docx_files:
-            try:
-                content, title = self._extract_docx_content(docx_file)
-                if content:
-                    index_metadata = get_document_metadata(docx_file)
-                    chunked_doc = strategy.chunk_document(
-                        content=content,
-                        file_path=str(docx_file),
-                        title=title,
-                        metadata=index_metadata,
-                    )
-                    logger.debug(
-                        f"Chunked DOCX '{title}' into {chunked_doc.total_chunks} chunks"
-                    )
-                    yield chunked_doc
-            except Exception as e:
-                logger.error(f"Error chunking DOCX {docx_file}: {e}")
+        chunk_fn = partial(self._chunk_file, config=config)
+        for file_path, chunked_doc, error in iter_ordered(chunk_fn, docx_files + pdf_files, workers):
+            kind = "DOCX" if file_path.suffix.lower() == ".docx" else "PDF"
+            if error is not None:
+                logger.error(f"Error chunking {kind} {file_path}: {error}")
                 continue
+            if chunked_doc is None:
+                continue  # no extractable content
+            logger.debug(
+                f"Chunked {kind} '{chunked_doc.document_title}' into {chunked_doc.total_chunks} chunks"
+            )
+            yield chunked_doc
 
-        for pdf_file in pdf_files:
-            try:
-                content, title = self._extract_pdf_content(pdf_file)
-                if content:
-                    index_metadata = get_document_metadata(pdf_file)
-                    chunked_doc = strategy.chunk_document(
-                        content=content,
-                        file_path=str(pdf_file),
-                        title=title,
-                        metadata=index_metadata,
-                    )
-                    logger.debug(
-                        f"Chunked PDF '{title}' into {chunked_doc.total_chunks} chunks"
-                    )
-                    yield chunked_doc
-            except Exception as e:
-                logger.error(f"Error chunking PDF {pdf_file}: {e}")
-                continue
+    def _chunk_file(
+        self,
+        file_path: Path,
+        config: Optional["ChunkingConfig"],
+    ) -> Optional["ChunkedDocument"]:
+        """Extract and chunk one DOCX/PDF file; None when it has no content.
+
+        Self-contained so it can run in a worker process (see
+        ``aion.loaders.parallel``).
+        """
+        if file_path.suffix.lower() == ".docx":
+            content, title = self._extract_docx_content(file_path)
+        else:
+            content, title = self._extract_pdf_content(file_path)
+        if not content:
+            return None
+        return PolicyChunkingStrategy(config).chunk_document(
+            content=content,
+            file_path=str(file_path),
+            title=title,
+            metadata=get_document_metadata(file_path),
+        )
 
     def _extract_docx_content(self, file_path: Path) -> tuple[str, str]:
         """Extract content and title from a DOCX file.
@@ -80,11 +80,10 @@ for the Energy System Architecture team.
 """
 
 import logging
-import re
 from dataclasses import dataclass, field
 from pathlib import Path
 
-import yaml
+from aion.yaml_utils import YAMLError, load_yaml, split_frontmatter
 
 logger = logging.getLogger(__name__)
 
@@ -346,13 +345,13 @@ def load_index_metadata(index_path: Path) -> IndexMetadata | None:
         content = index_path.read_text(encoding="utf-8")
 
         # Extract YAML frontmatter
-        frontmatter_match = re.match(r"^---\s*\n(.*?)\n---", content, re.DOTALL)
-        if not frontmatter_match:
+        split = split_frontmatter(content)
+        if split is None:
             logger.warning(f"No YAML frontmatter found in {index_path}")
             return None
 
-        yaml_content = frontmatter_match.group(1)
-        data = yaml.safe_load(yaml_content)
+        yaml_content = split[0]
+        data = load_yaml(yaml_content)
 
         if not data:
             logger.warning(f"Empty YAML frontmatter in {index_path}")
@@ -369,7 +368,7 @@ def load_index_metadata(index_path: Path) -> IndexMetadata | None:
             raw_content=content,
         )
 
-    except yaml.YAMLError as e:
+    except YAMLError as e:
         logger.error(f"Failed to parse YAML in {index_path}: {e}")
         return None
     except Exception as e:
@@ -9,12 +9,14 @@ import logging
 import re
 from collections.abc import Iterator
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 import frontmatter
 
 from aion.loaders.index_metadata_loader import get_document_metadata
+from aion.loaders.parallel import iter_ordered
 
 # Import chunking module (optional, for enhanced chunking)
 try:
@@ -560,6 +562,7 @@ class MarkdownLoader:
         self,
         adr_path: Path,
         config: Optional["ChunkingConfig"] = None,
+        workers: int | None = 1,
     ) -> Iterator["ChunkedDocument"]:
         """Load ADRs with hierarchical section-based chunking.
 
@@ -570,6 +573,8 @@ class MarkdownLoader:
         Args:
             adr_path: Path to ADR directory
             config: Optional chunking configuration
+            workers: Worker processes for parsing/chunking (1 = serial,
+                None or 0 = one per CPU). Output order is the same.
 
         Yields:
             ChunkedDocument objects with hierarchical chunks
@@ -578,59 +583,34 @@ class MarkdownLoader:
             logger.warning("Chunking module not available. Use load_adrs() instead.")
             return
 
-        strategy = ADRChunkingStrategy(config)
         adr_files = sorted(f for f in adr_path.glob("*.md") if self._is_content_file(f))
         logger.info(f"Loading {len(adr_files)} ADR files with chunking")
 
-        for adr_file in adr_files:
-            try:
-                content = adr_file.read_text(encoding="utf-8")
-
-                # Parse frontmatter
-                try:
-                    post = frontmatter.loads(content)
-                    body = post.content
-                except Exception:
-                    body = content
-
-                title = self._extract_title(body, adr_file)
-                index_metadata = get_document_metadata(adr_file)
-
-                # Extract Dublin Core metadata from frontmatter
-                try:
-                    dct = post.metadata.get("dct", {})
-                    if isinstance(dct, dict):
-                        index_metadata["dct_identifier"] = dct.get("identifier", "")
-                        index_metadata["dct_issued"] = str(dct.get("issued", ""))
-                except (AttributeError, NameError):
-                    pass  # frontmatter parse failed — fields stay empty
-
-                chunked_doc = strategy.chunk_document(
-                    content=body,
-                    file_path=str(adr_file),
-                    title=title,
-                    metadata=index_metadata,
-                )
-
-                logger.debug(
-                    f"Chunked ADR '{title}' into {chunked_doc.total_chunks} chunks"
-                )
-                yield chunked_doc
-
-            except Exception as e:
-                logger.error(f"Error chunking ADR {adr_file}: {e}")
+        chunk_fn = partial(
+            self._chunk_file, strategy_cls=ADRChunkingStrategy, config=config, extract_dct=True,
+        )
+        for adr_file, chunked_doc, error in iter_ordered(chunk_fn, adr_files, workers):
+            if error is not None:
+                logger.error(f"Error chunking ADR {adr_file}: {error}")
                 continue
+            logger.debug(
+                f"Chunked ADR '{chunked_doc.document_title}' into {chunked_doc.total_chunks} chunks"
+            )
+            yield chunked_doc
 
     def load_principles_chunked(
         self,
         principles_path: Path,
         config: Optional["ChunkingConfig"] = None,
+        workers: int | None = 1,
     ) -> Iterator["ChunkedDocument"]:
         """Load principles with hierarchical section-based chunking.
 
         Args:
             principles_path: Path to principles directory
             config: Optional chunking configuration
+            workers: Worker processes for parsing/chunking (1 = serial,
+                None or 0 = one per CPU). Output order is the same.
 
         Yields:
             ChunkedDocument objects with hierarchical chunks
@@ -639,52 +619,25 @@ class MarkdownLoader:
             logger.warning("Chunking module not available. Use load_principles() instead.")
             return
 
-        strategy = PrincipleChunkingStrategy(config)
         principle_files = sorted(f for f in principles_path.glob("*.md") if self._is_content_file(f))
         logger.info(f"Loading {len(principle_files)} principle files with chunking")
 
-        for principle_file in principle_files:
-            try:
-                content = principle_file.read_text(encoding="utf-8")
-
-                # Parse frontmatter
-                try:
-                    post = frontmatter.loads(content)
-                    body = post.content
-                except Exception:
-                    body = content
-
-                title = self._extract_title(body, principle_file)
-                index_metadata = get_document_metadata(principle_file)
-
-                # Extract Dublin Core metadata from frontmatter
-                try:
-                    dct = post.metadata.get("dct", {})
-                    if isinstance(dct, dict):
-                        index_metadata["dct_identifier"] = dct.get("identifier", "")
-                        index_metadata["dct_issued"] = str(dct.get("issued", ""))
-                except (AttributeError, NameError):
-                    pass  # frontmatter parse failed — fields stay empty
-
-                chunked_doc = strategy.chunk_document(
-                    content=body,
-                    file_path=str(principle_file),
-                    title=title,
-                    metadata=index_metadata,
-                )
-
-                logger.debug(
-                    f"Chunked principle '{title}' into {chunked_doc.total_chunks} chunks"
-                )
-                yield chunked_doc
-
-            except Exception as e:
-                logger.error(f"Error chunking principle {principle_file}: {e}")
+        chunk_fn = partial(
+            self._chunk_file, strategy_cls=PrincipleChunkingStrategy, config=config, extract_dct=True,
+        )
+        for principle_file, chunked_doc, error in iter_ordered(chunk_fn, principle_files, workers):
+            if error is not None:
+                logger.error(f"Error chunking principle {principle_file}: {error}")
                 continue
+            logger.debug(
+                f"Chunked principle '{chunked_doc.document_title}' into {chunked_doc.total_chunks} chunks"
+            )
+            yield chunked_doc
 
     def load_all_chunked(
         self,
         config: Optional["ChunkingConfig"] = None,
+        workers: int | None = 1,
     ) -> Iterator["ChunkedDocument"]:
         """Load all markdown files with appropriate chunking strategy.
 
@@ -693,6 +646,8 @@ class MarkdownLoader:
 
         Args:
             config: Optional chunking configuration
+            workers: Worker processes for parsing/chunking (1 = serial,
+                None or 0 = one per CPU). Output order is the same.
 
         Yields:
             ChunkedDocument objects
@@ -704,38 +659,64 @@ class MarkdownLoader:
         md_files = list(self.base_path.rglob("*.md"))
         logger.info(f"Loading {len(md_files)} markdown files with chunking")
 
-        for md_file in md_files:
-            try:
-                doc_type = self._determine_doc_type(md_file)
+        chunk_fn = partial(self._chunk_file, strategy_cls=None, config=config, extract_dct=False)
+        for md_file, chunked_doc, error in iter_ordered(chunk_fn, md_files, workers):
+            if error is not None:
+                logger.error(f"Error chunking {md_file}: {error}")
+                continue
+            yield chunked_doc
+
+    def _chunk_file(
+        self,
+        file_path: Path,
+        strategy_cls: type | None,
+        config: Optional["ChunkingConfig"],
+        extract_dct: bool,
+    ) -> "ChunkedDocument":
+        """Read, parse and chunk one markdown file.
 
-                if doc_type == "adr":
-                    strategy = ADRChunkingStrategy(config)
-                elif doc_type == "principle":
-                    strategy = PrincipleChunkingStrategy(config)
-                else:
-                    # Use principle strategy as default for other markdown
-                    strategy = PrincipleChunkingStrategy(config)
+        Self-contained so it can run in a worker process (see
+        ``aion.loaders.parallel``). Exceptions propagate to the caller,
+        which logs and skips the file.
 
-                content = md_file.read_text(encoding="utf-8")
+        Args:
+            file_path: Markdown file to chunk
+            strategy_cls: Chunking strategy class, or None to pick one
+                from the file's document type (ADR, else Principle)
+            config: Optional chunking configuration
+            extract_dct: Copy Dublin Core identifier/issued from frontmatter
+        """
+        if strategy_cls is None:
+            if self._determine_doc_type(file_path) == "adr":
+                strategy_cls = ADRChunkingStrategy
+            else:
+                # Use principle strategy as default for other markdown
+                strategy_cls = PrincipleChunkingStrategy
+        strategy = strategy_cls(config)
 
-                try:
-                    post = frontmatter.loads(content)
-                    body = post.content
-                except Exception:
-                    body = content
+        content = file_path.read_text(encoding="utf-8")
 
-                title = self._extract_title(body, md_file)
-                index_metadata = get_document_metadata(md_file)
+        # Parse frontmatter
+        post = None
+        try:
+            post = frontmatter.loads(content)
+            body = post.content
+        except Exception:
+            body = content
 
-                chunked_doc = strategy.chunk_document(
-                    content=body,
-                    file_path=str(md_file),
-                    title=title,
-                    metadata=index_metadata,
-                )
+        title = self._extract_title(body, file_path)
+        index_metadata = get_document_metadata(file_path)
 
-                yield chunked_doc
+        # Extract Dublin Core metadata from frontmatter
+        if extract_dct and post is not None:
+            dct = post.metadata.get("dct", {})
+            if isinstance(dct, dict):
+                index_metadata["dct_identifier"] = dct.get("identifier", "")
+                index_metadata["dct_issued"] = str(dct.get("issued", ""))
 
-            except Exception as e:
-                logger.error(f"Error chunking {md_file}: {e}")
-                continue
+        return strategy.chunk_document(
+            content=body,
+            file_path=str(file_path),
+            title=title,
+            metadata=index_metadata,
+        )
@@ -0,0 +1,103 @@
+"""Ordered process-pool map for the chunked loaders.
+
+Reading, frontmatter parsing, metadata resolution and chunking are pure
+per-file CPU work, so the chunked loaders hand each file to a worker
+process and stream the results back in input order — ingestion sees the
+same sequence of ``ChunkedDocument`` objects as the serial loop did.
+
+Workers are started with the ``spawn`` method, never ``fork``: ingestion
+holds an open Weaviate gRPC channel in the parent, and forking a process
+with live gRPC channels is unsafe. Workers only read files, so they open
+no clients of their own.
+"""
+
+import logging
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Futures kept in flight per worker. Bounds memory when the consumer
+# (embedding + Weaviate batches) is slower than the workers.
+_PREFETCH_PER_WORKER = 2
+
+
+def resolve_workers(workers: int | None) -> int:
+    """Worker count for a setting where ``None`` or ``0`` means one per CPU."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def iter_ordered(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int | None = 1,
+) -> Iterator[tuple[T, R | None, Exception | None]]:
+    """Apply ``fn`` to each item, yielding ``(item, result, error)`` in input order.
+
+    Exactly one of ``result``/``error`` is set. Errors are returned rather
+    than raised so callers keep their per-file "log and continue" handling.
+    Runs in-process when ``workers`` resolves to 1, for a single item, or
+    when the platform cannot start a process pool. ``fn`` and the items
+    must be picklable when a pool is used.
+
+    Args:
+        fn: Per-item function (module-level function or bound method).
+        items: Items to process.
+        workers: Worker processes; ``None`` or ``0`` = one per CPU.
+    """
+    items = list(items)
+    n_workers = min(resolve_workers(workers), len(items))
+    if n_workers <= 1:
+        yield from _iter_serial(fn, items)
+        return
+
+    try:
+        pool = ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"),
+        )
+    except (OSError, NotImplementedError) as e:
+        logger.warning(f"Process pool unavailable ({e}); loading serially")
+        yield from _iter_serial(fn, items)
+        return
+
+    with pool:
+        pending: deque[tuple[T, Future]] = deque()
+        remaining = iter(items)
+        window = n_workers * _PREFETCH_PER_WORKER
+        try:
+            for item in remaining:
+                pending.append((item, pool.submit(fn, item)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                item, future = pending.popleft()
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
+                for nxt in remaining:
+                    pending.append((nxt, pool.submit(fn, nxt)))
+                    break
+        finally:
+            # Consumer stopped early: drop queued work instead of finishing it
+            for _, future in pending:
+                future.cancel()
+
+
+def _iter_serial(fn: Callable[[T], R], items: list[T]) -> Iterator[tuple[T, R | None, Exception | None]]:
+    for item in items:
+        try:
+            result = fn(item)
+        except Exception as e:
+            yield item, None, e
+        else:
+            yield item, result, None
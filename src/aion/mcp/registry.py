@@ -8,7 +8,7 @@ import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
-import yaml
+from aion.yaml_utils import load_yaml
 
 
 @dataclass
@@ -43,7 +43,7 @@ def load_registry() -> dict[str, MCPServerConfig]:
     """Load MCP server configs from config.yaml."""
     global _servers
     with open(_CONFIG_PATH) as f:
-        raw = yaml.safe_load(f)
+        raw = load_yaml(f)
 
     for name, cfg in raw.get("servers", {}).items():
         auth = cfg.get("auth", {})
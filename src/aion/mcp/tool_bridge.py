@@ -32,6 +32,8 @@ from typing import Any, Awaitable, Callable
 
 from pydantic_ai.tools import RunContext
 
+from aion.tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,8 +129,9 @@ def build_mcp_tool_callable(
         # Drop None defaults for optional params so the MCP server sees only
         # what the LLM actually provided.
         payload = {k: v for k, v in kwargs.items() if v is not None}
-        server = await server_lookup(plugin_name, server_name)
-        return await server.call_tool(tool_name, payload)
+        with span(f"tool.{safe_name}", "tool", plugin=plugin_name):
+            server = await server_lookup(plugin_name, server_name)
+            return await server.call_tool(tool_name, payload)
 
     safe_name = f"{server_name}_{tool_name}".replace("-", "_")
     _tool.__name__ = safe_name
@@ -10,6 +10,7 @@ from datetime import datetime
 from pathlib import Path
 
 from aion.config import settings
+from aion.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,13 @@ def init_memory_tables(db_path: Path | None = None) -> None:
         )
     """)
 
+    # Migration: id of the last message folded into running_summary.
+    # Rolling summarization reads only messages after this watermark.
+    try:
+        cursor.execute("ALTER TABLE sessions ADD COLUMN summary_watermark INTEGER DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS user_profiles (
             user_id TEXT PRIMARY KEY,
@@ -61,6 +69,7 @@ def init_memory_tables(db_path: Path | None = None) -> None:
 # Session CRUD
 # ---------------------------------------------------------------------------
 
+@traced("db.create_session", "db")
 def create_session(conversation_id: str, db_path: Path | None = None) -> str:
     """Create a session record for a conversation. Returns session_id.
 
@@ -100,23 +109,57 @@ def get_running_summary(conversation_id: str, db_path: Path | None = None) -> st
     return (row[0] or "") if row else ""
 
 
-def update_running_summary(
-    conversation_id: str, summary: str, db_path: Path | None = None
-) -> None:
-    """Persist an updated running summary for the session."""
+def get_summary_state(conversation_id: str, db_path: Path | None = None) -> tuple[str, int]:
+    """Get the running summary and its watermark (last summarized message id)."""
     path = db_path or _DB_PATH
     conn = _get_connection(path)
     cursor = conn.cursor()
 
     cursor.execute(
-        "UPDATE sessions SET running_summary = ? WHERE conversation_id = ?",
-        (summary, conversation_id),
+        "SELECT running_summary, summary_watermark FROM sessions WHERE conversation_id = ?",
+        (conversation_id,),
     )
+    row = cursor.fetchone()
+    conn.close()
+
+    if not row:
+        return "", 0
+    return row[0] or "", row[1] or 0
+
+
+@traced("db.update_running_summary", "db")
+def update_running_summary(
+    conversation_id: str,
+    summary: str,
+    db_path: Path | None = None,
+    watermark: int | None = None,
+) -> None:
+    """Persist an updated running summary for the session.
+
+    ``watermark`` is the id of the last message the summary now covers;
+    when omitted the stored watermark is left unchanged.
+    """
+    path = db_path or _DB_PATH
+    conn = _get_connection(path)
+    cursor = conn.cursor()
+
+    if watermark is None:
+        cursor.execute(
+            "UPDATE sessions SET running_summary = ? WHERE conversation_id = ?",
+            (summary, conversation_id),
+        )
+    else:
+        cursor.execute(
+            "UPDATE sessions SET running_summary = ?, summary_watermark = ? "
+            "WHERE conversation_id = ?",
+            (summary, watermark, conversation_id),
+        )
 
     conn.commit()
     conn.close()
 
 
+@traced("db.end_session", "db")
 def end_session(conversation_id: str, db_path: Path | None = None) -> None:
     """Mark a session as ended."""
     path = db_path or _DB_PATH
@@ -167,6 +210,7 @@ def get_user_profile(user_id: str = _DEFAULT_USER, db_path: Path | None = None)
     }
 
 
+@traced("db.upsert_user_profile", "db")
 def upsert_user_profile(
     display_name: str = "",
     profile_block: str = "",
@@ -9,6 +9,7 @@ import logging
 import time
 
 from aion.config import is_reasoning_model, settings
+from aion.llm_scheduler import LLMShedError, Priority, llm_scheduler
 from aion.text_utils import elapsed_ms, strip_think_tags
 
 logger = logging.getLogger(__name__)
@@ -40,7 +41,7 @@ UPDATED SUMMARY:"""
 async def generate_rolling_summary(
     current_summary: str,
     messages_to_summarize: list[dict],
-) -> str:
+) -> str | None:
     """Generate an updated rolling summary incorporating new messages.
 
     Args:
@@ -48,7 +49,8 @@ async def generate_rolling_summary(
         messages_to_summarize: Messages that have left the verbatim window.
 
     Returns:
-        Updated summary text.
+        Updated summary text, or None if the LLM call failed or was shed —
+        the caller keeps its summary and must not advance its watermark.
     """
     if not messages_to_summarize:
         return current_summary
@@ -74,23 +76,29 @@ async def generate_rolling_summary(
         summary, latency_ms = await _call_llm(prompt)
         logger.info(f"Rolling summary generated: {latency_ms}ms, {len(summary)} chars")
         return summary.strip()
+    except LLMShedError:
+        logger.info("Rolling summary skipped: interactive LLM load over budget")
+        return None
     except Exception as e:
         logger.warning(f"Rolling summary generation failed: {e}")
-        # Fallback: keep the existing summary rather than losing it
-        return current_summary
+        return None
 
 
 async def _call_llm(prompt: str) -> tuple[str, int]:
-    """Single LLM call using the Persona's provider.
+    """Single LLM call using the Persona's provider, at background priority.
 
     Returns:
         Tuple of (response text, latency in ms).
+
+    Raises:
+        LLMShedError: The scheduler dropped the call under interactive load.
     """
     provider = settings.effective_persona_provider
 
-    if provider in ("github_models", "openai"):
-        return await _call_openai(prompt)
-    return await _call_ollama(prompt)
+    async with llm_scheduler.slot(provider, Priority.BACKGROUND):
+        if provider in ("github_models", "openai"):
+            return await _call_openai(prompt)
+        return await _call_ollama(prompt)
 
 
 async def _call_ollama(prompt: str) -> tuple[str, int]:
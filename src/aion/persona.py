@@ -14,8 +14,10 @@ import structlog
 
 from aion.config import is_reasoning_model, settings
 from aion.config.runtime import get_runtime_value
+from aion.llm_scheduler import Priority, llm_scheduler
 from aion.memory.session_store import get_running_summary, get_user_profile
 from aion.text_utils import elapsed_ms, strip_think_tags
+from aion.tracing import annotate, span
 
 logger = structlog.get_logger(__name__)
 
@@ -536,9 +538,11 @@ class Persona:
         Returns:
             Tuple of (response text, latency in ms).
         """
-        if self._use_openai_api:
-            return await self._classify_openai(system_prompt, user_prompt)
-        return await self._classify_ollama(system_prompt, user_prompt)
+        with span("persona.classify", "persona", model=settings.effective_persona_model):
+            async with llm_scheduler.slot(settings.effective_persona_provider, Priority.CLASSIFICATION):
+                if self._use_openai_api:
+                    return await self._classify_openai(system_prompt, user_prompt)
+                return await self._classify_ollama(system_prompt, user_prompt)
 
     async def _classify_ollama(self, system_prompt: str, user_prompt: str) -> tuple[str, int]:
         """Classify via Ollama API.
@@ -574,6 +578,10 @@ class Persona:
                     raise  # re-raise transient HTTP errors (429, 500, etc.)
                 result = response.json()
                 text = result.get("response", "")
+                annotate(
+                    input_tokens=result.get("prompt_eval_count"),
+                    output_tokens=result.get("eval_count"),
+                )
 
             # Strip <think> tags (chain-of-thought models)
             text = strip_think_tags(text)
@@ -626,6 +634,12 @@ class Persona:
                     f"Authentication failed for {provider}. Check your API key."
                 )
 
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            annotate(
+                input_tokens=usage.prompt_tokens,
+                output_tokens=usage.completion_tokens,
+            )
         choice = response.choices[0] if response.choices else None
         text = choice.message.content or "" if choice else ""
 
@@ -6,15 +6,26 @@ AInstein's Pydantic AI agents.
 
 JSONL records use the extension's transcript format so the existing
 transcriptParser.ts can drive character animations without modification.
+
+Records are never written on the request path: they go into a bounded
+in-memory buffer drained by one background writer thread (``_JsonlWriter``)
+that keeps each agent's file open and appends in batches. Delayed idle
+transitions are scheduled on the same thread's timer heap instead of a
+``threading.Timer`` per call. A full buffer drops records (counted in
+``stats()``) rather than blocking a request.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import json
 import os
 import re
 import threading
+import time
 import uuid
+from collections import deque
 from pathlib import Path
 from typing import Any
 
@@ -49,6 +60,144 @@ def _get_project_dir(ext_root: str | None) -> Path | None:
     return project_dir
 
 
+class _JsonlWriter:
+    """Background appender for the per-agent JSONL files.
+
+    Producers call ``put`` (or ``schedule`` for a delayed record) and return
+    immediately. The writer thread wakes when ``flush_records`` are queued,
+    every ``flush_interval`` seconds, or when a scheduled record falls due,
+    and appends everything queued per file in one write.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 10000,
+        flush_records: int = 64,
+        flush_interval: float = 0.1,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self._buffer: deque[tuple[Path, str]] = deque()
+        self._timers: list[tuple[float, int, Path, str]] = []  # heap by due time
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._handles: dict[Path, Any] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="pixel-agents-writer", daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Write what is buffered, drop pending timers and close the files."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._timers.clear()
+            self._cond.notify()
+        thread.join(timeout=5)
+        with self._cond:
+            self._thread = None
+        for handle in self._handles.values():
+            try:
+                handle.close()
+            except OSError:
+                pass
+        self._handles.clear()
+
+    def put(self, path: Path, record: dict[str, Any]) -> None:
+        line = json.dumps(record) + "\n"
+        with self._cond:
+            if len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return
+            self._buffer.append((path, line))
+            if len(self._buffer) in (1, self.flush_records):
+                self._cond.notify()
+
+    def schedule(self, delay: float, path: Path, record: dict[str, Any]) -> None:
+        line = json.dumps(record) + "\n"
+        with self._cond:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), path, line))
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._buffer) + len(self._timers)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping and not self._buffer and not self._timers:
+                    self._cond.wait()
+                # The interval runs from the first queued record, not from
+                # the last write, so a quiet writer doesn't spin.
+                deadline = time.monotonic() + self.flush_interval
+                while not self._stopping and len(self._buffer) < self.flush_records:
+                    now = time.monotonic()
+                    wakes = [deadline] if self._buffer else []
+                    if self._timers:
+                        wakes.append(self._timers[0][0])
+                    if not wakes or min(wakes) <= now:
+                        break
+                    self._cond.wait(min(wakes) - now)
+                now = time.monotonic()
+                while self._timers and self._timers[0][0] <= now:
+                    _, _, path, line = heapq.heappop(self._timers)
+                    if len(self._buffer) >= self.buffer_size:
+                        self.dropped += 1
+                    else:
+                        self._buffer.append((path, line))
+                batch = list(self._buffer)
+                self._buffer.clear()
+                stopping = self._stopping
+            if batch:
+                self._write_batch(batch)
+            if stopping:
+                return
+
+    def _write_batch(self, batch: list[tuple[Path, str]]) -> None:
+        by_path: dict[Path, list[str]] = {}
+        for path, line in batch:
+            by_path.setdefault(path, []).append(line)
+        for path, lines in by_path.items():
+            try:
+                handle = self._handles.get(path)
+                if handle is None:
+                    handle = self._handles[path] = open(path, "a")
+                handle.write("".join(lines))
+                # The extension's file watcher reads the file, not our buffer
+                handle.flush()
+                self.written += len(lines)
+            except OSError as e:
+                self._handles.pop(path, None)
+                logger.warning("pixel_agents.write_error", error=str(e))
+        self.flushes += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "written": self.written,
+                "dropped": self.dropped,
+                "flushes": self.flushes,
+                "buffered": len(self._buffer),
+                "scheduled": len(self._timers),
+            }
+
+
 class PixelAgentRegistry:
     """Manages per-agent JSONL files and the shared manifest."""
 
@@ -56,13 +205,23 @@ class PixelAgentRegistry:
         self._project_dir: Path | None = None
         self._agents: dict[str, dict[str, Any]] = {}  # key → {file, path, tool_counter}
         self._initialized = False
+        self._writer = _JsonlWriter()
 
-    def init(self, pixel_agents_dir: str | None = None) -> None:
-        """Create JSONL files and write the manifest.
+    def init(
+        self,
+        pixel_agents_dir: str | None = None,
+        buffer_size: int = 10000,
+        flush_records: int = 64,
+        flush_interval: float = 0.1,
+    ) -> None:
+        """Create JSONL files, write the manifest and start the writer.
 
         Args:
             pixel_agents_dir: Root directory for Pixel Agents data.
                               Pass settings.pixel_agents_dir from the caller.
+            buffer_size: Records held in memory before new ones are dropped.
+            flush_records: Queued records that trigger an immediate write.
+            flush_interval: Seconds between writes otherwise.
         """
         self._project_dir = _get_project_dir(pixel_agents_dir)
         if not self._project_dir:
@@ -100,6 +259,8 @@ class PixelAgentRegistry:
         }
         manifest_path = self._project_dir / "ainstein-manifest.json"
         manifest_path.write_text(json.dumps(manifest, indent=2))
+        self._writer = _JsonlWriter(buffer_size, flush_records, flush_interval)
+        self._writer.start()
         self._initialized = True
         logger.info(
             "pixel_agents.init",
@@ -108,9 +269,10 @@ class PixelAgentRegistry:
         )
 
     def shutdown(self) -> None:
-        """Remove manifest and JSONL files."""
+        """Stop the writer, then remove manifest and JSONL files."""
         if not self._initialized or not self._project_dir:
             return
+        self._writer.stop()
         manifest_path = self._project_dir / "ainstein-manifest.json"
         try:
             manifest_path.unlink(missing_ok=True)
@@ -224,17 +386,12 @@ class PixelAgentRegistry:
         if info.get("active_tool_id"):
             self.tool_result(agent_key, "Complete")
 
-        def _write_idle():
-            self._write(info, {
-                "type": "system",
-                "subtype": "turn_duration",
-            })
-
+        record = {"type": "system", "subtype": "turn_duration"}
         info["was_active"] = False
         if delay > 0:
-            threading.Timer(delay, _write_idle).start()
+            self._writer.schedule(delay, info["path"], record)
         else:
-            _write_idle()
+            self._write(info, record)
 
     def idle_all(self) -> None:
         """Mark all active agents as idle. Agents that never participated are skipped."""
@@ -244,12 +401,12 @@ class PixelAgentRegistry:
     # ── Internal ─────────────────────────────────────────────────────
 
     def _write(self, info: dict[str, Any], record: dict[str, Any]) -> None:
-        """Append a JSON record to the agent's JSONL file."""
-        try:
-            with open(info["path"], "a") as f:
-                f.write(json.dumps(record) + "\n")
-        except OSError as e:
-            logger.warning("pixel_agents.write_error", error=str(e))
+        """Queue a JSON record for the agent's JSONL file."""
+        self._writer.put(info["path"], record)
+
+    def stats(self) -> dict[str, int]:
+        """Writer counters: written, dropped, flushes, buffered, scheduled."""
+        return self._writer.stats()
 
 
 # Module-level singleton
@@ -8,11 +8,10 @@ import logging
 import shutil
 from typing import Any
 
-import yaml
-
 from aion.skills import DEFAULT_SKILL
 from aion.skills.registry import get_skill_registry
 from aion.tools.rag_search import DEFAULT_DISTANCE_THRESHOLD
+from aion.yaml_utils import YAMLError, dump_yaml, load_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -256,7 +255,7 @@ def update_thresholds(skill_name: str, thresholds: dict[str, Any]) -> dict[str,
     shutil.copy(thresholds_path, thresholds_path.with_suffix(".yaml.bak"))
 
     with open(thresholds_path, "w") as f:
-        yaml.dump(thresholds, f, default_flow_style=False, sort_keys=False)
+        dump_yaml(thresholds, f, default_flow_style=False, sort_keys=False)
 
     loader.clear_cache()
 
@@ -277,7 +276,7 @@ def get_plugin_thresholds(plugin_name: str) -> dict[str, Any]:
     path = plugin.thresholds_path
     if not path.exists():
         return {}
-    return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return load_yaml(path.read_text(encoding="utf-8")) or {}
 
 
 def update_plugin_thresholds(
@@ -317,7 +316,7 @@ def update_plugin_thresholds(
         if lead:
             header = "\n".join(lead).rstrip() + "\n\n"
 
-    body = yaml.dump(thresholds, default_flow_style=False, sort_keys=False)
+    body = dump_yaml(thresholds, default_flow_style=False, sort_keys=False)
     path.write_text(header + body, encoding="utf-8")
     _get_registry().reload()
     return {"success": True, "plugin": plugin_name, "thresholds": thresholds}
@@ -510,10 +509,10 @@ def _validate_skill_content(content: str) -> tuple[bool, list[str]]:
 
     frontmatter_text = content[3:second_delimiter].strip()
     try:
-        metadata = yaml.safe_load(frontmatter_text)
+        metadata = load_yaml(frontmatter_text)
         if metadata is None:
             metadata = {}
-    except yaml.YAMLError as e:
+    except YAMLError as e:
         errors.append(f"Invalid YAML in frontmatter: {e}")
         return (False, errors)
 
@@ -542,8 +541,8 @@ def _parse_skill_content(content: str) -> tuple[dict[str, Any], str]:
         if second_delimiter != -1:
             frontmatter_text = content[3:second_delimiter].strip()
             try:
-                metadata = yaml.safe_load(frontmatter_text) or {}
-            except yaml.YAMLError:
+                metadata = load_yaml(frontmatter_text) or {}
+            except YAMLError:
                 pass
             body = content[second_delimiter + 3:].strip()
 
@@ -552,7 +551,7 @@ def _parse_skill_content(content: str) -> tuple[dict[str, Any], str]:
 
 def _build_skill_content(metadata: dict[str, Any], body: str) -> str:
     """Build SKILL.md content from metadata and body."""
-    frontmatter = yaml.dump(
+    frontmatter = dump_yaml(
         metadata,
         default_flow_style=False,
         sort_keys=False,
@@ -0,0 +1,512 @@
+"""Background executor for PostToolUse hooks.
+
+``fire_post_tool_use`` runs hook scripts inline, so a slow script (up to
+the 30s per-script timeout) used to block the chat turn that saved the
+artifact. The server instead enqueues the event here and returns; worker
+threads fire the hooks afterwards.
+
+**Durable queue.** Each event becomes one job per plugin with matching
+hooks, stored in the ``hook_jobs`` SQLite table (same database as the
+conversation history). Several server processes may share the queue, so
+a claimed job records its owner (``host:pid``) and a lease that a
+heartbeat thread renews every ``hooks.lease_seconds / 3`` while the job
+runs. A job whose lease has expired — its process crashed or hung — goes
+back to ``pending`` and runs again, as do the owner's own ``running``
+rows when it restarts (same host and pid, e.g. pid 1 in a container).
+Jobs of live processes are left alone. That is at-least-once delivery,
+consistent with the advisory hook contract. Finished jobs are deleted
+after ``hooks.retention_days``.
+
+**Scheduling.** A bounded pool of worker threads (``hooks.workers``)
+claims the oldest runnable job. A job is runnable when:
+
+* its plugin has fewer jobs running than its concurrency limit
+  (``hooks.plugin_concurrency.<name>``, default
+  ``hooks.plugin_concurrency_default``), and
+* no earlier job of the same plugin for the same artifact is still
+  pending or running — so each plugin sees the saves of one artifact in
+  order, while different plugins and different artifacts proceed
+  independently.
+
+**Results.** Per-script records (exit code, duration, timeout, stderr
+tail) and the job duration are stored on the job row and served by
+``/api/hooks/jobs``.
+
+The artifact content is persisted only for plugins that require
+``artifact_materialization`` (the only ones that receive it); other jobs
+store the filename alone.
+
+Module-level singleton ``hook_runner`` follows the ``pixel_registry``
+pattern: ``init()`` at startup, ``shutdown()`` at exit. While not
+running (CLI, tests), ``submit_post_tool_use`` fires synchronously.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from aion.skills.hooks import (
+    fire_plugin_post_tool_use,
+    fire_post_tool_use,
+    plugin_has_post_tool_use,
+)
+from aion.skills.multi_registry import get_multi_registry
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hook_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plugin TEXT NOT NULL,
+    ordering_key TEXT NOT NULL,
+    tool_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    content TEXT,
+    content_type TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    results TEXT,
+    error TEXT,
+    duration_ms INTEGER,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    owner TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_hook_jobs_status ON hook_jobs(status, id);
+CREATE INDEX IF NOT EXISTS idx_hook_jobs_key ON hook_jobs(plugin, ordering_key, id);
+"""
+
+# Columns returned by the API (content is never exposed).
+_JOB_COLUMNS = (
+    "id, plugin, ordering_key, tool_name, file_path, content_type, status, "
+    "attempts, results, error, duration_ms, created_at, started_at, finished_at, owner"
+)
+
+# Seconds between sweeps deleting finished jobs past the retention period
+_PRUNE_INTERVAL = 3600
+
+# Oldest pending job per (plugin, artifact) — later saves of the same
+# artifact wait behind it, and behind any running job of that pair.
+_RUNNABLE_SQL = """
+SELECT j.id, j.plugin FROM hook_jobs j
+WHERE j.status = 'pending'
+  AND NOT EXISTS (
+      SELECT 1 FROM hook_jobs e
+      WHERE e.plugin = j.plugin AND e.ordering_key = j.ordering_key
+        AND e.id < j.id AND e.status IN ('pending', 'running')
+  )
+ORDER BY j.id
+"""
+
+
+def _job_dict(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["results"] = json.loads(job["results"]) if job.get("results") else []
+    return job
+
+
+class HookRunner:
+    """Bounded worker pool draining the durable ``hook_jobs`` queue."""
+
+    def __init__(self) -> None:
+        self._db_path: str | None = None
+        self._workers: list[threading.Thread] = []
+        self._cond = threading.Condition()
+        self._running_per_plugin: dict[str, int] = {}
+        self._plugin_concurrency: dict[str, int] = {}
+        self._default_concurrency = 1
+        self._lease_seconds = 60.0
+        self._retention_days: float | None = 7
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._heartbeat_thread: threading.Thread | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init(
+        self,
+        db_path: str,
+        workers: int = 4,
+        plugin_concurrency: dict[str, int] | None = None,
+        default_concurrency: int = 1,
+        lease_seconds: float = 60.0,
+        retention_days: float | None = 7,
+    ) -> None:
+        """Create the queue table, requeue interrupted jobs and start workers.
+
+        ``retention_days=None`` keeps finished jobs forever.
+        """
+        if self.running:
+            return
+        self._db_path = str(db_path)
+        self._plugin_concurrency = dict(plugin_concurrency or {})
+        self._default_concurrency = max(1, default_concurrency)
+        self._lease_seconds = max(1.0, lease_seconds)
+        self._retention_days = retention_days
+        self._running_per_plugin = {}
+        self._stopping = False
+
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            # Migration: lease columns for queues created before leases
+            for column in ("owner TEXT", "lease_expires_at REAL"):
+                try:
+                    conn.execute(f"ALTER TABLE hook_jobs ADD COLUMN {column}")
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+            conn.commit()
+        finally:
+            conn.close()
+        self._requeue_expired(include_own=True)
+        self.prune()
+
+        for i in range(max(1, workers)):
+            thread = threading.Thread(
+                target=self._worker, name=f"hook-runner-{i}", daemon=True,
+            )
+            thread.start()
+            self._workers.append(thread)
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat, name="hook-runner-heartbeat", daemon=True,
+        )
+        self._heartbeat_thread.start()
+        logger.info(f"Hook runner started with {len(self._workers)} worker(s)")
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop workers after their current job; pending jobs stay queued."""
+        if not self.running:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in [*self._workers, self._heartbeat_thread]:
+            if thread is not None:
+                thread.join(timeout)
+        self._workers = []
+        self._heartbeat_thread = None
+        logger.info("Hook runner stopped")
+
+    # ------------------------------------------------------------- leases
+
+    def _requeue_expired(self, include_own: bool = False) -> int:
+        """Return jobs with an expired lease (or, on init, our own) to pending.
+
+        Rows without a lease were claimed before leases existed and count
+        as expired.
+        """
+        query = (
+            "UPDATE hook_jobs SET status = 'pending', started_at = NULL, "
+            "owner = NULL, lease_expires_at = NULL WHERE status = 'running' "
+            "AND (lease_expires_at IS NULL OR lease_expires_at < ?"
+        )
+        params: list[Any] = [time.time()]
+        if include_own:
+            query += " OR owner = ?"
+            params.append(self._owner)
+        conn = self._connect()
+        try:
+            requeued = conn.execute(query + ")", params).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        if requeued:
+            logger.info(f"Hook runner requeued {requeued} interrupted job(s)")
+        return requeued
+
+    def _renew_leases(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE hook_jobs SET lease_expires_at = ? "
+                "WHERE owner = ? AND status = 'running'",
+                (time.time() + self._lease_seconds, self._owner),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def prune(self) -> int:
+        """Delete finished jobs older than the retention period."""
+        if self._retention_days is None:
+            return 0
+        cutoff = (datetime.now() - timedelta(days=self._retention_days)).isoformat()
+        conn = self._connect()
+        try:
+            removed = conn.execute(
+                "DELETE FROM hook_jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (cutoff,),
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        if removed:
+            logger.info(f"Hook runner pruned {removed} finished job(s)")
+        return removed
+
+    def _heartbeat(self) -> None:
+        """Renew our leases, reclaim expired ones and prune old jobs."""
+        next_prune = time.monotonic() + _PRUNE_INTERVAL
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopping, timeout=self._lease_seconds / 3)
+                if self._stopping:
+                    return
+            try:
+                self._renew_leases()
+                if self._requeue_expired():
+                    with self._cond:
+                        self._cond.notify_all()
+                if time.monotonic() >= next_prune:
+                    next_prune = time.monotonic() + _PRUNE_INTERVAL
+                    self.prune()
+            except sqlite3.Error as e:
+                logger.warning(f"Hook runner heartbeat failed: {e}")
+
+    # ------------------------------------------------------------- enqueue
+
+    def enqueue(
+        self,
+        file_path: str,
+        tool_name: str = "Write",
+        *,
+        content: str | None = None,
+        content_type: str | None = None,
+        ordering_key: str | None = None,
+    ) -> list[int]:
+        """Queue one job per plugin whose hooks match ``tool_name``.
+
+        ``ordering_key`` identifies the artifact for ordering purposes
+        (defaults to ``file_path``). Returns the new job ids.
+        """
+        from aion.skills.artifact_materialization import plugin_requires_materialization
+
+        multi = get_multi_registry()
+        rows = []
+        now = datetime.now().isoformat()
+        for plugin_name in multi.list_plugins():
+            plugin = multi.get_plugin(plugin_name)
+            if plugin is None or not plugin_has_post_tool_use(plugin, tool_name):
+                continue
+            keep_content = content is not None and plugin_requires_materialization(plugin)
+            rows.append((
+                plugin_name, ordering_key or file_path, tool_name, file_path,
+                content if keep_content else None, content_type, now,
+            ))
+        if not rows:
+            return []
+
+        conn = self._connect()
+        try:
+            job_ids = []
+            for row in rows:
+                cursor = conn.execute(
+                    "INSERT INTO hook_jobs (plugin, ordering_key, tool_name, file_path, "
+                    "content, content_type, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                job_ids.append(cursor.lastrowid)
+            conn.commit()
+        finally:
+            conn.close()
+
+        with self._cond:
+            self._cond.notify_all()
+        return job_ids
+
+    # ------------------------------------------------------------- workers
+
+    def _limit(self, plugin: str) -> int:
+        return max(1, self._plugin_concurrency.get(plugin, self._default_concurrency))
+
+    def _claim(self) -> sqlite3.Row | None:
+        """Mark the oldest runnable job as running. Caller holds ``_cond``."""
+        conn = self._connect()
+        try:
+            for row in conn.execute(_RUNNABLE_SQL).fetchall():
+                plugin = row["plugin"]
+                if self._running_per_plugin.get(plugin, 0) >= self._limit(plugin):
+                    continue
+                # Conditional update: another server process may share the queue.
+                claimed = conn.execute(
+                    "UPDATE hook_jobs SET status = 'running', attempts = attempts + 1, "
+                    "started_at = ?, owner = ?, lease_expires_at = ? "
+                    "WHERE id = ? AND status = 'pending'",
+                    (datetime.now().isoformat(), self._owner,
+                     time.time() + self._lease_seconds, row["id"]),
+                ).rowcount
+                conn.commit()
+                if not claimed:
+                    continue
+                self._running_per_plugin[plugin] = self._running_per_plugin.get(plugin, 0) + 1
+                return conn.execute("SELECT * FROM hook_jobs WHERE id = ?", (row["id"],)).fetchone()
+            return None
+        finally:
+            conn.close()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopping:
+                    try:
+                        job = self._claim()
+                    except sqlite3.Error as e:
+                        logger.warning(f"Hook runner failed to claim a job: {e}")
+                    if job is not None:
+                        break
+                    # Timed wait also picks up jobs enqueued by another process.
+                    self._cond.wait(timeout=1.0)
+                if job is None:
+                    return
+            try:
+                self._execute(job)
+            finally:
+                with self._cond:
+                    self._running_per_plugin[job["plugin"]] -= 1
+                    self._cond.notify_all()
+
+    def _execute(self, job: sqlite3.Row) -> None:
+        start = time.perf_counter()
+        results: list[dict] = []
+        error = None
+        plugin = get_multi_registry().get_plugin(job["plugin"])
+        if plugin is None:
+            error = f"plugin {job['plugin']!r} is no longer loaded"
+        else:
+            try:
+                results = fire_plugin_post_tool_use(
+                    plugin, job["file_path"], job["tool_name"],
+                    content=job["content"], content_type=job["content_type"],
+                )
+            except Exception as e:
+                logger.exception(f"Hook job {job['id']} raised")
+                error = str(e)
+
+        ok = error is None and all(r.get("returncode") == 0 for r in results)
+        duration = int((time.perf_counter() - start) * 1000)
+        conn = self._connect()
+        try:
+            # Owner check: if our lease lapsed the job was requeued, and its
+            # rerun (possibly in another process) records the outcome.
+            recorded = conn.execute(
+                "UPDATE hook_jobs SET status = ?, results = ?, error = ?, duration_ms = ?, "
+                "finished_at = ?, content = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                ("done" if ok else "failed", json.dumps(results), error, duration,
+                 datetime.now().isoformat(), job["id"], self._owner),
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        if not recorded:
+            logger.warning(f"Hook job {job['id']} lost its lease; result discarded")
+            return
+        logger.info(
+            f"Hook job {job['id']} ({job['plugin']}, {job['file_path']}) "
+            f"{'done' if ok else 'failed'} in {duration}ms"
+        )
+
+    # ------------------------------------------------------------- queries
+
+    def get_job(self, job_id: int) -> dict | None:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM hook_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _job_dict(row) if row else None
+
+    def list_jobs(self, limit: int = 50, status: str | None = None) -> list[dict]:
+        """Most recent jobs first, optionally filtered by status."""
+        query = f"SELECT {_JOB_COLUMNS} FROM hook_jobs"
+        params: list[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [_job_dict(r) for r in rows]
+
+    def stats(self) -> dict:
+        """Job counts per status plus average duration of finished jobs."""
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM hook_jobs GROUP BY status"
+            ).fetchall())
+            avg = conn.execute(
+                "SELECT AVG(duration_ms) FROM hook_jobs WHERE duration_ms IS NOT NULL"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            "running": self.running,
+            "workers": len(self._workers),
+            "counts": counts,
+            "avg_duration_ms": round(avg) if avg is not None else None,
+        }
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Block until no job is pending or running (tests, shutdown scripts)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            conn = self._connect()
+            try:
+                busy = conn.execute(
+                    "SELECT COUNT(*) FROM hook_jobs WHERE status IN ('pending', 'running')"
+                ).fetchone()[0]
+            finally:
+                conn.close()
+            if not busy:
+                return True
+            time.sleep(0.02)
+        return False
+
+
+hook_runner = HookRunner()
+
+
+def submit_post_tool_use(
+    file_path: str,
+    tool_name: str = "Write",
+    *,
+    content: str | None = None,
+    content_type: str | None = None,
+    ordering_key: str | None = None,
+) -> list[int]:
+    """Queue PostToolUse hooks when the runner is up, else fire them inline.
+
+    Returns the queued job ids (empty when fired synchronously).
+    """
+    if hook_runner.running:
+        return hook_runner.enqueue(
+            file_path, tool_name,
+            content=content, content_type=content_type, ordering_key=ordering_key,
+        )
+    fire_post_tool_use(file_path, tool_name, content=content, content_type=content_type)
+    return []
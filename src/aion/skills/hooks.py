@@ -31,12 +31,13 @@ A plugin's hook script written for the partner agentic-IDE host's
 won't fire usefully from AInstein's artifact-save unless its matcher
 happens to align with an artifact filename pattern.
 
-**Module-level functions, no class.** The plan's single firing point
-(artifact-save → PostToolUse/Write) doesn't justify a runner class
-with state. ``fire_post_tool_use(file_path)`` iterates every loaded
-plugin's hook declarations and fires every matching script
-synchronously with a per-script 30s timeout. Best-effort — exit codes
-are advisory; stderr is logged.
+**Module-level functions, no class.** ``fire_post_tool_use(file_path)``
+iterates every loaded plugin's hook declarations and fires every
+matching script synchronously with a per-script 30s timeout.
+Best-effort — exit codes are advisory; stderr is logged. The server's
+artifact-save path does not call it directly: it enqueues the event on
+the background runner in ``aion.skills.hook_runner``, which fires one
+plugin at a time through ``fire_plugin_post_tool_use``.
 
 **Environment passed to hooks**:
 
@@ -58,6 +59,7 @@ import logging
 import os
 import re
 import subprocess
+import time
 from typing import Any
 
 from aion.skills.multi_registry import get_multi_registry
@@ -70,6 +72,9 @@ logger = logging.getLogger(__name__)
 # script. Matches the value documented in the migration plan.
 _HOOK_TIMEOUT_SECONDS = 30
 
+# Tail of a hook's stderr kept in its result record.
+_STDERR_TAIL_CHARS = 2000
+
 # Secret patterns stripped from the env passed to hook scripts.
 # Compiled once for efficiency across many hook fires.
 _SECRET_PATTERNS: list[re.Pattern[str]] = [
@@ -123,9 +128,18 @@ def _fire_one_script(
     command: str,
     payload: dict,
     env_allowlist: list[str] | None,
-) -> None:
-    """Spawn one hook script. Errors are logged, never propagated."""
+) -> dict:
+    """Spawn one hook script. Errors are logged, never propagated.
+
+    Returns a result record (command, returncode, duration_ms, timed_out,
+    error, stderr) for the hook runner's job history.
+    """
     env = _filter_env(dict(os.environ), env_allowlist)
+    record: dict[str, Any] = {
+        "command": command, "returncode": None, "duration_ms": 0,
+        "timed_out": False, "error": None, "stderr": "",
+    }
+    start = time.perf_counter()
     try:
         result = subprocess.run(
             command,
@@ -138,19 +152,26 @@ def _fire_one_script(
         )
     except subprocess.TimeoutExpired:
         logger.warning("Hook %r timed out after %ds", command, _HOOK_TIMEOUT_SECONDS)
-        return
-    except Exception:
+        record["timed_out"] = True
+        return record
+    except Exception as e:
         logger.exception("Hook %r failed to spawn", command)
-        return
+        record["error"] = str(e)
+        return record
+    finally:
+        record["duration_ms"] = int((time.perf_counter() - start) * 1000)
 
     if result.stderr:
         for line in result.stderr.splitlines():
             logger.info("Hook %r stderr: %s", command, line)
     if result.returncode != 0:
         logger.info("Hook %r exited %d (advisory)", command, result.returncode)
+    record["returncode"] = result.returncode
+    record["stderr"] = result.stderr[-_STDERR_TAIL_CHARS:]
+    return record
 
 
-def _fire_plugin_hooks(plugin, post_tool_use: list, tool_name: str, payload: dict) -> None:
+def _fire_plugin_hooks(plugin, post_tool_use: list, tool_name: str, payload: dict) -> list[dict]:
     """Fire one plugin's matching PostToolUse hooks with a prepared payload.
 
     Extracted so the materialized-real-path branch and the filename-only
@@ -158,6 +179,7 @@ def _fire_plugin_hooks(plugin, post_tool_use: list, tool_name: str, payload: dic
     handling — the only difference between them is the ``file_path`` value
     already baked into ``payload``.
     """
+    results: list[dict] = []
     for entry in post_tool_use:
         if not isinstance(entry, dict):
             continue
@@ -183,7 +205,74 @@ def _fire_plugin_hooks(plugin, post_tool_use: list, tool_name: str, payload: dic
             env_allowlist = hook.get("env")
             if env_allowlist is not None and not isinstance(env_allowlist, list):
                 env_allowlist = None  # ignore malformed override
-            _fire_one_script(resolved_command, payload, env_allowlist)
+            results.append(_fire_one_script(resolved_command, payload, env_allowlist))
+    return results
+
+
+def _post_tool_use_entries(plugin) -> list | None:
+    """The plugin's ``PostToolUse`` array, or None when it declares none."""
+    hooks_config = plugin.resolve_hooks_config()
+    if hooks_config is None:
+        return None
+    post_tool_use = hooks_config.get("PostToolUse")
+    if not isinstance(post_tool_use, list):
+        return None
+    return post_tool_use
+
+
+def plugin_has_post_tool_use(plugin, tool_name: str = "Write") -> bool:
+    """Whether any of the plugin's PostToolUse matchers accepts ``tool_name``."""
+    post_tool_use = _post_tool_use_entries(plugin)
+    if post_tool_use is None:
+        return False
+    return any(
+        isinstance(entry, dict) and _matcher_matches(entry.get("matcher"), tool_name)
+        for entry in post_tool_use
+    )
+
+
+def fire_plugin_post_tool_use(
+    plugin,
+    file_path: str,
+    tool_name: str = "Write",
+    *,
+    content: str | None = None,
+    content_type: str | None = None,
+) -> list[dict]:
+    """Fire one plugin's matching PostToolUse hooks; return per-script results.
+
+    See ``fire_post_tool_use`` for the payload and ``file_path``
+    semantics. Used directly by the background hook runner, which
+    schedules each plugin separately.
+    """
+    post_tool_use = _post_tool_use_entries(plugin)
+    if post_tool_use is None:
+        return []
+
+    from aion.skills.artifact_materialization import (
+        materialized_artifact,
+        plugin_requires_materialization,
+    )
+
+    if content is not None and plugin_requires_materialization(plugin):
+        # Opt-in: project the SQLite blob onto a real path for this
+        # plugin's hooks only, then clean up (ephemeral, no sync-back).
+        with materialized_artifact(file_path, content) as real_path:
+            materialized_payload = {
+                "tool_name": tool_name,
+                "tool_input": {"file_path": str(real_path)},
+            }
+            return _fire_plugin_hooks(
+                plugin, post_tool_use, tool_name, materialized_payload,
+            )
+
+    # Default / non-requiring: filename-only payload — unchanged.
+    filename_payload = {
+        "tool_name": tool_name, "tool_input": {"file_path": file_path},
+    }
+    return _fire_plugin_hooks(
+        plugin, post_tool_use, tool_name, filename_payload,
+    )
 
 
 def fire_post_tool_use(
@@ -220,42 +309,13 @@ def fire_post_tool_use(
     Synchronous and best-effort: 30s timeout per hook, exceptions
     logged, advisory exit codes. No exceptions propagate to the caller.
     """
-    filename_payload = {
-        "tool_name": tool_name, "tool_input": {"file_path": file_path},
-    }
-
-    from aion.skills.artifact_materialization import (
-        materialized_artifact,
-        plugin_requires_materialization,
-    )
-
     multi = get_multi_registry()
     for plugin_name in multi.list_plugins():
         plugin = multi.get_plugin(plugin_name)
         if plugin is None:
             # Legacy in-tree synthesized plugin (pre-commit-4 fallback); no manifest object.
             continue
-        hooks_config = plugin.resolve_hooks_config()
-        if hooks_config is None:
-            continue
-
-        post_tool_use = hooks_config.get("PostToolUse")
-        if not isinstance(post_tool_use, list):
-            continue
-
-        if content is not None and plugin_requires_materialization(plugin):
-            # Opt-in: project the SQLite blob onto a real path for this
-            # plugin's hooks only, then clean up (ephemeral, no sync-back).
-            with materialized_artifact(file_path, content) as real_path:
-                materialized_payload = {
-                    "tool_name": tool_name,
-                    "tool_input": {"file_path": str(real_path)},
-                }
-                _fire_plugin_hooks(
-                    plugin, post_tool_use, tool_name, materialized_payload,
-                )
-        else:
-            # Default / non-requiring: filename-only payload — unchanged.
-            _fire_plugin_hooks(
-                plugin, post_tool_use, tool_name, filename_payload,
-            )
+        fire_plugin_post_tool_use(
+            plugin, file_path, tool_name,
+            content=content, content_type=content_type,
+        )
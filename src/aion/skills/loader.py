@@ -6,12 +6,11 @@ with YAML frontmatter and markdown instructions.
 """
 
 import logging
-import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
+from aion.yaml_utils import YAMLError, load_yaml, split_frontmatter
 
 logger = logging.getLogger(__name__)
 
@@ -153,22 +152,17 @@ class SkillLoader:
         """
         content = skill_md_path.read_text(encoding="utf-8")
 
-        frontmatter_match = re.match(
-            r"^---\s*\n(.*?)\n---\s*\n(.*)$",
-            content,
-            re.DOTALL
-        )
-
-        if not frontmatter_match:
+        split = split_frontmatter(content)
+        if split is None:
             logger.error(f"Invalid SKILL.md format (no frontmatter): {skill_md_path}")
             return None
 
-        frontmatter_str = frontmatter_match.group(1)
-        markdown_body = frontmatter_match.group(2).strip()
+        frontmatter_str, markdown_body = split
+        markdown_body = markdown_body.strip()
 
         try:
-            frontmatter = yaml.safe_load(frontmatter_str)
-        except yaml.YAMLError as e:
+            frontmatter = load_yaml(frontmatter_str) or {}
+        except YAMLError as e:
             logger.error(f"Invalid YAML frontmatter in {skill_md_path}: {e}")
             return None
 
@@ -202,7 +196,7 @@ class SkillLoader:
             if ref_file.is_file():
                 try:
                     if ref_file.suffix in (".yaml", ".yml"):
-                        references[ref_file.stem] = yaml.safe_load(
+                        references[ref_file.stem] = load_yaml(
                             ref_file.read_text(encoding="utf-8")
                         )
                     else:
@@ -220,7 +214,7 @@ class SkillLoader:
             return {}
 
         try:
-            return yaml.safe_load(thresholds_path.read_text(encoding="utf-8")) or {}
+            return load_yaml(thresholds_path.read_text(encoding="utf-8")) or {}
         except Exception as e:
             logger.warning(f"Failed to load thresholds from {thresholds_path}: {e}")
             return {}
@@ -240,7 +234,7 @@ class SkillLoader:
         if not self._thresholds_path.exists():
             return {}
         try:
-            return yaml.safe_load(self._thresholds_path.read_text(encoding="utf-8")) or {}
+            return load_yaml(self._thresholds_path.read_text(encoding="utf-8")) or {}
         except Exception as e:
             logger.warning(f"Failed to load thresholds from {self._thresholds_path}: {e}")
             return {}
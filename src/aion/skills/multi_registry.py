@@ -62,6 +62,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Callable
 
+from aion.cache import invalidate, on_invalidate
 from aion.skills.loader import Skill, SkillLoader
 from aion.skills.plugin import Plugin
 from aion.skills.plugin_loader import PluginLoader
@@ -330,17 +331,21 @@ class MultiPluginRegistry:
             return None
         return plugin, skill
 
-    def reload(self) -> None:
+    def reload(self, *, broadcast: bool = True) -> None:
         """Re-read every plugin's registry from disk and rebuild state.
 
         Used after the UI mutates a registry file (set_skill_enabled /
-        set_group_enabled) so in-memory state matches disk.
+        set_group_enabled) so in-memory state matches disk. For the global
+        registry the reload is broadcast to the other server workers
+        (``aion.cache``), which then reload with ``broadcast=False``.
         """
         self._loaded = False
         self._skill_owner.clear()
         for reg in self._registries.values():
             reg.reload()
         self.load()
+        if broadcast and self is _global_multi:
+            invalidate("skills")
 
     # -- reload observer -----------------------------------------------------
 
@@ -789,6 +794,15 @@ def _require_kernel_plugin(plugins: list[Plugin]) -> None:
         )
 
 
+def _reload_from_broadcast() -> None:
+    """Another worker reloaded its registry: re-read disk here too."""
+    if _global_multi is not None:
+        _global_multi.reload(broadcast=False)
+
+
+on_invalidate("skills", _reload_from_broadcast)
+
+
 def get_multi_registry() -> MultiPluginRegistry:
     """Get the process-wide MultiPluginRegistry singleton.
 
@@ -15,9 +15,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import yaml
-
 from aion.skills.loader import Skill, SkillLoader
+from aion.yaml_utils import load_yaml
 
 if TYPE_CHECKING:
     from aion.routing import ExecutionModel
@@ -179,7 +178,7 @@ class SkillRegistry:
             return False
 
         try:
-            content = yaml.safe_load(registry_path.read_text(encoding="utf-8"))
+            content = load_yaml(registry_path.read_text(encoding="utf-8"))
         except Exception as e:
             logger.error(f"Failed to parse registry: {e}")
             return False
@@ -0,0 +1,171 @@
+"""Coalescing SSE writer for the chat streaming endpoints.
+
+The endpoint generators yield one ``Event.to_sse()`` frame per event, and
+an agent burst (``status`` + ``decision`` + a run of ``text`` deltas)
+would otherwise reach the socket as many tiny writes. ``coalesce_sse``
+sits between the generator and ``StreamingResponse``: frames that arrive
+within ``agents.sse_coalesce_ms`` of the first buffered frame go out as
+one chunk. Latency-critical frames are never held back — the first frame
+of a stream (``init``), the first ``text`` delta and the terminal
+``complete`` / ``error`` flush the buffer immediately, together with
+anything queued before them so ordering is preserved.
+
+The source generator runs in a single pump task for the whole stream, so
+context variables it binds (structlog request_id, the request trace)
+persist across its steps exactly as when Starlette iterated it directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from aion.config.runtime import get_runtime_value
+from aion.events import sse_prefix
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_PREFIXES = (sse_prefix("complete"), sse_prefix("error"))
+_TEXT_PREFIX = sse_prefix("text")
+_QUEUE_MAXSIZE = 256
+_RATE_WINDOW_S = 60.0
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class _SSEStats:
+    """Process-wide frame, byte and flush counters (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record_flush(self, events: int, nbytes: int) -> None:
+        with self._lock:
+            self._events += events
+            self._bytes += nbytes
+            self._flushes += 1
+            self._recent.append(time.monotonic())
+
+    def snapshot(self) -> dict:
+        """Totals plus bytes per event, events per flush and flushes/s (last minute)."""
+        with self._lock:
+            cutoff = time.monotonic() - _RATE_WINDOW_S
+            while self._recent and self._recent[0] < cutoff:
+                self._recent.popleft()
+            return {
+                "events": self._events,
+                "bytes": self._bytes,
+                "flushes": self._flushes,
+                "bytes_per_event": round(self._bytes / self._events, 1) if self._events else None,
+                "events_per_flush": round(self._events / self._flushes, 2) if self._flushes else None,
+                "flushes_per_second": round(len(self._recent) / _RATE_WINDOW_S, 2),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events = 0
+            self._bytes = 0
+            self._flushes = 0
+            self._recent: deque[float] = deque(maxlen=100_000)
+
+
+sse_stats = _SSEStats()
+
+
+async def coalesce_sse(
+    source: AsyncIterator[str],
+    window_ms: float | None = None,
+) -> AsyncGenerator[str, None]:
+    """Re-chunk an SSE frame stream, merging frames within ``window_ms``.
+
+    ``window_ms`` defaults to ``agents.sse_coalesce_ms``; ``0`` passes
+    frames straight through (still counted in ``sse_stats``).
+    """
+    if window_ms is None:
+        window_ms = float(get_runtime_value("agents.sse_coalesce_ms", 20))
+
+    if window_ms <= 0:
+        async for frame in source:
+            sse_stats.record_flush(1, len(frame.encode("utf-8")))
+            yield frame
+        return
+
+    window = window_ms / 1000
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+
+    async def pump() -> None:
+        try:
+            async for frame in source:
+                await queue.put(frame)
+        except Exception as e:
+            await queue.put(_Failure(e))
+            return
+        finally:
+            # Run the source's own cleanup (trace export, context reset)
+            # now rather than at garbage collection when the client leaves.
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        await queue.put(_END)
+
+    loop = asyncio.get_running_loop()
+    pump_task = asyncio.create_task(pump())
+    buffer: list[str] = []
+    deadline = 0.0
+    seen_first = False
+    seen_text = False
+
+    def flush() -> str:
+        chunk = "".join(buffer)
+        sse_stats.record_flush(len(buffer), len(chunk.encode("utf-8")))
+        buffer.clear()
+        return chunk
+
+    try:
+        while True:
+            if not buffer:
+                item = await queue.get()
+            elif not queue.empty():
+                item = queue.get_nowait()
+            else:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    yield flush()
+                    continue
+
+            if item is _END:
+                break
+            if isinstance(item, _Failure):
+                if buffer:
+                    yield flush()
+                raise item.error
+
+            buffer.append(item)
+            urgent = not seen_first or item.startswith(_TERMINAL_PREFIXES)
+            seen_first = True
+            if not seen_text and item.startswith(_TEXT_PREFIX):
+                seen_text = urgent = True
+            if len(buffer) == 1:
+                deadline = loop.time() + window
+            if urgent or loop.time() >= deadline:
+                yield flush()
+
+        if buffer:
+            yield flush()
+    finally:
+        if not pump_task.done():
+            pump_task.cancel()
+            try:
+                await pump_task
+            except asyncio.CancelledError:
+                pass
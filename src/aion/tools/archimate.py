@@ -7,9 +7,11 @@ RAG agent tool registration.
 Original scripts are kept as-is for standalone CLI use.
 """
 
+import io
 import logging
 import xml.etree.ElementTree as ET
 from collections import defaultdict
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -138,6 +140,36 @@ ALLOWED_PATTERNS = {
     "Junction": [(ALL_ELEMENTS, ALL_ELEMENTS)],
 }
 
+# ALLOWED_PATTERNS compiled once at import into a dense lookup:
+# (relationship type, source type) → bitmask of allowed target types.
+# One dict probe and one AND per relationship instead of a scan over the
+# pattern list with set containment per pair.
+_TYPE_BIT = {t: 1 << i for i, t in enumerate(sorted(VALID_ELEMENT_TYPES))}
+
+
+def _compile_patterns(patterns: dict) -> dict[tuple[str, str], int]:
+    matrix: dict[tuple[str, str], int] = defaultdict(int)
+    for rtype, pairs in patterns.items():
+        for sources, targets in pairs:
+            mask = 0
+            for tgt in targets:
+                mask |= _TYPE_BIT[tgt]
+            for src in sources:
+                matrix[(rtype, src)] |= mask
+    return dict(matrix)
+
+
+_PATTERN_MATRIX = _compile_patterns(ALLOWED_PATTERNS)
+
+
+def relationship_allowed(rtype: str, src_type: str, tgt_type: str) -> bool:
+    """Return True if ``src_type -[rtype]-> tgt_type`` matches ALLOWED_PATTERNS.
+
+    Pure pattern lookup — callers keep their own exemptions (Association,
+    COMPOSITE endpoints).
+    """
+    return bool(_PATTERN_MATRIX.get((rtype, src_type), 0) & _TYPE_BIT.get(tgt_type, 0))
+
 # ---------------------------------------------------------------------------
 # Constants from inspect_model.py
 # ---------------------------------------------------------------------------
@@ -207,14 +239,180 @@ TYPE_RANK = {
     "AndJunction": 99, "OrJunction": 99,
 }
 
-
 # ---------------------------------------------------------------------------
-# Tool 1: validate_archimate
+# Streaming model reader
 # ---------------------------------------------------------------------------
+# Uploaded enterprise models can be tens of megabytes. read_archimate()
+# makes one iterparse pass, copies what the tools need into compact
+# records and detaches each element / relationship / view subtree as soon
+# as it has been read, so peak memory tracks the largest single subtree
+# rather than the whole document.
+
+_NAME = TAG("name")
+_DOCUMENTATION = TAG("documentation")
+_ELEMENTS, _ELEMENT = TAG("elements"), TAG("element")
+_RELATIONSHIPS, _RELATIONSHIP = TAG("relationships"), TAG("relationship")
+_PROPERTY_DEFINITIONS, _PROPERTY_DEFINITION = TAG("propertyDefinitions"), TAG("propertyDefinition")
+_PROPERTIES, _PROPERTY, _VALUE = TAG("properties"), TAG("property"), TAG("value")
+_VIEWS, _DIAGRAMS, _VIEW = TAG("views"), TAG("diagrams"), TAG("view")
+_NODE, _CONNECTION = TAG("node"), TAG("connection")
+_XSI_TYPE = f"{{{XSI}}}type"
+
+
+@dataclass(slots=True)
+class ModelElement:
+    id: str
+    type: str
+    name: str = ""
+    documentation: str = ""
+    properties: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ModelRelationship:
+    id: str
+    type: str
+    source: str
+    target: str
+    name: str = ""
+    properties: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ModelView:
+    id: str
+    name: str = ""
+    # (node identifier, elementRef) for every node, nested ones included
+    nodes: list[tuple[str, str]] = field(default_factory=list)
+    top_level_nodes: int = 0
+    # (identifier, relationshipRef, source node, target node)
+    connections: list[tuple[str, str, str, str]] = field(default_factory=list)
+
+
+@dataclass
+class ArchimateModel:
+    """Compact in-memory form of an Open Exchange document.
+
+    Property keys are resolved through ``propertyDefinitions`` (falling
+    back to the raw ref). Elements without an identifier are kept out of
+    ``elements``; ``unidentified_elements`` holds a short XML snippet of
+    each for error reporting.
+    """
+
+    root_tag: str = ""
+    name: str = ""
+    documentation: str = ""
+    has_elements_section: bool = False
+    elements: list[ModelElement] = field(default_factory=list)
+    relationships: list[ModelRelationship] = field(default_factory=list)
+    views: list[ModelView] = field(default_factory=list)
+    unidentified_elements: list[str] = field(default_factory=list)
+
+
+def _text(parent: ET.Element, tag: str) -> str:
+    child = parent.find(tag)
+    return child.text.strip() if child is not None and child.text else ""
 
-def _qname(elem: ET.Element) -> str:
-    return elem.get(f"{{{XSI}}}type", "")
 
+def _read_properties(parent: ET.Element) -> dict[str, str]:
+    container = parent.find(_PROPERTIES)
+    props: dict[str, str] = {}
+    for prop in (container if container is not None else parent).findall(_PROPERTY):
+        ref = prop.get("propertyDefinitionRef", "")
+        val = _text(prop, _VALUE)
+        if ref and val:
+            props[ref] = val
+    return props
+
+
+def read_archimate(xml_content: str | bytes) -> ArchimateModel:
+    """Read an Open Exchange document in a single streaming pass.
+
+    Raises:
+        ET.ParseError: If the document is not well-formed XML.
+    """
+    data = xml_content.encode("utf-8") if isinstance(xml_content, str) else xml_content
+    model = ArchimateModel()
+    prop_defs: dict[str, str] = {}
+    stack: list[ET.Element] = []
+    view: ModelView | None = None
+    view_el: ET.Element | None = None
+
+    for event, el in ET.iterparse(io.BytesIO(data), events=("start", "end")):
+        if event == "start":
+            stack.append(el)
+            if len(stack) == 1:
+                model.root_tag = el.tag
+            elif (el.tag == _VIEW and len(stack) == 4
+                  and stack[1].tag == _VIEWS and stack[2].tag == _DIAGRAMS):
+                view, view_el = ModelView(id=el.get("identifier", "")), el
+            continue
+
+        stack.pop()
+        depth = len(stack)
+        parent = stack[-1] if stack else None
+        tag = el.tag
+
+        if depth == 1:
+            if tag == _NAME:
+                model.name = (el.text or "").strip()
+            elif tag == _DOCUMENTATION:
+                model.documentation = (el.text or "").strip()
+            elif tag == _ELEMENTS:
+                model.has_elements_section = True
+            parent.remove(el)
+        elif depth == 2 and tag == _ELEMENT and parent.tag == _ELEMENTS:
+            eid = el.get("identifier")
+            if eid:
+                model.elements.append(ModelElement(
+                    id=eid, type=el.get(_XSI_TYPE, ""), name=_text(el, _NAME),
+                    documentation=_text(el, _DOCUMENTATION),
+                    properties=_read_properties(el),
+                ))
+            else:
+                model.unidentified_elements.append(ET.tostring(el, encoding="unicode")[:80])
+            parent.remove(el)
+        elif depth == 2 and tag == _RELATIONSHIP and parent.tag == _RELATIONSHIPS:
+            model.relationships.append(ModelRelationship(
+                id=el.get("identifier", ""), type=el.get(_XSI_TYPE, ""),
+                source=el.get("source", ""), target=el.get("target", ""),
+                name=_text(el, _NAME), properties=_read_properties(el),
+            ))
+            parent.remove(el)
+        elif depth == 2 and tag == _PROPERTY_DEFINITION and parent.tag == _PROPERTY_DEFINITIONS:
+            pdef_id, pdef_name = el.get("identifier", ""), _text(el, _NAME)
+            if pdef_id and pdef_name:
+                prop_defs[pdef_id] = pdef_name
+            parent.remove(el)
+        elif view is not None:
+            if tag == _NODE:
+                view.nodes.append((el.get("identifier", ""), el.get("elementRef", "")))
+                if parent is view_el:
+                    view.top_level_nodes += 1
+            elif tag == _CONNECTION and parent is view_el:
+                view.connections.append((
+                    el.get("identifier", ""), el.get("relationshipRef", ""),
+                    el.get("source", ""), el.get("target", ""),
+                ))
+            elif tag == _NAME and parent is view_el:
+                view.name = (el.text or "").strip()
+            elif el is view_el:
+                model.views.append(view)
+                view, view_el = None, None
+                parent.remove(el)
+
+    # propertyDefinitions follow elements/relationships in the exchange
+    # format, so keys can only be resolved once the pass is complete.
+    if prop_defs:
+        for item in (*model.elements, *model.relationships):
+            if item.properties:
+                item.properties = {prop_defs.get(k, k): v for k, v in item.properties.items()}
+    return model
+
+
+# ---------------------------------------------------------------------------
+# Tool 1: validate_archimate
+# ---------------------------------------------------------------------------
 
 def validate_archimate(xml_content: str) -> dict:
     """Validate ArchiMate 3.2 Open Exchange XML content.
@@ -222,11 +420,8 @@ def validate_archimate(xml_content: str) -> dict:
     Returns a structured result with validity status, counts, errors,
     and warnings.
     """
-    errors: list[str] = []
-    warnings: list[str] = []
-
     try:
-        root = ET.fromstring(xml_content)
+        model = read_archimate(xml_content)
     except ET.ParseError as e:
         return {
             "valid": False,
@@ -235,95 +430,76 @@ def validate_archimate(xml_content: str) -> dict:
             "errors": [f"XML parse error: {e}"],
             "warnings": [],
         }
+    return validate_model(model)
+
 
-    if root.tag != TAG("model"):
-        errors.append(f"Root element must be 'model' in namespace {NS}, got {root.tag}")
+def validate_model(model: ArchimateModel) -> dict:
+    """Validate an already-read model. Same result shape as ``validate_archimate``."""
+    errors: list[str] = []
+    warnings: list[str] = []
+
+    if model.root_tag != TAG("model"):
+        errors.append(f"Root element must be 'model' in namespace {NS}, got {model.root_tag}")
 
     element_ids: dict[str, str] = {}
     rel_ids: dict[str, tuple] = {}
 
-    elements_node = root.find(TAG("elements"))
-    if elements_node is not None:
-        for elem in elements_node.findall(TAG("element")):
-            eid = elem.get("identifier")
-            etype = _qname(elem)
-            if not eid:
-                errors.append(f"Element missing identifier: {ET.tostring(elem, encoding='unicode')[:80]}")
-                continue
-            if etype not in VALID_ELEMENT_TYPES:
-                errors.append(f"Invalid element type '{etype}' for element {eid}")
-            doc_el = elem.find(TAG("documentation"))
-            if doc_el is None or not (doc_el.text or "").strip():
-                warnings.append(f"Element {eid} has no documentation")
-            element_ids[eid] = etype
-
-    relationships_node = root.find(TAG("relationships"))
-    if relationships_node is not None:
-        for rel in relationships_node.findall(TAG("relationship")):
-            rid = rel.get("identifier")
-            rtype = _qname(rel)
-            src = rel.get("source")
-            tgt = rel.get("target")
-
-            if not rid:
-                errors.append("Relationship missing identifier")
-                continue
-
-            if rtype not in VALID_RELATIONSHIP_TYPES:
-                errors.append(f"Invalid relationship type '{rtype}' for relationship {rid}")
-
-            if src not in element_ids:
-                errors.append(f"Relationship {rid}: source '{src}' not found in elements")
-            if tgt not in element_ids:
-                errors.append(f"Relationship {rid}: target '{tgt}' not found in elements")
-
-            if src in element_ids and tgt in element_ids and rtype != "Association":
-                src_type = element_ids[src]
-                tgt_type = element_ids[tgt]
-                if src_type not in COMPOSITE and tgt_type not in COMPOSITE:
-                    if src_type != "ValueStream" and tgt_type != "ValueStream":
-                        patterns = ALLOWED_PATTERNS.get(rtype, [])
-                        allowed = any(src_type in sp and tgt_type in tp for sp, tp in patterns)
-                        if not allowed:
-                            warnings.append(
-                                f"Relationship {rid} ({rtype}): {src_type} -> {tgt_type} "
-                                f"may not be a valid ArchiMate 3.2 relationship"
-                            )
-
-            rel_ids[rid] = (rtype, src, tgt)
+    for snippet in model.unidentified_elements:
+        errors.append(f"Element missing identifier: {snippet}")
+    for elem in model.elements:
+        eid, etype = elem.id, elem.type
+        if etype not in VALID_ELEMENT_TYPES:
+            errors.append(f"Invalid element type '{etype}' for element {eid}")
+        if not elem.documentation:
+            warnings.append(f"Element {eid} has no documentation")
+        element_ids[eid] = etype
+
+    for rel in model.relationships:
+        rid, rtype, src, tgt = rel.id, rel.type, rel.source, rel.target
+
+        if not rid:
+            errors.append("Relationship missing identifier")
+            continue
+
+        if rtype not in VALID_RELATIONSHIP_TYPES:
+            errors.append(f"Invalid relationship type '{rtype}' for relationship {rid}")
+
+        if src not in element_ids:
+            errors.append(f"Relationship {rid}: source '{src or None}' not found in elements")
+        if tgt not in element_ids:
+            errors.append(f"Relationship {rid}: target '{tgt or None}' not found in elements")
+
+        if src in element_ids and tgt in element_ids and rtype != "Association":
+            src_type = element_ids[src]
+            tgt_type = element_ids[tgt]
+            if src_type not in COMPOSITE and tgt_type not in COMPOSITE:
+                if src_type != "ValueStream" and tgt_type != "ValueStream":
+                    if not relationship_allowed(rtype, src_type, tgt_type):
+                        warnings.append(
+                            f"Relationship {rid} ({rtype}): {src_type} -> {tgt_type} "
+                            f"may not be a valid ArchiMate 3.2 relationship"
+                        )
+
+        rel_ids[rid] = (rtype, src, tgt)
 
     # View referential integrity
-    views = root.find(TAG("views"))
-    if views is not None:
-        diagrams = views.find(TAG("diagrams"))
-        if diagrams is not None:
-            for view in diagrams.findall(TAG("view")):
-                view_id = view.get("identifier", "unknown")
-                node_ids: set[str] = set()
-
-                def _collect_nodes(parent: ET.Element) -> None:
-                    for node in parent.findall(TAG("node")):
-                        nid = node.get("identifier")
-                        eref = node.get("elementRef")
-                        if nid:
-                            node_ids.add(nid)
-                        if eref and eref not in element_ids:
-                            errors.append(f"View {view_id}: node {nid} references unknown element {eref}")
-                        _collect_nodes(node)
-
-                _collect_nodes(view)
-
-                for conn in view.findall(TAG("connection")):
-                    cid = conn.get("identifier", "?")
-                    rref = conn.get("relationshipRef")
-                    csrc = conn.get("source")
-                    ctgt = conn.get("target")
-                    if rref and rref not in rel_ids:
-                        errors.append(f"View {view_id}: connection {cid} references unknown relationship {rref}")
-                    if csrc and csrc not in node_ids:
-                        errors.append(f"View {view_id}: connection {cid} source node {csrc} not found in view")
-                    if ctgt and ctgt not in node_ids:
-                        errors.append(f"View {view_id}: connection {cid} target node {ctgt} not found in view")
+    for view in model.views:
+        view_id = view.id or "unknown"
+        node_ids: set[str] = set()
+        for nid, eref in view.nodes:
+            if nid:
+                node_ids.add(nid)
+            if eref and eref not in element_ids:
+                errors.append(f"View {view_id}: node {nid or None} references unknown element {eref}")
+
+        for cid, rref, csrc, ctgt in view.connections:
+            cid = cid or "?"
+            if rref and rref not in rel_ids:
+                errors.append(f"View {view_id}: connection {cid} references unknown relationship {rref}")
+            if csrc and csrc not in node_ids:
+                errors.append(f"View {view_id}: connection {cid} source node {csrc} not found in view")
+            if ctgt and ctgt not in node_ids:
+                errors.append(f"View {view_id}: connection {cid} target node {ctgt} not found in view")
 
     return {
         "valid": len(errors) == 0,
@@ -338,13 +514,6 @@ def validate_archimate(xml_content: str) -> dict:
 # Tool 2: inspect_archimate_model
 # ---------------------------------------------------------------------------
 
-def _get_name(elem: ET.Element) -> str:
-    name_el = elem.find(TAG("name"))
-    if name_el is not None and name_el.text:
-        return name_el.text.strip()
-    return "(unnamed)"
-
-
 def inspect_archimate_model(xml_content: str) -> dict:
     """Inspect an ArchiMate model and return a structured summary.
 
@@ -352,51 +521,39 @@ def inspect_archimate_model(xml_content: str) -> dict:
     and machine-readable indexes.
     """
     try:
-        root = ET.fromstring(xml_content)
+        model = read_archimate(xml_content)
     except ET.ParseError as e:
         return {"error": f"XML parse error: {e}"}
+    return inspect_model(model)
 
-    model_name = _get_name(root)
+
+def inspect_model(model: ArchimateModel) -> dict:
+    """Summarize an already-read model. Same result shape as ``inspect_archimate_model``."""
+    model_name = model.name or "(unnamed)"
     elements: dict[str, dict] = {}
     by_layer: dict[str, list] = defaultdict(list)
 
-    elements_node = root.find(TAG("elements"))
-    if elements_node is not None:
-        for elem in elements_node.findall(TAG("element")):
-            eid = elem.get("identifier")
-            etype = _qname(elem)
-            ename = _get_name(elem)
-            elements[eid] = {"type": etype, "name": ename}
-            layer = LAYER_MAP.get(etype, "Unknown")
-            by_layer[layer].append({"id": eid, "type": etype, "name": ename})
+    for elem in model.elements:
+        eid, etype = elem.id, elem.type
+        ename = elem.name or "(unnamed)"
+        elements[eid] = {"type": etype, "name": ename}
+        layer = LAYER_MAP.get(etype, "Unknown")
+        by_layer[layer].append({"id": eid, "type": etype, "name": ename})
 
     rels: dict[str, dict] = {}
     by_rel_type: dict[str, int] = defaultdict(int)
 
-    rels_node = root.find(TAG("relationships"))
-    if rels_node is not None:
-        for rel in rels_node.findall(TAG("relationship")):
-            rid = rel.get("identifier")
-            rtype = _qname(rel)
-            src = rel.get("source")
-            tgt = rel.get("target")
-            rels[rid] = {"type": rtype, "source": src, "target": tgt}
-            by_rel_type[rtype] += 1
-
-    existing_views = []
-    views_node = root.find(TAG("views"))
-    if views_node is not None:
-        diagrams = views_node.find(TAG("diagrams"))
-        if diagrams is not None:
-            for view in diagrams.findall(TAG("view")):
-                vid = view.get("identifier")
-                vname = _get_name(view)
-                node_count = len(list(view.findall(TAG("node"))))
-                conn_count = len(list(view.findall(TAG("connection"))))
-                existing_views.append({
-                    "id": vid, "name": vname,
-                    "nodes": node_count, "connections": conn_count,
-                })
+    for rel in model.relationships:
+        rels[rel.id] = {"type": rel.type, "source": rel.source, "target": rel.target}
+        by_rel_type[rel.type] += 1
+
+    existing_views = [
+        {
+            "id": view.id, "name": view.name or "(unnamed)",
+            "nodes": view.top_level_nodes, "connections": len(view.connections),
+        }
+        for view in model.views
+    ]
 
     # Build ordered elements_by_layer
     elements_by_layer = {}
@@ -11,7 +11,7 @@ import json
 import logging
 from pathlib import Path
 
-import yaml
+from aion.yaml_utils import load_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -80,7 +80,7 @@ def generate_explorer_html(yaml_content: str) -> str | None:
         Complete HTML string, or None on parse failure.
     """
     try:
-        data = yaml.safe_load(yaml_content)
+        data = load_yaml(yaml_content)
     except Exception:
         logger.warning("[html_explorer] Failed to parse YAML input")
         return None
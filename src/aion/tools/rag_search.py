@@ -18,6 +18,7 @@ from weaviate.classes.query import Filter
 from aion.config import settings
 from aion.ingestion.embeddings import embed_text
 from aion.text_utils import elapsed_ms
+from aion.tracing import span
 
 # Skills framework — optional, degrades gracefully
 try:
@@ -379,11 +380,13 @@ class RAGToolkit:
                 & Filter.by_property("adr_number").less_or_equal(end)
             )
             t0 = time.perf_counter()
-            results = collection.query.fetch_objects(
-                filters=adr_filter,
-                limit=_FETCH_OBJECTS_LIMIT,
-                return_properties=props,
-            )
+            with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+                results = collection.query.fetch_objects(
+                    filters=adr_filter,
+                    limit=_FETCH_OBJECTS_LIMIT,
+                    return_properties=props,
+                )
+                s.set(results=len(results.objects))
             wv_ms = elapsed_ms(t0)
             logger.info(
                 f"[timing] search_architecture_decisions(range): "
@@ -403,11 +406,13 @@ class RAGToolkit:
             adr_filter = Filter.by_property("adr_number").equal(padded)
             direct_limit = _get_truncation().get("direct_doc_max_chars", 12000)
             t0 = time.perf_counter()
-            results = collection.query.fetch_objects(
-                filters=adr_filter,
-                limit=_FETCH_OBJECTS_LIMIT,
-                return_properties=props,
-            )
+            with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+                results = collection.query.fetch_objects(
+                    filters=adr_filter,
+                    limit=_FETCH_OBJECTS_LIMIT,
+                    return_properties=props,
+                )
+                s.set(results=len(results.objects))
             wv_ms = elapsed_ms(t0)
             logger.info(
                 f"[timing] search_architecture_decisions(exact): "
@@ -426,14 +431,16 @@ class RAGToolkit:
 
         query_vector = self._get_query_vector(query)
         t0 = time.perf_counter()
-        results = collection.query.hybrid(
-            query=query,
-            vector=query_vector,
-            limit=limit,
-            alpha=settings.alpha_vocabulary,
-            filters=adr_filter,
-            return_properties=props,
-        )
+        with span("weaviate.hybrid", "weaviate", collection=collection.name) as s:
+            results = collection.query.hybrid(
+                query=query,
+                vector=query_vector,
+                limit=limit,
+                alpha=settings.alpha_vocabulary,
+                filters=adr_filter,
+                return_properties=props,
+            )
+            s.set(results=len(results.objects))
         wv_ms = elapsed_ms(t0)
         logger.info(
             f"[timing] search_architecture_decisions(hybrid): "
@@ -477,11 +484,13 @@ class RAGToolkit:
                 & Filter.by_property("principle_number").less_or_equal(end)
             )
             t0 = time.perf_counter()
-            results = collection.query.fetch_objects(
-                filters=pcp_filter,
-                limit=_FETCH_OBJECTS_LIMIT,
-                return_properties=props,
-            )
+            with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+                results = collection.query.fetch_objects(
+                    filters=pcp_filter,
+                    limit=_FETCH_OBJECTS_LIMIT,
+                    return_properties=props,
+                )
+                s.set(results=len(results.objects))
             wv_ms = elapsed_ms(t0)
             logger.info(
                 f"[timing] search_principles(range): "
@@ -499,11 +508,13 @@ class RAGToolkit:
             pcp_filter = Filter.by_property("principle_number").equal(padded)
             direct_limit = _get_truncation().get("direct_doc_max_chars", 12000)
             t0 = time.perf_counter()
-            results = collection.query.fetch_objects(
-                filters=pcp_filter,
-                limit=_FETCH_OBJECTS_LIMIT,
-                return_properties=props,
-            )
+            with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+                results = collection.query.fetch_objects(
+                    filters=pcp_filter,
+                    limit=_FETCH_OBJECTS_LIMIT,
+                    return_properties=props,
+                )
+                s.set(results=len(results.objects))
             wv_ms = elapsed_ms(t0)
             logger.info(
                 f"[timing] search_principles(exact): "
@@ -520,14 +531,16 @@ class RAGToolkit:
 
         query_vector = self._get_query_vector(query)
         t0 = time.perf_counter()
-        results = collection.query.hybrid(
-            query=query,
-            vector=query_vector,
-            limit=limit,
-            alpha=settings.alpha_vocabulary,
-            filters=pcp_filter,
-            return_properties=props,
-        )
+        with span("weaviate.hybrid", "weaviate", collection=collection.name) as s:
+            results = collection.query.hybrid(
+                query=query,
+                vector=query_vector,
+                limit=limit,
+                alpha=settings.alpha_vocabulary,
+                filters=pcp_filter,
+                return_properties=props,
+            )
+            s.set(results=len(results.objects))
         wv_ms = elapsed_ms(t0)
         logger.info(
             f"[timing] search_principles(hybrid): "
@@ -546,13 +559,15 @@ class RAGToolkit:
         query_vector = self._get_query_vector(query)
         content_limit = _get_truncation().get("content_max_chars", 800)
         t0 = time.perf_counter()
-        results = collection.query.hybrid(
-            query=query,
-            vector=query_vector,
-            limit=limit,
-            alpha=settings.alpha_vocabulary,
-            return_properties=props,
-        )
+        with span("weaviate.hybrid", "weaviate", collection=collection.name) as s:
+            results = collection.query.hybrid(
+                query=query,
+                vector=query_vector,
+                limit=limit,
+                alpha=settings.alpha_vocabulary,
+                return_properties=props,
+            )
+            s.set(results=len(results.objects))
         wv_ms = elapsed_ms(t0)
         logger.info(
             f"[timing] search_policies: "
@@ -568,10 +583,12 @@ class RAGToolkit:
         collection = self._get_collection("ArchitecturalDecision")
         props = self._get_return_props(collection)
         t0 = time.perf_counter()
-        results = collection.query.fetch_objects(
-            limit=_FETCH_OBJECTS_LIMIT,
-            return_properties=props,
-        )
+        with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+            results = collection.query.fetch_objects(
+                limit=_FETCH_OBJECTS_LIMIT,
+                return_properties=props,
+            )
+            s.set(results=len(results.objects))
         wv_ms = elapsed_ms(t0)
         logger.info(
             f"[timing] list_adrs: "
@@ -601,10 +618,12 @@ class RAGToolkit:
         collection = self._get_collection("Principle")
         props = self._get_return_props(collection)
         t0 = time.perf_counter()
-        results = collection.query.fetch_objects(
-            limit=_FETCH_OBJECTS_LIMIT,
-            return_properties=props,
-        )
+        with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+            results = collection.query.fetch_objects(
+                limit=_FETCH_OBJECTS_LIMIT,
+                return_properties=props,
+            )
+            s.set(results=len(results.objects))
         wv_ms = elapsed_ms(t0)
         logger.info(
             f"[timing] list_principles: "
@@ -634,10 +653,12 @@ class RAGToolkit:
         collection = self._get_collection("PolicyDocument")
         props = self._get_return_props(collection)
         t0 = time.perf_counter()
-        results = collection.query.fetch_objects(
-            limit=_FETCH_OBJECTS_LIMIT,
-            return_properties=props,
-        )
+        with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+            results = collection.query.fetch_objects(
+                limit=_FETCH_OBJECTS_LIMIT,
+                return_properties=props,
+            )
+            s.set(results=len(results.objects))
         wv_ms = elapsed_ms(t0)
         logger.info(
             f"[timing] list_policies: "
@@ -676,11 +697,13 @@ class RAGToolkit:
             props = self._get_return_props(collection)
             dar_filter = Filter.by_property("doc_type").equal("adr_approval")
             t0 = time.perf_counter()
-            results = collection.query.fetch_objects(
-                filters=dar_filter,
-                limit=_FETCH_OBJECTS_LIMIT,
-                return_properties=props,
-            )
+            with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+                results = collection.query.fetch_objects(
+                    filters=dar_filter,
+                    limit=_FETCH_OBJECTS_LIMIT,
+                    return_properties=props,
+                )
+                s.set(results=len(results.objects))
             wv_ms = elapsed_ms(t0)
             seen = {}
             for obj in results.objects:
@@ -705,11 +728,13 @@ class RAGToolkit:
             props = self._get_return_props(collection)
             dar_filter = Filter.by_property("doc_type").equal("principle_approval")
             t0 = time.perf_counter()
-            results = collection.query.fetch_objects(
-                filters=dar_filter,
-                limit=_FETCH_OBJECTS_LIMIT,
-                return_properties=props,
-            )
+            with span("weaviate.fetch_objects", "weaviate", collection=collection.name) as s:
+                results = collection.query.fetch_objects(
+                    filters=dar_filter,
+                    limit=_FETCH_OBJECTS_LIMIT,
+                    return_properties=props,
+                )
+                s.set(results=len(results.objects))
             wv_ms = elapsed_ms(t0)
             seen = {}
             for obj in results.objects:
@@ -749,22 +774,27 @@ class RAGToolkit:
             try:
                 collection = self._get_collection(base_name)
                 props = self._get_return_props(collection)
-                if query:
-                    coll_results = collection.query.hybrid(
-                        query=f"{team_name} {query}",
-                        vector=query_vector,
-                        limit=limit,
-                        alpha=settings.alpha_default,
-                        return_properties=props,
-                    )
-                else:
-                    # Use a high limit to ensure all chunks are scanned.
-                    # The per-team filter runs in Python after correction, so
-                    # we must fetch everything and filter down ourselves.
-                    coll_results = collection.query.fetch_objects(
-                        limit=_FETCH_OBJECTS_LIMIT,
-                        return_properties=props,
-                    )
+                with span(
+                    "weaviate.hybrid" if query else "weaviate.fetch_objects",
+                    "weaviate", collection=base_name,
+                ) as s:
+                    if query:
+                        coll_results = collection.query.hybrid(
+                            query=f"{team_name} {query}",
+                            vector=query_vector,
+                            limit=limit,
+                            alpha=settings.alpha_default,
+                            return_properties=props,
+                        )
+                    else:
+                        # Use a high limit to ensure all chunks are scanned.
+                        # The per-team filter runs in Python after correction, so
+                        # we must fetch everything and filter down ourselves.
+                        coll_results = collection.query.fetch_objects(
+                            limit=_FETCH_OBJECTS_LIMIT,
+                            return_properties=props,
+                        )
+                    s.set(results=len(coll_results.objects))
 
                 for obj in coll_results.objects:
                     # Apply ownership correction before filtering so that
@@ -799,7 +829,8 @@ class RAGToolkit:
         for base_name in base_names:
             if self.client.collections.exists(base_name):
                 collection = self.client.collections.get(base_name)
-                aggregate = collection.aggregate.over_all(total_count=True)
+                with span("weaviate.aggregate", "weaviate", collection=base_name):
+                    aggregate = collection.aggregate.over_all(total_count=True)
                 stats[base_name] = aggregate.total_count
             else:
                 stats[base_name] = 0
@@ -8,6 +8,9 @@ Extracted from GenerationPipeline for reuse across pipelines.
 import logging
 import re
 
+from aion.tools.yaml_model import YamlModel
+from aion.yaml_utils import dump_yaml, load_yaml
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,6 +98,71 @@ def build_source_metadata(sources: list[dict]) -> dict[str, dict]:
     return meta
 
 
+def _resolve_source_ref(ref_raw, etype: str, name: str) -> tuple[str | None, bool]:
+    """Canonical doc ref for an element, and whether it came from the name fallback.
+
+    Falls back to inferring the ref from the element name — only for
+    elements whose type matches the source doc type (Principle/ADR).
+    """
+    ref = normalize_ref(str(ref_raw)) if ref_raw else None
+    if ref:
+        return ref, False
+    # Type-gated fallback: only infer for Principle/ADR elements
+    if SOURCE_DOC_TYPES.get(etype):
+        m = re.match(r"(?:PCP|ADR)[.\s-]*(\d+)", name, re.I)
+        if m:
+            return normalize_ref(m.group(0)), True
+    return None, False
+
+
+def _apply_dct(props: dict, ref: str, meta: dict) -> None:
+    """Write dct:* properties for ``ref`` into ``props`` in place."""
+    props["dct:identifier"] = meta["resolved_identifier"]
+    props["dct:title"] = meta["title"]
+    if "creator" in meta:
+        props["dct:creator"] = meta["creator"]
+    if "issued" in meta:
+        props["dct:issued"] = meta["issued"]
+    if "language" in meta:
+        props["dct:language"] = meta["language"]
+
+    # UUID integrity check — catch pipeline corruption
+    raw_dct_id = meta.get("_raw_dct_identifier", "")
+    if raw_dct_id and props["dct:identifier"] != raw_dct_id:
+        logger.warning(
+            "[reconciliation] UUID mismatch for %s: enriched=%s, kb=%s",
+            ref, props["dct:identifier"], raw_dct_id,
+        )
+
+
+def _log_enrichment(total: int, explicit: int, fallback: int) -> None:
+    logger.info(
+        "dct enrichment: %d/%d elements enriched "
+        "(%d via source_ref, %d via name fallback)",
+        explicit + fallback, total, explicit, fallback,
+    )
+
+
+def enrich_model_with_dct(model: YamlModel, source_metadata: dict) -> None:
+    """Enrich a parsed model's elements with dct properties, in place.
+
+    Same rules as ``enrich_yaml_with_dct``; clears each element's
+    ``source_ref`` afterward.
+    """
+    explicit = 0
+    fallback = 0
+    for elem in model.elements.values():
+        ref, via_fallback = _resolve_source_ref(elem.source_ref, elem.type, elem.name)
+        elem.source_ref = ""
+        if ref and ref in source_metadata:
+            _apply_dct(elem.properties, ref, source_metadata[ref])
+            if via_fallback:
+                fallback += 1
+            else:
+                explicit += 1
+    _log_enrichment(len(model.elements), explicit, fallback)
+
+
 def enrich_yaml_with_dct(yaml_text: str, source_metadata: dict) -> str:
     """Enrich YAML elements with dct properties, strip source_ref.
 
@@ -104,74 +172,39 @@ def enrich_yaml_with_dct(yaml_text: str, source_metadata: dict) -> str:
     elements whose type matches the source doc type (Principle/ADR).
     Strips source_ref afterward (not an ArchiMate field).
     Returns original yaml_text unchanged on any parse error.
-    """
-    import yaml as _yaml
 
+    Text-in/text-out form for callers outside the generation pipeline,
+    which uses ``enrich_model_with_dct`` on the parsed model.
+    """
     try:
-        data = _yaml.safe_load(yaml_text)
+        data = load_yaml(yaml_text)
     except Exception:
         return yaml_text
     if not data or "elements" not in data:
         return yaml_text
 
     total = 0
-    enriched = 0
     explicit = 0
     fallback = 0
 
     for elem in data.get("elements", []):
         total += 1
-        ref_raw = elem.pop("source_ref", None)
-        ref = normalize_ref(ref_raw) if ref_raw else None
-        via_fallback = False
-
-        # Type-gated fallback: only infer for Principle/ADR elements
-        if not ref:
-            expected_prefix = SOURCE_DOC_TYPES.get(
-                elem.get("type", "")
-            )
-            if expected_prefix:
-                name = elem.get("name", "")
-                m = re.match(r"(?:PCP|ADR)[.\s-]*(\d+)", name, re.I)
-                if m:
-                    ref = normalize_ref(m.group(0))
-                    via_fallback = True
-
+        ref, via_fallback = _resolve_source_ref(
+            elem.pop("source_ref", None), elem.get("type", ""), elem.get("name", ""),
+        )
         if ref and ref in source_metadata:
             props = elem.get("properties", {})
             if not isinstance(props, dict):
                 props = {}
-            meta = source_metadata[ref]
-            props["dct:identifier"] = meta["resolved_identifier"]
-            props["dct:title"] = meta["title"]
-            if "creator" in meta:
-                props["dct:creator"] = meta["creator"]
-            if "issued" in meta:
-                props["dct:issued"] = meta["issued"]
-            if "language" in meta:
-                props["dct:language"] = meta["language"]
-
-            # UUID integrity check — catch pipeline corruption
-            raw_dct_id = meta.get("_raw_dct_identifier", "")
-            if raw_dct_id and props["dct:identifier"] != raw_dct_id:
-                logger.warning(
-                    "[reconciliation] UUID mismatch for %s: enriched=%s, kb=%s",
-                    ref, props["dct:identifier"], raw_dct_id,
-                )
-
+            _apply_dct(props, ref, source_metadata[ref])
             elem["properties"] = props
-            enriched += 1
             if via_fallback:
                 fallback += 1
             else:
                 explicit += 1
 
-    logger.info(
-        "dct enrichment: %d/%d elements enriched "
-        "(%d via source_ref, %d via name fallback)",
-        enriched, total, explicit, fallback,
-    )
+    _log_enrichment(total, explicit, fallback)
 
-    return _yaml.dump(
+    return dump_yaml(
         data, default_flow_style=False, allow_unicode=True, sort_keys=False
     )
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 # ── Safe YAML loading ─────────────────────────────────────────────────────────
 
 try:
-    import yaml
+    from aion.yaml_utils import load_yaml
     _HAS_YAML = True
 except ImportError:
     _HAS_YAML = False
@@ -29,7 +29,7 @@ def _safe_load_yaml(filepath):
         return _fallback_yaml_parse(filepath)
     try:
         with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-            return yaml.safe_load(f)
+            return load_yaml(f)
     except Exception:
         return None
 
@@ -4,6 +4,10 @@ Calls the SKOSMOS REST API for structured vocabulary lookups.
 Fixes critical quality issues in vocabulary queries (wrong results,
 duplicates, incoherent comparisons) by using SKOSMOS's exact label
 matching instead of Weaviate's approximate vector similarity.
+
+Search and concept lookups are served from the offline SKOS index
+(``aion.tools.skosmos_index``) when a snapshot exists; the live API is
+only hit on a miss.
 """
 
 import logging
@@ -11,9 +15,11 @@ import logging
 import requests
 
 from aion.config import settings
+from aion.tools.skosmos_index import get_vocabulary_index
 
 logger = logging.getLogger(__name__)
 
+_session: requests.Session | None = None
 
 
 def _base_url() -> str:
@@ -21,6 +27,21 @@ def _base_url() -> str:
     return f"{settings.skosmos_url}/rest/v1"
 
 
+def _http() -> requests.Session:
+    """Shared HTTP session — keeps the SKOSMOS connection alive across calls."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def _vocab_filter(vocab: str | None) -> str | None:
+    """Normalize the vocab argument; the LLM sometimes passes the string "None"."""
+    if vocab and str(vocab).strip().lower() != "none":
+        return vocab
+    return None
+
+
 # ---------------------------------------------------------------------------
 # JSON-LD helpers
 # ---------------------------------------------------------------------------
@@ -84,14 +105,21 @@ def skosmos_search(
     """Search SKOSMOS for concepts matching a query string.
 
     Uses exact and pattern-based label matching with unique=true to
-    prevent duplicate results.
+    prevent duplicate results. Served from the offline index when it has
+    hits; falls back to the live API otherwise.
 
     Returns:
         dict with "results" (list of concept dicts) and "total_results" (int).
     """
+    vocab = _vocab_filter(vocab)
+    index = get_vocabulary_index()
+    if index is not None:
+        results = index.search(query, lang=lang, vocab=vocab, max_results=max_results)
+        if results:
+            return {"results": results, "total_results": len(results)}
+
     try:
-        # Guard against LLM passing string "None" instead of omitting the param
-        if vocab and str(vocab).strip().lower() != "none":
+        if vocab:
             url = f"{_base_url()}/{vocab}/search"
         else:
             url = f"{_base_url()}/search"
@@ -104,7 +132,7 @@ def skosmos_search(
             "fields": "broader related",
         }
 
-        resp = requests.get(url, params=params, timeout=settings.timeout_skosmos)
+        resp = _http().get(url, params=params, timeout=settings.timeout_skosmos)
         resp.raise_for_status()
         data = resp.json()
 
@@ -148,13 +176,19 @@ def skosmos_concept_details(
     Fetches and flattens JSON-LD response into a simple dict with
     prefLabel, definition, broader/narrower/related links, etc.
     """
+    if not vocab:
+        return {"error": "vocab parameter is required — use the 'vocab' field from skosmos_search results"}
+    index = get_vocabulary_index()
+    if index is not None:
+        details = index.concept_details(uri, vocab=vocab, lang=lang)
+        if details is not None:
+            return details
+
     try:
-        if not vocab:
-            return {"error": "vocab parameter is required — use the 'vocab' field from skosmos_search results"}
         url = f"{_base_url()}/{vocab}/data"
         params = {"uri": uri, "format": "application/json"}
 
-        resp = requests.get(url, params=params, timeout=settings.timeout_skosmos)
+        resp = _http().get(url, params=params, timeout=settings.timeout_skosmos)
         resp.raise_for_status()
         data = resp.json()
 
@@ -267,12 +301,18 @@ def skosmos_list_vocabularies(lang: str = "en") -> dict:
     """List all vocabularies available in SKOSMOS.
 
     Returns vocabulary IDs, titles, descriptions, and concept counts.
+    The offline index only has titles in its sync language; other
+    languages go to the live API.
     """
+    index = get_vocabulary_index()
+    if index is not None and index.vocabularies and index.lang == lang:
+        return {"vocabularies": [dict(v) for v in index.vocabularies]}
+
     try:
         url = f"{_base_url()}/vocabularies"
         params = {"lang": lang}
 
-        resp = requests.get(url, params=params, timeout=settings.timeout_skosmos)
+        resp = _http().get(url, params=params, timeout=settings.timeout_skosmos)
         resp.raise_for_status()
         data = resp.json()
 
@@ -0,0 +1,481 @@
+"""Offline SKOS vocabulary index.
+
+A local snapshot of every SKOSMOS vocabulary, so the hot vocabulary
+tools (``skosmos_search``, ``skosmos_concept_details``, ``skosmos_define``)
+resolve from memory instead of paying several serial HTTP round trips
+per disambiguation turn.
+
+Three layers:
+
+* **Snapshot** — ``sync_vocabularies()`` pulls each vocabulary's full
+  JSON-LD dump from the SKOSMOS REST API and writes a compact gzip'd
+  JSON file (``settings.skosmos_index_path``). Run via ``aion sync-vocabularies``.
+* **Label index** — built in memory at load time: exact label map,
+  sorted label list for prefix search (``bisect``), trigram postings
+  for infix search (SKOSMOS's ``*query*`` semantics), and an
+  abbreviation map (``DSO`` → "Distribution System Operator").
+* **Concept store** — URI → concept record, for ``concept_details``
+  without a network call.
+
+The index is strictly a cache: ``aion.tools.skosmos`` consults it first
+and falls back to the live API on a miss. A missing index file means
+every call goes live, exactly as before.
+"""
+
+import bisect
+import gzip
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from aion.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+# Abbreviations: short, uppercase-dominant tokens (DSO, TSO, CIM, IEC61968).
+_ABBREV_RE = re.compile(r"^[A-Z][A-Z0-9&\-]{1,9}$")
+# "Distribution System Operator (DSO)" → DSO
+_PAREN_ABBREV_RE = re.compile(r"\(([A-Z][A-Z0-9&\-]{1,9})\)\s*$")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_label(text: str) -> str:
+    """Case-fold and collapse whitespace — the key for every label lookup."""
+    return _WS_RE.sub(" ", text).strip().casefold()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# ---------------------------------------------------------------------------
+# JSON-LD → compact concept records
+# ---------------------------------------------------------------------------
+
+def _lang_values(val) -> dict[str, list[str]]:
+    """Flatten a JSON-LD literal (str / dict / list) into ``{lang: [values]}``.
+
+    Untagged literals are stored under the empty language ``""``.
+    """
+    out: dict[str, list[str]] = {}
+    items = val if isinstance(val, list) else [val]
+    for item in items:
+        if isinstance(item, str):
+            lang, value = "", item
+        elif isinstance(item, dict):
+            lang = item.get("lang", item.get("@language", "")) or ""
+            value = item.get("value", item.get("@value", ""))
+        else:
+            continue
+        if value:
+            out.setdefault(lang, []).append(str(value))
+    return out
+
+
+def _link_uris(val) -> list[str]:
+    """Extract URIs from a JSON-LD broader/narrower/related value."""
+    if not val:
+        return []
+    items = val if isinstance(val, list) else [val]
+    uris = []
+    for item in items:
+        if isinstance(item, str):
+            uris.append(item)
+        elif isinstance(item, dict):
+            uri = item.get("uri", item.get("@id", ""))
+            if uri:
+                uris.append(uri)
+    return uris
+
+
+def _is_concept(node: dict) -> bool:
+    types = node.get("type", node.get("@type", []))
+    if isinstance(types, str):
+        types = [types]
+    return any(t in ("skos:Concept", "Concept") or t.endswith("#Concept") for t in types)
+
+
+def concepts_from_graph(data: dict, vocab: str) -> list[dict]:
+    """Convert a SKOSMOS JSON-LD vocabulary dump into compact concept records."""
+    graph = data.get("graph", data.get("@graph", [data]))
+    if not isinstance(graph, list):
+        graph = [graph]
+
+    concepts = []
+    for node in graph:
+        if not isinstance(node, dict) or not _is_concept(node):
+            continue
+        uri = node.get("uri", node.get("@id", ""))
+        pref = {lang: vals[0] for lang, vals in _lang_values(node.get("prefLabel", [])).items()}
+        if not uri or not pref:
+            continue
+        definition = _lang_values(node.get("skos:definition", node.get("definition", [])))
+        scope = _lang_values(node.get("scopeNote", node.get("skos:scopeNote", [])))
+        notation = node.get("notation", node.get("skos:notation", ""))
+        if isinstance(notation, (dict, list)):
+            notation = next(iter(_lang_values(notation).values()), [""])[0]
+        concepts.append({
+            "uri": uri,
+            "vocab": vocab,
+            "pref": pref,
+            "alt": _lang_values(node.get("altLabel", [])),
+            "def": {lang: vals[0] for lang, vals in definition.items()},
+            "scope": {lang: vals[0] for lang, vals in scope.items()},
+            "broader": _link_uris(node.get("broader")),
+            "narrower": _link_uris(node.get("narrower")),
+            "related": _link_uris(node.get("related")),
+            "notation": notation or "",
+        })
+    return concepts
+
+
+def _pick(by_lang: dict[str, str], lang: str) -> str:
+    """Pick a value by language preference: requested → untagged → en → any."""
+    if not by_lang:
+        return ""
+    for candidate in (lang, "", "en"):
+        if candidate in by_lang:
+            return by_lang[candidate]
+    return next(iter(by_lang.values()))
+
+
+# ---------------------------------------------------------------------------
+# In-memory index
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class _LabelEntry:
+    """One (concept, label) pair in the label index."""
+
+    concept: int
+    label: str
+    lang: str
+    is_pref: bool
+
+
+@dataclass
+class VocabularyIndex:
+    """Label + concept index over a SKOSMOS snapshot.
+
+    Build with ``from_snapshot`` (or ``load``); all lookups are pure
+    in-memory dict / bisect operations. Concept labels keep every
+    language; ``vocabularies`` titles are in ``lang``, the sync language.
+    """
+
+    concepts: list[dict]
+    vocabularies: list[dict] = field(default_factory=list)
+    built_at: float = 0.0
+    source_url: str = ""
+    lang: str = "en"
+
+    def __post_init__(self) -> None:
+        self._by_uri: dict[str, int] = {}
+        self._entries: list[_LabelEntry] = []
+        self._exact: dict[str, list[int]] = {}
+        self._abbrev: dict[str, set[int]] = {}
+        self._trigram: dict[str, list[int]] = {}
+
+        for ci, concept in enumerate(self.concepts):
+            self._by_uri[concept["uri"]] = ci
+            for lang, label in concept["pref"].items():
+                self._add_label(ci, label, lang, is_pref=True)
+            for lang, labels in concept["alt"].items():
+                for label in labels:
+                    self._add_label(ci, label, lang, is_pref=False)
+            notation = concept.get("notation", "")
+            if notation and _ABBREV_RE.match(notation):
+                self._abbrev.setdefault(notation.casefold(), set()).add(ci)
+
+        # Prefix search: entries sorted by normalized label, bisect on the keys.
+        order = sorted(range(len(self._entries)), key=lambda i: normalize_label(self._entries[i].label))
+        self._sorted_keys = [normalize_label(self._entries[i].label) for i in order]
+        self._sorted_ids = order
+
+    def _add_label(self, ci: int, label: str, lang: str, *, is_pref: bool) -> None:
+        eid = len(self._entries)
+        self._entries.append(_LabelEntry(ci, label, lang, is_pref))
+        key = normalize_label(label)
+        self._exact.setdefault(key, []).append(eid)
+        for gram in _trigrams(key):
+            self._trigram.setdefault(gram, []).append(eid)
+
+        if _ABBREV_RE.match(label.strip()):
+            self._abbrev.setdefault(key, set()).add(ci)
+        m = _PAREN_ABBREV_RE.search(label)
+        if m:
+            self._abbrev.setdefault(m.group(1).casefold(), set()).add(ci)
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    # -- lookups ------------------------------------------------------------
+
+    def _candidates(self, key: str) -> list[tuple[int, int]]:
+        """Return ``(rank, entry_id)`` for every label matching ``key``.
+
+        Rank 0 = exact, 1 = prefix, 2 = infix. Entries can appear more
+        than once; the caller keeps the best rank per concept.
+        """
+        found: list[tuple[int, int]] = [(0, eid) for eid in self._exact.get(key, ())]
+
+        start = bisect.bisect_left(self._sorted_keys, key)
+        for pos in range(start, len(self._sorted_keys)):
+            if not self._sorted_keys[pos].startswith(key):
+                break
+            found.append((1, self._sorted_ids[pos]))
+
+        if len(key) >= 3:
+            postings = [self._trigram.get(g) for g in _trigrams(key)]
+            if all(postings):
+                postings.sort(key=len)
+                pool = set(postings[0])
+                for p in postings[1:]:
+                    pool.intersection_update(p)
+                    if not pool:
+                        break
+                found.extend(
+                    (2, eid) for eid in pool
+                    if key in normalize_label(self._entries[eid].label)
+                )
+        else:
+            found.extend(
+                (2, eid) for eid, entry in enumerate(self._entries)
+                if key in normalize_label(entry.label)
+            )
+        return found
+
+    def search(
+        self,
+        query: str,
+        lang: str = "en",
+        vocab: str | None = None,
+        max_results: int = 10,
+    ) -> list[dict]:
+        """Label search with the same result shape as the SKOSMOS ``/search`` API.
+
+        One hit per concept (``unique=true``). Ordering: abbreviation or
+        exact match, then prefix, then infix; within a rank, labels in
+        the requested language before other languages, prefLabel before
+        altLabel, shorter labels first.
+        """
+        key = normalize_label(query.strip("*"))
+        if not key:
+            return []
+
+        best: dict[int, tuple] = {}
+        for ci in self._abbrev.get(key, ()):
+            best[ci] = (0, 0, 0, 0, None)
+        for rank, eid in self._candidates(key):
+            entry = self._entries[eid]
+            sort_key = (
+                rank,
+                0 if entry.lang in (lang, "") else 1,
+                0 if entry.is_pref else 1,
+                len(entry.label),
+                entry,
+            )
+            current = best.get(entry.concept)
+            if current is None or sort_key[:4] < current[:4]:
+                best[entry.concept] = sort_key
+
+        ranked = sorted(best.items(), key=lambda kv: (kv[1][:4], kv[0]))
+        results = []
+        for ci, sort_key in ranked:
+            concept = self.concepts[ci]
+            if vocab and concept["vocab"] != vocab:
+                continue
+            entry = sort_key[4]
+            results.append({
+                "uri": concept["uri"],
+                "prefLabel": _pick(concept["pref"], lang),
+                "altLabel": entry.label if entry is not None and not entry.is_pref else "",
+                "vocab": concept["vocab"],
+                "definition": _pick(concept["def"], lang),
+                "broader": self._links(concept["broader"], lang),
+                "related": self._links(concept["related"], lang),
+            })
+            if len(results) >= max_results:
+                break
+        return results
+
+    def _links(self, uris: list[str], lang: str) -> list[dict]:
+        links = []
+        for uri in uris:
+            ci = self._by_uri.get(uri)
+            label = _pick(self.concepts[ci]["pref"], lang) if ci is not None else ""
+            links.append({"uri": uri, "label": label})
+        return links
+
+    def concept_details(self, uri: str, vocab: str | None = None, lang: str = "en") -> dict | None:
+        """Return the ``skosmos_concept_details`` shape, or ``None`` on a miss."""
+        ci = self._by_uri.get(uri)
+        if ci is None:
+            return None
+        concept = self.concepts[ci]
+        if vocab and concept["vocab"] != vocab:
+            return None
+        alt = concept["alt"]
+        alt_labels = alt.get(lang) or alt.get("") or [label for labels in alt.values() for label in labels]
+        return {
+            "uri": uri,
+            "prefLabel": _pick(concept["pref"], lang),
+            "altLabels": list(alt_labels),
+            "definition": _pick(concept["def"], lang),
+            "broader": self._links(concept["broader"], lang),
+            "narrower": self._links(concept["narrower"], lang),
+            "related": self._links(concept["related"], lang),
+            "scopeNote": _pick(concept["scope"], lang),
+            "notation": concept.get("notation", ""),
+        }
+
+    # -- persistence --------------------------------------------------------
+
+    def to_snapshot(self) -> dict:
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "built_at": self.built_at,
+            "source_url": self.source_url,
+            "lang": self.lang,
+            "vocabularies": self.vocabularies,
+            "concepts": self.concepts,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> "VocabularyIndex":
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported SKOS index version {data.get('version')!r} "
+                f"(expected {INDEX_FORMAT_VERSION}) — re-run `aion sync-vocabularies`"
+            )
+        return cls(
+            concepts=data.get("concepts", []),
+            vocabularies=data.get("vocabularies", []),
+            built_at=data.get("built_at", 0.0),
+            source_url=data.get("source_url", ""),
+            lang=data.get("lang", "en"),  # snapshots predating the field were synced in "en"
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot atomically (temp file + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        payload = json.dumps(self.to_snapshot(), ensure_ascii=False, separators=(",", ":"))
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(payload)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "VocabularyIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls.from_snapshot(json.load(f))
+
+
+# ---------------------------------------------------------------------------
+# Module-level cache
+# ---------------------------------------------------------------------------
+
+_index: VocabularyIndex | None = None
+_index_loaded = False
+
+
+def index_path() -> Path:
+    return settings.resolve_path(settings.skosmos_index_path)
+
+
+def get_vocabulary_index() -> VocabularyIndex | None:
+    """Return the loaded index, or ``None`` if no snapshot exists.
+
+    Loaded once per process. A corrupt or outdated snapshot is logged
+    and treated as absent, so the tools fall back to the live API.
+    """
+    global _index, _index_loaded
+    if _index_loaded:
+        return _index
+    _index_loaded = True
+    path = index_path()
+    if not path.exists():
+        return None
+    try:
+        start = time.perf_counter()
+        _index = VocabularyIndex.load(path)
+        logger.info(
+            "[timing] skos_index_load concepts=%d elapsed_ms=%d",
+            len(_index), (time.perf_counter() - start) * 1000,
+        )
+    except (OSError, ValueError, KeyError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring unusable SKOS index at %s: %s", path, e)
+        _index = None
+    return _index
+
+
+def set_vocabulary_index(index: VocabularyIndex | None) -> None:
+    """Install an index directly (after a sync, or in tests)."""
+    global _index, _index_loaded
+    _index = index
+    _index_loaded = True
+
+
+def clear_cache() -> None:
+    """Forget the loaded index; the next lookup reloads from disk."""
+    global _index, _index_loaded
+    _index = None
+    _index_loaded = False
+
+
+# ---------------------------------------------------------------------------
+# Snapshot / sync
+# ---------------------------------------------------------------------------
+
+def sync_vocabularies(path: Path | None = None, lang: str = "en") -> VocabularyIndex:
+    """Pull every SKOSMOS vocabulary into a fresh on-disk index.
+
+    Raises ``requests.RequestException`` if SKOSMOS is unreachable — a
+    partial snapshot would silently shadow concepts the live API has.
+    """
+    from aion.tools.skosmos import _base_url, _extract_label, _http
+
+    session = _http()
+    resp = session.get(f"{_base_url()}/vocabularies", params={"lang": lang},
+                       timeout=settings.timeout_skosmos)
+    resp.raise_for_status()
+
+    vocabularies = []
+    concepts: list[dict] = []
+    for item in resp.json().get("vocabularies", []):
+        vocab_id = item.get("id", "")
+        if not vocab_id:
+            continue
+        # Same JSON-LD format the live concept_details fetch uses; without
+        # a uri parameter SKOSMOS returns the whole vocabulary graph.
+        data_resp = session.get(
+            f"{_base_url()}/{vocab_id}/data",
+            params={"format": "application/json"},
+            timeout=settings.timeout_long_running,
+        )
+        data_resp.raise_for_status()
+        vocab_concepts = concepts_from_graph(data_resp.json(), vocab_id)
+        concepts.extend(vocab_concepts)
+        vocabularies.append({
+            "id": vocab_id,
+            "title": _extract_label(item.get("title", "")),
+            "description": _extract_label(item.get("description", "")),
+            "concept_count": item.get("conceptCount", len(vocab_concepts)),
+            "languages": item.get("languages", []),
+        })
+        logger.info("SKOS sync: %s → %d concepts", vocab_id, len(vocab_concepts))
+
+    index = VocabularyIndex(
+        concepts=concepts,
+        vocabularies=vocabularies,
+        built_at=time.time(),
+        source_url=settings.skosmos_url,
+        lang=lang,
+    )
+    index.save(path or index_path())
+    set_vocabulary_index(index)
+    return index
@@ -0,0 +1,296 @@
+"""Typed in-memory form of the ArchiMate YAML model.
+
+The generation pipeline used to hand YAML *text* from stage to stage:
+registry reconciliation, source-metadata backfill, DCT enrichment, diff
+merge and XML conversion each re-parsed it, and most dumped it back.
+``parse_model`` now validates the LLM output once into a ``YamlModel``;
+every stage works on that object and the model is serialized only at the
+edges — ``yaml_to_xml.serialize_model`` for the companion .yaml artifact
+and ``yaml_to_xml.yaml_to_archimate_xml`` for the XML.
+
+Element IDs are stored normalized (``id-`` prefixed), the form the XML
+uses; relationship IDs are derived on demand from source/target so they
+stay correct after reconciliation rewrites element IDs.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from aion.tools.archimate import (
+    COMPOSITE,
+    VALID_ELEMENT_TYPES,
+    VALID_RELATIONSHIP_TYPES,
+    relationship_allowed,
+)
+from aion.yaml_utils import YAMLError, load_yaml
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class YamlElement:
+    id: str
+    type: str
+    name: str
+    documentation: str = ""
+    properties: dict[str, str] = field(default_factory=dict)
+    source_ref: str = ""  # provenance hint for DCT enrichment, never serialized
+
+
+@dataclass(slots=True)
+class YamlRelationship:
+    type: str
+    source: str
+    target: str
+    name: str = ""
+    properties: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class YamlModel:
+    """Validated model. ``elements`` is keyed by normalized element ID in document order."""
+
+    name: str
+    documentation: str = ""
+    elements: dict[str, YamlElement] = field(default_factory=dict)
+    relationships: list[YamlRelationship] = field(default_factory=list)
+
+    def copy(self) -> "YamlModel":
+        """Copy deep enough that mutating the copy never touches this model."""
+        return YamlModel(
+            name=self.name,
+            documentation=self.documentation,
+            elements={
+                eid: YamlElement(e.id, e.type, e.name, e.documentation,
+                                 dict(e.properties), e.source_ref)
+                for eid, e in self.elements.items()
+            },
+            relationships=[
+                YamlRelationship(r.type, r.source, r.target, r.name, dict(r.properties))
+                for r in self.relationships
+            ],
+        )
+
+    def remap_ids(self, id_map: dict[str, str]) -> None:
+        """Rename elements (old ID → new ID) and follow them in relationships.
+
+        Raises:
+            ValueError: If two elements end up with the same ID — the same
+                error ``parse_model`` reports for a duplicate.
+        """
+        if not id_map:
+            return
+        elements: dict[str, YamlElement] = {}
+        for eid, elem in self.elements.items():
+            new_id = id_map.get(eid, eid)
+            if new_id in elements:
+                raise ValueError(f"Duplicate element id: '{new_id.removeprefix('id-')}'")
+            elem.id = new_id
+            elements[new_id] = elem
+        self.elements = elements
+        for rel in self.relationships:
+            rel.source = id_map.get(rel.source, rel.source)
+            rel.target = id_map.get(rel.target, rel.target)
+
+    def relationship_ids(self) -> list[str]:
+        """Deterministic relationship IDs: ``id-rel-{source}-{target}`` with ``-N`` for repeats."""
+        pair_counts: dict[str, int] = defaultdict(int)
+        ids = []
+        for rel in self.relationships:
+            pair_key = f"{rel.source.removeprefix('id-')}-{rel.target.removeprefix('id-')}"
+            pair_counts[pair_key] += 1
+            count = pair_counts[pair_key]
+            ids.append(f"id-rel-{pair_key}" if count == 1 else f"id-rel-{pair_key}-{count}")
+        return ids
+
+
+def validate_properties(raw) -> dict[str, str]:
+    """Validate and normalize a properties mapping.
+
+    Accepts a dict of key→value pairs. Non-dict input returns empty dict.
+    Keys and values are coerced to strings and stripped.
+    """
+    if not raw or not isinstance(raw, dict):
+        return {}
+    result = {}
+    for k, v in raw.items():
+        k_str = str(k).strip()
+        if not k_str:
+            continue
+        result[k_str] = str(v).strip()
+    return result
+
+
+def parse_model(yaml_str: str) -> YamlModel:
+    """Parse YAML and validate all fields into a ``YamlModel``.
+
+    Element IDs are prefixed with 'id-' if not already. Relationships
+    whose source or target is not a model element are dropped with a
+    warning; type pairs outside ``ALLOWED_PATTERNS`` only warn.
+
+    Raises:
+        ValueError: If YAML is invalid, missing required fields, or
+            contains invalid element/relationship types.
+    """
+    try:
+        raw = load_yaml(yaml_str)
+    except YAMLError as e:
+        raise ValueError(f"Invalid YAML syntax: {e}") from e
+
+    if not isinstance(raw, dict):
+        raise ValueError("YAML root must be a mapping")
+
+    # Model metadata
+    meta = raw.get("model", {})
+    if not isinstance(meta, dict):
+        raise ValueError("'model' must be a mapping with at least 'name'")
+    if not meta.get("name"):
+        raise ValueError("'model.name' is required")
+    model = YamlModel(
+        name=str(meta["name"]).strip(),
+        documentation=str(meta.get("documentation", "")).strip(),
+    )
+
+    # Elements
+    elements = raw.get("elements", [])
+    if not isinstance(elements, list) or not elements:
+        raise ValueError("'elements' must be a non-empty list")
+
+    for i, elem in enumerate(elements):
+        if not isinstance(elem, dict):
+            raise ValueError(f"Element {i}: must be a mapping")
+        eid = str(elem.get("id", "")).strip()
+        if not eid:
+            raise ValueError(f"Element {i}: 'id' is required")
+        etype = str(elem.get("type", "")).strip()
+        if not etype:
+            raise ValueError(f"Element '{eid}': 'type' is required")
+        if etype not in VALID_ELEMENT_TYPES:
+            raise ValueError(
+                f"Element '{eid}': invalid type '{etype}'. "
+                f"Must be one of the valid ArchiMate element types."
+            )
+        ename = str(elem.get("name", "")).strip()
+        if not ename:
+            raise ValueError(f"Element '{eid}': 'name' is required")
+
+        documentation = str(elem.get("documentation", "") or "").strip()
+        if not documentation:
+            logger.warning(
+                f"[yaml_to_xml] Element '{eid}' ({etype}) has no documentation"
+            )
+
+        # Normalize ID: add 'id-' prefix if missing
+        full_id = eid if eid.startswith("id-") else f"id-{eid}"
+        if full_id in model.elements:
+            raise ValueError(f"Duplicate element id: '{eid}'")
+
+        source_ref = elem.get("source_ref")
+        model.elements[full_id] = YamlElement(
+            id=full_id,
+            type=etype,
+            name=ename,
+            documentation=documentation,
+            properties=validate_properties(elem.get("properties")),
+            source_ref=str(source_ref).strip() if source_ref else "",
+        )
+
+    # Relationships
+    relationships = raw.get("relationships", [])
+    if not isinstance(relationships, list):
+        raise ValueError("'relationships' must be a list")
+
+    for i, rel in enumerate(relationships):
+        if not isinstance(rel, dict):
+            raise ValueError(f"Relationship {i}: must be a mapping")
+        rtype = str(rel.get("type", "")).strip()
+        if not rtype:
+            raise ValueError(f"Relationship {i}: 'type' is required")
+        if rtype not in VALID_RELATIONSHIP_TYPES:
+            raise ValueError(
+                f"Relationship {i}: invalid type '{rtype}'. "
+                f"Must be one of the valid ArchiMate relationship types."
+            )
+        source = str(rel.get("source", "")).strip()
+        target = str(rel.get("target", "")).strip()
+        if not source or not target:
+            raise ValueError(f"Relationship {i}: 'source' and 'target' are required")
+
+        # Normalize source/target IDs
+        full_source = source if source.startswith("id-") else f"id-{source}"
+        full_target = target if target.startswith("id-") else f"id-{target}"
+
+        src_elem = model.elements.get(full_source)
+        if src_elem is None:
+            logger.warning(
+                f"Relationship {i}: source '{source}' does not reference "
+                f"a valid element id — dropping relationship"
+            )
+            continue
+        tgt_elem = model.elements.get(full_target)
+        if tgt_elem is None:
+            logger.warning(
+                f"Relationship {i}: target '{target}' does not reference "
+                f"a valid element id — dropping relationship"
+            )
+            continue
+
+        # Validate source→target pair against ALLOWED_PATTERNS
+        if rtype != "Association":
+            src_type, tgt_type = src_elem.type, tgt_elem.type
+            if src_type not in COMPOSITE and tgt_type not in COMPOSITE:
+                if not relationship_allowed(rtype, src_type, tgt_type):
+                    logger.warning(
+                        f"[yaml_to_xml] Relationship {i} ({rtype}): "
+                        f"{src_type} -> {tgt_type} may not be a valid "
+                        f"ArchiMate 3.2 relationship"
+                    )
+
+        model.relationships.append(YamlRelationship(
+            type=rtype,
+            source=full_source,
+            target=full_target,
+            name=str(rel.get("name", "")).strip(),
+            properties=validate_properties(rel.get("properties")),
+        ))
+
+    return model
+
+
+def model_to_data(model: YamlModel) -> dict:
+    """Normalized dict consumed by the XML builder and layout engine.
+
+    Same shape ``yaml_to_xml._parse_and_validate`` has always returned:
+    ``properties`` only present when non-empty, relationship IDs derived.
+    """
+    elements = []
+    for elem in model.elements.values():
+        entry = {
+            "id": elem.id,
+            "type": elem.type,
+            "name": elem.name,
+            "documentation": elem.documentation,
+        }
+        if elem.properties:
+            entry["properties"] = elem.properties
+        elements.append(entry)
+
+    relationships = []
+    for rid, rel in zip(model.relationship_ids(), model.relationships):
+        entry = {
+            "id": rid,
+            "type": rel.type,
+            "source": rel.source,
+            "target": rel.target,
+            "name": rel.name,
+        }
+        if rel.properties:
+            entry["properties"] = rel.properties
+        relationships.append(entry)
+
+    return {
+        "model": {"name": model.name, "documentation": model.documentation},
+        "elements": elements,
+        "relationships": relationships,
+    }
@@ -0,0 +1,241 @@
+"""Incremental ArchiMate YAML validation over an LLM token stream.
+
+``GenerationPipeline`` used to discover a malformed YAML model only after
+the whole response had been generated — then pay a full retry. This
+module validates the model *while it streams*: each ``elements`` /
+``relationships`` list item is parsed and checked as soon as the next
+item (or section) starts, so a structural error aborts generation
+within seconds instead of at the end.
+
+Checks mirror ``yaml_model.parse_model`` exactly:
+
+* **Structural errors** (raise ``YamlStreamError``) — invalid YAML in an
+  item, missing ``id``/``type``/``name``, unknown element type, duplicate
+  element id, unknown relationship type, missing ``source``/``target``,
+  missing ``model.name``. These are the same conditions the converter
+  rejects, so aborting early never rejects output the converter accepts.
+* **Warnings** (counted, never abort) — relationships referencing unknown
+  element ids (the converter drops them) and source→target pairs not in
+  ``ALLOWED_PATTERNS`` (the converter only warns).
+
+Refinement diff envelopes (``refinement:``) pass through unvalidated;
+``apply_yaml_diff`` owns their semantics.
+"""
+
+import logging
+import re
+from collections.abc import Callable
+
+from aion.tools.archimate import (
+    COMPOSITE,
+    VALID_ELEMENT_TYPES,
+    VALID_RELATIONSHIP_TYPES,
+    relationship_allowed,
+)
+from aion.yaml_utils import YAMLError, load_yaml
+
+logger = logging.getLogger(__name__)
+
+_FENCE_RE = re.compile(r"^\s*```\s*([A-Za-z]*)\s*$")
+_TOP_KEY_RE = re.compile(r"^([A-Za-z_][\w-]*):(.*)$")
+_ITEM_RE = re.compile(r"^(\s*)-(\s|$)")
+_LIST_SECTIONS = ("elements", "relationships")
+
+
+class YamlStreamError(ValueError):
+    """Structural error detected mid-stream. Message matches the converter's."""
+
+
+class IncrementalModelParser:
+    """Line-oriented incremental validator for the ArchiMate YAML schema.
+
+    Feed raw token deltas with ``feed()``; call ``finish()`` once the
+    stream ends to validate the trailing item. ``on_progress`` is called
+    with ``(element_count, relationship_count)`` whenever a new item is
+    accepted — the pipeline forwards it to the UI as a status event.
+    """
+
+    def __init__(self, on_progress: Callable[[int, int], None] | None = None):
+        self._on_progress = on_progress
+        self._pending = ""
+        self._started = False
+        self._in_fence = False
+        self._done = False
+        self._in_think = False
+        self._passthrough = False
+
+        self._section: str | None = None
+        self._section_lines: list[str] = []
+        self._item_indent: int | None = None
+        self._item_lines: list[str] = []
+
+        self.element_ids: dict[str, str] = {}
+        self.element_count = 0
+        self.relationship_count = 0
+        self.warnings: list[str] = []
+
+    # -- public API ---------------------------------------------------------
+
+    def feed(self, chunk: str) -> None:
+        """Consume a token delta. Raises ``YamlStreamError`` on a structural error."""
+        if self._done or not chunk:
+            return
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self._line(line)
+            if self._done:
+                break
+
+    def finish(self) -> None:
+        """Flush the trailing partial line and the last open item."""
+        if not self._done and self._pending:
+            self._line(self._pending)
+        self._pending = ""
+        self._close_section()
+        self._done = True
+
+    # -- line handling ------------------------------------------------------
+
+    def _line(self, line: str) -> None:
+        if self._in_think:
+            if "</think>" in line:
+                self._in_think = False
+            return
+        if not self._started and "<think>" in line and "</think>" not in line:
+            self._in_think = True
+            return
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            if self._in_fence:
+                self.finish()
+            elif not self._started and fence.group(1).lower() in ("", "yaml", "yml"):
+                self._in_fence = True
+                self._started = True
+            return
+
+        if not self._started:
+            # Unfenced output: start at the first top-level schema key.
+            key = _TOP_KEY_RE.match(line)
+            if not key or key.group(1) not in ("model", "elements", "relationships", "refinement"):
+                return
+            self._started = True
+
+        if self._passthrough or not line.strip() or line.lstrip().startswith("#"):
+            return
+
+        key = _TOP_KEY_RE.match(line)
+        if key:
+            self._close_section()
+            self._section = key.group(1)
+            if self._section == "refinement":
+                self._passthrough = True
+            elif self._section == "model" and key.group(2).strip():
+                self._section_lines.append(key.group(2))  # inline `model: {name: X}`
+            return
+
+        if self._section in _LIST_SECTIONS:
+            item = _ITEM_RE.match(line)
+            indent = item and len(item.group(1))
+            if item and (self._item_indent is None or indent == self._item_indent):
+                self._close_item()
+                self._item_indent = indent
+            self._item_lines.append(line)
+        elif self._section == "model":
+            self._section_lines.append(line)
+
+    def _close_section(self) -> None:
+        if self._section in _LIST_SECTIONS:
+            self._close_item()
+        elif self._section == "model" and not self._passthrough:
+            self._check_model()
+        self._section = None
+        self._section_lines = []
+        self._item_indent = None
+
+    def _close_item(self) -> None:
+        if not self._item_lines:
+            return
+        indent = self._item_indent or 0
+        block = "\n".join(line[indent:] for line in self._item_lines)
+        self._item_lines = []
+        try:
+            parsed = load_yaml(block)
+        except YAMLError as e:
+            raise YamlStreamError(f"Invalid YAML syntax in {self._section}: {e}") from e
+        if not isinstance(parsed, list) or len(parsed) != 1:
+            raise YamlStreamError(f"Invalid YAML syntax in {self._section}: expected one list item")
+        if self._section == "elements":
+            self._check_element(parsed[0])
+        else:
+            self._check_relationship(parsed[0])
+        if self._on_progress:
+            self._on_progress(self.element_count, self.relationship_count)
+
+    # -- schema checks (kept in lockstep with yaml_model.parse_model) --
+
+    def _check_model(self) -> None:
+        try:
+            model = load_yaml("\n".join(self._section_lines)) if self._section_lines else None
+        except YAMLError as e:
+            raise YamlStreamError(f"Invalid YAML syntax in model: {e}") from e
+        if not isinstance(model, dict):
+            raise YamlStreamError("'model' must be a mapping with at least 'name'")
+        if not model.get("name"):
+            raise YamlStreamError("'model.name' is required")
+
+    def _check_element(self, elem) -> None:
+        i = self.element_count
+        if not isinstance(elem, dict):
+            raise YamlStreamError(f"Element {i}: must be a mapping")
+        eid = str(elem.get("id", "")).strip()
+        if not eid:
+            raise YamlStreamError(f"Element {i}: 'id' is required")
+        etype = str(elem.get("type", "")).strip()
+        if not etype:
+            raise YamlStreamError(f"Element '{eid}': 'type' is required")
+        if etype not in VALID_ELEMENT_TYPES:
+            raise YamlStreamError(
+                f"Element '{eid}': invalid type '{etype}'. "
+                f"Must be one of the valid ArchiMate element types."
+            )
+        if not str(elem.get("name", "")).strip():
+            raise YamlStreamError(f"Element '{eid}': 'name' is required")
+        full_id = eid if eid.startswith("id-") else f"id-{eid}"
+        if full_id in self.element_ids:
+            raise YamlStreamError(f"Duplicate element id: '{eid}'")
+        self.element_ids[full_id] = etype
+        self.element_count += 1
+
+    def _check_relationship(self, rel) -> None:
+        i = self.relationship_count
+        if not isinstance(rel, dict):
+            raise YamlStreamError(f"Relationship {i}: must be a mapping")
+        rtype = str(rel.get("type", "")).strip()
+        if not rtype:
+            raise YamlStreamError(f"Relationship {i}: 'type' is required")
+        if rtype not in VALID_RELATIONSHIP_TYPES:
+            raise YamlStreamError(
+                f"Relationship {i}: invalid type '{rtype}'. "
+                f"Must be one of the valid ArchiMate relationship types."
+            )
+        source = str(rel.get("source", "")).strip()
+        target = str(rel.get("target", "")).strip()
+        if not source or not target:
+            raise YamlStreamError(f"Relationship {i}: 'source' and 'target' are required")
+        self.relationship_count += 1
+
+        full_source = source if source.startswith("id-") else f"id-{source}"
+        full_target = target if target.startswith("id-") else f"id-{target}"
+        src_type = self.element_ids.get(full_source)
+        tgt_type = self.element_ids.get(full_target)
+        if src_type is None or tgt_type is None:
+            self.warnings.append(f"Relationship {i}: references an unknown element id")
+            return
+        if rtype != "Association" and src_type not in COMPOSITE and tgt_type not in COMPOSITE:
+            if not relationship_allowed(rtype, src_type, tgt_type):
+                self.warnings.append(
+                    f"Relationship {i} ({rtype}): {src_type} -> {tgt_type} "
+                    f"may not be a valid ArchiMate 3.2 relationship"
+                )
@@ -3,8 +3,9 @@
 Forward (yaml_to_archimate_xml): Converts a lightweight YAML
 representation (elements + relationships only) into a complete
 ArchiMate 3.2 Open Exchange XML document with auto-generated views
-using Sugiyama hierarchical layout (layer grouping, barycenter
-crossing reduction, row wrapping).
+using Sugiyama hierarchical layout (layer grouping, median/transposition
+crossing reduction, row wrapping). Refinements keep the coordinates of
+carried-over elements from the previous XML.
 
 Reverse (xml_to_yaml): Converts ArchiMate Open Exchange XML back to
 compact YAML for LLM inspection and reasoning (~90% token reduction).
@@ -16,17 +17,13 @@ import re
 import xml.etree.ElementTree as ET
 from collections import defaultdict
 
-import yaml
-
 from aion.tools.archimate import (
-    ALLOWED_PATTERNS,
     APP_ACTIVE,
     APP_BEHAVIOR,
     APP_PASSIVE,
     BIZ_ACTIVE,
     BIZ_BEHAVIOR,
     BIZ_PASSIVE,
-    COMPOSITE,
     IMPL,
     LAYER_MAP,
     LAYER_ORDER,
@@ -40,7 +37,21 @@ from aion.tools.archimate import (
     VALID_ELEMENT_TYPES,
     VALID_RELATIONSHIP_TYPES,
     XSI,
+    ArchimateModel,
+    read_archimate,
+)
+from aion.tools.archimate_layout import PinnedNode, order_layers, read_view_layout
+from aion.tools.yaml_model import (
+    YamlElement,
+    YamlModel,
+    YamlRelationship,
+    model_to_data,
+    parse_model,
 )
+from aion.tools.yaml_model import (
+    validate_properties as _validate_properties,
+)
+from aion.yaml_utils import YAMLError, load_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -104,31 +115,45 @@ def _filter_for_viewpoint(data: dict, viewpoint: str) -> dict:
     }
 
 
-def yaml_to_archimate_xml(yaml_str: str) -> tuple[str, dict]:
+def yaml_to_archimate_xml(
+    yaml_str: str | YamlModel,
+    previous_xml: str | None = None,
+) -> tuple[str, dict]:
     """Convert YAML model definition to ArchiMate 3.2 Open Exchange XML.
 
     Args:
-        yaml_str: YAML string with model, elements, and relationships.
+        yaml_str: YAML string with model, elements, and relationships,
+            or a ``YamlModel`` already produced by ``parse_model``.
+        previous_xml: The artifact this model refines. Elements carried
+            over keep their coordinates in the view instead of the whole
+            view being laid out from scratch.
 
     Returns:
         Tuple of (xml_string, info_dict) where info_dict contains
-        element_count and relationship_count.
+        element_count, relationship_count and pinned_count.
 
     Raises:
         ValueError: If YAML is invalid, missing required fields, or
             contains invalid element/relationship types.
     """
-    data = _parse_and_validate(yaml_str)
+    model = yaml_str if isinstance(yaml_str, YamlModel) else parse_model(yaml_str)
+    data = model_to_data(model)
     root = _build_model(data)
-    _generate_view(root, data)
+    pinned = read_view_layout(previous_xml)
+    _generate_view(root, data, pinned=pinned)
 
     ET.register_namespace("", NS)
     ET.register_namespace("xsi", XSI)
     xml_str = ET.tostring(root, encoding="unicode", xml_declaration=True)
 
+    element_layers = {e["id"]: LAYER_MAP.get(e["type"], "Composite") for e in data["elements"]}
     info = {
         "element_count": len(data["elements"]),
         "relationship_count": len(data["relationships"]),
+        "pinned_count": sum(
+            1 for eid, pin in pinned.items()
+            if element_layers.get(eid) == LAYER_MAP.get(pin.type, "Composite")
+        ),
     }
     logger.info(
         f"[yaml_to_xml] Converted: {info['element_count']} elements, "
@@ -211,23 +236,6 @@ def generate_viewpoint_xml(
 # Property helpers
 # ---------------------------------------------------------------------------
 
-def _validate_properties(raw) -> dict[str, str]:
-    """Validate and normalize a properties mapping.
-
-    Accepts a dict of key→value pairs. Non-dict input returns empty dict.
-    Keys and values are coerced to strings and stripped.
-    """
-    if not raw or not isinstance(raw, dict):
-        return {}
-    result = {}
-    for k, v in raw.items():
-        k_str = str(k).strip()
-        if not k_str:
-            continue
-        result[k_str] = str(v).strip()
-    return result
-
-
 def _prop_def_id(key: str) -> str:
     """Convert a property key to an XML-safe propertyDefinition identifier.
 
@@ -252,158 +260,7 @@ def _parse_and_validate(yaml_str: str) -> dict:
     Element IDs are prefixed with 'id-' if not already.
     Relationship IDs are derived as 'id-rel-{source}-{target}'.
     """
-    try:
-        raw = yaml.safe_load(yaml_str)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML syntax: {e}") from e
-
-    if not isinstance(raw, dict):
-        raise ValueError("YAML root must be a mapping")
-
-    # Model metadata
-    model = raw.get("model", {})
-    if not isinstance(model, dict):
-        raise ValueError("'model' must be a mapping with at least 'name'")
-    if not model.get("name"):
-        raise ValueError("'model.name' is required")
-
-    # Elements
-    elements = raw.get("elements", [])
-    if not isinstance(elements, list) or not elements:
-        raise ValueError("'elements' must be a non-empty list")
-
-    element_ids = set()
-    normalized_elements = []
-    for i, elem in enumerate(elements):
-        if not isinstance(elem, dict):
-            raise ValueError(f"Element {i}: must be a mapping")
-        eid = str(elem.get("id", "")).strip()
-        if not eid:
-            raise ValueError(f"Element {i}: 'id' is required")
-        etype = str(elem.get("type", "")).strip()
-        if not etype:
-            raise ValueError(f"Element '{eid}': 'type' is required")
-        if etype not in VALID_ELEMENT_TYPES:
-            raise ValueError(
-                f"Element '{eid}': invalid type '{etype}'. "
-                f"Must be one of the valid ArchiMate element types."
-            )
-        ename = str(elem.get("name", "")).strip()
-        if not ename:
-            raise ValueError(f"Element '{eid}': 'name' is required")
-
-        if not elem.get("documentation", "").strip():
-            logger.warning(
-                f"[yaml_to_xml] Element '{eid}' ({etype}) has no documentation"
-            )
-
-        # Normalize ID: add 'id-' prefix if missing
-        full_id = eid if eid.startswith("id-") else f"id-{eid}"
-        if full_id in element_ids:
-            raise ValueError(f"Duplicate element id: '{eid}'")
-        element_ids.add(full_id)
-
-        entry = {
-            "id": full_id,
-            "type": etype,
-            "name": ename,
-            "documentation": str(elem.get("documentation", "")).strip(),
-        }
-        props = _validate_properties(elem.get("properties"))
-        if props:
-            entry["properties"] = props
-        normalized_elements.append(entry)
-
-    # Build element type index for relationship validation
-    element_type_index = {e["id"]: e["type"] for e in normalized_elements}
-
-    # Relationships
-    relationships = raw.get("relationships", [])
-    if not isinstance(relationships, list):
-        raise ValueError("'relationships' must be a list")
-
-    # Derive deterministic IDs: id-rel-{source}-{target} with -N suffix for dupes
-    pair_counts: dict[str, int] = defaultdict(int)
-    normalized_rels = []
-    for i, rel in enumerate(relationships):
-        if not isinstance(rel, dict):
-            raise ValueError(f"Relationship {i}: must be a mapping")
-        rtype = str(rel.get("type", "")).strip()
-        if not rtype:
-            raise ValueError(f"Relationship {i}: 'type' is required")
-        if rtype not in VALID_RELATIONSHIP_TYPES:
-            raise ValueError(
-                f"Relationship {i}: invalid type '{rtype}'. "
-                f"Must be one of the valid ArchiMate relationship types."
-            )
-        source = str(rel.get("source", "")).strip()
-        target = str(rel.get("target", "")).strip()
-        if not source or not target:
-            raise ValueError(f"Relationship {i}: 'source' and 'target' are required")
-
-        # Normalize source/target IDs
-        full_source = source if source.startswith("id-") else f"id-{source}"
-        full_target = target if target.startswith("id-") else f"id-{target}"
-
-        if full_source not in element_ids:
-            logger.warning(
-                f"Relationship {i}: source '{source}' does not reference "
-                f"a valid element id — dropping relationship"
-            )
-            continue
-        if full_target not in element_ids:
-            logger.warning(
-                f"Relationship {i}: target '{target}' does not reference "
-                f"a valid element id — dropping relationship"
-            )
-            continue
-
-        # Validate source→target pair against ALLOWED_PATTERNS
-        if rtype != "Association":
-            src_type = element_type_index.get(full_source, "")
-            tgt_type = element_type_index.get(full_target, "")
-            if src_type not in COMPOSITE and tgt_type not in COMPOSITE:
-                patterns = ALLOWED_PATTERNS.get(rtype, [])
-                allowed = any(
-                    src_type in sp and tgt_type in tp for sp, tp in patterns
-                )
-                if not allowed:
-                    logger.warning(
-                        f"[yaml_to_xml] Relationship {i} ({rtype}): "
-                        f"{src_type} -> {tgt_type} may not be a valid "
-                        f"ArchiMate 3.2 relationship"
-                    )
-
-        # Derive deterministic ID
-        src_code = full_source.removeprefix("id-")
-        tgt_code = full_target.removeprefix("id-")
-        pair_key = f"{src_code}-{tgt_code}"
-        pair_counts[pair_key] += 1
-        count = pair_counts[pair_key]
-        rid = f"id-rel-{pair_key}" if count == 1 else f"id-rel-{pair_key}-{count}"
-
-        rname = str(rel.get("name", "")).strip()
-
-        rel_entry = {
-            "id": rid,
-            "type": rtype,
-            "source": full_source,
-            "target": full_target,
-            "name": rname,
-        }
-        rel_props = _validate_properties(rel.get("properties"))
-        if rel_props:
-            rel_entry["properties"] = rel_props
-        normalized_rels.append(rel_entry)
-
-    return {
-        "model": {
-            "name": str(model["name"]).strip(),
-            "documentation": str(model.get("documentation", "")).strip(),
-        },
-        "elements": normalized_elements,
-        "relationships": normalized_rels,
-    }
+    return model_to_data(parse_model(yaml_str))
 
 
 # ---------------------------------------------------------------------------
@@ -524,7 +381,9 @@ def _build_model(data: dict) -> ET.Element:
 # Implements the same conceptual steps as Dagre (archi-scripts):
 #   1. Layer assignment — fixed by ArchiMate element type (LAYER_MAP)
 #   2. Initial ordering — type_rank ASC, degree DESC, name ASC
-#   3. Crossing reduction — 3 alternating barycenter sweeps
+#   3. Crossing reduction — weighted-median sweeps with adjacent-pair
+#      transposition, keeping the ordering with fewest crossings
+#      (aion.tools.archimate_layout)
 #   4. Row wrapping — max WRAP_THRESHOLD elements per row
 #   5. Dynamic Y spacing — each layer starts after the previous ends + gap
 # ---------------------------------------------------------------------------
@@ -537,11 +396,15 @@ def _elem_width(name: str) -> int:
 
 def _sugiyama_positions(
     data: dict,
+    pinned: dict[str, PinnedNode] | None = None,
 ) -> tuple[list[dict], list[dict]]:
     """Compute node positions using Sugiyama hierarchical layout.
 
     Args:
         data: Parsed model dict with 'elements' and 'relationships'.
+        pinned: Coordinates from the previous version of this view
+            (``read_view_layout``). Elements still present in the same
+            layer keep them; the rest go into free cells of their layer.
 
     Returns:
         Tuple of (positioned_nodes, connections) where each node has
@@ -558,7 +421,7 @@ def _sugiyama_positions(
         }
     elem_ids = set(elem_lookup)
 
-    # Build adjacency (undirected, for barycenter computation)
+    # Build adjacency (undirected, for crossing reduction)
     adj: dict[str, set] = defaultdict(set)
     valid_rels: list[dict] = []
     for rel in data["relationships"]:
@@ -587,38 +450,33 @@ def _sugiyama_positions(
             elem_lookup[eid]["name"],
         ))
 
-    # Barycenter crossing reduction (3 alternating sweeps)
-    def barycenter(eid: str, ref_pos: dict[str, int]) -> float | None:
-        nbrs = [ref_pos[n] for n in adj[eid] if n in ref_pos]
-        return sum(nbrs) / len(nbrs) if nbrs else None
-
-    def reorder(layer_idx: int, direction: str) -> None:
-        if direction == "down" and layer_idx == 0:
-            return
-        if direction == "up" and layer_idx == len(active_layers) - 1:
-            return
-        ref_lay = active_layers[
-            layer_idx - 1 if direction == "down" else layer_idx + 1
-        ]
-        ref_pos = {eid: i for i, eid in enumerate(layer_elems[ref_lay])}
-        cur_lay = active_layers[layer_idx]
-
-        def sort_key(eid: str):
-            b = barycenter(eid, ref_pos)
-            if b is None:
-                # No cross-layer edge: preserve type_rank / degree / alpha
-                return (1, TYPE_RANK.get(elem_lookup[eid]["type"], 50),
-                        -degree[eid], elem_lookup[eid]["name"])
-            return (0, b, TYPE_RANK.get(elem_lookup[eid]["type"], 50),
-                    elem_lookup[eid]["name"])
-
-        layer_elems[cur_lay].sort(key=sort_key)
-
-    for _ in range(3):
-        for i in range(1, len(active_layers)):
-            reorder(i, "down")
-        for i in range(len(active_layers) - 2, -1, -1):
-            reorder(i, "up")
+    # Elements carried over from the previous view in the same layer keep
+    # their coordinates; the ordering below then only sequences new ones.
+    pinned = {
+        eid: pin for eid, pin in (pinned or {}).items()
+        if eid in elem_lookup
+        and LAYER_MAP.get(pin.type, "Composite") == elem_lookup[eid]["layer"]
+    }
+
+    # Crossing reduction: weighted-median sweeps + transposition over
+    # integer node ids (aion.tools.archimate_layout). Skipped on an
+    # incremental relayout, where the pinned elements fix the order.
+    # A full layout costs more than the three barycenter sweeps this
+    # replaced (~0.3s vs ~0.15s at 5,000 elements), but leaves about a
+    # third of the crossings and stays well under a second. Refinement
+    # turns, the frequent case, take the pinned path and skip it.
+    if not pinned:
+        ids = sorted(elem_ids)
+        index = {eid: i for i, eid in enumerate(ids)}
+        layer_index = {lay: i for i, lay in enumerate(active_layers)}
+        layer_of = [layer_index[elem_lookup[eid]["layer"]] for eid in ids]
+        neighbours = [[index[n] for n in adj[eid]] for eid in ids]
+        ordered = order_layers(
+            [[index[eid] for eid in layer_elems[lay]] for lay in active_layers],
+            neighbours, layer_of,
+        )
+        for lay, layer in zip(active_layers, ordered):
+            layer_elems[lay] = [ids[i] for i in layer]
 
     # Determine cell width from widest element
     max_w = max(
@@ -635,6 +493,12 @@ def _sugiyama_positions(
         n_rows = max(1, math.ceil(len(layer_elems[lay]) / WRAP_THRESHOLD))
         cur_y += n_rows * CELL_H + LAYER_GAP
 
+    if pinned:
+        nodes = _place_with_pins(
+            active_layers, layer_elems, elem_lookup, adj, pinned, cell_w,
+        )
+        return nodes, _connections(valid_rels)
+
     # Compute node positions
     nodes: list[dict] = []
     for lay in active_layers:
@@ -649,16 +513,81 @@ def _sugiyama_positions(
                 "h": ELEMENT_H,
             })
 
-    # Connections between elements that both have nodes
-    connections: list[dict] = []
-    for rel in valid_rels:
-        connections.append({
-            "relationshipRef": rel["id"],
-            "source": rel["source"],
-            "target": rel["target"],
-        })
+    return nodes, _connections(valid_rels)
+
+
+def _connections(valid_rels: list[dict]) -> list[dict]:
+    """Connections between elements that both have nodes."""
+    return [
+        {"relationshipRef": rel["id"], "source": rel["source"], "target": rel["target"]}
+        for rel in valid_rels
+    ]
 
-    return nodes, connections
+
+def _place_with_pins(
+    active_layers: list[str],
+    layer_elems: dict[str, list[str]],
+    elem_lookup: dict[str, dict],
+    adj: dict[str, set],
+    pinned: dict[str, PinnedNode],
+    cell_w: int,
+) -> list[dict]:
+    """Incremental layout: keep pinned coordinates, fit new elements around them.
+
+    Each layer's band starts at its topmost pinned element (or below the
+    previous layer when none of its elements are pinned). New elements
+    take the first grid row of the band with a free cell, in the cell
+    closest to the median x of their already placed neighbours.
+    """
+    placed: dict[str, tuple[int, int]] = {}
+    # Occupied rectangles bucketed by grid row, for O(1) overlap checks
+    buckets: dict[int, list[tuple[int, int, int]]] = defaultdict(list)
+
+    def occupy(eid: str, x: int, y: int) -> None:
+        placed[eid] = (x, y)
+        w = _elem_width(elem_lookup[eid]["name"])
+        for row in range(y // CELL_H, (y + ELEMENT_H) // CELL_H + 1):
+            buckets[row].append((x, x + w, y))
+
+    def is_free(x: int, y: int, w: int) -> bool:
+        for row in range(y // CELL_H, (y + ELEMENT_H) // CELL_H + 1):
+            for x0, x1, y0 in buckets.get(row, ()):
+                if x < x1 and x0 < x + w and y < y0 + ELEMENT_H and y0 < y + ELEMENT_H:
+                    return False
+        return True
+
+    for eid, pin in pinned.items():
+        occupy(eid, pin.x, pin.y)
+
+    nodes: list[dict] = []
+    prev_bottom = MARGIN_Y - LAYER_GAP
+    for lay in active_layers:
+        band = [pinned[eid].y for eid in layer_elems[lay] if eid in pinned]
+        band_top = min(band) if band else prev_bottom + LAYER_GAP
+        for eid in layer_elems[lay]:
+            if eid not in pinned:
+                w = _elem_width(elem_lookup[eid]["name"])
+                nbr_x = sorted(placed[n][0] for n in adj[eid] if n in placed)
+                target_x = nbr_x[len(nbr_x) // 2] if nbr_x else MARGIN_X
+                y = band_top
+                while True:
+                    free = [
+                        MARGIN_X + col * cell_w for col in range(WRAP_THRESHOLD)
+                        if is_free(MARGIN_X + col * cell_w, y, w)
+                    ]
+                    if free:
+                        occupy(eid, min(free, key=lambda x: abs(x - target_x)), y)
+                        break
+                    y += CELL_H
+            x, y = placed[eid]
+            nodes.append({
+                "elementRef": eid, "x": x, "y": y,
+                "w": _elem_width(elem_lookup[eid]["name"]), "h": ELEMENT_H,
+            })
+        prev_bottom = max(
+            [prev_bottom] + [placed[eid][1] + ELEMENT_H for eid in layer_elems[lay]]
+        )
+    return nodes
 
 
 def _generate_view(
@@ -666,13 +595,15 @@ def _generate_view(
     data: dict,
     view_index: int = 1,
     viewpoint_name: str = "Overview",
+    pinned: dict[str, PinnedNode] | None = None,
 ) -> None:
     """Add a view using Sugiyama hierarchical layout.
 
     Can be called multiple times on the same root to add multiple views
-    with different viewpoint_name and view_index values.
+    with different viewpoint_name and view_index values. ``pinned`` keeps
+    elements at their coordinates in the previous version of the view.
     """
-    nodes, connections = _sugiyama_positions(data)
+    nodes, connections = _sugiyama_positions(data, pinned)
 
     # Assign node IDs: nv{view_index}-{short_code}
     node_map: dict[str, str] = {}  # element_id → node_id
@@ -726,10 +657,7 @@ def _generate_view(
 # Reverse: XML → YAML
 # ---------------------------------------------------------------------------
 
-def _TAG(t): return f"{{{NS}}}{t}"  # noqa: N802
-
-
-def xml_to_yaml(xml_str: str) -> str:
+def xml_to_yaml(xml_str: str | bytes) -> str:
     """Convert ArchiMate Open Exchange XML to compact YAML.
 
     Extracts elements and relationships, discards views (they are
@@ -737,7 +665,7 @@ def xml_to_yaml(xml_str: str) -> str:
     the same YAML format that yaml_to_archimate_xml accepts as input.
 
     Args:
-        xml_str: Valid ArchiMate 3.2 Open Exchange XML string.
+        xml_str: Valid ArchiMate 3.2 Open Exchange XML (str or raw bytes).
 
     Returns:
         YAML string with model, elements, and relationships.
@@ -746,107 +674,56 @@ def xml_to_yaml(xml_str: str) -> str:
         ValueError: If XML cannot be parsed or has no elements.
     """
     try:
-        root = ET.fromstring(xml_str)
+        model = read_archimate(xml_str)
     except ET.ParseError as e:
         raise ValueError(f"Invalid XML: {e}") from e
+    return model_to_yaml(model)
 
-    # Model metadata
-    name_el = root.find(_TAG("name"))
-    model_name = name_el.text.strip() if name_el is not None and name_el.text else "Untitled"
-    doc_el = root.find(_TAG("documentation"))
-    model_doc = doc_el.text.strip() if doc_el is not None and doc_el.text else ""
-
-    # Property definitions: map propertyDefinitionRef → human-readable key
-    prop_defs: dict[str, str] = {}
-    prop_defs_node = root.find(_TAG("propertyDefinitions"))
-    if prop_defs_node is not None:
-        for pdef in prop_defs_node.findall(_TAG("propertyDefinition")):
-            pdef_id = pdef.get("identifier", "")
-            pdef_name_el = pdef.find(_TAG("name"))
-            if pdef_id and pdef_name_el is not None and pdef_name_el.text:
-                prop_defs[pdef_id] = pdef_name_el.text.strip()
 
-    # Elements
-    elements_node = root.find(_TAG("elements"))
-    if elements_node is None:
+def model_to_yaml(model: ArchimateModel) -> str:
+    """Serialize an already-read model to compact YAML (see ``xml_to_yaml``).
+
+    Raises:
+        ValueError: If the model has no elements section or no valid elements.
+    """
+    if not model.has_elements_section:
         raise ValueError("No <elements> section found in XML")
 
     elements = []
     element_ids: set[str] = set()
-    for elem in elements_node.findall(_TAG("element")):
-        eid = elem.get("identifier", "")
-        etype = elem.get(f"{{{XSI}}}type", "")
-        if not eid or etype not in VALID_ELEMENT_TYPES:
-            continue  # Skip junctions and unknown types
-        en = elem.find(_TAG("name"))
-        ename = en.text.strip() if en is not None and en.text else ""
-        if not ename:
-            continue
-        ed = elem.find(_TAG("documentation"))
-        edoc = ed.text.strip() if ed is not None and ed.text else ""
-
-        short_id = eid.removeprefix("id-")
-        element_ids.add(eid)
-        entry: dict = {"id": short_id, "type": etype, "name": ename}
-        if edoc:
-            entry["documentation"] = edoc
-        # Parse <properties><property> children (schema-correct wrapper)
-        props = {}
-        props_container = elem.find(_TAG("properties"))
-        prop_source = props_container if props_container is not None else elem
-        for prop_el in prop_source.findall(_TAG("property")):
-            ref = prop_el.get("propertyDefinitionRef", "")
-            val_el = prop_el.find(_TAG("value"))
-            val = val_el.text.strip() if val_el is not None and val_el.text else ""
-            key = prop_defs.get(ref, ref)
-            if key and val:
-                props[key] = val
-        if props:
-            entry["properties"] = props
+    for elem in model.elements:
+        if elem.type not in VALID_ELEMENT_TYPES or not elem.name:
+            continue  # Skip junctions, unknown types and unnamed elements
+        element_ids.add(elem.id)
+        entry: dict = {"id": elem.id.removeprefix("id-"), "type": elem.type, "name": elem.name}
+        if elem.documentation:
+            entry["documentation"] = elem.documentation
+        if elem.properties:
+            entry["properties"] = dict(elem.properties)
         elements.append(entry)
 
     if not elements:
         raise ValueError("No valid elements found in XML")
 
-    # Relationships
-    rels_node = root.find(_TAG("relationships"))
     relationships: list[dict] = []
-    if rels_node is not None:
-        for rel in rels_node.findall(_TAG("relationship")):
-            rtype = rel.get(f"{{{XSI}}}type", "")
-            source = rel.get("source", "")
-            target = rel.get("target", "")
-            if not rtype or rtype not in VALID_RELATIONSHIP_TYPES:
-                continue
-            if source not in element_ids or target not in element_ids:
-                continue  # Skip relationships referencing missing elements
-            rn = rel.find(_TAG("name"))
-            rname = rn.text.strip() if rn is not None and rn.text else ""
-
-            entry = {
-                "type": rtype,
-                "source": source.removeprefix("id-"),
-                "target": target.removeprefix("id-"),
-            }
-            if rname:
-                entry["name"] = rname
-            # Parse <properties><property> children (schema-correct wrapper)
-            rel_props = {}
-            rel_props_container = rel.find(_TAG("properties"))
-            rel_prop_source = rel_props_container if rel_props_container is not None else rel
-            for prop_el in rel_prop_source.findall(_TAG("property")):
-                ref = prop_el.get("propertyDefinitionRef", "")
-                val_el = prop_el.find(_TAG("value"))
-                val = val_el.text.strip() if val_el is not None and val_el.text else ""
-                key = prop_defs.get(ref, ref)
-                if key and val:
-                    rel_props[key] = val
-            if rel_props:
-                entry["properties"] = rel_props
-            relationships.append(entry)
+    for rel in model.relationships:
+        if rel.type not in VALID_RELATIONSHIP_TYPES:
+            continue
+        if rel.source not in element_ids or rel.target not in element_ids:
+            continue  # Skip relationships referencing missing elements
+        entry = {
+            "type": rel.type,
+            "source": rel.source.removeprefix("id-"),
+            "target": rel.target.removeprefix("id-"),
+        }
+        if rel.name:
+            entry["name"] = rel.name
+        if rel.properties:
+            entry["properties"] = dict(rel.properties)
+        relationships.append(entry)
 
     result = _serialize_yaml(
-        {"name": model_name, "documentation": model_doc},
+        {"name": model.name or "Untitled", "documentation": model.documentation},
         elements,
         relationships,
     )
@@ -857,6 +734,39 @@ def xml_to_yaml(xml_str: str) -> str:
     return result
 
 
+def serialize_model(model: YamlModel) -> str:
+    """Serialize a ``YamlModel`` to the compact YAML ``parse_model`` reads back.
+
+    Element IDs are written short (no ``id-`` prefix); ``source_ref`` is
+    dropped — it is a generation-time hint, not part of the model.
+    """
+    elements = []
+    for elem in model.elements.values():
+        entry: dict = {"id": elem.id.removeprefix("id-"), "type": elem.type, "name": elem.name}
+        if elem.documentation:
+            entry["documentation"] = elem.documentation
+        if elem.properties:
+            entry["properties"] = elem.properties
+        elements.append(entry)
+    relationships = []
+    for rel in model.relationships:
+        entry = {
+            "type": rel.type,
+            "source": rel.source.removeprefix("id-"),
+            "target": rel.target.removeprefix("id-"),
+        }
+        if rel.name:
+            entry["name"] = rel.name
+        if rel.properties:
+            entry["properties"] = rel.properties
+        relationships.append(entry)
+    return _serialize_yaml(
+        {"name": model.name, "documentation": model.documentation},
+        elements,
+        relationships,
+    )
+
+
 def _serialize_yaml(
     model: dict, elements: list[dict], relationships: list[dict],
 ) -> str:
@@ -889,7 +799,7 @@ def _serialize_yaml(
             continue
         lines.append(f"  # {layer}")
         for elem in group:
-            lines.append(f"  - id: {elem['id']}")
+            lines.append(f'  - id: "{_yaml_escape(elem["id"])}"')
             lines.append(f"    type: {elem['type']}")
             lines.append(f'    name: "{_yaml_escape(elem["name"])}"')
             if elem.get("documentation"):
@@ -904,8 +814,8 @@ def _serialize_yaml(
         lines.append("relationships:")
         for rel in relationships:
             lines.append(f"  - type: {rel['type']}")
-            lines.append(f"    source: {rel['source']}")
-            lines.append(f"    target: {rel['target']}")
+            lines.append(f'    source: "{_yaml_escape(rel["source"])}"')
+            lines.append(f'    target: "{_yaml_escape(rel["target"])}"')
             if rel.get("name"):
                 lines.append(f'    name: "{_yaml_escape(rel["name"])}"')
             if rel.get("properties"):
@@ -918,9 +828,23 @@ def _serialize_yaml(
     return "\n".join(lines) + "\n"
 
 
+# Characters a YAML double-quoted scalar cannot hold raw: the quote and
+# backslash, and line breaks / control characters, which YAML would fold
+# or reject. Everything else is written as-is.
+_YAML_ESCAPE_RE = re.compile(r'[\\"\x00-\x1f\x7f-\x9f\u2028\u2029]')
+_YAML_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def _yaml_escape_char(match: re.Match) -> str:
+    ch = match.group()
+    if ch in _YAML_ESCAPES:
+        return _YAML_ESCAPES[ch]
+    return f"\\x{ord(ch):02x}" if ord(ch) <= 0xFF else f"\\u{ord(ch):04x}"
+
+
 def _yaml_escape(text: str) -> str:
-    """Escape characters that need quoting inside YAML double-quoted strings."""
-    return text.replace("\\", "\\\\").replace('"', '\\"')
+    """Escape text for a YAML double-quoted string so it loads back unchanged."""
+    return _YAML_ESCAPE_RE.sub(_yaml_escape_char, text)
 
 
 # ---------------------------------------------------------------------------
@@ -938,10 +862,7 @@ _PATCHABLE_ELEMENT_FIELDS = {"name", "documentation", "properties"}
 def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
     """Apply a structured YAML diff envelope to an existing ArchiMate model.
 
-    The diff envelope uses a ``refinement:`` root key with ``add``,
-    ``modify``, and ``remove`` sections.  All operations are validated
-    before any mutation; if any operation is invalid the entire diff is
-    rejected (all-or-nothing).
+    Text-in/text-out wrapper around ``apply_model_diff``.
 
     Args:
         base_yaml: Existing model as YAML (short IDs, no ``id-`` prefix).
@@ -954,14 +875,37 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
         ValueError: If the diff is structurally invalid or references
             nonexistent IDs.
     """
-    # -- Parse inputs -------------------------------------------------------
     try:
-        base = yaml.safe_load(base_yaml)
-    except yaml.YAMLError as e:
+        base = parse_model(base_yaml)
+    except ValueError as e:
         raise ValueError(f"Base YAML parse error: {e}") from e
+    merged, summary = apply_model_diff(base, diff_yaml)
+    return serialize_model(merged), summary
+
+
+def apply_model_diff(base: YamlModel, diff_yaml: str) -> tuple[YamlModel, dict]:
+    """Apply a structured YAML diff envelope to a parsed model.
+
+    The diff envelope uses a ``refinement:`` root key with ``add``,
+    ``modify``, and ``remove`` sections.  All operations are validated
+    before any mutation; if any operation is invalid the entire diff is
+    rejected (all-or-nothing). ``base`` is never mutated — the merge runs
+    on a copy.
+
+    Diff keys use short IDs (no ``id-`` prefix); relationships are keyed
+    ``rel-{source}-{target}`` as derived from the *base* model.
+
+    Returns:
+        Tuple of (merged_model, change_summary_dict).
+
+    Raises:
+        ValueError: If the diff is structurally invalid or references
+            nonexistent IDs.
+    """
+    # -- Parse diff ---------------------------------------------------------
     try:
-        diff = yaml.safe_load(diff_yaml)
-    except yaml.YAMLError as e:
+        diff = load_yaml(diff_yaml)
+    except YAMLError as e:
         raise ValueError(f"Diff YAML parse error: {e}") from e
 
     if not isinstance(diff, dict) or "refinement" not in diff:
@@ -971,33 +915,15 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
     if not isinstance(ref, dict):
         raise ValueError("'refinement' must be a mapping")
 
-    # -- Build mutable structures from base ---------------------------------
-    model = dict(base.get("model", {}))
-    elements: list[dict] = [dict(e) for e in base.get("elements", [])]
-    relationships: list[dict] = [dict(r) for r in base.get("relationships", [])]
-
-    # Index by short ID (strip id- prefix if present in base)
-    element_index: dict[str, dict] = {}
-    for elem in elements:
-        sid = str(elem.get("id", "")).removeprefix("id-")
-        elem["id"] = sid  # normalize to short
-        element_index[sid] = elem
-
-    # Normalize relationship source/target to short IDs
-    for rel in relationships:
-        rel["source"] = str(rel.get("source", "")).removeprefix("id-")
-        rel["target"] = str(rel.get("target", "")).removeprefix("id-")
+    model = base.copy()
+    elements = model.elements  # full id → element
 
     # Derive relationship IDs from base model (before adds).
     # Modify keys must reference these base IDs, not post-add IDs.
-    pair_counts: dict[str, int] = defaultdict(int)
-    rel_index: dict[str, dict] = {}
-    for rel in relationships:
-        pair_key = f"{rel['source']}-{rel['target']}"
-        pair_counts[pair_key] += 1
-        count = pair_counts[pair_key]
-        derived = f"rel-{pair_key}" if count == 1 else f"rel-{pair_key}-{count}"
-        rel_index[derived] = rel
+    rel_index: dict[str, YamlRelationship] = {
+        rid.removeprefix("id-"): rel
+        for rid, rel in zip(model.relationship_ids(), model.relationships)
+    }
 
     summary = {
         "added_elements": 0,
@@ -1025,18 +951,16 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
         ename = str(new_elem.get("name", "")).strip()
         if not ename:
             raise ValueError(f"Added element '{eid}': 'name' is required")
-        if eid in element_index:
+        if f"id-{eid}" in elements:
             raise ValueError(f"Added element '{eid}': ID already exists in model")
 
-        entry = {"id": eid, "type": etype, "name": ename}
-        edoc = str(new_elem.get("documentation", "")).strip()
-        if edoc:
-            entry["documentation"] = edoc
-        entry_props = _validate_properties(new_elem.get("properties"))
-        if entry_props:
-            entry["properties"] = entry_props
-        elements.append(entry)
-        element_index[eid] = entry
+        elements[f"id-{eid}"] = YamlElement(
+            id=f"id-{eid}",
+            type=etype,
+            name=ename,
+            documentation=str(new_elem.get("documentation", "")).strip(),
+            properties=_validate_properties(new_elem.get("properties")),
+        )
         summary["added_elements"] += 1
 
     # -- ADD relationships --------------------------------------------------
@@ -1050,22 +974,21 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
         tgt = str(new_rel.get("target", "")).strip().removeprefix("id-")
         if not src or not tgt:
             raise ValueError("Added relationship: 'source' and 'target' required")
-        if src not in element_index:
+        if f"id-{src}" not in elements:
             raise ValueError(
                 f"Added relationship: source '{src}' not found in model"
             )
-        if tgt not in element_index:
+        if f"id-{tgt}" not in elements:
             raise ValueError(
                 f"Added relationship: target '{tgt}' not found in model"
             )
-        entry = {"type": rtype, "source": src, "target": tgt}
-        rname = str(new_rel.get("name", "")).strip()
-        if rname:
-            entry["name"] = rname
-        rel_props = _validate_properties(new_rel.get("properties"))
-        if rel_props:
-            entry["properties"] = rel_props
-        relationships.append(entry)
+        model.relationships.append(YamlRelationship(
+            type=rtype,
+            source=f"id-{src}",
+            target=f"id-{tgt}",
+            name=str(new_rel.get("name", "")).strip(),
+            properties=_validate_properties(new_rel.get("properties")),
+        ))
         summary["added_relationships"] += 1
 
     # -- MODIFY elements, relationships, + model metadata --------------------
@@ -1082,7 +1005,7 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
                         f"Modify model: unknown field '{field}' "
                         f"(allowed: name, documentation)"
                     )
-                model[field] = str(value).strip()
+                setattr(model, field, str(value).strip())
             summary["modified"] += 1
             continue
 
@@ -1093,13 +1016,9 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
             target_rel = rel_index[key]
             for field, value in patches.items():
                 if field == "properties":
-                    existing = target_rel.get("properties", {})
-                    if not isinstance(existing, dict):
-                        existing = {}
-                    existing.update(_validate_properties(value))
-                    target_rel["properties"] = existing
+                    target_rel.properties.update(_validate_properties(value))
                 elif field == "name":
-                    target_rel["name"] = str(value).strip()
+                    target_rel.name = str(value).strip()
                 else:
                     raise ValueError(
                         f"Modify '{key}': cannot patch field '{field}' on relationship "
@@ -1110,9 +1029,9 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
 
         # Element modify
         eid = str(key).strip().removeprefix("id-")
-        if eid not in element_index:
+        elem = elements.get(f"id-{eid}")
+        if elem is None:
             raise ValueError(f"Modify '{eid}': element not found in model")
-        elem = element_index[eid]
         for field, value in patches.items():
             if field not in _PATCHABLE_ELEMENT_FIELDS:
                 raise ValueError(
@@ -1120,13 +1039,9 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
                     f"(allowed: {', '.join(sorted(_PATCHABLE_ELEMENT_FIELDS))})"
                 )
             if field == "properties":
-                existing = elem.get("properties", {})
-                if not isinstance(existing, dict):
-                    existing = {}
-                existing.update(_validate_properties(value))
-                elem["properties"] = existing
+                elem.properties.update(_validate_properties(value))
             else:
-                elem[field] = str(value).strip()
+                setattr(elem, field, str(value).strip())
         summary["modified"] += 1
 
     # -- REMOVE elements (with cascade) -------------------------------------
@@ -1135,36 +1050,39 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
     remove_section = ref.get("remove", {}) or {}
     for rid in remove_section.get("elements", []) or []:
         eid = str(rid).strip().removeprefix("id-")
-        if eid not in element_index:
+        full_id = f"id-{eid}"
+        if full_id not in elements:
             warning = f"Remove '{eid}': element not found in model (skipped)"
             logger.warning(f"[apply_yaml_diff] {warning}")
             summary["warnings"].append(warning)
             continue
 
         # Remove element
-        del element_index[eid]
-        elements[:] = [e for e in elements if e["id"] != eid]
+        del elements[full_id]
         summary["removed_elements"] += 1
 
         # Cascade: remove dangling relationships
         kept = []
-        for rel in relationships:
-            if rel["source"] == eid or rel["target"] == eid:
+        for rel in model.relationships:
+            if rel.source == full_id or rel.target == full_id:
                 summary["removed_relationships"] += 1
                 summary["cascade_notes"].append(
-                    f"Removed {rel['type']} relationship: "
-                    f"{rel['source']}\u2192{rel['target']} "
+                    f"Removed {rel.type} relationship: "
+                    f"{rel.source.removeprefix('id-')}\u2192{rel.target.removeprefix('id-')} "
                     f"(dangling after {eid} removal)"
                 )
             else:
                 kept.append(rel)
-        relationships[:] = kept
-
-    # -- Serialize and validate ---------------------------------------------
-    merged_yaml = _serialize_yaml(model, elements, relationships)
+        model.relationships = kept
 
-    # Run through _parse_and_validate to catch any structural issues
-    _parse_and_validate(merged_yaml)
+    # -- Validate the merged model (same checks parse_model applies) ---------
+    if not model.name:
+        raise ValueError("'model.name' is required")
+    if not elements:
+        raise ValueError("'elements' must be a non-empty list")
+    for elem in elements.values():
+        if not elem.name:
+            raise ValueError(f"Element '{elem.id.removeprefix('id-')}': 'name' is required")
 
     logger.info(
         f"[apply_yaml_diff] Merged: "
@@ -1172,4 +1090,4 @@ def apply_yaml_diff(base_yaml: str, diff_yaml: str) -> tuple[str, dict]:
         f"~{summary['modified']}mod, "
         f"-{summary['removed_elements']}e -{summary['removed_relationships']}r"
     )
-    return merged_yaml, summary
+    return model, summary
@@ -0,0 +1,347 @@
+"""Per-request span tracing with a flamegraph-style timing breakdown.
+
+A ``Trace`` is started for each ``/api/chat/stream`` request and stored in
+a contextvar next to structlog's ``request_id``. Code on the request path
+opens nested spans with ``span(...)`` (or ``@traced`` / ``@traced_tool``);
+when no trace is active these are cheap no-ops, so CLI runs, tests and
+background jobs pay nothing.
+
+Spans follow the request across ``asyncio`` tasks (contextvars are copied
+into every task) and into the agent worker thread, which is started via
+``contextvars.copy_context().run``. Categories used on the request path:
+
+- ``persona`` — intent classification (with token counts)
+- ``llm`` — every pydantic-ai model request (with token counts)
+- ``scheduler`` — time spent queued for an LLM slot (aion.llm_scheduler)
+- ``tool`` — every agent tool call
+- ``weaviate`` — every Weaviate query
+- ``embedding`` — every embedding call
+- ``quality_gate`` — response quality-gate checks
+- ``db`` — SQLite writes
+
+The summary is attached to the ``complete`` event's ``timing["trace"]``
+(see ``Event.to_sse``). With ``trace_export_dir`` set, each finished trace
+is also written as ``<request_id>.trace.json`` in Chrome trace-event
+format, loadable in ``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_current_trace: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar(
+    "aion_trace", default=None
+)
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "aion_trace_span", default=None
+)
+
+_ATTR_TYPES = (str, int, float, bool, type(None))
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class Span:
+    """One timed operation. Children are appended from any thread."""
+
+    __slots__ = ("name", "category", "start", "end", "attrs", "children", "thread_id")
+
+    def __init__(self, name: str, category: str, attrs: dict | None = None):
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.attrs: dict = {}
+        self.children: list[Span] = []
+        self.thread_id = threading.get_ident()
+        if attrs:
+            self.set(**attrs)
+
+    def set(self, **attrs) -> None:
+        """Attach attributes (token counts, result sizes, ...) to the span."""
+        for key, value in attrs.items():
+            self.attrs[key] = value if isinstance(value, _ATTR_TYPES) else str(value)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class _NoopSpan:
+    """Returned by ``span()`` when no trace is active."""
+
+    __slots__ = ()
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Span tree for one request."""
+
+    def __init__(self, name: str, request_id: str | None = None):
+        if request_id is None:
+            import structlog
+
+            request_id = structlog.contextvars.get_contextvars().get("request_id")
+        self.request_id = request_id or "trace"
+        self.root = Span(name, "request")
+        self._lock = threading.Lock()
+
+    def _add(self, parent: Span, child: Span) -> None:
+        with self._lock:
+            parent.children.append(child)
+
+    def summary(self) -> dict:
+        """Nested span tree plus per-category and per-name totals.
+
+        Open spans (including the root while the request is still running)
+        are measured up to now.
+        """
+        with self._lock:
+            breakdown: dict[str, dict] = {}
+            by_name: dict[str, dict] = {}
+            tokens = {"input_tokens": 0, "output_tokens": 0}
+
+            def visit(s: Span) -> dict:
+                duration = s.duration
+                if s is not self.root:
+                    for totals, key in ((breakdown, s.category), (by_name, s.name)):
+                        entry = totals.setdefault(key, {"count": 0, "total_ms": 0.0})
+                        entry["count"] += 1
+                        entry["total_ms"] = round(entry["total_ms"] + duration * 1000, 1)
+                    for key in tokens:
+                        if isinstance(s.attrs.get(key), int):
+                            tokens[key] += s.attrs[key]
+                node = {
+                    "name": s.name,
+                    "cat": s.category,
+                    "start_ms": _ms(s.start - self.root.start),
+                    "duration_ms": _ms(duration),
+                }
+                if s.attrs:
+                    node["attrs"] = dict(s.attrs)
+                if s.children:
+                    node["children"] = [visit(c) for c in s.children]
+                return node
+
+            tree = visit(self.root)
+            return {
+                "request_id": self.request_id,
+                "total_ms": tree["duration_ms"],
+                "tokens": tokens,
+                "breakdown": breakdown,
+                "by_name": by_name,
+                "spans": tree.get("children", []),
+            }
+
+    def to_chrome(self) -> dict:
+        """Chrome trace-event format (complete ``"X"`` events, µs)."""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            stack = [self.root]
+            while stack:
+                s = stack.pop()
+                events.append({
+                    "name": s.name,
+                    "cat": s.category,
+                    "ph": "X",
+                    "ts": round((s.start - self.root.start) * 1e6, 1),
+                    "dur": round(s.duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": s.thread_id,
+                    "args": dict(s.attrs),
+                })
+                stack.extend(reversed(s.children))
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"request_id": self.request_id},
+        }
+
+    def export(self, directory: str | Path) -> Path:
+        """Write the Chrome trace to ``<directory>/<request_id>.trace.json``."""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        path = path / f"{self.request_id}.trace.json"
+        path.write_text(json.dumps(self.to_chrome()), encoding="utf-8")
+        return path
+
+
+def current_trace() -> Trace | None:
+    """The trace of the request being handled, if any."""
+    return _current_trace.get()
+
+
+def annotate(**attrs) -> None:
+    """Set attributes on the innermost open span (no-op without a trace)."""
+    if _current_trace.get() is None:
+        return
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+def start_trace(name: str = "request", request_id: str | None = None) -> Trace:
+    """Start a trace in the current context.
+
+    ``request_id`` defaults to the structlog ``request_id`` contextvar.
+    """
+    trace = Trace(name, request_id)
+    _current_trace.set(trace)
+    _current_span.set(trace.root)
+    return trace
+
+
+def finish_trace(trace: Trace, export_dir: str | Path | None = None) -> None:
+    """Close the root span, detach the trace and optionally export it."""
+    trace.root.end = time.perf_counter()
+    if _current_trace.get() is trace:
+        _current_trace.set(None)
+        _current_span.set(None)
+    if export_dir:
+        try:
+            path = trace.export(export_dir)
+            logger.debug(f"Trace written to {path}")
+        except OSError as e:
+            logger.warning(f"Failed to export trace {trace.request_id}: {e}")
+
+
+class _SpanScope:
+    """Context manager timing a nested span of the current trace.
+
+    Example:
+        with span("weaviate.hybrid", "weaviate", collection=name) as s:
+            results = collection.query.hybrid(...)
+            s.set(results=len(results.objects))
+    """
+
+    __slots__ = ("_name", "_category", "_attrs", "_span", "_token")
+
+    def __init__(self, name: str, category: str = "app", **attrs):
+        self._name = name
+        self._category = category
+        self._attrs = attrs
+        self._span = None
+        self._token = None
+
+    def __enter__(self) -> Span | _NoopSpan:
+        trace = _current_trace.get()
+        if trace is None:
+            return _NOOP_SPAN
+        parent = _current_span.get() or trace.root
+        self._span = Span(self._name, self._category, self._attrs)
+        trace._add(parent, self._span)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._span is None:
+            return
+        self._span.end = time.perf_counter()
+        if exc_type is not None:
+            self._span.set(error=exc_type.__name__)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from a different context (e.g. a generator finalised
+            # elsewhere): nothing to restore there.
+            pass
+
+
+# Public, function-style name: ``with span(...)``
+span = _SpanScope
+
+
+def traced(name: str | None = None, category: str = "app"):
+    """Decorator form of ``span`` for sync and async functions."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, category):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_tool(func):
+    """Trace an agent tool: ``@agent.tool`` above, ``@traced_tool`` below.
+
+    ``functools.wraps`` keeps the signature, annotations and docstring
+    pydantic-ai builds the tool schema from.
+    """
+    return traced(f"tool.{func.__name__}", "tool")(func)
+
+
+def _usage_attrs(usage) -> dict:
+    if callable(usage):  # StreamedResponse.usage is a method on older pydantic-ai
+        usage = usage()
+    attrs = {}
+    for key, legacy in (("input_tokens", "request_tokens"), ("output_tokens", "response_tokens")):
+        value = getattr(usage, key, None)
+        if value is None:
+            value = getattr(usage, legacy, None)
+        if value is not None:
+            attrs[key] = value
+    return attrs
+
+
+@functools.cache
+def _traced_model_class():
+    from contextlib import asynccontextmanager
+
+    from pydantic_ai.models.wrapper import WrapperModel
+
+    class TracedModel(WrapperModel):
+        """pydantic-ai model wrapper recording an ``llm`` span per request."""
+
+        def __init__(self, wrapped, component: str):
+            super().__init__(wrapped)
+            self.component = component
+
+        async def request(self, *args, **kwargs):
+            with span(f"llm.{self.component}", "llm", model=self.model_name) as s:
+                response = await super().request(*args, **kwargs)
+                s.set(**_usage_attrs(response.usage))
+                return response
+
+        @asynccontextmanager
+        async def request_stream(self, *args, **kwargs):
+            with span(f"llm.{self.component}", "llm", model=self.model_name, stream=True) as s:
+                async with super().request_stream(*args, **kwargs) as stream:
+                    yield stream
+                s.set(**_usage_attrs(stream.usage))
+
+    return TracedModel
+
+
+def traced_model(model, component: str):
+    """Wrap a pydantic-ai model so each request becomes an ``llm`` span."""
+    return _traced_model_class()(model, component)
@@ -0,0 +1,61 @@
+"""Shared YAML facade.
+
+Every YAML read and write in the codebase goes through here so it uses
+libyaml's C loader/dumper (``CSafeLoader`` / ``CSafeDumper``) when PyYAML
+was built against it, and the pure-Python ``SafeLoader`` / ``SafeDumper``
+otherwise. The choice is invisible to callers: for the plain data the
+codebase handles (mappings, lists, str, int, float, bool, None) both
+paths produce the same objects and byte-identical text.
+"""
+
+__all__ = ["HAS_LIBYAML", "YAMLError", "dump_yaml", "load_yaml", "split_frontmatter"]
+
+from typing import Any
+
+import yaml
+from yaml import YAMLError
+
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _Dumper
+    from yaml import SafeLoader as _Loader
+    HAS_LIBYAML = False
+
+
+def load_yaml(stream) -> Any:
+    """``yaml.safe_load`` on the fastest available loader (str, bytes or file)."""
+    return yaml.load(stream, Loader=_Loader)
+
+
+def dump_yaml(data: Any, stream=None, **kwargs) -> str | None:
+    """``yaml.dump`` on the fastest available safe dumper; same keyword arguments."""
+    return yaml.dump(data, stream, Dumper=_Dumper, **kwargs)
+
+
+def split_frontmatter(content: str) -> tuple[str, str] | None:
+    """Split a ``---``-delimited frontmatter block from the document body.
+
+    Returns ``(frontmatter, body)``, or None if ``content`` does not open
+    with a frontmatter block that is closed by a ``---`` line. Scans line
+    starts with ``str.find`` instead of a DOTALL regex, so the cost does
+    not grow with the body.
+    """
+    if not content.startswith("---"):
+        return None
+    first_nl = content.find("\n", 3)
+    if first_nl == -1 or content[3:first_nl].strip():
+        return None
+    pos = first_nl
+    while True:
+        close = content.find("\n---", pos)
+        if close == -1:
+            return None
+        line_end = content.find("\n", close + 4)
+        if line_end == -1:
+            line_end = len(content)  # closing --- on the last line
+        if not content[close + 4:line_end].strip():
+            return content[first_nl + 1:close], content[line_end + 1:]
+        pos = close + 4
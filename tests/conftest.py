@@ -104,3 +104,22 @@ def weaviate_client(weaviate_available):
     client = weaviate.connect_to_local()
     yield client
     client.close()
+
+
+# ---------------------------------------------------------------------------
+# Benchmark reports — shown in the terminal summary, past output capture
+# ---------------------------------------------------------------------------
+
+def pytest_terminal_summary(terminalreporter):
+    """Print ``record_property("benchmark_report", text)`` from passed tests."""
+    lines = [
+        value
+        for report in terminalreporter.stats.get("passed", [])
+        for name, value in report.user_properties
+        if name == "benchmark_report"
+    ]
+    if lines:
+        terminalreporter.section("benchmark reports")
+        for text in lines:
+            for line in str(text).splitlines():
+                terminalreporter.write_line(line)
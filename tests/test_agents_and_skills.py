@@ -245,6 +245,141 @@ class TestSessionContext:
         assert ctx.step_index == 2
 
 
+class TestRunStreaming:
+    """run_streaming emits answer text as it is generated."""
+
+    ANSWER = ["ADR.12 ", "adopts CIM ", "as the default ", "domain language."]
+
+    def _agent(self):
+        from pydantic_ai import Agent, RunContext
+        from pydantic_ai.messages import ModelRequest, ToolReturnPart
+        from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+        answer = self.ANSWER
+
+        async def stream_fn(messages, info):
+            tool_returned = any(
+                isinstance(p, ToolReturnPart)
+                for m in messages if isinstance(m, ModelRequest) for p in m.parts
+            )
+            if not tool_returned:
+                # Narration before the tool call — not part of the answer
+                yield "Let me search the ADRs first."
+                yield {0: DeltaToolCall(name="search", json_args='{"query": "cim"}')}
+                return
+            for chunk in answer:
+                yield chunk
+
+        agent = Agent(FunctionModel(stream_function=stream_fn), deps_type=SessionContext)
+
+        @agent.tool
+        def search(ctx: RunContext[SessionContext], query: str) -> list[dict]:
+            return [{"title": "ADR.12"}]
+
+        return agent
+
+    def _run(self, batch_chars):
+        import asyncio
+
+        from aion.agents import run_streaming
+
+        q = Queue()
+        ctx = SessionContext(event_queue=q, agent_label="RAG Agent")
+        output = asyncio.run(run_streaming(self._agent(), "What is ADR.12?", ctx, batch_chars=batch_chars))
+        events = []
+        while not q.empty():
+            events.append(q.get_nowait())
+        return output, events
+
+    def test_streams_answer_and_retracts_narration(self):
+        output, events = self._run(batch_chars=10)
+        assert output == "".join(self.ANSWER)
+        assert [e.type for e in events] == ["text", "replace", "text", "text", "text"]
+        assert events[0].content == "Let me search the ADRs first."
+        assert events[1].content == ""
+        assert "".join(e.content for e in events[2:]) == output
+        assert all(e.agent == "RAG Agent" for e in events)
+
+    def test_unsent_narration_dropped_without_replace(self):
+        output, events = self._run(batch_chars=1000)
+        assert [e.type for e in events] == ["text"]
+        assert events[0].content == output
+
+
+class TestComplianceBatches:
+    """PrincipleAgent._query_batched runs batches concurrently, merges in order."""
+
+    def _agent(self, fail_batch=None):
+        import asyncio
+        from types import SimpleNamespace
+
+        from aion.agents.principle_agent import PrincipleAgent
+
+        agent = PrincipleAgent.__new__(PrincipleAgent)
+        agent.toolkit = MagicMock()
+        agent.toolkit.list_principles.return_value = [
+            {"principle_number": f"PCP.{i}", "title": f"P{i}", "content": "..."}
+            for i in range(10, 17)
+        ]
+        agent.prompts = []
+        agent.in_flight = agent.peak = 0
+
+        async def run(prompt, deps, message_history):
+            agent.prompts.append(prompt)
+            agent.in_flight += 1
+            agent.peak = max(agent.peak, agent.in_flight)
+            ids = [line.split()[1] for line in prompt.splitlines() if line.startswith("### PCP.")]
+            # Earlier batches finish last
+            await asyncio.sleep(0.002 * (20 - int(ids[0][4:])))
+            agent.in_flight -= 1
+            if ids[0] == fail_batch:
+                raise RuntimeError("model timeout")
+            rows = "\n".join(f"| {pid} | x | COMPLIANT | e | r | none |" for pid in ids)
+            return SimpleNamespace(output=f"| Principle ID | Name | Verdict |\n|---|---|---|\n{rows}")
+
+        agent._agent = SimpleNamespace(run=run)
+        return agent
+
+    def _run(self, agent, concurrency=2):
+        import asyncio
+
+        q = Queue()
+        ctx = SessionContext(event_queue=q)
+        cfg = {"compliance_batch_size": 2, "compliance_batch_concurrency": concurrency}
+        response, _ = asyncio.run(agent._query_batched("Check it", "## DOCUMENT\nSolution design", ctx, cfg))
+        statuses = []
+        while not q.empty():
+            statuses.append(q.get_nowait().content)
+        return response, statuses
+
+    def test_concurrent_bounded_and_merged_in_order(self):
+        agent = self._agent()
+        response, statuses = self._run(agent, concurrency=2)
+
+        assert agent.peak == 2
+        rows = [line.split("|")[1].strip() for line in response.splitlines() if "| COMPLIANT |" in line]
+        assert rows == [f"PCP.{i}" for i in range(10, 17)]
+        assert "- **7** Compliant" in response
+        assert any("speedup" in s for s in statuses)
+
+    def test_prompts_share_document_prefix(self):
+        agent = self._agent()
+        self._run(agent)
+
+        prefix = agent.prompts[0].split("## PRINCIPLES TO EVALUATE")[0]
+        assert prefix.startswith("## DOCUMENT\nSolution design")
+        assert "Original question: Check it" in prefix
+        assert len(agent.prompts) == 4
+        assert all(p.startswith(prefix) for p in agent.prompts)
+
+    def test_failed_batch_keeps_others(self):
+        agent = self._agent(fail_batch="PCP.12")
+        response, _ = self._run(agent, concurrency=4)
+
+        assert "PCP.12" not in response and "PCP.13" not in response
+        assert "- **5** Compliant" in response
+
+
 class TestProcessHistory:
     """Regression tests for process_history truncation boundary logic."""
 
@@ -0,0 +1,199 @@
+"""Tests for the ArchiMate view layout engine and incremental relayout."""
+
+import random
+import time
+
+import pytest
+
+from aion.tools.archimate_layout import count_crossings, order_layers, read_view_layout
+from aion.tools.yaml_to_xml import (
+    ELEMENT_H,
+    _sugiyama_positions,
+    yaml_to_archimate_xml,
+)
+
+_TYPES = [
+    "Goal", "Requirement", "BusinessActor", "BusinessProcess",
+    "ApplicationComponent", "ApplicationService", "DataObject",
+    "Node", "SystemSoftware",
+]
+
+
+def _synthetic_model(n: int, seed: int = 7) -> dict:
+    """``n`` elements spread over the layers, ~1.5 relationships each."""
+    rng = random.Random(seed)
+    elements = [
+        {"id": f"id-e{i}", "type": _TYPES[i % len(_TYPES)], "name": f"Element {i}"}
+        for i in range(n)
+    ]
+    relationships = []
+    for k in range(int(n * 1.5)):
+        s, t = rng.randrange(n), rng.randrange(n)
+        relationships.append({
+            "id": f"id-rel-{k}", "type": "Association",
+            "source": f"id-e{s}", "target": f"id-e{t}",
+        })
+    return {"model": {"name": "Synthetic"}, "elements": elements, "relationships": relationships}
+
+
+def _overlaps(nodes: list[dict]) -> list[tuple[str, str]]:
+    rows: dict[int, list[dict]] = {}
+    for node in nodes:
+        rows.setdefault(node["y"], []).append(node)
+    clashes = []
+    for a in nodes:
+        for y in rows:
+            if abs(y - a["y"]) >= ELEMENT_H:
+                continue
+            for b in rows[y]:
+                if a is not b and a["x"] < b["x"] + b["w"] and b["x"] < a["x"] + a["w"]:
+                    clashes.append((a["elementRef"], b["elementRef"]))
+    return clashes
+
+
+REFINE_BASE = """\
+model:
+  name: "Refinement"
+elements:
+  - id: b1
+    type: BusinessProcess
+    name: "Order Processing"
+  - id: a1
+    type: ApplicationComponent
+    name: "Order Service"
+  - id: a2
+    type: ApplicationInterface
+    name: "Order API"
+  - id: t1
+    type: SystemSoftware
+    name: "Container Runtime"
+relationships:
+  - type: Serving
+    source: a1
+    target: b1
+  - type: Composition
+    source: a1
+    target: a2
+  - type: Serving
+    source: t1
+    target: a1
+"""
+
+REFINE_NEXT = REFINE_BASE.replace("relationships:\n", """\
+  - id: a3
+    type: ApplicationComponent
+    name: "Billing Service"
+  - id: t2
+    type: Node
+    name: "Kubernetes Cluster"
+relationships:
+  - type: Serving
+    source: a3
+    target: b1
+  - type: Serving
+    source: t2
+    target: a3
+""")
+
+
+def _positions(xml_str: str) -> dict[str, tuple[int, int]]:
+    return {eid: (pin.x, pin.y) for eid, pin in read_view_layout(xml_str).items()}
+
+
+class TestCrossingReduction:
+    def test_count_crossings(self):
+        # 0-3 and 1-2 cross once; 0-2 shares an endpoint and doesn't cross
+        down = [[3, 2], [2], [], []]
+        pos = [0, 1, 0, 1]
+        assert count_crossings([[0, 1], [2, 3]], down, pos) == 1
+
+    def test_order_layers_untangles_bipartite_graph(self):
+        # Layer 0: 0..3, layer 1: 4..7, edges i -> 7 - i (fully reversed)
+        neighbours = [[7], [6], [5], [4], [3], [2], [1], [0]]
+        layers = order_layers([[0, 1, 2, 3], [4, 5, 6, 7]], neighbours, [0] * 4 + [1] * 4)
+        pos = {v: i for layer in layers for i, v in enumerate(layer)}
+        down = [[7], [6], [5], [4], [], [], [], []]
+        assert count_crossings(layers, down, pos) == 0
+
+    def test_layout_has_no_overlaps_and_fewer_crossings(self):
+        data = _synthetic_model(500)
+        nodes, connections = _sugiyama_positions(data)
+        assert len(nodes) == 500
+        assert not _overlaps(nodes)
+        assert {c["source"] for c in connections} <= {n["elementRef"] for n in nodes}
+
+
+class TestIncrementalRelayout:
+    def test_carried_over_elements_keep_coordinates(self):
+        previous_xml, _ = yaml_to_archimate_xml(REFINE_BASE)
+        before = _positions(previous_xml)
+
+        xml_str, info = yaml_to_archimate_xml(REFINE_NEXT, previous_xml)
+        after = _positions(xml_str)
+
+        assert info["pinned_count"] == 4
+        assert {eid: after[eid] for eid in before} == before
+        assert {"id-a3", "id-t2"} <= set(after)
+        nodes = [
+            {"elementRef": eid, "x": x, "y": y, "w": 160, "h": ELEMENT_H}
+            for eid, (x, y) in after.items()
+        ]
+        assert not _overlaps(nodes)
+
+    def test_element_moved_to_another_layer_is_relaid(self):
+        previous_xml, _ = yaml_to_archimate_xml(REFINE_BASE)
+        moved = REFINE_BASE.replace(
+            'type: SystemSoftware\n    name: "Container Runtime"',
+            'type: BusinessActor\n    name: "Container Runtime"',
+        )
+        _, info = yaml_to_archimate_xml(moved, previous_xml)
+        assert info["pinned_count"] == 3
+
+    def test_unparseable_previous_xml_ignored(self):
+        xml_str, info = yaml_to_archimate_xml(REFINE_BASE, "<not xml")
+        assert info["pinned_count"] == 0
+        assert xml_str == yaml_to_archimate_xml(REFINE_BASE)[0]
+
+
+@pytest.mark.benchmark
+class TestLayoutBenchmark:
+    """Full and incremental layout time on synthetic models.
+
+    Timings are reported, not asserted: wall-clock bounds flake under a
+    loaded test run; they appear under "benchmark reports" in the summary.
+    Run: pytest tests/test_archimate_layout.py -m benchmark
+    """
+
+    @pytest.mark.parametrize("size", [50, 500, 5000])
+    def test_layout_time(self, size, record_property):
+        data = _synthetic_model(size)
+
+        start = time.perf_counter()
+        nodes, _ = _sugiyama_positions(data)
+        full_s = time.perf_counter() - start
+
+        # Refinement turn: one element added, the rest pinned
+        pinned = {
+            n["elementRef"]: _pin(n, data) for n in nodes
+        }
+        data["elements"].append({"id": "id-new", "type": "Node", "name": "New node"})
+        data["relationships"].append({
+            "id": "id-rel-new", "type": "Association", "source": "id-new", "target": "id-e7",
+        })
+        start = time.perf_counter()
+        relaid, _ = _sugiyama_positions(data, pinned)
+        incremental_s = time.perf_counter() - start
+
+        record_property("benchmark_report", (
+            f"layout {size:>5} elements: full {full_s * 1000:7.1f} ms, "
+            f"incremental {incremental_s * 1000:7.1f} ms"
+        ))
+        assert len(relaid) == size + 1
+        assert not _overlaps(relaid)
+
+
+def _pin(node: dict, data: dict):
+    from aion.tools.archimate_layout import PinnedNode
+
+    types = {e["id"]: e["type"] for e in data["elements"]}
+    return PinnedNode(x=node["x"], y=node["y"], type=types[node["elementRef"]])
@@ -0,0 +1,163 @@
+"""Relationship-validity matrix, streaming reader and large-model validation.
+
+``relationship_allowed`` is ``ALLOWED_PATTERNS`` compiled into a bitmask
+table; it must agree with the pattern scan it replaces on every
+(relationship, source, target) triple. The benchmark checks that
+validating a synthetic 5,000-element enterprise model stays fast.
+"""
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from aion.tools.archimate import (
+    ALLOWED_PATTERNS,
+    NS,
+    VALID_ELEMENT_TYPES,
+    VALID_RELATIONSHIP_TYPES,
+    XSI,
+    read_archimate,
+    relationship_allowed,
+    validate_archimate,
+)
+
+
+def _scan(rtype: str, src: str, tgt: str) -> bool:
+    return any(src in sp and tgt in tp for sp, tp in ALLOWED_PATTERNS.get(rtype, []))
+
+
+def test_matrix_matches_pattern_scan():
+    for rtype in VALID_RELATIONSHIP_TYPES | {"Unknown"}:
+        for src in VALID_ELEMENT_TYPES:
+            for tgt in VALID_ELEMENT_TYPES:
+                assert relationship_allowed(rtype, src, tgt) == _scan(rtype, src, tgt), (
+                    rtype, src, tgt,
+                )
+
+
+def test_unknown_types_not_allowed():
+    assert not relationship_allowed("Serving", "Bogus", "BusinessRole")
+    assert not relationship_allowed("Serving", "ApplicationService", "Bogus")
+
+
+def _synthetic_model(n_elements: int, n_relationships: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    etypes = sorted(VALID_ELEMENT_TYPES)
+    rtypes = sorted(VALID_RELATIONSHIP_TYPES)
+    parts = [
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<model xmlns="{NS}" xmlns:xsi="{XSI}" identifier="id-m">'
+        f"<name>Synthetic</name><elements>"
+    ]
+    for i in range(n_elements):
+        parts.append(
+            f'<element identifier="id-e{i}" xsi:type="{rng.choice(etypes)}">'
+            f"<name>E{i}</name><documentation>d</documentation></element>"
+        )
+    parts.append("</elements><relationships>")
+    for i in range(n_relationships):
+        parts.append(
+            f'<relationship identifier="id-r{i}" xsi:type="{rng.choice(rtypes)}" '
+            f'source="id-e{rng.randrange(n_elements)}" target="id-e{rng.randrange(n_elements)}"/>'
+        )
+    parts.append('</relationships><views><diagrams><view identifier="id-v1" xsi:type="Diagram">')
+    # Nested nodes (20 per group) exercise the nested-node walk
+    for g in range(0, n_elements, 20):
+        parts.append(f'<node identifier="n{g}" elementRef="id-e{g}" xsi:type="Element">')
+        for i in range(g + 1, min(g + 20, n_elements)):
+            parts.append(f'<node identifier="n{i}" elementRef="id-e{i}" xsi:type="Element"/>')
+        parts.append("</node>")
+    parts.append("</view></diagrams></views></model>")
+    return "".join(parts)
+
+
+@pytest.mark.benchmark
+def test_validate_5000_element_model():
+    xml = _synthetic_model(5_000, 10_000)
+    t0 = time.perf_counter()
+    result = validate_archimate(xml)
+    elapsed = time.perf_counter() - t0
+
+    assert result["valid"], result["errors"][:5]
+    assert (result["element_count"], result["relationship_count"]) == (5_000, 10_000)
+    print(f"\nvalidate_archimate: 5,000 elements / 10,000 relationships in {elapsed * 1000:.0f} ms")
+    assert elapsed < 2.0
+
+
+# ---------------------------------------------------------------------------
+# Streaming reader
+# ---------------------------------------------------------------------------
+
+_PROPS_MODEL = f"""<?xml version="1.0" encoding="UTF-8"?>
+<model xmlns="{NS}" xmlns:xsi="{XSI}" identifier="id-m">
+  <name xml:lang="en">Reader Fixture</name>
+  <elements>
+    <element identifier="id-a1" xsi:type="ApplicationComponent">
+      <name xml:lang="en">Billing</name>
+      <properties>
+        <property propertyDefinitionRef="pd-owner"><value xml:lang="en">Finance</value></property>
+      </properties>
+    </element>
+    <element identifier="id-b1" xsi:type="BusinessProcess"><name>Invoice</name></element>
+    <element xsi:type="Node"><name>No id</name></element>
+  </elements>
+  <relationships>
+    <relationship identifier="id-r1" xsi:type="Serving" source="id-a1" target="id-b1"/>
+  </relationships>
+  <propertyDefinitions>
+    <propertyDefinition identifier="pd-owner" type="string"><name>owner</name></propertyDefinition>
+  </propertyDefinitions>
+  <views><diagrams>
+    <view identifier="id-v1" xsi:type="Diagram">
+      <name>Main</name>
+      <node identifier="n1" elementRef="id-a1" xsi:type="Element">
+        <node identifier="n2" elementRef="id-b1" xsi:type="Element"/>
+      </node>
+      <connection identifier="c1" relationshipRef="id-r1" source="n1" target="n2"/>
+    </view>
+  </diagrams></views>
+</model>
+"""
+
+
+class TestStreamingReader:
+    def test_single_pass_extracts_everything(self):
+        model = read_archimate(_PROPS_MODEL)
+        assert model.name == "Reader Fixture"
+        assert [e.id for e in model.elements] == ["id-a1", "id-b1"]
+        assert len(model.unidentified_elements) == 1
+        # propertyDefinitions come after elements — keys still resolved
+        assert model.elements[0].properties == {"owner": "Finance"}
+        view = model.views[0]
+        assert (view.name, view.top_level_nodes) == ("Main", 1)
+        assert view.nodes == [("n2", "id-b1"), ("n1", "id-a1")]
+        assert view.connections == [("c1", "id-r1", "n1", "n2")]
+
+    def test_bytes_input(self):
+        assert read_archimate(_PROPS_MODEL.encode()).name == "Reader Fixture"
+
+    def test_consumers_share_the_reader(self):
+        from aion.tools.archimate import inspect_archimate_model
+        from aion.tools.yaml_to_xml import xml_to_yaml
+
+        result = validate_archimate(_PROPS_MODEL)
+        assert any("missing identifier" in e for e in result["errors"])
+        info = inspect_archimate_model(_PROPS_MODEL)
+        assert info["existing_views"] == [{"id": "id-v1", "name": "Main", "nodes": 1, "connections": 1}]
+        assert "owner" in xml_to_yaml(_PROPS_MODEL)
+
+    def test_memory_stays_below_full_tree(self):
+        xml = _synthetic_model(5_000, 10_000).encode()
+
+        def peak(fn):
+            tracemalloc.start()
+            fn()
+            _, top = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return top
+
+        assert peak(lambda: read_archimate(xml)) < peak(lambda: ET.fromstring(xml))
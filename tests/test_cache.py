@@ -0,0 +1,193 @@
+"""Tests for the shared cache tier (aion.cache)."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from aion import cache
+from aion.cache import (
+    cache_stats,
+    cache_tier,
+    configure,
+    invalidate,
+    on_invalidate,
+    sync_invalidations,
+)
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+@pytest.fixture
+def shared(tmp_path):
+    cache._reset_for_tests()
+    path = tmp_path / "shared_cache.db"
+    configure(path, poll_seconds=0)
+    yield path
+    cache._reset_for_tests()
+
+
+def _other_worker(path: Path, code: str) -> None:
+    """Run ``code`` in a separate interpreter attached to the same store."""
+    script = f"from aion import cache\ncache.configure({str(path)!r})\n{code}"
+    env = {**os.environ, "PYTHONPATH": _SRC}
+    subprocess.run([sys.executable, "-c", script], check=True, env=env, timeout=30)
+
+
+class TestCacheTier:
+    def test_lru_eviction_and_stats_without_shared_store(self):
+        cache._reset_for_tests()
+        configure(None)
+        try:
+            tier = cache_tier("t", maxsize=2)
+            tier.set("a", 1)
+            tier.set("b", 2)
+            assert tier.get("a") == 1
+            tier.set("c", 3)  # evicts b, the least recently used
+            assert tier.get("b") is None
+            assert tier.get_or_set("c", lambda: pytest.fail("cached")) == 3
+
+            stats = cache_stats()
+            assert stats["shared_backend"] is None
+            assert stats["namespaces"]["t"] == {
+                "size": 2, "local_hits": 2, "shared_hits": 0, "misses": 1, "hit_rate": 0.667,
+            }
+        finally:
+            cache._reset_for_tests()
+
+    def test_long_keys_hashed(self, shared):
+        tier = cache_tier("emb")
+        tier.set("x" * 500, [0.1, 0.2])
+        tier.clear_local()
+        assert tier.get("x" * 500) == [0.1, 0.2]
+        assert tier.stats()["shared_hits"] == 1
+
+    def test_expired_entries_ignored(self, shared):
+        tier = cache_tier("short", ttl=-1)
+        tier.set("k", "v")
+        tier.clear_local()
+        assert tier.get("k") is None
+
+
+class TestSharedStorePruning:
+    def test_expired_and_oldest_entries_pruned(self, tmp_path):
+        store = cache.SharedStore(tmp_path / "shared_cache.db", max_entries=3)
+        store.set("ns", "stale", "x", ttl=-1)
+        for key in ("a", "b", "c", "d"):
+            store.set("ns", key, key, ttl=None)
+        store.set("ns", "a", "a2", ttl=None)  # rewrite makes "a" the newest
+
+        assert store.prune() == 2
+        assert [store.get("ns", k) for k in ("a", "b", "c", "d")] == ["a2", None, "c", "d"]
+
+    def test_writes_trigger_sweep(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "_PRUNE_EVERY", 4)
+        store = cache.SharedStore(tmp_path / "shared_cache.db", max_entries=2)
+        for i in range(4):
+            store.set("ns", str(i), "v", ttl=None)
+        rows = store._conn().execute("SELECT key FROM cache_entries ORDER BY key").fetchall()
+        assert rows == [("2",), ("3",)]
+
+
+class TestAcrossWorkers:
+    def test_value_computed_by_other_worker_is_shared(self, shared):
+        _other_worker(shared, "cache.cache_tier('embeddings').set('q', [1.0, 2.0])")
+
+        tier = cache_tier("embeddings")
+        assert tier.get_or_set("q", lambda: pytest.fail("should be a shared hit")) == [1.0, 2.0]
+        assert tier.get("q") == [1.0, 2.0]
+        stats = tier.stats()
+        assert (stats["shared_hits"], stats["local_hits"], stats["misses"]) == (1, 1, 0)
+
+    def test_invalidation_broadcast(self, shared):
+        calls = []
+        on_invalidate("skills", lambda: calls.append("skills"))
+        tier = cache_tier("skills")
+        tier.set("k", "stale")
+
+        # Own invalidations don't call local listeners or re-fire on sync
+        invalidate("skills")
+        assert sync_invalidations(force=True) == [] and calls == []
+        tier.set("k", "stale")
+
+        _other_worker(shared, "cache.invalidate('skills')")
+        assert sync_invalidations(force=True) == ["skills"]
+        assert calls == ["skills"]
+        assert tier.get("k") is None
+        assert sync_invalidations(force=True) == []
+
+    def test_sync_is_rate_limited(self, shared):
+        configure(shared, poll_seconds=60)
+        _other_worker(shared, "cache.invalidate('runtime_config')")
+        assert sync_invalidations() == []
+        assert sync_invalidations(force=True) == ["runtime_config"]
+
+
+class TestIntegrations:
+    def test_runtime_reload_from_other_worker(self, shared, monkeypatch, tmp_path):
+        from aion.config import runtime
+
+        config_file = tmp_path / "runtime.yaml"
+        config_file.write_text("agents:\n  stream_batch_chars: 40\n")
+        monkeypatch.setattr(runtime, "_RUNTIME_YAML_PATH", config_file)
+        runtime.clear_cache()
+        try:
+            assert runtime.get_runtime_value("agents.stream_batch_chars", 0) == 40
+
+            config_file.write_text("agents:\n  stream_batch_chars: 80\n")
+            assert runtime.get_runtime_value("agents.stream_batch_chars", 0) == 40
+            _other_worker(shared, "cache.invalidate('runtime_config')")
+            sync_invalidations(force=True)
+            assert runtime.get_runtime_value("agents.stream_batch_chars", 0) == 80
+        finally:
+            runtime.clear_cache()
+
+    def test_global_registry_reload_is_broadcast(self, shared, monkeypatch):
+        import aion.skills.multi_registry as mr
+
+        reloads = []
+        registry = mr.MultiPluginRegistry()
+        monkeypatch.setattr(registry, "load", lambda: reloads.append("load"))
+        monkeypatch.setattr(mr, "_global_multi", registry)
+
+        registry.reload()
+        assert reloads == ["load"]
+        generations = cache._get_store().generations()
+        assert generations.get("skills") == 1
+
+        # Another worker reloads: this one re-reads disk without re-broadcasting
+        _other_worker(shared, "cache.invalidate('skills')")
+        assert sync_invalidations(force=True) == ["skills"]
+        assert reloads == ["load", "load"]
+        assert cache._get_store().generations()["skills"] == 2
+
+        # Ad-hoc registries (tests, tooling) never broadcast
+        mr.MultiPluginRegistry().reload()
+        assert cache._get_store().generations()["skills"] == 2
+
+    def test_query_embeddings_cached(self, shared, monkeypatch):
+        from aion.ingestion import embeddings
+
+        calls = []
+
+        class FakeClient:
+            def embed(self, text):
+                calls.append(text)
+                return [float(len(text))]
+
+        monkeypatch.setattr(embeddings, "get_embeddings_client", lambda: FakeClient())
+        assert embeddings.embed_text("what is ADR.29?") == [15.0]
+        assert embeddings.embed_text("what is ADR.29?") == [15.0]
+        assert calls == ["what is ADR.29?"]
+
+        # Stored as packed float32 bytes, not a JSON float list
+        tier = cache_tier("embeddings")
+        assert (tier.maxsize, tier.ttl) == (embeddings._QUERY_CACHE_SIZE, embeddings._QUERY_CACHE_TTL)
+        raw = cache._get_store()._conn().execute(
+            "SELECT value FROM cache_entries WHERE namespace = 'embeddings'"
+        ).fetchone()[0]
+        assert raw == json.dumps(embeddings._pack_vector([15.0]))
+        assert embeddings._unpack_vector(embeddings._pack_vector([0.5] * 3072)) == [0.5] * 3072
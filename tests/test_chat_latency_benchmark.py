@@ -0,0 +1,422 @@
+"""End-to-end latency benchmark for the ``/api/chat/stream`` pipeline.
+
+Drives the real request path — ``Persona.process`` → routing →
+``RAGAgent.query`` → ``RAGToolkit`` → ``ResponseQualityGate.evaluate`` →
+``save_message`` → SSE serialization — with every external service
+replaced by a local stand-in:
+
+    - LLM + embeddings: a fake Ollama / OpenAI-compatible HTTP server with
+      configurable latency (``/api/generate``, ``/v1/chat/completions``,
+      ``/api/embed``). The RAG agent is sent through one real tool call
+      before it answers.
+    - Vector store: the embedded backend, loaded with the repo's ADRs and
+      principles by the regular ingestion pipeline.
+    - SQLite: a temp database.
+
+The chat app and the fake LLM both run under uvicorn, and the client
+reads the SSE stream over real sockets. Closed-loop users (1, 8, 32)
+send requests back to back. The test reports throughput, end-to-end
+p50/p95/p99 and per-stage percentiles, and fails when p95 or throughput
+regress past ``fixtures/chat_latency_baseline.json`` by more than the
+tolerance. The baseline is machine-specific, so it is not committed: the
+first run on a machine writes it, later runs compare against it, and a
+run with ``AION_BENCH_UPDATE_BASELINE=1`` rewrites it. A baseline recorded
+for different fake latencies or load levels skips the comparison.
+
+``rag_fallback`` in the stage breakdown counts agent runs that failed and
+fell back to ``RAGAgent._direct_query``; it should stay empty.
+
+Run:
+    pytest tests/test_chat_latency_benchmark.py -m benchmark -rs
+
+Environment:
+    AION_BENCH_LLM_LATENCY_MS    fake LLM latency per call (default 25)
+    AION_BENCH_EMBED_LATENCY_MS  fake embedding latency per call (default 3)
+    AION_BENCH_TOLERANCE         allowed regression fraction (default 0.5)
+    AION_BENCH_UPDATE_BASELINE   "1" rewrites an existing baseline from this run
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+uvicorn = pytest.importorskip("uvicorn")
+
+import httpx  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from aion.config import settings  # noqa: E402
+from aion.evaluation.cassette import StageTimings, percentiles  # noqa: E402
+from aion.ingestion.embedded_store import EmbeddedClient, tokenize  # noqa: E402
+
+pytestmark = pytest.mark.benchmark
+
+LLM_LATENCY_MS = float(os.environ.get("AION_BENCH_LLM_LATENCY_MS", "25"))
+EMBED_LATENCY_MS = float(os.environ.get("AION_BENCH_EMBED_LATENCY_MS", "3"))
+TOLERANCE = float(os.environ.get("AION_BENCH_TOLERANCE", "0.5"))
+UPDATE_BASELINE = os.environ.get("AION_BENCH_UPDATE_BASELINE") == "1"
+
+BASELINE_PATH = Path(__file__).parent / "fixtures" / "chat_latency_baseline.json"
+
+# Concurrent users -> requests per user
+LOAD_LEVELS = {1: 12, 8: 4, 32: 2}
+
+_EMBED_DIM = 768
+_MODEL = "bench-model"
+
+QUESTIONS = [
+    "What does the decision about the domain language standard say?",
+    "Which ADR covers TLS for data communication?",
+    "What authentication standard was chosen for identification?",
+    "How should message exchange be handled in distributed systems?",
+    "What do the principles say about data ownership?",
+    "Which principle addresses data reliability?",
+    "What format is used for architectural decision records?",
+    "How is eventual consistency handled in our architecture?",
+]
+
+
+# ── Fake LLM server ──────────────────────────────────────────────────────────
+
+def _embed(text: str) -> list[float]:
+    """Deterministic hashed bag-of-words embedding (shared with ingestion)."""
+    vec = [0.0] * _EMBED_DIM
+    for token in tokenize(text):
+        vec[int(hashlib.md5(token.encode()).hexdigest(), 16) % _EMBED_DIM] += 1.0
+    return vec
+
+
+def _completion(message: dict) -> dict:
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": _MODEL,
+        "choices": [{"index": 0, "message": message, "finish_reason": (
+            "tool_calls" if message.get("tool_calls") else "stop"
+        )}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+    }
+
+
+async def _chat_completions(request: Request) -> JSONResponse:
+    body = await request.json()
+    await asyncio.sleep(LLM_LATENCY_MS / 1000)
+    messages = body.get("messages", [])
+    tools = {t["function"]["name"] for t in body.get("tools", [])}
+    question = next(
+        (m["content"] for m in reversed(messages) if m.get("role") == "user" and isinstance(m.get("content"), str)),
+        "",
+    )
+
+    # First turn with tools: one search, then answer from the tool result
+    if "search_architecture_decisions" in tools and not any(m.get("role") == "tool" for m in messages):
+        return JSONResponse(_completion({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{hashlib.md5(question.encode()).hexdigest()[:8]}",
+                "type": "function",
+                "function": {
+                    "name": "search_architecture_decisions",
+                    "arguments": json.dumps({"query": question, "limit": 5}),
+                },
+            }],
+        }))
+    return JSONResponse(_completion({
+        "role": "assistant",
+        "content": "According to ADR.12 the knowledge base answers this directly.",
+    }))
+
+
+async def _generate(request: Request) -> JSONResponse:
+    body = await request.json()
+    await asyncio.sleep(LLM_LATENCY_MS / 1000)
+    message = body.get("prompt", "").rsplit("CURRENT MESSAGE:\n", 1)[-1].strip()
+    classification = {
+        "intent": "retrieval",
+        "content": message,
+        "skill_tags": [],
+        "doc_refs": [],
+        "github_refs": [],
+        "complexity": "simple",
+    }
+    return JSONResponse({"model": _MODEL, "response": json.dumps(classification), "done": True})
+
+
+async def _embed_endpoint(request: Request) -> JSONResponse:
+    body = await request.json()
+    await asyncio.sleep(EMBED_LATENCY_MS / 1000)
+    inputs = body.get("input", [])
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    return JSONResponse({"model": _MODEL, "embeddings": [_embed(t) for t in inputs]})
+
+
+async def _tags(request: Request) -> JSONResponse:
+    return JSONResponse({"models": [{"name": _MODEL}]})
+
+
+fake_llm_app = Starlette(routes=[
+    Route("/v1/chat/completions", _chat_completions, methods=["POST"]),
+    Route("/api/generate", _generate, methods=["POST"]),
+    Route("/api/embed", _embed_endpoint, methods=["POST"]),
+    Route("/api/tags", _tags, methods=["GET"]),
+])
+
+
+class _ServerThread:
+    """Run an ASGI app under uvicorn on an ephemeral port in a daemon thread."""
+
+    def __init__(self, app):
+        config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("benchmark server did not start")
+            time.sleep(0.01)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+# ── Stage timing hooks ───────────────────────────────────────────────────────
+
+def _timed(stage: str, fn, timings: dict):
+    """Wrap ``fn`` to record its duration into ``timings["current"]``."""
+    if asyncio.iscoroutinefunction(fn):
+        async def async_wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                timings["current"].record(stage, (time.perf_counter() - t0) * 1000)
+        return async_wrapper
+
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings["current"].record(stage, (time.perf_counter() - t0) * 1000)
+    return wrapper
+
+
+def _install_stage_timers(mp: pytest.MonkeyPatch, timings: dict) -> None:
+    import aion.chat_ui as chat_ui
+    from aion.agents.quality_gate import ResponseQualityGate
+    from aion.agents.rag_agent import RAGAgent
+    from aion.evaluation.cassette import TOOLKIT_METHODS
+    from aion.events import Event
+    from aion.persona import Persona
+    from aion.tools.rag_search import RAGToolkit
+
+    mp.setattr(Persona, "process", _timed("persona", Persona.process, timings))
+    mp.setattr(chat_ui, "_get_execution_model", _timed("routing", chat_ui._get_execution_model, timings))
+    mp.setattr(RAGAgent, "query", _timed("rag_agent", RAGAgent.query, timings))
+    mp.setattr(RAGAgent, "_direct_query", _timed("rag_fallback", RAGAgent._direct_query, timings))
+    for name in TOOLKIT_METHODS:
+        mp.setattr(RAGToolkit, name, _timed("rag_tools", getattr(RAGToolkit, name), timings))
+    mp.setattr(ResponseQualityGate, "evaluate", _timed("quality_gate", ResponseQualityGate.evaluate, timings))
+    mp.setattr(chat_ui, "save_message", _timed("save_message", chat_ui.save_message, timings))
+    mp.setattr(Event, "to_sse", _timed("sse", Event.to_sse, timings))
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="module")
+def bench_env(tmp_path_factory):
+    """Fake LLM, embedded index, temp SQLite and the chat app, all local."""
+    import aion.chat_ui as chat_ui
+    import aion.memory.session_store as session_store
+    import aion.registry.element_registry as element_registry
+    import aion.storage.capability_store as capability_store
+    from aion.agents.rag_agent import RAGAgent
+    from aion.ingestion import ingestion
+    from aion.ingestion.collections import CollectionManager
+    from aion.ingestion.embeddings import close_embeddings_client
+    from aion.persona import Persona
+
+    adr_path = settings.resolve_path(settings.markdown_path) / "decisions"
+    if not adr_path.exists():
+        pytest.skip(f"{adr_path} not present")
+
+    tmp = tmp_path_factory.mktemp("chat_bench")
+    mp = pytest.MonkeyPatch()
+    timings = {"current": StageTimings()}
+
+    with _ServerThread(fake_llm_app) as llm_url:
+        for name, value in {
+            "llm_provider": "ollama", "persona_provider": None, "persona_model": None,
+            "rag_provider": None, "rag_model": None, "embedding_provider": None,
+            "ollama_url": llm_url, "ollama_model": _MODEL, "ingestion_workers": 1,
+        }.items():
+            mp.setattr(settings, name, value)
+        close_embeddings_client()
+
+        # Index the repo's ADRs and principles (embedding in-process)
+        mp.setattr(ingestion, "embed_texts", lambda texts: [_embed(t) for t in texts])
+        client = EmbeddedClient(tmp / "index")
+        CollectionManager(client).create_all_collections()
+        pipeline = ingestion.DataIngestionPipeline(client)
+        pipeline._ingest_adrs_chunked(batch_size=50)
+        pipeline._ingest_principles_chunked(batch_size=50)
+        client.flush()
+
+        db = tmp / "chat_history.db"
+        mp.setattr(chat_ui, "_db_path", db)
+        mp.setattr(session_store, "_DB_PATH", db)
+        mp.setattr(element_registry, "_DB_PATH", db)
+        mp.setattr(capability_store, "_db_path", db)
+        chat_ui.init_db()
+
+        try:
+            rag_agent = RAGAgent(client)
+        except TypeError as e:  # pydantic-ai release without history_processors
+            mp.undo()
+            pytest.skip(f"RAGAgent cannot be built with the installed pydantic-ai: {e}")
+
+        mp.setattr(chat_ui, "_weaviate_client", client)
+        mp.setattr(chat_ui, "_rag_agent", rag_agent)
+        mp.setattr(chat_ui, "_persona", Persona())
+        for name in ("_vocabulary_agent", "_archimate_agent", "_principle_agent",
+                     "_repo_analysis_agent", "_document_agent", "_generation_pipeline"):
+            mp.setattr(chat_ui, name, MagicMock())
+        _install_stage_timers(mp, timings)
+
+        @asynccontextmanager
+        async def _no_lifespan(app):
+            yield
+
+        mp.setattr(chat_ui.app.router, "lifespan_context", _no_lifespan)
+
+        try:
+            with _ServerThread(chat_ui.app) as chat_url:
+                yield chat_url, timings
+        finally:
+            mp.undo()
+            close_embeddings_client()
+
+
+# ── Load generator ───────────────────────────────────────────────────────────
+
+async def _chat_turn(client: httpx.AsyncClient, message: str) -> float:
+    """POST one chat message, consume the SSE stream, return latency in ms."""
+    t0 = time.perf_counter()
+    events = []
+    async with client.stream("POST", "/api/chat/stream", json={"message": message}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[6:]))
+    latency = (time.perf_counter() - t0) * 1000
+    types = [e.get("type") for e in events]
+    assert "error" not in types, events
+    complete = [e for e in events if e.get("type") == "complete"]
+    assert complete and complete[-1].get("response"), types
+    return latency
+
+
+async def _run_level(base_url: str, users: int, per_user: int) -> dict:
+    latencies: list[float] = []
+
+    async def user(index: int, client: httpx.AsyncClient) -> None:
+        for turn in range(per_user):
+            question = QUESTIONS[(index + turn) % len(QUESTIONS)]
+            latencies.append(await _chat_turn(client, question))
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        await _chat_turn(client, QUESTIONS[0])  # warm connection + caches
+        t0 = time.perf_counter()
+        await asyncio.gather(*(user(i, client) for i in range(users)))
+        elapsed = time.perf_counter() - t0
+
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        **{k: v for k, v in percentiles(latencies).items() if k != "count"},
+    }
+
+
+def _report(results: dict, stages: dict) -> str:
+    lines = [
+        f"chat pipeline benchmark (LLM {LLM_LATENCY_MS:g}ms, embed {EMBED_LATENCY_MS:g}ms)",
+        f"{'users':>5} {'reqs':>5} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8}",
+    ]
+    for users, r in results.items():
+        lines.append(
+            f"{users:>5} {r['requests']:>5} {r['throughput_rps']:>7} "
+            f"{r['p50']:>8} {r['p95']:>8} {r['p99']:>8}"
+        )
+    for users, by_stage in stages.items():
+        lines.append(f"stages @ {users} users (ms):")
+        for stage, pct in by_stage.items():
+            lines.append(f"  {stage:<13} n={pct['count']:<5} p50={pct['p50']:<8} p95={pct['p95']:<8} p99={pct['p99']}")
+    return "\n".join(lines)
+
+
+def _regressions(results: dict, baseline: dict) -> list[str]:
+    problems = []
+    for users, current in results.items():
+        base = baseline["levels"].get(str(users))
+        if not base:
+            continue
+        p95_limit = base["p95"] * (1 + TOLERANCE)
+        if current["p95"] > p95_limit:
+            problems.append(f"{users} users: p95 {current['p95']}ms > {p95_limit:.1f}ms (baseline {base['p95']}ms)")
+        rps_floor = base["throughput_rps"] * (1 - TOLERANCE)
+        if current["throughput_rps"] < rps_floor:
+            problems.append(
+                f"{users} users: throughput {current['throughput_rps']} req/s < {rps_floor:.2f} "
+                f"(baseline {base['throughput_rps']})"
+            )
+    return problems
+
+
+def test_chat_stream_latency(bench_env, record_property):
+    base_url, timings = bench_env
+    config = {"llm_latency_ms": LLM_LATENCY_MS, "embed_latency_ms": EMBED_LATENCY_MS,
+              "load_levels": {str(u): n for u, n in LOAD_LEVELS.items()}}
+
+    results, stages = {}, {}
+    for users, per_user in LOAD_LEVELS.items():
+        timings["current"] = StageTimings()  # per-level stage breakdown
+        results[users] = asyncio.run(_run_level(base_url, users, per_user))
+        stages[users] = timings["current"].summary()
+    report = _report(results, stages)
+
+    current = {"config": config, "levels": {str(u): r for u, r in results.items()}}
+    record_property("chat_latency", current)
+    if UPDATE_BASELINE or not BASELINE_PATH.exists():
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(current, indent=2) + "\n")
+        record_property("benchmark_report", f"{report}\nbaseline written to {BASELINE_PATH}")
+        return
+    record_property("benchmark_report", report)
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    if baseline.get("config") != config:
+        pytest.skip("benchmark config differs from the stored baseline; rerun with AION_BENCH_UPDATE_BASELINE=1")
+    problems = _regressions(results, baseline)
+    assert not problems, "latency regression vs baseline:\n" + "\n".join(problems) + "\n\n" + report
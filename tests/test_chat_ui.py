@@ -1,5 +1,6 @@
 """Tests for chat_ui helper functions."""
 
+import pytest
 
 from aion.chat_ui import _query_references_artifact
 
@@ -102,3 +103,223 @@ class TestQueryReferencesArtifact:
     def test_missing_content_type(self):
         artifact = {}
         assert _query_references_artifact("analyze the artifact", "follow_up", artifact) is True
+
+
+class TestRepoArchimatePhases:
+    """stream_repo_archimate_response: explorer and model run concurrently."""
+
+    @staticmethod
+    def _patch(monkeypatch, gate):
+        import asyncio
+
+        import aion.chat_ui as chat_ui
+        from aion.events import Event
+
+        async def analysis(*args, **kwargs):
+            yield Event(type="status", content="analysing")
+            yield Event(type="complete", response="done")
+
+        async def generation(*args, **kwargs):
+            yield Event(type="status", content="generating")
+            await asyncio.wait_for(gate.wait(), timeout=5)  # held until explorer lands
+            yield Event(type="artifact", filename="model.archimate.xml")
+            yield Event(type="complete", response="model done")
+
+        def save(conversation_id, filename, content, content_type, summary):
+            gate.set()
+            return "art-1"
+
+        monkeypatch.setattr(chat_ui, "stream_repo_analysis_response", analysis)
+        monkeypatch.setattr(chat_ui, "stream_generation_response", generation)
+        monkeypatch.setattr(chat_ui, "get_latest_artifact", lambda cid, content_type: {"content": "meta: {}"})
+        monkeypatch.setattr(chat_ui, "generate_explorer_html", lambda notes: "<html/>")
+        monkeypatch.setattr(chat_ui, "save_artifact", save)
+        return chat_ui
+
+    async def test_explorer_delivered_before_model_finishes(self, monkeypatch):
+        import asyncio
+
+        gate = asyncio.Event()
+        chat_ui = self._patch(monkeypatch, gate)
+        events = [e async for e in chat_ui.stream_repo_archimate_response("q", conversation_id="c1")]
+
+        artifacts = [e.filename for e in events if e.type == "artifact"]
+        assert artifacts[0].endswith(".html")
+        assert artifacts[1] == "model.archimate.xml"
+        assert events[-1].type == "complete"
+        assert "explorer has been saved" in events[-1].response
+
+    async def test_failed_analysis_skips_dependents(self, monkeypatch):
+        import asyncio
+
+        gate = asyncio.Event()
+        chat_ui = self._patch(monkeypatch, gate)
+        monkeypatch.setattr(chat_ui, "get_latest_artifact", lambda cid, content_type: None)
+        events = [e async for e in chat_ui.stream_repo_archimate_response("q", conversation_id="c1")]
+
+        assert [e.type for e in events][-1] == "error"
+        assert not any(e.type == "artifact" for e in events)
+
+    async def test_phase_failure_is_not_terminal(self, monkeypatch):
+        import asyncio
+
+        from aion.events import Event
+
+        gate = asyncio.Event()
+        chat_ui = self._patch(monkeypatch, gate)
+
+        async def generation(*args, **kwargs):
+            yield Event(type="error", content="model boom")
+
+        monkeypatch.setattr(chat_ui, "stream_generation_response", generation)
+        events = [e async for e in chat_ui.stream_repo_archimate_response("q", conversation_id="c1")]
+
+        assert not any(e.type == "error" for e in events)
+        assert any(e.type == "status" and e.content == "model boom" for e in events)
+        assert any(e.type == "artifact" for e in events)
+        assert events[-1].type == "complete"
+        assert "model boom" in events[-1].response
+
+    async def test_all_dependents_failing_ends_with_single_error(self, monkeypatch):
+        import asyncio
+
+        from aion.events import Event
+
+        gate = asyncio.Event()
+        chat_ui = self._patch(monkeypatch, gate)
+
+        async def generation(*args, **kwargs):
+            yield Event(type="error", content="model boom")
+
+        monkeypatch.setattr(chat_ui, "stream_generation_response", generation)
+        monkeypatch.setattr(chat_ui, "generate_explorer_html", lambda notes: "")
+        events = [e async for e in chat_ui.stream_repo_archimate_response("q", conversation_id="c1")]
+
+        assert [e.type for e in events].count("error") == 1
+        assert events[-1].type == "error"
+        assert "model boom" in events[-1].content
+
+    async def test_closing_stream_cancels_and_closes_running_phases(self):
+        import asyncio
+
+        from aion.chat_ui import _Phase, _run_phase_graph
+        from aion.events import Event
+
+        cleaned_up = []
+
+        async def slow(results):
+            try:
+                yield Event(type="status", content="started")
+                await asyncio.sleep(10)
+            finally:
+                await asyncio.sleep(0)  # async cleanup, as in the agent streams
+                cleaned_up.append("slow")
+
+        stream = _run_phase_graph([_Phase("slow", slow)], {}, {})
+        assert (await stream.__anext__()).content == "started"
+        await stream.aclose()
+        assert cleaned_up == ["slow"]
+
+
+class TestRollingSummary:
+    """Watermarked, debounced rolling summarization."""
+
+    @pytest.fixture
+    def conversation(self, tmp_path, monkeypatch):
+        import aion.chat_ui as cui
+        import aion.memory.session_store as session_store
+
+        db = tmp_path / "chat.db"
+        monkeypatch.setattr(cui, "_db_path", db)
+        monkeypatch.setattr(session_store, "_DB_PATH", db)
+        cui.init_db()
+        conv_id = cui.create_conversation("t")
+        session_store.create_session(conv_id)
+
+        calls = []
+
+        async def fake_summary(current, messages):
+            calls.append([m["content"] for m in messages])
+            return f"summary of {len(calls)} passes"
+
+        monkeypatch.setattr(cui, "generate_rolling_summary", fake_summary)
+        return cui, conv_id, calls
+
+    @staticmethod
+    def _add(cui, conv_id, start, count):
+        for i in range(start, start + count):
+            cui.save_message(conv_id, "user" if i % 2 == 0 else "assistant", f"m{i}")
+
+    async def test_only_unsummarized_tail_is_summarized(self, conversation):
+        from aion.memory.session_store import get_summary_state
+
+        cui, conv_id, calls = conversation
+        self._add(cui, conv_id, 0, 30)
+
+        await cui._maybe_update_summary(conv_id)
+        assert calls == [[f"m{i}" for i in range(10)]]
+        summary, watermark = get_summary_state(conv_id)
+        assert summary == "summary of 1 passes" and watermark > 0
+
+        # Previously every later turn re-triggered the LLM call
+        await cui._maybe_update_summary(conv_id)
+        self._add(cui, conv_id, 30, 3)
+        await cui._maybe_update_summary(conv_id)
+        assert len(calls) == 1
+
+        self._add(cui, conv_id, 33, 1)
+        await cui._maybe_update_summary(conv_id)
+        assert calls[1] == ["m10", "m11", "m12", "m13"]
+
+    async def test_legacy_summary_adopts_watermark(self, conversation):
+        from aion.memory.session_store import get_summary_state, update_running_summary
+
+        cui, conv_id, calls = conversation
+        self._add(cui, conv_id, 0, 30)
+        update_running_summary(conv_id, "old summary")
+
+        await cui._maybe_update_summary(conv_id)
+        assert calls == []
+        summary, watermark = get_summary_state(conv_id)
+        assert summary == "old summary"
+        assert cui._count_messages_after(conv_id, watermark) == 20
+
+    async def test_failed_summary_keeps_watermark(self, conversation, monkeypatch):
+        from aion.memory.session_store import get_summary_state
+
+        cui, conv_id, calls = conversation
+        self._add(cui, conv_id, 0, 30)
+
+        async def failed_summary(current, messages):
+            calls.append([m["content"] for m in messages])
+            return None
+
+        monkeypatch.setattr(cui, "generate_rolling_summary", failed_summary)
+        await cui._maybe_update_summary(conv_id)
+        assert get_summary_state(conv_id)[1] == 0
+
+        # The same batch is retried on the next pass
+        await cui._maybe_update_summary(conv_id)
+        assert calls[0] == calls[1] == [f"m{i}" for i in range(10)]
+
+    async def test_burst_of_turns_coalesced(self, conversation, monkeypatch):
+        import asyncio
+
+        cui, conv_id, _ = conversation
+        runs = []
+
+        async def fake_update(conversation_id):
+            runs.append(conversation_id)
+
+        monkeypatch.setattr(cui, "_maybe_update_summary", fake_update)
+        monkeypatch.setattr(cui, "get_runtime_value", lambda key, default=None: 0.02)
+
+        for _ in range(5):
+            cui._schedule_summary_update(conv_id)
+        await asyncio.sleep(0.1)
+        assert runs == [conv_id]
+        assert conv_id not in cui._summary_tasks
+
+        cui._schedule_summary_update(conv_id)
+        await asyncio.sleep(0.1)
+        assert runs == [conv_id, conv_id]
@@ -0,0 +1,74 @@
+"""CLI startup import budget.
+
+``aion config`` / ``aion registry list`` must not pull in the agent stack
+(pydantic-ai, openai), Weaviate or the PDF/DOCX parsers — those are
+imported inside the commands that need them. Each check runs in a fresh
+interpreter so modules already loaded by other tests don't mask a
+regression.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from aion._startup_profile import _parse_importtime
+
+# Modules that must stay out of `import aion.cli`.
+_HEAVY_MODULES = (
+    "pydantic_ai", "openai", "weaviate", "fitz", "pymupdf", "docx",
+    "aion.agents", "aion.persona", "aion.ingestion.ingestion",
+)
+
+# Cumulative import time of aion.cli, in microseconds. Generous for slow
+# CI runners; the eager-import layout measured well over 2 s.
+_IMPORT_BUDGET_US = 1_500_000
+
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(
+        p for p in (_SRC, os.environ.get("PYTHONPATH", "")) if p
+    )}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True, text=True, timeout=60, env=env,
+    )
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    proc = _run(
+        "import sys, aion.cli; "
+        f"print(','.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
+
+
+def test_cli_import_time_within_budget():
+    proc = _run("import aion.cli", "-X", "importtime")
+    assert proc.returncode == 0, proc.stderr
+    rows = {name: cum for name, _, cum, _ in _parse_importtime(proc.stderr)}
+    assert rows["aion.cli"] < _IMPORT_BUDGET_US, (
+        f"import aion.cli took {rows['aion.cli'] / 1000:.0f} ms "
+        f"(budget {_IMPORT_BUDGET_US / 1000:.0f} ms) — run `aion --profile-startup` "
+        "to see which import regressed"
+    )
+
+
+@pytest.mark.parametrize("stderr, expected", [
+    (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n",
+        [("json.decoder", 120, 120, 1), ("json", 300, 420, 0)],
+    ),
+    ("unrelated warning line\n", []),
+])
+def test_parse_importtime(stderr, expected):
+    assert _parse_importtime(stderr) == expected
@@ -0,0 +1,136 @@
+"""Tests for the document-number index and exact reference fetches."""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from weaviate.classes.data import DataObject  # noqa: E402
+
+from aion.generation import GenerationPipeline  # noqa: E402
+from aion.ingestion import doc_index, ingestion  # noqa: E402
+from aion.ingestion.collections import CollectionManager  # noqa: E402
+from aion.ingestion.embedded_store import EmbeddedClient  # noqa: E402
+
+ADR = CollectionManager.ADR_COLLECTION
+
+
+def _adr(number: int, chunk: int = 0, doc_type: str = "adr", title: str | None = None) -> DataObject:
+    padded = str(number).zfill(4)
+    return DataObject(
+        properties={
+            "adr_number": padded,
+            "title": title or f"ADR {padded}",
+            "doc_type": doc_type,
+            "content": f"ADR {padded} chunk {chunk}",
+            "full_text": f"ADR {padded} chunk {chunk}",
+            "chunk_index": chunk,
+        },
+        uuid=str(uuid4()),
+    )
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "index.db"
+    monkeypatch.setattr(doc_index, "_DB_PATH", path)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch, db_path):
+    """Embedded store with ADR.1..ADR.100 ingested through the pipeline."""
+    monkeypatch.setattr(ingestion, "embed_texts", lambda texts: [[1.0, 0.0, 0.0]] * len(texts))
+    client = EmbeddedClient(tmp_path / "store")
+    CollectionManager(client).create_all_collections()
+    pipeline = ingestion.DataIngestionPipeline(client)
+    collection = client.collections.get(ADR)
+
+    batch = [_adr(n) for n in range(1, 101)]
+    batch += [_adr(90, chunk=1), _adr(90, doc_type="adr_approval", title="Decision Approval Record 90")]
+    pipeline._insert_batch_with_embeddings(collection, batch, "adr_chunked", "full_text")
+    pipeline._write_doc_index([])
+    return client, pipeline
+
+
+def _spy_fetches(client, monkeypatch) -> list:
+    collection = client.collections.get(ADR)
+    calls = []
+    original = collection.query.fetch_objects
+
+    def fetch_objects(**kwargs):
+        result = original(**kwargs)
+        calls.append((kwargs["filters"], len(result.objects)))
+        return result
+
+    monkeypatch.setattr(collection.query, "fetch_objects", fetch_objects)
+    return calls
+
+
+class TestDocIndex:
+    def test_lookup_returns_chunks_in_order(self, db_path):
+        doc_index.replace_collection(ADR, [
+            doc_index.index_entry("u2", {"adr_number": "0007", "chunk_index": 1}),
+            doc_index.index_entry("u1", {"adr_number": "7", "chunk_index": 0}),
+            doc_index.index_entry("u3", {"adr_number": "0008"}),
+        ])
+        found = doc_index.lookup(ADR, ["0007", "0009"])
+        assert list(found) == ["0007"]
+        assert [row["chunk_uuid"] for row in found["0007"]] == ["u1", "u2"]
+
+    def test_replace_collection_drops_stale_entries(self, db_path):
+        doc_index.replace_collection(ADR, [doc_index.index_entry("old", {"adr_number": "0001"})])
+        doc_index.replace_collection(ADR, [doc_index.index_entry("new", {"adr_number": "0001"})])
+        assert [r["chunk_uuid"] for r in doc_index.lookup(ADR, ["0001"])["0001"]] == ["new"]
+
+    def test_lookup_without_table(self, db_path):
+        assert doc_index.lookup(ADR, ["0001"]) == {}
+
+    def test_entry_without_number_skipped(self):
+        assert doc_index.index_entry("u", {"title": "Template"}) is None
+
+
+class TestExactReferenceFetch:
+    def test_fetches_only_cited_documents(self, store, monkeypatch):
+        client, _ = store
+        calls = _spy_fetches(client, monkeypatch)
+
+        docs = GenerationPipeline(client)._fetch_adrs(["ADR.1", "ADR.90"])
+
+        assert [d["adr_number"] for d in docs] == ["0001", "0090"]
+        assert docs[1]["content"] == "ADR 0090 chunk 0\n\nADR 0090 chunk 1"
+        # One fetch by id, returning the three cited chunks (DAR excluded)
+        assert len(calls) == 1
+        assert calls[0][0].target == "_id" and calls[0][1] == 3
+
+    def test_falls_back_to_exact_filter_when_index_missing(self, store, db_path, monkeypatch):
+        client, _ = store
+        db_path.unlink()
+        calls = _spy_fetches(client, monkeypatch)
+
+        docs = GenerationPipeline(client)._fetch_adrs(["ADR.1", "ADR.90"])
+
+        assert [d["adr_number"] for d in docs] == ["0001", "0090"]
+        assert len(calls) == 1 and calls[0][1] == 4  # ADR.90's DAR filtered in Python
+
+    def test_reingest_replaces_entries(self, store):
+        client, pipeline = store
+        client.collections.delete(ADR)
+        CollectionManager(client).create_all_collections()
+        pipeline._doc_index_entries = {}
+        pipeline._insert_batch_with_embeddings(
+            client.collections.get(ADR), [_adr(1, title="Renamed")], "adr_chunked", "full_text",
+        )
+        pipeline._write_doc_index([])
+
+        assert doc_index.lookup(ADR, ["0090"]) == {}
+        assert [d["title"] for d in GenerationPipeline(client)._fetch_adrs(["ADR.1"])] == ["Renamed"]
+
+    def test_failed_collection_keeps_previous_index(self, store):
+        _, pipeline = store
+        pipeline._doc_index_entries = {}
+        pipeline._write_doc_index(["adr: boom"])
+        assert "0090" in doc_index.lookup(ADR, ["0090"])
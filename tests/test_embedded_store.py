@@ -0,0 +1,324 @@
+"""Tests for the embedded retrieval backend (``aion.ingestion.embedded_store``).
+
+The backend stands in for the Weaviate client, so the tests drive it the
+way production does: ``CollectionManager`` creates the schema,
+``DataIngestionPipeline`` ingests the repo's ADRs and principles, and the
+unchanged ``RAGToolkit`` searches and lists on top. BM25 and hybrid
+fusion are checked against straightforward reference implementations.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import statistics
+import time
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from weaviate.classes.config import DataType, Property, Tokenization  # noqa: E402
+from weaviate.classes.data import DataObject  # noqa: E402
+from weaviate.classes.query import Filter  # noqa: E402
+
+from aion.config import settings  # noqa: E402
+from aion.ingestion.collections import CollectionManager  # noqa: E402
+from aion.ingestion.embedded_store import (  # noqa: E402
+    BM25_B,
+    BM25_K1,
+    EmbeddedClient,
+    tokenize,
+)
+
+_DIM = 64
+
+
+def _embed(text: str) -> list[float]:
+    """Deterministic hashed bag-of-words embedding."""
+    vec = [0.0] * _DIM
+    for token in tokenize(text):
+        vec[int(hashlib.md5(token.encode()).hexdigest(), 16) % _DIM] += 1.0
+    return vec
+
+
+def _make_collection(client, name="Docs"):
+    return client.collections.create(
+        name=name,
+        properties=[
+            Property(name="title", data_type=DataType.TEXT, tokenization=Tokenization.WORD),
+            Property(name="content", data_type=DataType.TEXT, tokenization=Tokenization.WORD),
+            Property(name="doc_type", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+            Property(name="number", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+        ],
+    )
+
+
+_DOCS = [
+    ("Use TLS everywhere", "Encrypt all traffic between services with TLS.", "adr", "0001"),
+    ("Event sourcing", "Store state changes as an append-only event log.", "adr", "0002"),
+    ("Decision Approval Record", "Approval table for ADR 0002.", "adr_approval", "0002"),
+    ("Data ownership", "Every dataset has exactly one owning team.", "principle", "0010"),
+    ("Eventual consistency", "Services tolerate eventual consistency of events.", "principle", "0011"),
+    ("Template", "Fill in context, decision and consequences.", "template", ""),
+]
+
+
+@pytest.fixture
+def docs(tmp_path):
+    client = EmbeddedClient(tmp_path / "index")
+    coll = _make_collection(client)
+    result = coll.data.insert_many([
+        DataObject(
+            properties={"title": t, "content": c, "doc_type": d, "number": n},
+            vector=_embed(f"{t} {c}"),
+        )
+        for t, c, d, n in _DOCS
+    ])
+    assert not result.has_errors
+    return client, coll
+
+
+# ---------------------------------------------------------------------------
+# Reference implementations
+# ---------------------------------------------------------------------------
+
+def _reference_bm25(query: str, texts: list[str]) -> list[float]:
+    docs = [tokenize(t) for t in texts]
+    avgdl = sum(map(len, docs)) / len(docs)
+    scores = []
+    for tokens in docs:
+        tf = Counter(tokens)
+        score = 0.0
+        for term in dict.fromkeys(tokenize(query)):
+            n = sum(term in d for d in docs)
+            if not n:
+                continue
+            idf = math.log(1 + (len(docs) - n + 0.5) / (n + 0.5))
+            f = tf[term]
+            score += idf * f * (BM25_K1 + 1) / (f + BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / avgdl))
+        scores.append(score)
+    return scores
+
+
+class TestSearch:
+    def test_bm25_matches_reference(self, docs):
+        _, coll = docs
+        query = "event consistency services"
+        expected = _reference_bm25(query, [f"{t} {c}" for t, c, *_ in _DOCS])
+        got = {o.properties["title"]: o.metadata.score for o in coll.query.bm25(query, limit=10).objects}
+        ranked = sorted(
+            ((s, t) for s, (t, *_) in zip(expected, _DOCS) if s > 0), key=lambda x: -x[0],
+        )
+        assert list(got) == [t for _, t in ranked]
+        # Normalized (relative) score: best = 1, worst = 0
+        assert max(got.values()) == pytest.approx(1.0) and min(got.values()) == pytest.approx(0.0)
+
+    def test_alpha_one_is_pure_cosine(self, docs):
+        _, coll = docs
+        qv = _embed("encrypt traffic")
+        objs = coll.query.hybrid(query="irrelevant words", vector=qv, alpha=1.0, limit=6).objects
+        q = np.asarray(qv) / np.linalg.norm(qv)
+        cos = {
+            t: float(np.dot(q, np.asarray(_embed(f"{t} {c}")) / np.linalg.norm(_embed(f"{t} {c}"))))
+            for t, c, *_ in _DOCS
+        }
+        assert [o.properties["title"] for o in objs] == sorted(cos, key=lambda t: -cos[t])
+        assert objs[0].metadata.distance == pytest.approx(1 - cos[objs[0].properties["title"]], abs=1e-6)
+
+    def test_hybrid_is_weighted_relative_score_fusion(self, docs):
+        _, coll = docs
+        query, qv, alpha = "event log", _embed("event log"), 0.4
+        vec = {o.properties["title"]: o.metadata.score
+               for o in coll.query.hybrid(query=query, vector=qv, alpha=1.0, limit=10).objects}
+        kw = {o.properties["title"]: o.metadata.score for o in coll.query.bm25(query, limit=10).objects}
+        fused = coll.query.hybrid(query=query, vector=qv, alpha=alpha, limit=10).objects
+        for obj in fused:
+            title = obj.properties["title"]
+            assert obj.metadata.score == pytest.approx(alpha * vec.get(title, 0) + (1 - alpha) * kw.get(title, 0))
+        scores = [o.metadata.score for o in fused]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_no_vector_degrades_to_keyword(self, docs):
+        _, coll = docs
+        hybrid = coll.query.hybrid(query="dataset team", vector=None, alpha=0.7, limit=3).objects
+        bm25 = coll.query.bm25("dataset team", limit=3).objects
+        assert [o.uuid for o in hybrid] == [o.uuid for o in bm25]
+        assert hybrid[0].properties["title"] == "Data ownership"
+
+    @pytest.mark.parametrize("flt, titles", [
+        (Filter.by_property("doc_type").equal("adr"), {"Use TLS everywhere", "Event sourcing"}),
+        (Filter.by_property("number").greater_or_equal("0002") & Filter.by_property("number").less_or_equal("0010"),
+         {"Event sourcing", "Decision Approval Record", "Data ownership"}),
+        (Filter.by_property("doc_type").not_equal("adr") & Filter.by_property("doc_type").not_equal("template"),
+         {"Decision Approval Record", "Data ownership", "Eventual consistency"}),
+        (Filter.by_property("doc_type").equal("template") | Filter.by_property("title").like("event*"),
+         {"Template", "Event sourcing", "Eventual consistency"}),
+        (Filter.not_(Filter.by_property("doc_type").contains_any(["adr", "principle"])),
+         {"Decision Approval Record", "Template"}),
+    ])
+    def test_filters(self, docs, flt, titles):
+        _, coll = docs
+        fetched = {o.properties["title"] for o in coll.query.fetch_objects(filters=flt, limit=50).objects}
+        assert fetched == titles
+        searched = coll.query.hybrid(query="event", vector=_embed("event"), alpha=0.5, filters=flt, limit=50)
+        assert {o.properties["title"] for o in searched.objects} <= titles
+
+    def test_return_properties_and_stats(self, docs):
+        client, coll = docs
+        objs = coll.query.fetch_objects(limit=2, return_properties=["title"]).objects
+        assert [o.properties for o in objs] == [{"title": "Use TLS everywhere"}, {"title": "Event sourcing"}]
+        assert coll.aggregate.over_all(total_count=True).total_count == len(_DOCS)
+        assert [p.name for p in coll.config.get().properties] == ["title", "content", "doc_type", "number"]
+
+    def test_include_vector(self, docs):
+        _, coll = docs
+        assert coll.query.fetch_objects(limit=1).objects[0].vector is None
+        obj = coll.query.fetch_objects(limit=1, include_vector=True).objects[0]
+        assert len(obj.vector["default"]) == _DIM
+        assert math.isclose(sum(v * v for v in obj.vector["default"]), 1.0, rel_tol=1e-5)
+
+    def test_dimension_mismatch_reported_per_object(self, docs):
+        _, coll = docs
+        result = coll.data.insert_many([DataObject(properties={"title": "x"}, vector=[1.0, 0.0])])
+        assert result.has_errors and "dimension" in result.errors[0]
+        assert coll.aggregate.over_all().total_count == len(_DOCS)
+
+
+class TestPersistence:
+    def test_round_trip_memory_mapped(self, docs, tmp_path):
+        client, coll = docs
+        before = [o.uuid for o in coll.query.hybrid(query="event", vector=_embed("event"), limit=4).objects]
+        client.close()
+
+        reopened = EmbeddedClient(tmp_path / "index")
+        assert reopened.collections.exists("Docs")
+        again = reopened.collections.get("Docs")
+        assert isinstance(again._vectors, np.memmap)
+        assert [o.uuid for o in again.query.hybrid(query="event", vector=_embed("event"), limit=4).objects] == before
+
+        # Appends after reopening are searchable and persisted too
+        again.data.insert_many([DataObject(properties={"title": "Late", "content": "zebra"}, vector=_embed("zebra"))])
+        assert again.query.bm25("zebra").objects[0].properties["title"] == "Late"
+        reopened.close()
+        assert EmbeddedClient(tmp_path / "index").collections.get("Docs").aggregate.over_all().total_count == 7
+
+    def test_delete(self, docs):
+        client, _ = docs
+        client.close()
+        client.collections.delete("Docs")
+        assert not client.collections.exists("Docs")
+
+
+def test_get_weaviate_client_selects_embedded(monkeypatch, tmp_path):
+    from aion.ingestion.client import get_weaviate_client
+
+    monkeypatch.setattr(settings, "retrieval_backend", "embedded")
+    monkeypatch.setattr(settings, "embedded_index_path", tmp_path / "idx")
+    client = get_weaviate_client()
+    assert isinstance(client, EmbeddedClient) and client.path == tmp_path / "idx"
+
+
+# ---------------------------------------------------------------------------
+# End to end: ingestion pipeline → unchanged RAGToolkit
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def ingested(tmp_path_factory):
+    from aion.ingestion import ingestion
+    from aion.tools import rag_search
+
+    adr_path = settings.resolve_path(settings.markdown_path) / "decisions"
+    if not adr_path.exists():
+        pytest.skip(f"{adr_path} not present")
+
+    mp = pytest.MonkeyPatch()
+    mp.setattr(ingestion, "embed_texts", lambda texts: [_embed(t) for t in texts])
+    mp.setattr(rag_search, "embed_text", _embed)
+    mp.setattr(settings, "ingestion_workers", 1)
+
+    path = tmp_path_factory.mktemp("embedded") / "index"
+    client = EmbeddedClient(path)
+    CollectionManager(client).create_all_collections()
+    pipeline = ingestion.DataIngestionPipeline(client)
+    counts = (pipeline._ingest_adrs_chunked(batch_size=20), pipeline._ingest_principles_chunked(batch_size=20))
+    client.close()
+
+    # Reopen from disk, as a fresh process would
+    yield rag_search.RAGToolkit(EmbeddedClient(path)), counts
+    mp.undo()
+
+
+class TestRAGToolkitOnEmbedded:
+    def test_ingested(self, ingested):
+        toolkit, (adr_chunks, pcp_chunks) = ingested
+        assert adr_chunks > 0 and pcp_chunks > 0
+        stats = toolkit.get_collection_stats()
+        assert stats["ArchitecturalDecision"] == adr_chunks
+        assert stats["Principle"] == pcp_chunks
+        assert stats["PolicyDocument"] == 0
+
+    def test_list_adrs_and_principles(self, ingested):
+        toolkit, _ = ingested
+        adrs = toolkit.list_adrs()
+        assert adrs and len({a["file_path"] for a in adrs}) == len(adrs)
+        assert not any(a["title"].startswith("Decision Approval Record") for a in adrs)
+        principles = toolkit.list_principles()
+        assert principles and all(p["principle_number"] for p in principles)
+
+    def test_exact_and_range_lookup(self, ingested):
+        toolkit, _ = ingested
+        number = toolkit.list_adrs()[1]["adr_number"]
+        exact = toolkit.search_architecture_decisions("x", doc_refs=[f"ADR.{number}"])
+        assert {r["adr_number"] for r in exact} == {number}
+        ranged = toolkit.search_principles("x", doc_refs=["PCP.10", "PCP.12"])
+        assert ranged and all(10 <= int(r["principle_number"]) <= 12 for r in ranged)
+
+    def test_hybrid_search_finds_title(self, ingested):
+        toolkit, _ = ingested
+        target = toolkit.list_principles()[3]
+        results = toolkit.search_principles(target["title"])
+        assert results
+        assert target["title"] in [r["title"] for r in results]
+
+    def test_list_dars(self, ingested):
+        toolkit, _ = ingested
+        dars = toolkit.list_dars()
+        assert all(d["dar_source"] in ("ADR", "PCP") for d in dars)
+
+
+@pytest.mark.benchmark
+def test_hybrid_latency_3000_chunks(tmp_path):
+    rng = random.Random(11)
+    vocab = [f"term{i}" for i in range(2_000)]
+    client = EmbeddedClient(tmp_path / "bench")
+    coll = _make_collection(client)
+    dim = 768
+    vectors = np.random.default_rng(11).standard_normal((3_000, dim)).astype(np.float32)
+    coll.data.insert_many([
+        DataObject(
+            properties={
+                "title": " ".join(rng.choices(vocab, k=6)),
+                "content": " ".join(rng.choices(vocab, k=150)),
+                "doc_type": rng.choice(["adr", "principle", "template"]),
+                "number": f"{i:04d}",
+            },
+            vector=vectors[i],
+        )
+        for i in range(3_000)
+    ])
+    client.close()
+    coll = EmbeddedClient(tmp_path / "bench").collections.get("Docs")
+    flt = Filter.by_property("doc_type").not_equal("template")
+    query_vec = vectors[42] + 0.1
+    coll.query.hybrid(query="term1 term2 term3", vector=query_vec, filters=flt, limit=8)  # warm indexes
+
+    timings = []
+    for _ in range(200):
+        t0 = time.perf_counter()
+        coll.query.hybrid(query="term1 term2 term3", vector=query_vec, alpha=0.6, filters=flt, limit=8)
+        timings.append(time.perf_counter() - t0)
+    median_ms = statistics.median(timings) * 1000
+    print(f"\nembedded hybrid (3,000 x {dim}, filtered): median {median_ms:.3f} ms")
+    assert median_ms < 5
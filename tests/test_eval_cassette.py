@@ -0,0 +1,238 @@
+"""Tests for the evaluation cassette (record/replay) and concurrent runners."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from aion.evaluation import RAGEvaluator
+from aion.evaluation import test_runner as runner
+from aion.evaluation.cassette import (
+    Cassette,
+    CassetteMissError,
+    StageTimings,
+    http_stage,
+    percentiles,
+)
+from aion.evaluation.evaluator import ProviderResult
+from aion.tools.rag_search import RAGToolkit
+
+
+@pytest.fixture
+def fake_transports(monkeypatch):
+    """Replace the real httpx transports with counters that echo the request."""
+    calls = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        body = json.loads(request.content or b"null")
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json", "x-request-id": "secret"},
+            json={"echo": body, "n": len(calls)},
+        )
+
+    def handle_request(self, request):
+        return respond(request)
+
+    async def handle_async_request(self, request):
+        return respond(request)
+
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", handle_request)
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request)
+    return calls
+
+
+class TestPercentiles:
+    def test_interpolates(self):
+        assert percentiles(list(range(101))) == {"count": 101, "p50": 50, "p95": 95, "p99": 99}
+        assert percentiles([40, 0, 10]) == {"count": 3, "p50": 10, "p95": 37.0, "p99": 39.4}
+
+    def test_single_and_empty(self):
+        assert percentiles([7]) == {"count": 1, "p50": 7, "p95": 7, "p99": 7}
+        assert percentiles([]) == {"count": 0, "p50": None, "p95": None, "p99": None}
+
+    def test_stage_timings(self):
+        timings = StageTimings()
+        for ms in (10, 20, 30):
+            timings.record("llm", ms)
+        timings.record("retrieval", 5)
+        summary = timings.summary()
+        assert list(summary) == ["llm", "retrieval"]
+        assert summary["llm"]["p50"] == 20
+
+    def test_http_stage(self):
+        assert http_stage("http://localhost:11434/api/embed") == "embedding"
+        assert http_stage("https://api.openai.com/v1/embeddings") == "embedding"
+        assert http_stage("https://api.openai.com/v1/chat/completions") == "llm"
+        assert http_stage("http://localhost:11434/api/chat") == "llm"
+        assert http_stage("http://localhost:8080/v1/meta") == "http"
+
+
+class TestHttpRecordReplay:
+    async def test_record_then_replay_offline(self, tmp_path, fake_transports):
+        path = tmp_path / "eval.cassette.json"
+
+        with Cassette(path, mode="record") as cassette:
+            async with httpx.AsyncClient() as client:
+                first = await client.post("http://llm:1/v1/chat/completions", json={"q": 1, "m": "x"})
+                second = await client.post("http://llm:1/v1/chat/completions", json={"m": "x", "q": 1})
+            embed = httpx.post("http://ollama:2/api/embed", json={"input": "hi"})
+        assert len(fake_transports) == 3
+        assert cassette.timings.summary()["llm"]["count"] == 2
+
+        saved = path.read_text()
+        assert "x-request-id" not in saved and "secret" not in saved
+
+        fake_transports.clear()
+        with Cassette(path, mode="replay") as cassette:
+            # Different host, reordered JSON keys: same recordings, in order
+            async with httpx.AsyncClient() as client:
+                r1 = await client.post("http://other:9/v1/chat/completions", json={"m": "x", "q": 1})
+                r2 = await client.post("http://other:9/v1/chat/completions", json={"q": 1, "m": "x"})
+            r3 = httpx.post("http://ollama:2/api/embed", json={"input": "hi"})
+
+        assert fake_transports == []
+        assert (r1.json(), r2.json(), r3.json()) == (first.json(), second.json(), embed.json())
+        assert r1.json()["n"] == 1 and r2.json()["n"] == 2
+        assert cassette.timings.summary()["embedding"]["count"] == 1
+
+    def test_replay_miss_raises(self, tmp_path, fake_transports):
+        path = tmp_path / "c.json"
+        with Cassette(path, mode="record"):
+            httpx.post("http://llm/v1/chat/completions", json={"q": "recorded"})
+
+        with Cassette(path, mode="replay"):
+            httpx.post("http://llm/v1/chat/completions", json={"q": "recorded"})
+            with pytest.raises(CassetteMissError):
+                httpx.post("http://llm/v1/chat/completions", json={"q": "recorded"})
+            with pytest.raises(CassetteMissError):
+                httpx.post("http://llm/v1/chat/completions", json={"q": "new"})
+        assert fake_transports == [("POST", "/v1/chat/completions")]
+
+    def test_off_mode_times_without_recording(self, tmp_path, fake_transports):
+        with Cassette() as cassette:
+            httpx.get("http://llm/v1/models")
+        assert cassette.timings.summary()["http"]["count"] == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_patches_removed_on_exit(self, tmp_path, fake_transports):
+        before = httpx.HTTPTransport.handle_request
+        tool_before = RAGToolkit.list_adrs
+        with Cassette(tmp_path / "c.json", mode="record"):
+            assert httpx.HTTPTransport.handle_request is not before
+            with pytest.raises(RuntimeError):
+                Cassette().__enter__()
+        assert httpx.HTTPTransport.handle_request is before
+        assert RAGToolkit.list_adrs is tool_before
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            Cassette("x.json", mode="rewind")
+        with pytest.raises(ValueError):
+            Cassette(mode="replay")
+
+
+class TestToolkitRecordReplay:
+    def test_retrieval_replayed_without_weaviate(self, tmp_path, monkeypatch):
+        rows = [{"title": "ADR.12", "content": "Use CIM"}]
+        search = MagicMock(return_value=rows)
+        monkeypatch.setattr(RAGToolkit, "search_architecture_decisions", search)
+        path = tmp_path / "c.json"
+
+        with Cassette(path, mode="record"):
+            toolkit = RAGToolkit(MagicMock())
+            assert toolkit.search_architecture_decisions("cim", limit=3) == rows
+        assert search.call_count == 1
+
+        with Cassette(path, mode="replay") as cassette:
+            replayed = RAGToolkit(None).search_architecture_decisions("cim", limit=3)
+            with pytest.raises(CassetteMissError):
+                RAGToolkit(None).search_architecture_decisions("cim", limit=4)
+        assert replayed == rows
+        assert search.call_count == 1
+        assert cassette.timings.summary()["retrieval"]["count"] == 2
+
+
+class TestConcurrentRunners:
+    async def test_evaluator_run_all_bounded_and_ordered(self, monkeypatch):
+        cases = [
+            {"id": f"c{i}", "question": f"q{i}", "category": "adr", "required_terms": []}
+            for i in range(6)
+        ]
+        evaluator = RAGEvaluator(test_cases=cases)
+        in_flight = peak = 0
+
+        async def fake_query(self, question, provider, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later questions finish first
+            await asyncio.sleep(0.01 * (6 - int(question[1:])))
+            in_flight -= 1
+            return ProviderResult(provider=provider, question=question, total_latency_ms=int(question[1:]))
+
+        monkeypatch.setattr(RAGEvaluator, "run_single_query", fake_query)
+        results = await evaluator.run_all(concurrency=2)
+
+        assert [r.test_case_id for r in results] == [c["id"] for c in cases]
+        assert peak == 4  # 2 test cases x 2 providers
+        pct = evaluator.get_summary()["openai"]["latency_percentiles"]["total"]
+        assert pct["count"] == 6 and pct["p50"] == 2.5
+
+    async def test_run_questions_ordered_and_timed(self, monkeypatch):
+        async def fake_query(question, debug=False, verbose=False):
+            await asyncio.sleep(0.001 * (5 - int(question[1:])))
+            return {"response": f"answer {question}", "latency_ms": 10, "error": None, "sources": []}
+
+        monkeypatch.setattr(runner, "query_rag", fake_query)
+        questions = [
+            {"id": f"Q{i}", "question": f"q{i}", "category": "ADR", "difficulty": "Easy",
+             "expected_keywords": ["answer"]}
+            for i in range(5)
+        ]
+        timings = StageTimings()
+
+        results = await runner._run_questions(questions, 3, timings)
+
+        assert [r["id"] for r in results] == [q["id"] for q in questions]
+        assert all(r["score"] == "✅" for r in results)
+        assert timings.summary()["total"]["count"] == 5
+
+    def test_suppress_output_reentrant(self, capfd):
+        with runner.suppress_output():
+            with runner.suppress_output():
+                print("hidden")
+                runner.progress("visible")
+            print("still hidden")
+        print("after")
+        out = capfd.readouterr().out
+        assert "hidden" not in out
+        assert "visible" in out and "after" in out
+
+    async def test_suppress_output_overlapping_tasks(self, capfd):
+        first_in, second_in, first_out = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+        async def first():
+            with runner.suppress_output():
+                first_in.set()
+                await second_in.wait()
+            first_out.set()
+
+        async def second():
+            await first_in.wait()
+            with runner.suppress_output():
+                second_in.set()
+                await first_out.wait()  # the block that redirected has exited
+                print("SHOULD BE SUPPRESSED")
+            print("after both")
+
+        await asyncio.gather(first(), second())
+        assert runner._suppress_depth == 0
+        with runner.suppress_output():
+            print("suppressed again")
+        out = capfd.readouterr().out
+        assert "SHOULD BE SUPPRESSED" not in out and "suppressed again" not in out
+        assert "after both" in out
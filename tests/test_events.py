@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import json
 import logging
+from dataclasses import asdict
 
 import pytest
 
@@ -138,6 +139,15 @@ class TestToSSE:
         roundtrip = Event.from_legacy_dict(payload)
         assert roundtrip == original
 
+    @pytest.mark.parametrize("event_type,kwargs", _VARIANT_FIXTURES)
+    def test_byte_identical_to_dict_serialisation(self, event_type, kwargs):
+        """The pre-encoded fragment path must produce exactly the bytes
+        ``json.dumps`` of the populated-field dict did.
+        """
+        e = Event(type=event_type, **{"rewritten_query": "ünïcode \"q\"", **kwargs})
+        payload = {k: v for k, v in asdict(e).items() if v is not None}
+        assert e.to_sse() == f"data: {json.dumps(payload)}\n\n"
+
 
 # ── from_legacy_dict: the migration bridge ───────────────────────────────────
 
@@ -0,0 +1,228 @@
+"""Tests for the background PostToolUse hook runner.
+
+Hooks are real ``/bin/sh -c`` commands appending to a log in tmp_path;
+the queue is a tmp SQLite file.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from aion.skills import hook_runner as runner_module
+from aion.skills.hook_runner import HookRunner, submit_post_tool_use
+from aion.skills.multi_registry import (
+    MultiPluginRegistry,
+    _reset_multi_registry_for_tests,
+)
+from aion.skills.plugin import load_plugin_manifest
+
+
+def _plugin(root: Path, name: str, command: str) -> Path:
+    plugin_dir = root / ".ainstein-plugin"
+    plugin_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "name": name, "runtime": "ainstein", "version": "0.0.1",
+        "hooks": {"PostToolUse": [{
+            "matcher": "Write",
+            "hooks": [{"type": "command", "command": command}],
+        }]},
+    }
+    (plugin_dir / "plugin.json").write_text(json.dumps(manifest), encoding="utf-8")
+    (plugin_dir / "skills-registry.yaml").write_text("skills: []\n", encoding="utf-8")
+    (root / "skills").mkdir(exist_ok=True)
+    return root
+
+
+def _install(*roots: Path) -> None:
+    import aion.skills.multi_registry as mr
+
+    _reset_multi_registry_for_tests()
+    multi = MultiPluginRegistry()
+    for root in roots:
+        multi.add_plugin_from_object(load_plugin_manifest(root))
+    multi.load()
+    mr._global_multi = multi
+
+
+def _log_hook(log: Path, tag: str, sleep: float = 0) -> str:
+    """Append ``<tag> <file_path> start|end`` lines around an optional sleep."""
+    fp = "$(python3 -c 'import json,sys; print(json.load(sys.stdin)[\"tool_input\"][\"file_path\"])')"
+    return (
+        f'fp={fp}; echo "{tag} $fp start" >> {log}; '
+        f'sleep {sleep}; echo "{tag} $fp end" >> {log}'
+    )
+
+
+@pytest.fixture
+def runner(tmp_path):
+    r = HookRunner()
+    yield r
+    r.shutdown()
+    _reset_multi_registry_for_tests()
+
+
+class TestHookRunner:
+    def test_enqueue_returns_before_hook_finishes(self, tmp_path, runner):
+        log = tmp_path / "hooks.log"
+        _install(_plugin(tmp_path / "p", "slow", _log_hook(log, "slow", sleep=0.5)))
+        runner.init(tmp_path / "q.db", workers=2)
+
+        start = time.perf_counter()
+        job_ids = runner.enqueue("a.html")
+        assert time.perf_counter() - start < 0.3
+        assert len(job_ids) == 1
+
+        assert runner.wait_idle()
+        job = runner.get_job(job_ids[0])
+        assert job["status"] == "done"
+        assert job["plugin"] == "slow"
+        assert job["duration_ms"] >= 500
+        assert job["results"][0]["returncode"] == 0
+        assert "content" not in job
+        assert log.read_text().splitlines() == ["slow a.html start", "slow a.html end"]
+
+    def test_ordering_per_artifact_and_plugin_limit(self, tmp_path, runner):
+        log = tmp_path / "hooks.log"
+        _install(
+            _plugin(tmp_path / "a", "alpha", _log_hook(log, "alpha", sleep=0.1)),
+            _plugin(tmp_path / "b", "beta", _log_hook(log, "beta", sleep=0.1)),
+        )
+        runner.init(tmp_path / "q.db", workers=4, plugin_concurrency={"beta": 2})
+
+        for name in ("x.html", "y.html", "x.html", "y.html"):
+            runner.enqueue(name)
+        assert runner.wait_idle()
+
+        lines = log.read_text().splitlines()
+        alpha = [line for line in lines if line.startswith("alpha")]
+        # alpha has the default limit of 1: strictly one job at a time
+        assert all(
+            alpha[i].endswith("start") and alpha[i + 1].endswith("end")
+            for i in range(0, len(alpha), 2)
+        )
+        for fp in ("x.html", "y.html"):
+            beta = [line for line in lines if line.startswith(f"beta {fp}")]
+            # Saves of one artifact never overlap within a plugin
+            assert beta == [f"beta {fp} start", f"beta {fp} end"] * 2
+        # beta ran its two artifacts concurrently
+        beta_events = [line.split()[2] for line in lines if line.startswith("beta")]
+        assert beta_events[:2] == ["start", "start"]
+
+    def test_jobs_survive_restart(self, tmp_path, runner):
+        log = tmp_path / "hooks.log"
+        _install(_plugin(tmp_path / "p", "demo", _log_hook(log, "demo")))
+        db = tmp_path / "q.db"
+        runner.init(db, workers=1)
+        runner.shutdown()
+
+        # Queued while no worker runs, plus one interrupted mid-run
+        runner.enqueue("queued.html")
+        conn = sqlite3.connect(db)
+        conn.execute(
+            "INSERT INTO hook_jobs (plugin, ordering_key, tool_name, file_path, status, created_at) "
+            "VALUES ('demo', 'crashed.html', 'Write', 'crashed.html', 'running', 'x')"
+        )
+        conn.commit()
+        conn.close()
+
+        restarted = HookRunner()
+        restarted.init(db, workers=1)
+        try:
+            assert restarted.wait_idle()
+            assert restarted.stats()["counts"] == {"done": 2}
+        finally:
+            restarted.shutdown()
+        assert sorted(log.read_text().split()) == sorted(
+            "demo queued.html start demo queued.html end "
+            "demo crashed.html start demo crashed.html end".split()
+        )
+
+    def test_restart_requeues_only_expired_or_own_leases(self, tmp_path, runner):
+        log = tmp_path / "hooks.log"
+        _install(_plugin(tmp_path / "p", "demo", _log_hook(log, "demo")))
+        db = tmp_path / "q.db"
+        runner.init(db, workers=1)
+        runner.shutdown()
+
+        now = time.time()
+        conn = sqlite3.connect(db)
+        conn.executemany(
+            "INSERT INTO hook_jobs (plugin, ordering_key, tool_name, file_path, status, "
+            "created_at, owner, lease_expires_at) VALUES ('demo', ?, 'Write', ?, 'running', 'x', ?, ?)",
+            [
+                ("live.html", "live.html", "other-host:1", now + 60),
+                ("expired.html", "expired.html", "other-host:2", now - 1),
+                ("own.html", "own.html", runner._owner, now + 60),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        runner.init(db, workers=1)
+        assert runner.wait_idle(timeout=2) is False  # live.html still belongs to its owner
+        jobs = {j["file_path"]: j for j in runner.list_jobs()}
+        assert jobs["live.html"]["status"] == "running"
+        assert jobs["live.html"]["owner"] == "other-host:1"
+        assert jobs["expired.html"]["status"] == jobs["own.html"]["status"] == "done"
+        assert "demo live.html start" not in log.read_text()
+
+    def test_heartbeat_renews_lease_of_long_job(self, tmp_path, runner):
+        _install(_plugin(tmp_path / "p", "slow", "sleep 1.5"))
+        db = tmp_path / "q.db"
+        runner.init(db, workers=1, lease_seconds=1)
+
+        [job_id] = runner.enqueue("a.html")
+        assert runner.wait_idle()
+        job = runner.get_job(job_id)
+        # Without renewal the 1s lease would lapse and the job be rerun
+        assert (job["status"], job["attempts"]) == ("done", 1)
+
+    def test_finished_jobs_pruned(self, tmp_path, runner):
+        _install(_plugin(tmp_path / "p", "demo", "true"))
+        db = tmp_path / "q.db"
+        runner.init(db, workers=1, retention_days=1)
+        runner.shutdown()
+
+        conn = sqlite3.connect(db)
+        conn.executemany(
+            "INSERT INTO hook_jobs (plugin, ordering_key, tool_name, file_path, status, "
+            "created_at, finished_at) VALUES ('demo', ?, 'Write', ?, ?, 'x', ?)",
+            [
+                ("old.html", "old.html", "done", "2000-01-01T00:00:00"),
+                ("old-failed.html", "old-failed.html", "failed", "2000-01-01T00:00:00"),
+                ("new.html", "new.html", "done", "2999-01-01T00:00:00"),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        runner.init(db, workers=1, retention_days=1)
+        assert [j["file_path"] for j in runner.list_jobs()] == ["new.html"]
+
+    def test_failed_hook_recorded(self, tmp_path, runner):
+        _install(_plugin(tmp_path / "p", "demo", "echo boom >&2; exit 3"))
+        runner.init(tmp_path / "q.db", workers=1)
+
+        [job_id] = runner.enqueue("a.html")
+        assert runner.wait_idle()
+
+        job = runner.get_job(job_id)
+        assert job["status"] == "failed"
+        assert job["results"][0]["returncode"] == 3
+        assert job["results"][0]["stderr"].strip() == "boom"
+        assert runner.list_jobs(status="failed")[0]["id"] == job_id
+
+    def test_submit_fires_inline_when_not_running(self, tmp_path, monkeypatch):
+        log = tmp_path / "hooks.log"
+        _install(_plugin(tmp_path / "p", "demo", _log_hook(log, "demo")))
+        monkeypatch.setattr(runner_module, "hook_runner", HookRunner())
+        try:
+            assert submit_post_tool_use("inline.html") == []
+            assert log.read_text().splitlines() == ["demo inline.html start", "demo inline.html end"]
+        finally:
+            _reset_multi_registry_for_tests()
@@ -0,0 +1,257 @@
+"""Tests for LLM admission control and priority scheduling (aion.llm_scheduler)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aion.config import settings
+from aion.llm_scheduler import LLMShedError, Priority, llm_scheduler, scheduled_model
+
+
+@pytest.fixture(autouse=True)
+def _reset_scheduler():
+    llm_scheduler.reset()
+    yield
+    llm_scheduler.reset()
+
+
+async def _hold(provider: str, priority: Priority, release: asyncio.Event, order: list | None = None):
+    async with llm_scheduler.slot(provider, priority):
+        if order is not None:
+            order.append(priority)
+        await release.wait()
+
+
+async def _call(provider: str, priority: Priority, order: list, **kwargs):
+    async with llm_scheduler.slot(provider, priority, **kwargs):
+        order.append(priority)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestAdmission:
+    async def test_waiters_granted_in_priority_order(self):
+        llm_scheduler.configure(providers={"ollama": {"concurrency": 1}})
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold("ollama", Priority.INTERACTIVE, release))
+        await _settle()
+
+        order: list[Priority] = []
+        tasks = [
+            asyncio.create_task(_call("ollama", p, order))
+            for p in (Priority.BACKGROUND, Priority.GATE, Priority.INTERACTIVE, Priority.CLASSIFICATION)
+        ]
+        await _settle()
+        assert llm_scheduler.snapshot()["providers"]["ollama"] == {
+            "limit": 1, "active": 1, "queued": 4, "rpm": None,
+        }
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert order == [Priority.INTERACTIVE, Priority.CLASSIFICATION, Priority.GATE, Priority.BACKGROUND]
+
+    async def test_providers_have_independent_lanes(self):
+        llm_scheduler.configure(providers={"ollama": {"concurrency": 1}})
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold("ollama", Priority.INTERACTIVE, release))
+        await _settle()
+
+        order: list[Priority] = []
+        await asyncio.wait_for(_call("openai", Priority.GATE, order), 1)
+        assert order == [Priority.GATE]
+        release.set()
+        await holder
+
+    async def test_token_bucket_spaces_requests(self):
+        llm_scheduler.configure(providers={"openai": {"concurrency": 4, "rpm": 600, "burst": 1}})
+        order: list[Priority] = []
+        start = time.monotonic()
+        await asyncio.gather(*(_call("openai", Priority.INTERACTIVE, order) for _ in range(3)))
+        # Burst of one, then one request per 100ms
+        assert time.monotonic() - start >= 0.18
+        assert llm_scheduler.snapshot()["providers"]["openai"]["rpm"] == 600
+
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        llm_scheduler.configure(providers={"ollama": {"concurrency": 1}})
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold("ollama", Priority.INTERACTIVE, release))
+        await _settle()
+
+        order: list[Priority] = []
+        waiter = asyncio.create_task(_call("ollama", Priority.INTERACTIVE, order))
+        await _settle()
+        waiter.cancel()
+        await _settle()
+        assert llm_scheduler.snapshot()["providers"]["ollama"]["queued"] == 0
+
+        release.set()
+        await holder
+        await asyncio.wait_for(_call("ollama", Priority.GATE, order), 1)
+        assert order == [Priority.GATE]
+
+    async def test_release_from_another_thread_wakes_waiter(self):
+        llm_scheduler.configure(providers={"ollama": {"concurrency": 1}})
+        held, release = threading.Event(), threading.Event()
+
+        def agent_thread():
+            async def run():
+                async with llm_scheduler.slot("ollama", Priority.INTERACTIVE):
+                    held.set()
+                    await asyncio.to_thread(release.wait)
+            asyncio.run(run())
+
+        thread = threading.Thread(target=agent_thread)
+        thread.start()
+        await asyncio.to_thread(held.wait)
+
+        order: list[Priority] = []
+        waiter = asyncio.create_task(_call("ollama", Priority.GATE, order))
+        await _settle()
+        assert order == []
+        release.set()
+        await asyncio.wait_for(waiter, 2)
+        thread.join()
+        assert order == [Priority.GATE]
+
+
+class TestShedding:
+    async def test_background_shed_while_interactive_over_budget(self):
+        llm_scheduler.configure(
+            providers={"ollama": {"concurrency": 1}}, interactive_budget_ms=50,
+        )
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold("ollama", Priority.GATE, release))
+        await _settle()
+
+        order: list[Priority] = []
+        background = asyncio.create_task(_call("ollama", Priority.BACKGROUND, order))
+        interactive = asyncio.create_task(_call("ollama", Priority.INTERACTIVE, order))
+        await asyncio.sleep(0.08)  # interactive now queued past its budget
+        assert llm_scheduler.snapshot()["overloaded"]
+
+        # New background work is refused outright...
+        with pytest.raises(LLMShedError):
+            await _call("ollama", Priority.BACKGROUND, order)
+
+        release.set()
+        await holder
+        await interactive
+        # ...and queued background work is shed instead of granted.
+        with pytest.raises(LLMShedError):
+            await background
+        assert order == [Priority.INTERACTIVE]
+
+        stats = llm_scheduler.snapshot()["priorities"]
+        assert stats["background"] == {
+            "requests": 0, "shed": 2, "queue_avg_ms": None, "queue_p95_ms": None, "queue_max_ms": 0.0,
+        }
+        assert stats["interactive"]["requests"] == 1
+        assert stats["interactive"]["queue_p95_ms"] >= 80
+
+        # The slow interactive wait is still in the p90 window
+        with pytest.raises(LLMShedError):
+            await _call("ollama", Priority.BACKGROUND, order)
+
+    async def test_background_shed_after_deadline(self):
+        llm_scheduler.configure(
+            providers={"ollama": {"concurrency": 1}}, background_deadline_ms=50,
+        )
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold("ollama", Priority.GATE, release))
+        await _settle()
+
+        with pytest.raises(LLMShedError):
+            await _call("ollama", Priority.BACKGROUND, [])
+        release.set()
+        await holder
+        assert llm_scheduler.snapshot()["providers"]["ollama"] == {
+            "limit": 1, "active": 0, "queued": 0, "rpm": None,
+        }
+
+    async def test_interactive_never_shed(self):
+        llm_scheduler.configure(interactive_budget_ms=0)
+        order: list[Priority] = []
+        for p in (Priority.INTERACTIVE, Priority.CLASSIFICATION, Priority.GATE):
+            await _call("openai", p, order)
+        assert len(order) == 3
+
+    async def test_summarizer_returns_none_when_shed(self, monkeypatch):
+        from aion.memory import summarizer
+
+        async def shed(prompt):
+            raise LLMShedError("shed")
+
+        monkeypatch.setattr(summarizer, "_call_llm", shed)
+        result = await summarizer.generate_rolling_summary(
+            "previous", [{"role": "user", "content": "hi"}],
+        )
+        assert result is None
+
+    async def test_turn_summary_falls_back_when_shed(self):
+        import aion.chat_ui as cui
+
+        llm_scheduler.configure(
+            providers={settings.effective_persona_provider: {"concurrency": 1}},
+            background_deadline_ms=20,
+        )
+        release = asyncio.Event()
+        holder = asyncio.create_task(
+            _hold(settings.effective_persona_provider, Priority.INTERACTIVE, release),
+        )
+        await _settle()
+
+        assert await cui._llm_summarize_turn("long answer") is None
+        assert llm_scheduler.snapshot()["priorities"]["background"]["shed"] == 1
+        release.set()
+        await holder
+
+
+class TestCallSites:
+    async def test_synthesis_stream_holds_interactive_slot(self, monkeypatch):
+        import httpx
+
+        from aion import generation
+
+        monkeypatch.setattr(settings, "rag_provider", "ollama")
+        seen = []
+
+        def handler(request):
+            seen.append(llm_scheduler.snapshot()["providers"]["ollama"]["active"])
+            return httpx.Response(200, text='{"response": "ok", "done": true}\n')
+
+        transport = httpx.MockTransport(handler)
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx, "AsyncClient", lambda **kw: real_client(transport=transport, **kw),
+        )
+
+        tokens = [t async for t in generation.stream_synthesis_response("q", "kb")]
+
+        assert "".join(tokens) == "ok"
+        assert seen == [1]
+        stats = llm_scheduler.snapshot()
+        assert stats["priorities"]["interactive"]["requests"] == 1
+        assert stats["providers"]["ollama"]["active"] == 0
+
+
+class TestScheduledModel:
+    async def test_agent_requests_take_slots(self):
+        pytest.importorskip("pydantic_ai")
+        from pydantic_ai import Agent
+        from pydantic_ai.models.test import TestModel
+
+        agent = Agent(scheduled_model(TestModel(), "ollama", Priority.INTERACTIVE))
+        await agent.run("hello")
+        async with agent.run_stream("hello") as result:
+            await result.get_output()
+
+        stats = llm_scheduler.snapshot()
+        assert stats["priorities"]["interactive"]["requests"] == 2
+        assert stats["providers"]["ollama"]["active"] == 0
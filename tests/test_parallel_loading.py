@@ -0,0 +1,121 @@
+"""Tests for parallel document loading (``aion.loaders.parallel``).
+
+The chunked loaders hand each file to a process pool. Ingestion must not
+be able to tell: same documents, same chunks, same order, and a file that
+fails is logged and skipped exactly as in the serial loop.
+"""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from aion.loaders import DocumentLoader, MarkdownLoader, parallel
+from aion.loaders.parallel import iter_ordered, resolve_workers
+
+_DOC = Path(__file__).resolve().parents[1] / "data" / "esa-main-artifacts" / "doc"
+_POLICIES = Path(__file__).resolve().parents[1] / "data" / "do-artifacts" / "policy_docs"
+
+# Fresh uuid4s per run; everything else must match
+_VOLATILE = {"chunk_id", "parent_chunk_id", "root_document_id", "created_at", "modified_at"}
+
+
+def _fingerprint(docs) -> list:
+    return [
+        (
+            doc.source_file,
+            doc.document_title,
+            [
+                {k: v for k, v in chunk.to_dict().items() if k not in _VOLATILE}
+                for chunk in doc.chunks
+            ],
+        )
+        for doc in docs
+    ]
+
+
+class TestIterOrdered:
+    def test_pool_preserves_order_and_returns_errors(self):
+        items = [str(i) for i in range(40)] + ["x"] + ["7"]
+        out = list(iter_ordered(int, items, workers=3))
+        assert [item for item, _, _ in out] == items
+        assert [r for _, r, e in out if e is None] == list(range(40)) + [7]
+        (bad,) = [(item, e) for item, _, e in out if e is not None]
+        assert bad[0] == "x" and isinstance(bad[1], ValueError)
+
+    def test_serial_matches_pool(self):
+        items = ["3", "1", "oops", "2"]
+        serial = [(i, r, type(e)) for i, r, e in iter_ordered(int, items, workers=1)]
+        pooled = [(i, r, type(e)) for i, r, e in iter_ordered(int, items, workers=2)]
+        assert serial == pooled
+
+    def test_early_stop(self):
+        gen = iter_ordered(int, [str(i) for i in range(100)], workers=2)
+        assert next(gen) == ("0", 0, None)
+        gen.close()
+
+    def test_falls_back_when_pool_unavailable(self, monkeypatch):
+        def no_pool(**kwargs):
+            raise OSError("no semaphores")
+
+        monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+        assert [r for _, r, _ in iter_ordered(int, ["1", "2"], workers=4)] == [1, 2]
+
+    def test_resolve_workers(self, monkeypatch):
+        monkeypatch.setattr(parallel.os, "cpu_count", lambda: 6)
+        assert resolve_workers(0) == resolve_workers(None) == 6
+        assert resolve_workers(1) == 1
+        assert resolve_workers(-3) == 1
+
+
+class TestMarkdownLoader:
+    @pytest.mark.parametrize("kind", ["decisions", "principles"])
+    def test_parallel_matches_serial(self, kind):
+        path = _DOC / kind
+        if not path.exists():
+            pytest.skip(f"{path} not present")
+        loader = MarkdownLoader(path)
+        load = loader.load_adrs_chunked if kind == "decisions" else loader.load_principles_chunked
+
+        serial = list(load(path, workers=1))
+        pooled = list(load(path, workers=4))
+
+        assert serial
+        assert _fingerprint(pooled) == _fingerprint(serial)
+
+    def test_failed_file_logged_and_skipped(self, tmp_path, caplog):
+        (tmp_path / "0001-first.md").write_text(
+            "---\ndct:\n  identifier: urn:uuid:one\n---\n# First\n\n## Context\n\nText.\n"
+        )
+        (tmp_path / "0002-broken.md").mkdir()  # read_text raises
+        (tmp_path / "0003-third.md").write_text("# Third\n\n## Decision\n\nMore text.\n")
+
+        with caplog.at_level(logging.ERROR, logger="aion.loaders.markdown_loader"):
+            docs = list(MarkdownLoader(tmp_path).load_adrs_chunked(tmp_path, workers=2))
+
+        assert [Path(d.source_file).name for d in docs] == ["0001-first.md", "0003-third.md"]
+        assert docs[0].chunks[0].metadata.dct_identifier == "urn:uuid:one"
+        assert "Error chunking ADR" in caplog.text and "0002-broken.md" in caplog.text
+
+    def test_frontmatter_failure_does_not_leak_previous_dct(self, tmp_path):
+        (tmp_path / "0001-a.md").write_text("---\ndct:\n  identifier: urn:uuid:a\n---\n# A\n\nBody.\n")
+        (tmp_path / "0002-b.md").write_text("---\n[unclosed\n---\n# B\n\nBody.\n")
+
+        docs = list(MarkdownLoader(tmp_path).load_adrs_chunked(tmp_path))
+
+        assert [d.chunks[0].metadata.dct_identifier for d in docs] == ["urn:uuid:a", ""]
+
+
+class TestDocumentLoader:
+    def test_parallel_matches_serial(self):
+        pytest.importorskip("docx")
+        if not _POLICIES.exists():
+            pytest.skip(f"{_POLICIES} not present")
+        loader = DocumentLoader(_POLICIES)
+
+        serial = list(loader.load_all_chunked(workers=1))
+        pooled = list(loader.load_all_chunked(workers=4))
+
+        assert serial
+        assert _fingerprint(pooled) == _fingerprint(serial)
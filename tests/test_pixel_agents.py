@@ -0,0 +1,96 @@
+"""Tests for the buffered Pixel Agents JSONL writer."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+from aion.pixel_agents import PixelAgentRegistry, _JsonlWriter
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reg = PixelAgentRegistry()
+    reg.init(str(tmp_path / "pixel"), flush_records=64, flush_interval=0.05)
+    yield reg
+    reg.shutdown()
+
+
+class TestPixelAgentWriter:
+    def test_records_written_in_order_off_the_request_path(self, registry):
+        path = registry._agents["rag_agent"]["path"]
+        registry.thinking("rag_agent", "Searching")
+        registry.tool_call("rag_agent", "search_adrs")
+        registry.tool_call("rag_agent", "search_principles")
+
+        assert path.read_text() == ""  # nothing written synchronously
+        assert _wait_for(lambda: len(path.read_text().splitlines()) == 4)
+        kinds = [r["message"]["content"][0]["type"] for r in _records(path)]
+        assert kinds == ["text", "tool_use", "tool_result", "tool_use"]
+        assert registry.stats()["flushes"] == 1
+
+    def test_idle_scheduled_without_timer_threads(self, registry):
+        path = registry._agents["rag_agent"]["path"]
+        threads_before = threading.active_count()
+        start = time.monotonic()
+        for key in ("rag_agent", "vocabulary_agent", "principle_agent"):
+            registry.speech(key, "hi")
+            registry.idle(key, delay=0.2)
+        assert threading.active_count() == threads_before
+        assert registry.stats()["scheduled"] == 3
+
+        assert _wait_for(lambda: registry.stats()["scheduled"] == 0 and registry.stats()["buffered"] == 0)
+        assert _wait_for(lambda: len(path.read_text().splitlines()) == 2)
+        assert time.monotonic() - start >= 0.2
+        assert _records(path)[-1] == {"type": "system", "subtype": "turn_duration"}
+
+    def test_flush_on_size(self, tmp_path):
+        writer = _JsonlWriter(flush_records=3, flush_interval=60)
+        writer.start()
+        try:
+            path = tmp_path / "a.jsonl"
+            for i in range(3):
+                writer.put(path, {"i": i})
+            assert _wait_for(lambda: path.exists() and len(path.read_text().splitlines()) == 3)
+        finally:
+            writer.stop()
+
+    def test_overflow_drops_instead_of_blocking(self, tmp_path):
+        writer = _JsonlWriter(buffer_size=2, flush_records=100, flush_interval=60)
+        path = tmp_path / "a.jsonl"
+        for i in range(5):
+            writer.put(path, {"i": i})
+        assert writer.stats()["dropped"] == 3
+
+        writer.start()
+        writer.stop()  # stop writes what was buffered
+        assert _records(path) == [{"i": 0}, {"i": 1}]
+        assert writer.stats()["written"] == 2
+
+    def test_shutdown_removes_files(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        reg = PixelAgentRegistry()
+        reg.init(str(tmp_path / "pixel"))
+        path = reg._agents["rag_agent"]["path"]
+        reg.speech("rag_agent", "bye")
+        reg.idle("rag_agent", delay=10)
+        reg.shutdown()
+        assert not path.exists()
+        assert reg.stats()["scheduled"] == 0
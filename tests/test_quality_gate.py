@@ -3,22 +3,30 @@
 Tests cover the deterministic, code-level components:
 - Abstention overflow detection and truncation
 - Citation extraction and recovery
-- Token ceiling skip logic
+- Token ceiling skip logic and the local proportionality scorer
 
-LLM-dependent components (evaluation, condensation) are not tested here
-as they require live model access.
+LLM calls are replaced by a scripted fake to check how the sequential,
+fused and speculative modes schedule them; verdict quality itself needs
+live model access and is not tested here.
 """
 
 import asyncio
+from queue import Queue
 
 import pytest
 
+from aion.agents import quality_gate
 from aion.agents.quality_gate import (
     ResponseQualityGate,
+    _classify_query,
     _count_list_items,
     _estimate_tokens,
     _extract_citations,
+    _parse_fused,
+    _score_proportionality,
+    gate_stats,
 )
+from aion.events import Event
 
 
 class TestEstimateTokens:
@@ -334,3 +342,246 @@ class TestCitationRecovery:
         condensed = "ADR.29 mandates X, while PCP.10 requires Y."
         missing = _extract_citations(original) - _extract_citations(condensed)
         assert missing == set()
+
+
+class TestSpeculativeMode:
+    """Streamed answers get a ``replace`` event when the gate reshapes them."""
+
+    RESPONSE = (
+        "ADR.29 contains no budget information.\n\n"
+        "- Operational complexity (IdP management)\n"
+        "- Dependency on Authorization Server\n"
+        "- Migration effort\n"
+        "- Key rotation overhead\n"
+    )
+
+    @pytest.fixture(autouse=True)
+    def abstention_config(self, monkeypatch):
+        monkeypatch.setattr(
+            "aion.agents.quality_gate._get_quality_gate_config",
+            lambda: {
+                "enabled": True,
+                "abstention_cleanup": {
+                    "enabled": True,
+                    "item_threshold": 2,
+                    "negation_signals": ["contains no"],
+                },
+            },
+        )
+
+    def _evaluate(self, response, already_streamed):
+        queue = Queue()
+        result, meta = asyncio.run(ResponseQualityGate().evaluate(
+            response=response,
+            query="What is the budget in ADR.29?",
+            complexity="simple",
+            event_queue=queue,
+            agent_label="RAG Agent",
+            already_streamed=already_streamed,
+        ))
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return result, meta, events
+
+    def test_reshaped_response_is_replaced(self):
+        result, meta, events = self._evaluate(self.RESPONSE, already_streamed=True)
+        assert meta["gate_fired"] is True
+        assert [e.type for e in events] == ["status", "replace"]
+        assert events[1].content == result
+        assert events[1].agent == "RAG Agent"
+
+    def test_not_streamed_emits_status_only(self):
+        _, _, events = self._evaluate(self.RESPONSE, already_streamed=False)
+        assert [e.type for e in events] == ["status"]
+        assert isinstance(events[0], Event)
+
+    def test_passed_response_not_replaced(self):
+        response = "ADR.29 specifies OAuth 2.0 for authorization."
+        result, _, events = self._evaluate(response, already_streamed=True)
+        assert result == response
+        assert events == []
+
+
+def _words(n: int, word: str = "word") -> str:
+    return " ".join([word] * n)
+
+
+SCORER_CFG = {
+    "token_ceiling": 300,
+    "local_scorer": {
+        "enabled": True,
+        "pass_tokens": 400,
+        "max_pass_headings": 1,
+        "max_pass_list_items": 2,
+        "fail_tokens": 700,
+        "fail_headings": 4,
+        "dense_citations": 2.0,
+        "definition_scale": 0.75,
+    },
+}
+
+
+class TestLocalScorer:
+    def test_query_class(self):
+        assert _classify_query("What is ADR.29?") == "definition"
+        assert _classify_query("define eventual consistency") == "definition"
+        assert _classify_query("Summarize the OAuth decision") == "lookup"
+
+    def test_under_ceiling_passes_even_when_disabled(self):
+        verdict, features = _score_proportionality(_words(200), "q", {"token_ceiling": 300})
+        assert verdict == "pass" and features["reason"] == "under token ceiling"
+
+    def test_concise_prose_passes(self):
+        verdict, _ = _score_proportionality(_words(380), "Summarize ADR.29", SCORER_CFG)
+        assert verdict == "pass"
+
+    def test_definition_queries_use_scaled_thresholds(self):
+        response = _words(380)
+        assert _score_proportionality(response, "What is ADR.29?", SCORER_CFG)[0] == "uncertain"
+        assert _score_proportionality(_words(540), "What is ADR.29?", SCORER_CFG)[0] == "fail"
+        assert _score_proportionality(_words(540), "Summarize ADR.29", SCORER_CFG)[0] == "uncertain"
+
+    def test_far_over_budget_fails(self):
+        verdict, features = _score_proportionality(_words(800), "Summarize ADR.29", SCORER_CFG)
+        assert verdict == "fail" and features["reason"] == "far over token budget"
+
+    def test_sectioned_walkthrough_fails_unless_citation_dense(self):
+        sections = "".join(f"## Section {i}\n{_words(80)}\n\n" for i in range(4))
+        assert _score_proportionality(sections, "Summarize ADR.29", SCORER_CFG)[0] == "fail"
+
+        cited = "".join(
+            f"## Section {i}\n{_words(70)} ADR.{i}0 PCP.{i}1 ADR.{i}2 PCP.{i}3 ADR.{i}4 PCP.{i}5 ADR.{i}6\n\n"
+            for i in range(4)
+        )
+        verdict, features = _score_proportionality(cited, "Summarize ADR.29", SCORER_CFG)
+        assert features["citation_density"] >= 2.0
+        assert verdict == "uncertain"
+
+    def test_disabled_scorer_defers_to_llm(self):
+        assert _score_proportionality(_words(900), "q", {"token_ceiling": 300})[0] == "uncertain"
+
+
+class TestParseFused:
+    def test_pass(self):
+        assert _parse_fused('{"verdict": "PASS"}') == (False, None)
+
+    def test_fail_with_text(self):
+        assert _parse_fused('```json\n{"verdict": "FAIL", "condensed": " Short. "}\n```') == (True, "Short.")
+
+    def test_fail_without_text(self):
+        assert _parse_fused('{"verdict": "FAIL"}') == (True, None)
+
+    def test_malformed_defaults(self):
+        assert _parse_fused("PASS, looks fine") == (False, None)
+        assert _parse_fused("FAIL") == (True, None)
+        assert _parse_fused("[1, 2]") == (False, None)
+
+
+class TestGateModes:
+    """Scheduling of the gate's LLM calls per proportionality mode."""
+
+    # Two headings keep it out of the scorer's clear-pass band
+    RESPONSE = "## Context\n" + _words(170) + " ADR.29\n\n## Decision\n" + _words(170)
+
+    @pytest.fixture
+    def llm(self, monkeypatch):
+        calls = []
+        script = {"evaluate": "PASS", "fused": '{"verdict": "PASS"}', "cancelled": False}
+
+        class _Client:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        async def fake_request(self, client, system_prompt, user_content, model, provider,
+                               max_tokens, json_output):
+            assert isinstance(client, _Client)
+            kind = "fused" if json_output else (
+                "evaluate" if system_prompt == "EVAL" else "condense"
+            )
+            calls.append(kind)
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                script["cancelled"] = True
+                raise
+            return script.get(kind, "Condensed answer.")
+
+        monkeypatch.setattr(quality_gate, "_new_client", lambda provider: _Client())
+        monkeypatch.setattr(ResponseQualityGate, "_request", fake_request)
+        gate_stats.reset()
+        return calls, script
+
+    def _run(self, monkeypatch, mode, query="Summarize ADR.29", response=None):
+        monkeypatch.setattr(quality_gate, "_get_quality_gate_config", lambda: {
+            "enabled": True,
+            "proportionality": {
+                **SCORER_CFG,
+                "enabled": True,
+                "mode": mode,
+                "evaluation_prompt": "EVAL",
+                "condensation_prompt": "CONDENSE",
+                "fused_prompt": "FUSED",
+            },
+        })
+        return asyncio.run(ResponseQualityGate().evaluate(
+            response=response or self.RESPONSE, query=query, complexity="simple",
+            event_queue=None, agent_label="RAG Agent",
+        ))
+
+    def test_sequential(self, llm, monkeypatch):
+        calls, script = llm
+        result, meta = self._run(monkeypatch, "sequential")
+        assert result == self.RESPONSE and meta["path"] == "sequential_pass"
+        script["evaluate"] = "FAIL"
+        result, meta = self._run(monkeypatch, "sequential")
+        assert calls == ["evaluate", "evaluate", "condense"]
+        assert meta["path"] == "sequential_fail"
+        assert result == "Condensed answer.\n\nSee also: ADR.29"
+
+    def test_fused_single_call(self, llm, monkeypatch):
+        calls, script = llm
+        _, meta = self._run(monkeypatch, "fused")
+        assert meta["path"] == "fused_pass"
+        script["fused"] = '{"verdict": "FAIL", "condensed": "ADR.29 in short."}'
+        result, meta = self._run(monkeypatch, "fused")
+        assert calls == ["fused", "fused"]
+        assert result == "ADR.29 in short." and meta["path"] == "fused_fail"
+
+    def test_fused_fail_without_text_falls_back_to_condense(self, llm, monkeypatch):
+        calls, script = llm
+        script["fused"] = '{"verdict": "FAIL"}'
+        result, _ = self._run(monkeypatch, "fused")
+        assert calls == ["fused", "condense"]
+        assert result.startswith("Condensed answer.")
+
+    def test_speculative_pass_cancels_condensation(self, llm, monkeypatch):
+        calls, script = llm
+        result, meta = self._run(monkeypatch, "speculative")
+        assert result == self.RESPONSE and meta["path"] == "speculative_pass"
+        assert sorted(calls) == ["condense", "evaluate"]
+        assert script["cancelled"] is True
+
+    def test_speculative_fail_overlaps_calls(self, llm, monkeypatch):
+        calls, script = llm
+        script["evaluate"] = "FAIL"
+        result, meta = self._run(monkeypatch, "speculative")
+        assert meta["path"] == "speculative_fail"
+        assert result.startswith("Condensed answer.")
+        assert len(calls) == 2
+        assert meta["latency_ms"] < 100  # two 50ms calls, run concurrently
+
+    def test_local_verdicts_skip_the_evaluation_call(self, llm, monkeypatch):
+        calls, _ = llm
+        _, meta = self._run(monkeypatch, "sequential", response=_words(350))
+        assert meta["path"] == "local_pass" and calls == []
+        _, meta = self._run(monkeypatch, "sequential", response=_words(900))
+        assert meta["path"] == "local_fail" and calls == ["condense"]
+
+        stats = gate_stats.snapshot()
+        assert stats["total"] == 2
+        assert stats["paths"]["local_pass"]["hit_rate"] == 0.5
+        assert stats["paths"]["local_fail"]["avg_ms"] >= 50
@@ -1125,3 +1125,96 @@ class TestDetectModules:
         assert by_path["src/aion/agents"]["file_count"] >= 2
         # tools/ has __init__.py + search.py + archimate.py = 3 files
         assert by_path["src/aion/tools"]["file_count"] >= 2
+
+
+# ── Native pipeline (RepoAnalysisAgent fast path) ─────────────────────────────
+
+class TestNativePipeline:
+    """The six extraction steps run without an LLM deciding each tool call."""
+
+    def test_runs_all_steps_and_merges(self, sample_repo):
+        import asyncio
+        from queue import Queue
+
+        from aion.agents import SessionContext
+        from aion.agents.repo_analysis_agent import run_repo_pipeline
+
+        q = Queue()
+        ctx = SessionContext(event_queue=q)
+        merged = asyncio.run(run_repo_pipeline(ctx, str(sample_repo)))
+
+        assert merged["type"] == "architecture_notes"
+        assert merged["summary"]["repo_name"] == sample_repo.name
+        tools = [e.tool for e in q.queue if e.type == "decision"]
+        assert tools[:2] == ["clone_repo", "profile_repo"]
+        assert set(tools[2:4]) == {"extract_manifests", "extract_code_structure"}
+        assert tools[4:] == ["build_dep_graph", "merge_and_save_notes"]
+        assert ctx.tool_call_count == 0  # no agent tool calls involved
+
+    def test_clone_failure_short_circuits(self, tmp_path):
+        import asyncio
+
+        from aion.agents import SessionContext
+        from aion.agents.repo_analysis_agent import run_repo_pipeline
+
+        ctx = SessionContext()
+        result = asyncio.run(run_repo_pipeline(ctx, str(tmp_path / "missing")))
+        assert "error" in result
+        assert [o["type"] for o in ctx.retrieved_objects] == ["clone_result"]
+
+    def test_summary_agent_gets_summary_only_prompt(self, sample_repo, monkeypatch):
+        import asyncio
+
+        pytest.importorskip("pydantic_ai")
+        from pydantic_ai.messages import ModelResponse, SystemPromptPart, TextPart
+        from pydantic_ai.models.function import FunctionModel
+
+        from aion.agents import SessionContext
+        from aion.agents import repo_analysis_agent as ra
+        from aion.config import settings
+
+        prompts = []
+
+        def summarize(messages, info):
+            prompts.extend(
+                p.content for m in messages for p in m.parts if isinstance(p, SystemPromptPart)
+            )
+            assert not info.function_tools
+            return ModelResponse(parts=[TextPart("summary")])
+
+        monkeypatch.setattr(
+            type(settings), "build_pydantic_ai_model",
+            lambda self, component: FunctionModel(summarize),
+        )
+        # Only the summary agent runs on this path
+        monkeypatch.setattr(ra, "_build_repo_analysis_agent", lambda mcp_tools=None: None)
+        agent = ra.RepoAnalysisAgent()
+        ctx = SessionContext(system_prompt=agent._build_system_prompt(""))
+        output = asyncio.run(agent._run_native("analyze", str(sample_repo), ctx))
+
+        assert output == "summary"
+        assert prompts == [ra._SUMMARY_SYSTEM_PROMPT]
+        assert "clone_repo" not in prompts[0]
+
+    def test_find_repo_ref(self, sample_repo):
+        from aion.agents.repo_analysis_agent import _find_repo_ref
+
+        assert _find_repo_ref(
+            "Analyze https://github.com/acme/widget/tree/main."
+        ) == "https://github.com/acme/widget/tree/main"
+        assert _find_repo_ref(f"model the repo at {sample_repo}") == str(sample_repo)
+        assert _find_repo_ref("analyze our billing repository") is None
+
+    def test_find_repo_ref_ignores_non_repo_urls(self):
+        from aion.agents.repo_analysis_agent import _find_repo_ref
+
+        assert _find_repo_ref("see https://docs.example.com/guide, then explain") is None
+        assert _find_repo_ref("clone (https://git.example.com/team/app.git).") == (
+            "https://git.example.com/team/app.git"
+        )
+        assert _find_repo_ref("use <git@gitlab.com:team/app.git>, please") == (
+            "git@gitlab.com:team/app.git"
+        )
+        assert _find_repo_ref("docs at https://example.com/x then https://github.com/acme/widget)") == (
+            "https://github.com/acme/widget"
+        )
@@ -0,0 +1,186 @@
+"""Tests for the offline SKOS vocabulary index (``aion.tools.skosmos_index``).
+
+The index is a cache in front of the SKOSMOS REST API: search and
+concept details resolve locally, and the live API is only consulted on
+a miss. Built here from a small JSON-LD graph in the shape SKOSMOS
+returns from ``/{vocab}/data``.
+"""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from aion.tools import skosmos_index
+from aion.tools.skosmos_index import VocabularyIndex, concepts_from_graph
+
+
+def _graph():
+    return {"graph": [
+        {
+            "uri": "http://ex.org/esav/dso",
+            "type": "skos:Concept",
+            "prefLabel": [
+                {"lang": "en", "value": "Distribution System Operator (DSO)"},
+                {"lang": "nl", "value": "Netbeheerder"},
+            ],
+            "altLabel": [{"lang": "en", "value": "DSO"}],
+            "skos:definition": [
+                {"lang": "en", "value": "Operator of a distribution grid."},
+                {"lang": "nl", "value": "Beheerder van een distributienet."},
+            ],
+            "broader": {"uri": "http://ex.org/esav/operator"},
+        },
+        {
+            "uri": "http://ex.org/esav/operator",
+            "type": ["skos:Concept"],
+            "prefLabel": {"lang": "en", "value": "Operator"},
+            "narrower": [{"uri": "http://ex.org/esav/dso"}],
+        },
+        {
+            "uri": "http://ex.org/esav/active-power",
+            "type": "skos:Concept",
+            "prefLabel": [{"lang": "en", "value": "Active power"}],
+            "skos:definition": [{"lang": "en", "value": "Real component of power."}],
+        },
+        {"uri": "http://ex.org/esav", "type": "skos:ConceptScheme",
+         "prefLabel": "ESAV"},
+    ]}
+
+
+@pytest.fixture
+def index():
+    concepts = concepts_from_graph(_graph(), "esav")
+    concepts.append({
+        "uri": "http://ex.org/cim/power", "vocab": "cim",
+        "pref": {"en": "Apparent power"}, "alt": {}, "def": {"en": "S = V·I"},
+        "scope": {}, "broader": [], "narrower": [], "related": [], "notation": "",
+    })
+    return VocabularyIndex(concepts=concepts, vocabularies=[{"id": "esav"}, {"id": "cim"}])
+
+
+@pytest.fixture(autouse=True)
+def _reset_index_cache():
+    skosmos_index.clear_cache()
+    yield
+    skosmos_index.clear_cache()
+
+
+class TestGraphParsing:
+    def test_only_concepts_are_kept(self, index):
+        assert len(index) == 4
+        assert "http://ex.org/esav" not in {c["uri"] for c in index.concepts}
+
+    def test_language_maps(self, index):
+        dso = index.concepts[0]
+        assert dso["pref"] == {"en": "Distribution System Operator (DSO)", "nl": "Netbeheerder"}
+        assert dso["def"]["nl"] == "Beheerder van een distributienet."
+
+
+class TestSearch:
+    def test_exact_before_prefix_before_infix(self, index):
+        hits = index.search("power")
+        # "power" is an infix of both — prefix/exact rank nothing, shorter first
+        assert [h["prefLabel"] for h in hits] == ["Active power", "Apparent power"]
+        hits = index.search("active")
+        assert hits[0]["uri"] == "http://ex.org/esav/active-power"
+
+    def test_abbreviation_map(self, index):
+        hits = index.search("dso")
+        assert hits[0]["uri"] == "http://ex.org/esav/dso"
+        assert len(hits) == 1  # unique per concept
+
+    def test_language_preference(self, index):
+        assert index.search("netbeheer", lang="nl")[0]["prefLabel"] == "Netbeheerder"
+        assert index.search("netbeheer", lang="en")[0]["prefLabel"].startswith("Distribution")
+
+    def test_vocab_filter_and_limit(self, index):
+        assert [h["vocab"] for h in index.search("power", vocab="cim")] == ["cim"]
+        assert len(index.search("o", max_results=2)) == 2
+
+    def test_wildcards_stripped(self, index):
+        assert index.search("*operator*")[0]["prefLabel"] == "Operator"
+
+
+class TestConceptDetails:
+    def test_links_resolve_labels(self, index):
+        details = index.concept_details("http://ex.org/esav/dso", vocab="esav")
+        assert details["definition"] == "Operator of a distribution grid."
+        assert details["broader"] == [{"uri": "http://ex.org/esav/operator", "label": "Operator"}]
+        assert details["altLabels"] == ["DSO"]
+
+    def test_miss_returns_none(self, index):
+        assert index.concept_details("http://ex.org/unknown") is None
+        assert index.concept_details("http://ex.org/esav/dso", vocab="cim") is None
+
+
+class TestPersistence:
+    def test_roundtrip(self, index, tmp_path):
+        path = tmp_path / "idx.json.gz"
+        index.save(path)
+        loaded = VocabularyIndex.load(path)
+        assert loaded.concepts == index.concepts
+        assert loaded.lang == "en"
+        assert loaded.search("dso")[0]["uri"] == "http://ex.org/esav/dso"
+
+    def test_wrong_version_rejected(self):
+        with pytest.raises(ValueError, match="sync-vocabularies"):
+            VocabularyIndex.from_snapshot({"version": 0, "concepts": []})
+
+    def test_missing_file_means_no_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(skosmos_index.settings, "skosmos_index_path", tmp_path / "none.json.gz")
+        assert skosmos_index.get_vocabulary_index() is None
+
+
+class TestToolFallback:
+    """``aion.tools.skosmos`` serves from the index, live API only on a miss."""
+
+    def test_search_hit_skips_network(self, index):
+        from aion.tools import skosmos
+
+        skosmos_index.set_vocabulary_index(index)
+        with patch.object(skosmos, "_http") as mock_http:
+            result = skosmos.skosmos_search("active power")
+        assert result["results"][0]["vocab"] == "esav"
+        mock_http.assert_not_called()
+
+    def test_search_miss_falls_back_to_live(self, index):
+        from aion.tools import skosmos
+
+        skosmos_index.set_vocabulary_index(index)
+        with patch.object(skosmos, "_http") as mock_http:
+            mock_http.return_value.get.return_value.json.return_value = {"results": []}
+            result = skosmos.skosmos_search("flux capacitor")
+        assert result == {"results": [], "total_results": 0}
+        mock_http.return_value.get.assert_called_once()
+
+    def test_define_resolves_fully_offline(self, index):
+        from aion.tools import skosmos
+
+        skosmos_index.set_vocabulary_index(index)
+        with patch.object(skosmos, "_http") as mock_http:
+            result = skosmos.skosmos_define("active power")
+        assert result["definition"] == "Real component of power."
+        assert result["vocabulary"] == "esav"
+        mock_http.assert_not_called()
+
+    def test_list_vocabularies_in_sync_language_is_offline(self, index):
+        from aion.tools import skosmos
+
+        skosmos_index.set_vocabulary_index(index)
+        with patch.object(skosmos, "_http") as mock_http:
+            result = skosmos.skosmos_list_vocabularies(lang="en")
+        assert [v["id"] for v in result["vocabularies"]] == ["esav", "cim"]
+        mock_http.assert_not_called()
+
+    def test_list_vocabularies_other_language_goes_live(self, index):
+        from aion.tools import skosmos
+
+        skosmos_index.set_vocabulary_index(index)
+        with patch.object(skosmos, "_http") as mock_http:
+            mock_http.return_value.get.return_value.json.return_value = {
+                "vocabularies": [{"id": "esav", "title": "Energiesysteem"}],
+            }
+            result = skosmos.skosmos_list_vocabularies(lang="nl")
+        assert result["vocabularies"][0]["title"] == "Energiesysteem"
+        assert mock_http.return_value.get.call_args.kwargs["params"] == {"lang": "nl"}
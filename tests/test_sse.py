@@ -0,0 +1,131 @@
+"""Tests for the coalescing SSE writer (aion.sse)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+
+import pytest
+
+from aion.events import Event
+from aion.sse import coalesce_sse, sse_stats
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    sse_stats.reset()
+    yield
+    sse_stats.reset()
+
+
+async def _frames(*steps):
+    """Yield ``Event.to_sse()`` frames; a float step sleeps that long."""
+    for step in steps:
+        if isinstance(step, float):
+            await asyncio.sleep(step)
+        else:
+            yield step.to_sse()
+
+
+def _text(content):
+    return Event(type="text", content=content)
+
+
+async def _collect(source, window_ms=30):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    chunks = []
+    async for chunk in coalesce_sse(source, window_ms=window_ms):
+        chunks.append((chunk, loop.time() - start))
+    return chunks
+
+
+def _types(chunk: str) -> list[str]:
+    return [frame.split('"type": "')[1].split('"')[0] for frame in chunk.split("\n\n") if frame]
+
+
+class TestCoalesceSSE:
+    async def test_burst_coalesced_latency_critical_frames_immediate(self):
+        chunks = await _collect(_frames(
+            Event(type="init", conversation_id="c"),
+            Event(type="status", content="Searching..."),
+            Event(type="decision", tool="search"),
+            _text("Hel"), _text("lo"), _text(" wor"), _text("ld"),
+            0.1,
+            Event(type="complete", response="Hello world"),
+        ))
+
+        assert [_types(c) for c, _ in chunks] == [
+            ["init"],
+            ["status", "decision", "text"],  # first token flushes what precedes it
+            ["text", "text", "text"],        # window expiry
+            ["complete"],                    # terminal, not held for the window
+        ]
+        assert chunks[-1][1] - chunks[-2][1] > 0.05
+
+        stats = sse_stats.snapshot()
+        assert stats["events"] == 8
+        assert stats["flushes"] == 4
+        assert stats["events_per_flush"] == 2.0
+        assert stats["bytes"] == sum(len(c.encode()) for c, _ in chunks)
+        assert stats["bytes_per_event"] == round(stats["bytes"] / 8, 1)
+        assert stats["flushes_per_second"] > 0
+
+    async def test_output_bytes_unchanged(self):
+        events = [Event(type="init"), _text("a"), _text("é"), Event(type="error", content="x")]
+        chunks = await _collect(_frames(*events))
+        assert "".join(c for c, _ in chunks) == "".join(e.to_sse() for e in events)
+
+    async def test_trailing_frames_flushed_after_window(self):
+        chunks = await _collect(_frames(
+            Event(type="init"), _text("first"), Event(type="status", content="tool call"), 0.2,
+            Event(type="complete"),
+        ), window_ms=20)
+        assert [_types(c) for c, _ in chunks] == [["init"], ["text"], ["status"], ["complete"]]
+        # The status frame went out when its window closed, not with complete
+        assert chunks[3][1] - chunks[2][1] > 0.1
+
+    async def test_zero_window_passes_through(self):
+        chunks = await _collect(_frames(Event(type="init"), _text("a"), _text("b")), window_ms=0)
+        assert len(chunks) == 3
+        assert sse_stats.snapshot()["flushes"] == 3
+
+    async def test_source_error_propagates_after_buffered_frames(self):
+        async def failing():
+            yield Event(type="init").to_sse()
+            yield Event(type="status", content="s").to_sse()
+            raise RuntimeError("boom")
+
+        received = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for chunk in coalesce_sse(failing(), window_ms=1000):
+                received.append(chunk)
+        assert [_types(c) for c in received] == [["init"], ["status"]]
+
+    async def test_context_vars_persist_across_source_steps(self):
+        var = contextvars.ContextVar("request_id", default=None)
+
+        async def source():
+            var.set("req-1")
+            yield Event(type="init").to_sse()
+            await asyncio.sleep(0.01)
+            yield Event(type="status", content=var.get()).to_sse()
+
+        chunks = await _collect(source())
+        assert '"content": "req-1"' in chunks[-1][0]
+
+    async def test_close_runs_source_cleanup(self):
+        cleaned = asyncio.Event()
+
+        async def source():
+            try:
+                yield Event(type="init").to_sse()
+                await asyncio.sleep(10)
+                yield Event(type="complete").to_sse()
+            finally:
+                cleaned.set()
+
+        writer = coalesce_sse(source(), window_ms=20)
+        assert _types(await writer.__anext__()) == ["init"]
+        await writer.aclose()
+        assert cleaned.is_set()
@@ -0,0 +1,217 @@
+"""Tests for per-request span tracing (aion.tracing)."""
+
+import asyncio
+import contextvars
+import json
+import threading
+
+import pytest
+from pydantic_ai import Agent, RunContext
+from pydantic_ai.models.test import TestModel
+
+from aion.events import Event
+from aion.tracing import (
+    annotate,
+    current_trace,
+    finish_trace,
+    span,
+    start_trace,
+    traced,
+    traced_model,
+    traced_tool,
+)
+
+
+@pytest.fixture
+def trace():
+    """Run the test inside a fresh context so traces never leak between tests."""
+    ctx = contextvars.copy_context()
+    t = ctx.run(start_trace, "test", "req-1")
+    yield ctx, t
+    ctx.run(finish_trace, t)
+
+
+class TestSpans:
+    def test_noop_without_trace(self):
+        assert current_trace() is None
+        with span("weaviate.hybrid", "weaviate") as s:
+            s.set(results=3)
+            annotate(input_tokens=1)
+
+        @traced("db.write", "db")
+        def write():
+            return 42
+
+        assert write() == 42
+
+    def test_nesting_and_breakdown(self, trace):
+        ctx, t = trace
+
+        def work():
+            with span("tool.search", "tool", query="cim"):
+                with span("weaviate.hybrid", "weaviate") as s:
+                    s.set(results=4, collection=object())
+                with span("embedding.ollama", "embedding"):
+                    pass
+            with span("llm.rag", "llm"):
+                annotate(input_tokens=100, output_tokens=20)
+
+        ctx.run(work)
+        summary = t.summary()
+
+        assert summary["request_id"] == "req-1"
+        assert [s["name"] for s in summary["spans"]] == ["tool.search", "llm.rag"]
+        tool = summary["spans"][0]
+        assert tool["attrs"] == {"query": "cim"}
+        assert [c["name"] for c in tool["children"]] == ["weaviate.hybrid", "embedding.ollama"]
+        assert tool["children"][0]["attrs"]["results"] == 4
+        assert isinstance(tool["children"][0]["attrs"]["collection"], str)
+        assert set(summary["breakdown"]) == {"tool", "weaviate", "embedding", "llm"}
+        assert summary["by_name"]["llm.rag"]["count"] == 1
+        assert summary["tokens"] == {"input_tokens": 100, "output_tokens": 20}
+        json.dumps(summary)
+
+    def test_error_recorded(self, trace):
+        ctx, t = trace
+
+        def fail():
+            with span("db.save_message", "db"):
+                raise OSError("disk full")
+
+        with pytest.raises(OSError):
+            ctx.run(fail)
+        assert t.summary()["spans"][0]["attrs"] == {"error": "OSError"}
+
+    def test_thread_started_with_copied_context(self, trace):
+        ctx, t = trace
+
+        def agent_thread():
+            with span("llm.rag", "llm"):
+                pass
+
+        def request():
+            with span("rag_agent", "agent"):
+                thread = threading.Thread(target=contextvars.copy_context().run, args=(agent_thread,))
+                thread.start()
+                thread.join()
+
+        ctx.run(request)
+        root = t.summary()["spans"][0]
+        assert root["children"][0]["name"] == "llm.rag"
+
+    async def test_async_decorator_and_concurrent_tasks(self):
+        @traced("embedding.batch", "embedding")
+        async def embed(i):
+            await asyncio.sleep(0.001 * i)
+            return i
+
+        async def request():
+            t = start_trace("request", "req-2")
+            with span("retrieval", "tool"):
+                assert await asyncio.gather(embed(2), embed(1)) == [2, 1]
+            finish_trace(t)
+            return t
+
+        t = await asyncio.create_task(request())
+        retrieval = t.summary()["spans"][0]
+        assert [c["name"] for c in retrieval["children"]] == ["embedding.batch"] * 2
+        assert current_trace() is None
+
+
+class TestExport:
+    def test_finish_writes_chrome_trace(self, tmp_path):
+        def request():
+            t = start_trace("chat_stream", "abc123")
+            with span("persona.classify", "persona", model="m"):
+                pass
+            finish_trace(t, tmp_path)
+            return t
+
+        contextvars.copy_context().run(request)
+
+        data = json.loads((tmp_path / "abc123.trace.json").read_text())
+        events = data["traceEvents"]
+        assert [e["name"] for e in events] == ["chat_stream", "persona.classify"]
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+        assert events[1]["args"] == {"model": "m"}
+        assert events[1]["ts"] >= events[0]["ts"]
+
+    def test_complete_event_carries_trace(self, trace):
+        ctx, t = trace
+        event = Event(type="complete", response="ok", timing={"total_ms": 5})
+
+        def emit():
+            with span("quality_gate.evaluate", "quality_gate"):
+                pass
+            return event.to_sse(), Event(type="status", content="x").to_sse()
+
+        complete, status = ctx.run(emit)
+        payload = json.loads(complete[len("data: "):])
+        assert payload["timing"]["total_ms"] == 5
+        assert payload["timing"]["trace"]["breakdown"]["quality_gate"]["count"] == 1
+        assert event.timing == {"total_ms": 5}
+        assert "timing" not in json.loads(status[len("data: "):])
+
+    def test_complete_event_without_trace_unchanged(self):
+        payload = json.loads(Event(type="complete", response="ok").to_sse()[len("data: "):])
+        assert payload == {"type": "complete", "response": "ok"}
+
+
+class TestPydanticAI:
+    def _agent(self):
+        agent = Agent(traced_model(TestModel(), "rag"), deps_type=int)
+
+        @agent.tool
+        @traced_tool
+        def search(ctx: RunContext[int], query: str, limit: int = 3) -> list[dict]:
+            """Search the knowledge base.
+
+            Args:
+                query: Search query
+            """
+            return [{"query": query, "deps": ctx.deps}]
+
+        return agent
+
+    def test_traced_tool_keeps_schema(self):
+        schema = self._agent()._function_toolset.tools["search"].function_schema.json_schema
+        assert schema["required"] == ["query"]
+        assert schema["properties"]["query"]["description"] == "Search query"
+
+    async def test_llm_and_tool_spans(self):
+        agent = self._agent()
+        t = start_trace("request", "req-3")
+        result = await agent.run("hello", deps=7)
+        async with agent.run_stream("again", deps=7) as stream:
+            await stream.get_output()
+        finish_trace(t)
+
+        assert '"deps":7' in result.output.replace(" ", "")
+        summary = t.summary()
+        llm_spans = [s for s in summary["spans"] if s["cat"] == "llm"]
+        assert llm_spans and all(s["attrs"]["model"] == "test" for s in llm_spans)
+        assert any(s["attrs"].get("stream") for s in llm_spans)
+        assert summary["tokens"]["input_tokens"] > 0
+        assert summary["by_name"]["tool.search"]["count"] == 2
+
+
+class TestGenerationLLMSpan:
+    async def test_call_llm_records_tokens(self, monkeypatch):
+        from aion.generation import GenerationPipeline
+
+        async def fake_ollama(self, system_prompt, user_prompt, max_tokens_override=None, on_token=None):
+            return "yaml", {"prompt_tokens": 120, "completion_tokens": 45}
+
+        monkeypatch.setattr(GenerationPipeline, "_call_ollama", fake_ollama)
+        monkeypatch.setattr(GenerationPipeline, "_call_openai", fake_ollama)
+
+        t = start_trace("request", "req-4")
+        assert await GenerationPipeline(client=None)._call_llm("sys", "user") == (
+            "yaml", {"prompt_tokens": 120, "completion_tokens": 45},
+        )
+        finish_trace(t)
+
+        summary = t.summary()
+        assert [s["name"] for s in summary["spans"]] == ["llm_scheduler.wait", "generation.llm"]
+        assert summary["spans"][1]["cat"] == "llm"
+        assert summary["tokens"] == {"input_tokens": 120, "output_tokens": 45}
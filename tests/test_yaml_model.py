@@ -0,0 +1,203 @@
+"""Tests for the typed YAML model (``aion.tools.yaml_model``).
+
+The generation pipeline parses LLM YAML once into a ``YamlModel`` and
+runs reconciliation, backfill, DCT enrichment, diff merge and XML
+conversion on it. These tests pin the model to the text APIs it replaced:
+same validation, same XML, same merged YAML.
+"""
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from aion.generation import GenerationPipeline
+from aion.tools.reconciliation import enrich_model_with_dct, enrich_yaml_with_dct
+from aion.tools.yaml_model import (
+    YamlElement,
+    YamlModel,
+    YamlRelationship,
+    model_to_data,
+    parse_model,
+)
+from aion.tools.yaml_to_xml import (
+    _parse_and_validate,
+    apply_model_diff,
+    apply_yaml_diff,
+    serialize_model,
+    yaml_to_archimate_xml,
+)
+
+MODEL_YAML = """\
+model:
+  name: "Typed Model"
+elements:
+  - id: p1
+    type: Principle
+    name: "PCP.10 Consistency"
+    documentation: "Eventual consistency."
+    source_ref: PCP.10
+  - id: a1
+    type: ApplicationComponent
+    name: "Sync Service"
+    documentation: "Syncs."
+    properties:
+      owner: ops
+relationships:
+  - type: Realization
+    source: a1
+    target: p1
+  - type: Association
+    source: a1
+    target: p1
+  - type: Serving
+    source: a1
+    target: ghost
+"""
+
+METADATA = {
+    "PCP.10": {"resolved_identifier": "urn:uuid:abc", "title": "Consistency", "language": "en"},
+}
+
+
+class TestParseModel:
+    def test_elements_indexed_by_normalized_id(self):
+        model = parse_model(MODEL_YAML)
+        assert list(model.elements) == ["id-p1", "id-a1"]
+        assert model.elements["id-p1"].source_ref == "PCP.10"
+        assert model.elements["id-a1"].properties == {"owner": "ops"}
+        # Dangling relationship dropped, as the converter always did
+        assert len(model.relationships) == 2
+
+    def test_matches_legacy_normalized_dict(self):
+        assert model_to_data(parse_model(MODEL_YAML)) == _parse_and_validate(MODEL_YAML)
+
+    def test_slotted(self):
+        model = parse_model(MODEL_YAML)
+        with pytest.raises(AttributeError):
+            model.elements["id-a1"].colour = "red"
+
+    @pytest.mark.parametrize("text, message", [
+        ("[1, 2]", "YAML root must be a mapping"),
+        ("model: {name: X}\nelements: []", "'elements' must be a non-empty list"),
+        ("model: {name: X}\nelements:\n  - {id: a, type: Bogus, name: A}", "invalid type 'Bogus'"),
+    ])
+    def test_validation_errors(self, text, message):
+        with pytest.raises(ValueError, match=message):
+            parse_model(text)
+
+
+class TestModelOperations:
+    def test_remap_ids_follows_relationships(self):
+        model = parse_model(MODEL_YAML)
+        model.remap_ids({"id-a1": "id-canon-a"})
+        assert list(model.elements) == ["id-p1", "id-canon-a"]
+        assert {r.source for r in model.relationships} == {"id-canon-a"}
+        assert model.relationship_ids() == ["id-rel-canon-a-p1", "id-rel-canon-a-p1-2"]
+
+    def test_remap_collision_is_duplicate_error(self):
+        model = parse_model(MODEL_YAML)
+        with pytest.raises(ValueError, match="Duplicate element id: 'p1'"):
+            model.remap_ids({"id-a1": "id-p1"})
+
+    def test_copy_is_independent(self):
+        model = parse_model(MODEL_YAML)
+        clone = model.copy()
+        clone.elements["id-a1"].properties["owner"] = "dev"
+        clone.relationships.pop()
+        assert model.elements["id-a1"].properties == {"owner": "ops"}
+        assert len(model.relationships) == 2
+
+    def test_enrich_matches_text_form(self):
+        model = parse_model(MODEL_YAML)
+        enrich_model_with_dct(model, METADATA)
+        assert model.elements["id-p1"].source_ref == ""
+        text = yaml.safe_load(enrich_yaml_with_dct(MODEL_YAML, METADATA))
+        assert model.elements["id-p1"].properties == text["elements"][0]["properties"]
+
+    def test_serialize_round_trips(self):
+        model = parse_model(MODEL_YAML)
+        again = parse_model(serialize_model(model))
+        assert model_to_data(again) == model_to_data(model)
+        assert "source_ref" not in serialize_model(model)
+
+    def test_serialize_round_trips_escapes_and_yaml_like_ids(self):
+        model = YamlModel(
+            name='Model "v2"\twith tab',
+            documentation="line one\nline two\r\nback\\slash \x07bell \u2028sep",
+            elements={
+                "id-true": YamlElement("id-true", "ApplicationComponent", "Multi\nline",
+                                       "Doc: with colon", {"key\nx": "val\tue"}),
+                "id-1e3": YamlElement("id-1e3", "Principle", "# not a comment"),
+                "id-null": YamlElement("id-null", "Principle", "null"),
+            },
+            relationships=[
+                YamlRelationship("Realization", "id-true", "id-1e3", "re\nalizes"),
+                YamlRelationship("Realization", "id-true", "id-null"),
+            ],
+        )
+        assert parse_model(serialize_model(model)) == model
+
+    def test_xml_from_model_equals_xml_from_text(self):
+        assert yaml_to_archimate_xml(parse_model(MODEL_YAML)) == yaml_to_archimate_xml(MODEL_YAML)
+
+
+class TestModelDiff:
+    DIFF = """\
+refinement:
+  add:
+    elements:
+      - {id: n1, type: Node, name: Server}
+  modify:
+    rel-a1-p1: {name: realizes}
+  remove:
+    elements: [p1]
+"""
+
+    def test_base_untouched_and_text_wrapper_agrees(self):
+        base = parse_model(MODEL_YAML)
+        merged, summary = apply_model_diff(base, self.DIFF)
+        assert list(base.elements) == ["id-p1", "id-a1"]
+        assert list(merged.elements) == ["id-a1", "id-n1"]
+        assert summary["removed_relationships"] == 2
+
+        text, text_summary = apply_yaml_diff(MODEL_YAML, self.DIFF)
+        assert text == serialize_model(merged)
+        assert text_summary == summary
+
+    def test_modify_to_empty_name_rejected(self):
+        diff = "refinement:\n  modify:\n    a1: {name: ''}\n"
+        with pytest.raises(ValueError, match="'name' is required"):
+            apply_model_diff(parse_model(MODEL_YAML), diff)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline: one parse, every stage on the model
+# ---------------------------------------------------------------------------
+
+def test_prepare_model_reconciles_backfills_and_enriches(monkeypatch):
+    def fake_reconcile(elements, **kwargs):
+        id_map = {}
+        for elem in elements:
+            id_map[elem["id"]] = f"reg-{elem['id']}"
+            elem["id"] = id_map[elem["id"]]
+        return {"elements": elements, "id_map": id_map}
+
+    monkeypatch.setattr("aion.generation.reconcile_elements", fake_reconcile)
+    fetched = []
+    monkeypatch.setattr(
+        GenerationPipeline, "_fetch_by_doc_refs",
+        lambda self, refs: fetched.append(refs) or [{"principle_number": "10", "kb_uuid": "abc",
+                                                      "title": "Consistency"}],
+    )
+    pipeline = GenerationPipeline(client=None)
+    model = parse_model(MODEL_YAML)
+
+    metadata = pipeline._prepare_model(model, ["PCP.10"], {})
+
+    assert fetched == [["PCP.10"]]
+    assert "PCP.10" in metadata
+    assert list(model.elements) == ["id-reg-p1", "id-reg-a1"]
+    assert model.elements["id-reg-p1"].properties["dct:identifier"] == "urn:uuid:abc"
+    xml, info = yaml_to_archimate_xml(model)
+    assert 'source="id-reg-a1"' in xml and info["relationship_count"] == 2
+    assert isinstance(model, YamlModel)
@@ -111,7 +111,9 @@ class _StubRegistry:
         return None  # → system_prompt = "" (skipping skill content load)
 
 
-async def _stub_call_llm(self, system_prompt, user_prompt, max_tokens_override=None):
+async def _stub_call_llm(
+    self, system_prompt, user_prompt, max_tokens_override=None, on_token=None,
+):
     """Returns the VALID_YAML fixture wrapped in markdown fences.
     Matches the real ``_call_llm`` shape: ``(text, stats)``.
     """
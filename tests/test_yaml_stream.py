@@ -0,0 +1,193 @@
+"""Tests for streaming ArchiMate YAML validation (``aion.tools.yaml_stream``).
+
+The parser sees the LLM response as arbitrary token deltas and must
+reach the same verdict as ``yaml_to_xml._parse_and_validate`` — only
+sooner. ``GenerationPipeline`` uses it to abort a doomed generation
+mid-stream and go straight to the retry.
+"""
+from __future__ import annotations
+
+import pytest
+
+from aion.generation import GenerationPipeline
+from aion.skills.registry import SkillRegistryEntry
+from aion.tools.yaml_stream import IncrementalModelParser, YamlStreamError
+
+VALID = """\
+Here is the model:
+
+```yaml
+model:
+  name: "Streaming Fixture"
+
+elements:
+  - id: b1
+    type: BusinessProcess
+    name: "Order Processing"
+    properties:
+      - key: owner
+        value: sales
+  - id: a1
+    type: ApplicationComponent
+    name: "Order Service"
+
+relationships:
+  - type: Serving
+    source: a1
+    target: b1
+```
+"""
+
+
+def _feed(text: str, step: int, parser: IncrementalModelParser | None = None):
+    parser = parser or IncrementalModelParser()
+    for i in range(0, len(text), step):
+        parser.feed(text[i:i + step])
+    parser.finish()
+    return parser
+
+
+class TestIncrementalModelParser:
+    @pytest.mark.parametrize("step", [1, 3, 17, 10_000])
+    def test_counts_independent_of_chunking(self, step):
+        parser = _feed(VALID, step)
+        assert (parser.element_count, parser.relationship_count) == (2, 1)
+        assert parser.warnings == []
+
+    def test_progress_reported_per_item(self):
+        seen = []
+        _feed(VALID, 5, IncrementalModelParser(on_progress=lambda e, r: seen.append((e, r))))
+        assert seen == [(1, 0), (2, 0), (2, 1)]
+
+    def test_invalid_type_aborts_before_stream_ends(self):
+        text = VALID.replace("ApplicationComponent", "AppThing")
+        parser = IncrementalModelParser()
+        cut = text.index("relationships:")
+        with pytest.raises(YamlStreamError, match="invalid type 'AppThing'"):
+            parser.feed(text[:cut + len("relationships:\n")])
+
+    def test_duplicate_id(self):
+        with pytest.raises(YamlStreamError, match="Duplicate element id: 'id-b1'"):
+            _feed(VALID.replace("id: a1", "id: id-b1"), 8)
+
+    def test_missing_model_name(self):
+        with pytest.raises(YamlStreamError, match="'model.name' is required"):
+            _feed(VALID.replace('  name: "Streaming Fixture"\n', "  version: 1\n"), 8)
+
+    def test_inline_model_mapping(self):
+        text = VALID.replace('model:\n  name: "Streaming Fixture"', "model: {name: Inline}")
+        assert _feed(text, 8).element_count == 2
+
+    def test_pattern_mismatch_only_warns(self):
+        text = VALID.replace("type: Serving", "type: Access")
+        parser = _feed(text, 8)
+        assert parser.relationship_count == 1
+        assert len(parser.warnings) == 1
+
+    def test_refinement_envelope_passes_through(self):
+        diff = "```yaml\nrefinement:\n  add:\n    elements:\n      - id: x\n        type: Bogus\n```\n"
+        assert _feed(diff, 4).element_count == 0
+
+    def test_think_block_and_trailing_text_ignored(self):
+        text = "<think>\nelements:\n  - id: nope\n</think>\n" + VALID + "\nelements: oops\n"
+        assert _feed(text, 6).element_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Pipeline wiring: an aborted stream goes straight to the retry prompt
+# ---------------------------------------------------------------------------
+
+class _StubRegistry:
+    def __init__(self, entry):
+        self._entry = entry
+
+    def get_generation_skill(self, skill_tags):
+        return self._entry
+
+    def get_loader_for_skill(self, name):
+        return None
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    entry = SkillRegistryEntry(
+        name="archimate-oxc-generator", path="x/SKILL.md", description="",
+        execution="generation", validation_tool="", yaml_pipeline=True,
+    )
+    monkeypatch.setattr("aion.generation.get_skill_registry", lambda: _StubRegistry(entry))
+    monkeypatch.setattr("aion.generation.query_registry_for_prompt", lambda **kw: [])
+    monkeypatch.setattr(
+        GenerationPipeline, "_reconcile_model",
+        lambda self, model, doc_refs, source_metadata: None,
+    )
+    return GenerationPipeline(client=None)
+
+
+def _streaming_llm(outputs, prompts):
+    async def _call_llm(self, system_prompt, user_prompt, max_tokens_override=None, on_token=None):
+        prompts.append(user_prompt)
+        text = outputs[len(prompts) - 1]
+        for i in range(0, len(text), 7):
+            if on_token:
+                on_token(text[i:i + 7])
+        return text, {"prompt_tokens": 1, "completion_tokens": 1}
+    return _call_llm
+
+
+async def test_stream_abort_retries_with_error(pipeline, monkeypatch):
+    bad = VALID.replace("BusinessProcess", "BusinessThing") + "\n" * 50 + "never reached"
+    prompts: list[str] = []
+    monkeypatch.setattr(GenerationPipeline, "_call_llm", _streaming_llm([bad, VALID], prompts))
+    converted = []
+    monkeypatch.setattr(
+        "aion.generation.yaml_to_archimate_xml",
+        lambda y, previous_xml=None: converted.append(y) or ("<model>stub</model>", {}),
+    )
+
+    response, _ = await pipeline.generate(
+        query="q", skill_tags=["archimate"], source_text="src",
+    )
+
+    assert len(prompts) == 2
+    assert "invalid type 'BusinessThing'" in prompts[1]
+    assert len(converted) == 1  # only the retry output reaches the converter
+    assert "saved as an artifact" in response
+
+
+async def test_second_abort_gives_up(pipeline, monkeypatch):
+    bad = VALID.replace("BusinessProcess", "BusinessThing")
+    prompts: list[str] = []
+    monkeypatch.setattr(GenerationPipeline, "_call_llm", _streaming_llm([bad, bad], prompts))
+
+    response, _ = await pipeline.generate(
+        query="q", skill_tags=["archimate"], source_text="src",
+    )
+
+    assert len(prompts) == 2
+    assert response.startswith("YAML conversion failed after retry")
+
+
+async def test_aborted_call_counts_estimated_usage(pipeline, monkeypatch):
+    bad = VALID.replace("BusinessProcess", "BusinessThing")
+    monkeypatch.setattr(GenerationPipeline, "_call_llm", _streaming_llm([bad], []))
+    totals = {"prompt_tokens": 0, "completion_tokens": 0}
+
+    with pytest.raises(YamlStreamError):
+        await pipeline._call_llm_monitored(
+            "s" * 40, "u" * 40, totals, monitor=IncrementalModelParser(),
+        )
+
+    assert totals["prompt_tokens"] == 20
+    assert 0 < totals["completion_tokens"] < len(bad) // 4
+
+
+async def test_finish_surfaces_error_in_last_item(pipeline, monkeypatch):
+    body = VALID.split("```yaml\n", 1)[1].split("```", 1)[0]
+    unterminated = body.replace("    target: b1\n", "")  # last item, no closing fence
+    monkeypatch.setattr(GenerationPipeline, "_call_llm", _streaming_llm([unterminated], []))
+    totals = {"prompt_tokens": 0, "completion_tokens": 0}
+
+    with pytest.raises(YamlStreamError, match="'source' and 'target' are required"):
+        await pipeline._call_llm_monitored("s", "u", totals, monitor=IncrementalModelParser())
+
+    assert totals == {"prompt_tokens": 1, "completion_tokens": 1}
@@ -0,0 +1,175 @@
+"""Tests for the shared YAML facade (``aion.yaml_utils``).
+
+The facade swaps PyYAML's pure-Python loader/dumper for libyaml's when
+available. That must be invisible: same objects, byte-identical text,
+and the frontmatter splitter must agree with the regex it replaced on
+every SKILL.md shipped in the repo. The benchmark compares both paths on
+a large architecture_notes document and a 1,000-element ArchiMate model.
+"""
+from __future__ import annotations
+
+import importlib
+import random
+import re
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from aion import yaml_utils
+from aion.tools.archimate import VALID_ELEMENT_TYPES, VALID_RELATIONSHIP_TYPES
+from aion.yaml_utils import dump_yaml, load_yaml, split_frontmatter
+
+_ROOT = Path(__file__).resolve().parents[1]
+_DUMP_KW = {"default_flow_style": False, "allow_unicode": True, "sort_keys": False}
+_OLD_FRONTMATTER = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)$", re.DOTALL)
+
+
+def _architecture_notes(n_components: int = 400, seed: int = 3) -> dict:
+    """Synthetic notes in the shape ``merge_architecture_notes`` produces."""
+    rng = random.Random(seed)
+    components = [
+        {
+            "id": f"mod:svc_{i}",
+            "name": f"svc_{i}",
+            "type": rng.choice(["module", "service", "library"]),
+            "language": rng.choice(["python", "typescript", None]),
+            "path": f"src/svc_{i}/",
+            "source": "code_structure",
+            "role": rng.choice(["api", "worker", "ui"]),
+            "changed": rng.random() < 0.2,
+            "interfaces": [f"/api/v1/svc_{i}/{r}" for r in ("list", "get", "create")],
+        }
+        for i in range(n_components)
+    ]
+    edges = [
+        {
+            "from": f"mod:svc_{rng.randrange(n_components)}",
+            "to": f"mod:svc_{rng.randrange(n_components)}",
+            "relation": rng.choice(["import", "api_call", "depends_on"]),
+            "evidence": f"import: svc_{i} in src/svc_{i}/main.py — “quoted” café",
+            "evidence_strength": rng.choice(["strong", "weak"]),
+        }
+        for i in range(n_components * 3)
+    ]
+    return {
+        "type": "architecture_notes",
+        "version": "1.1",
+        "meta": {"repo_name": "synthetic", "branch": "main", "analyzer_version": 2},
+        "summary": {"tech_stack": ["python", "typescript"], "total_components": n_components},
+        "components": components,
+        "edges": edges,
+        "infrastructure": [{"id": f"infra:db{i}", "name": f"db{i}", "port": 5432 + i} for i in range(40)],
+        "readme_excerpt": "Multi-line\nREADME text: with colons, 'quotes' and # hashes\n",
+    }
+
+
+def _archimate_yaml(n_elements: int = 1_000, seed: int = 5) -> str:
+    rng = random.Random(seed)
+    etypes = sorted(VALID_ELEMENT_TYPES)
+    rtypes = sorted(VALID_RELATIONSHIP_TYPES)
+    lines = ['model:\n  name: "Synthetic"\n', "elements:\n"]
+    for i in range(n_elements):
+        lines.append(
+            f"  - id: e{i}\n    type: {rng.choice(etypes)}\n    name: \"Element {i}\"\n"
+            f"    documentation: \"Does thing {i}.\"\n"
+            f"    properties:\n      \"dct:identifier\": \"urn:uuid:{i:08d}\"\n"
+        )
+    lines.append("relationships:\n")
+    for _ in range(n_elements * 2):
+        lines.append(
+            f"  - type: {rng.choice(rtypes)}\n"
+            f"    source: e{rng.randrange(n_elements)}\n    target: e{rng.randrange(n_elements)}\n"
+        )
+    return "".join(lines)
+
+
+class TestParity:
+    @pytest.mark.parametrize("data", [
+        _architecture_notes(30),
+        {"unicode": "Grid operator — “net” ✓", "empty": {}, "none": None, "nums": [1, 2.5, -3]},
+        {"long": "word " * 60, "multi": "line one\nline two\n", "colon": "a: b", "lead": " x"},
+    ])
+    def test_dump_byte_identical(self, data):
+        assert dump_yaml(data, **_DUMP_KW) == yaml.dump(data, **_DUMP_KW)
+        assert dump_yaml(data) == yaml.dump(data)
+
+    def test_load_matches_pure_python(self):
+        text = _archimate_yaml(50)
+        assert load_yaml(text) == yaml.safe_load(text)
+
+    def test_errors_surface_as_yaml_error(self):
+        with pytest.raises(yaml_utils.YAMLError):
+            load_yaml("key: [unclosed")
+
+    def test_safe_loader_rejects_python_tags(self):
+        with pytest.raises(yaml_utils.YAMLError):
+            load_yaml("!!python/object/apply:os.system ['true']")
+
+    def test_fallback_without_libyaml(self, monkeypatch):
+        monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+        monkeypatch.delattr(yaml, "CSafeDumper", raising=False)
+        try:
+            fallback = importlib.reload(yaml_utils)
+            assert fallback.HAS_LIBYAML is False
+            data = _architecture_notes(5)
+            assert fallback.load_yaml(fallback.dump_yaml(data)) == data
+        finally:
+            monkeypatch.undo()
+            importlib.reload(yaml_utils)
+
+
+class TestSplitFrontmatter:
+    @pytest.mark.parametrize("path", sorted(_ROOT.glob("**/SKILL.md")), ids=lambda p: p.parent.name)
+    def test_agrees_with_regex_on_repo_skills(self, path):
+        content = path.read_text(encoding="utf-8")
+        old = _OLD_FRONTMATTER.match(content)
+        new = split_frontmatter(content)
+        assert (old is None) == (new is None)
+        if old:
+            assert load_yaml(new[0]) == load_yaml(old.group(1))
+            assert new[1].strip() == old.group(2).strip()
+
+    @pytest.mark.parametrize("content, expected", [
+        ("---\nname: x\n---\nbody\n", ("name: x", "body\n")),
+        ("---\r\nname: x\r\n---\r\nbody", ("name: x\r", "body")),
+        ("---\nname: x\n---", ("name: x", "")),
+        ("---\na: ---x\n---y\n---\nbody", ("a: ---x\n---y", "body")),
+        ("---\n---\nbody", ("", "body")),
+        ("no frontmatter", None),
+        ("--- title\nname: x\n---\n", None),
+        ("---\nname: x\n", None),
+    ])
+    def test_cases(self, content, expected):
+        assert split_frontmatter(content) == expected
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not yaml_utils.HAS_LIBYAML, reason="PyYAML built without libyaml")
+@pytest.mark.parametrize("name", ["architecture_notes", "archimate_1000"])
+def test_libyaml_speedup(name):
+    if name == "architecture_notes":
+        text = yaml.dump(_architecture_notes(), **_DUMP_KW)
+    else:
+        text = _archimate_yaml()
+    data = yaml.safe_load(text)
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - t0
+
+    py_obj, py_load = timed(lambda: yaml.safe_load(text))
+    c_obj, c_load = timed(lambda: load_yaml(text))
+    py_text, py_dump = timed(lambda: yaml.dump(data, **_DUMP_KW))
+    c_text, c_dump = timed(lambda: dump_yaml(data, **_DUMP_KW))
+
+    assert c_obj == py_obj
+    assert c_text == py_text
+    print(
+        f"\n{name} ({len(text) / 1024:.0f} KiB): "
+        f"load {py_load * 1000:.0f} → {c_load * 1000:.0f} ms, "
+        f"dump {py_dump * 1000:.0f} → {c_dump * 1000:.0f} ms"
+    )
+    assert c_load < py_load